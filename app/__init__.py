@@ -1,4 +1,9 @@
 import os
+
+# first: times every import below when STARTUP_PROFILE=1
+from .utils import startup_profiler
+from .utils.startup_profiler import phase
+
 from flask import Flask, g
 from werkzeug.middleware.proxy_fix import ProxyFix
 from marshmallow import ValidationError
@@ -7,10 +12,9 @@ from flask_limiter.errors import RateLimitExceeded
 
 
 from .utils.extensions import limiter
+from .utils import fast_json
 from .extensions import db, redis_connection, jwt, cors
-#indexe
-from .services.pos_ledger_service import setup_indexes as setup_pos_indexes
-from .utils.database_setup import setup_database_indexes
+from .extensions import request_profiler
 
 from .config import load_config
 from .routes import (
@@ -19,13 +23,24 @@ from .routes import (
 )
 from .middleware.access_mode import detect_access_mode
 from .utils.error_handlers import register_error_handlers
+from .utils.social.api_rate_limiter import apply_rate_limit_headers
 from app.config import load_config
-from .middleware.subscription_scheduler import run_scheduled_subscription_activation
 from .jobs.trial_expiration_job import register_trial_commands
+from .jobs.subscription_activation_job import register_subscription_commands
+from .jobs.usage_reconcile_job import register_usage_commands
+from .jobs.envelope_migration_job import register_envelope_commands
+from .jobs.blind_index_backfill_job import register_blind_index_commands
+from .jobs.index_migration_job import register_index_commands
+from .jobs.stock_balance_job import register_stock_balance_commands
+from .jobs.periodic import register_periodic_commands
 
 
 # instantiate subscribers app
-def create_social_app():
+def create_social_app(service_groups=None):
+    """
+    service_groups: route groups to register (see app.routes); None reads
+    SERVICE_GROUPS, () serves only "/" and "/health" (workers, enqueuer).
+    """
     app = Flask(__name__)
     
     #get actual client IP
@@ -41,6 +56,9 @@ def create_social_app():
     # Load configuration (ensure it does NOT override Flask-Smorest keys)
     load_config(app)
 
+    # orjson-backed jsonify (JSON_FAST_PATH=false for Flask's encoder)
+    fast_json.init_app(app)
+
     # Config for MTO
     app.config["API_TITLE"] = "Subscriber API"
     app.config["API_VERSION"] = "v1"
@@ -57,32 +75,40 @@ def create_social_app():
     api = Api(app)
 
     # Initialize all extensions
-    db.init_app(app)
-    redis_connection.init_app(app)
-    jwt.init_app(app)
-    cors.init_app(app)
+    with phase("extensions", "social"):
+        # first, so its before_request covers every other hook
+        request_profiler.init_app(app)
+        db.init_app(app)
+        redis_connection.init_app(app)
+        jwt.init_app(app)
+        cors.init_app(app)
 
     # Register error handlers
     register_error_handlers(app)
 
     # Add global middleware
     app.before_request(detect_access_mode)
+    app.after_request(apply_rate_limit_headers)
     
     #trial commands
     register_trial_commands(app)
+    register_usage_commands(app)
+    register_index_commands(app)
 
     # Register all blueprints using `api.register_blueprint(...)`
-    register_social_routes(app, api)
+    with phase("routes", "social"):
+        register_social_routes(app, api, service_groups)
     
     @app.get("/health")
     def health():
         return {"ok": True}
 
+    startup_profiler.report("social")
 
     return app
 
 # instantiate admin app
-def create_mto_admin_app():
+def create_mto_admin_app(service_groups=None):
     app = Flask(__name__)
     
     # Init limiter with app
@@ -99,15 +125,13 @@ def create_mto_admin_app():
         x_prefix=1    # Trust X-Forwarded-Prefix
     )
     
-    
-    @app.before_request
-    def activate_scheduled_subscriptions():
-        # if g.get("current_user"):
-        run_scheduled_subscription_activation()
 
     # Load configuration (ensure it does NOT override Flask-Smorest keys)
     load_config(app)
 
+    # orjson-backed jsonify (JSON_FAST_PATH=false for Flask's encoder)
+    fast_json.init_app(app)
+
     # Config for MTO
     app.config["API_TITLE"] = "Administrator API"
     app.config["API_VERSION"] = "v1"
@@ -124,25 +148,37 @@ def create_mto_admin_app():
     api = Api(app)
 
     # Initialize all extensions
-    db.init_app(app)
-    redis_connection.init_app(app)
-    jwt.init_app(app)
-    cors.init_app(app)
-    
-    #Setup database indexes (first run only)
-    with app.app_context():
-        setup_pos_indexes()
-        setup_database_indexes()
+    with phase("extensions", "admin"):
+        # first, so its before_request covers every other hook
+        request_profiler.init_app(app)
+        db.init_app(app)
+        redis_connection.init_app(app)
+        jwt.init_app(app)
+        cors.init_app(app)
     
+    # Indexes are not touched at startup: `flask indexes diff|build|drop`
 
     # Register error handlers
     register_error_handlers(app)
 
     # Add global middleware
     app.before_request(detect_access_mode)
+    app.after_request(apply_rate_limit_headers)
+
+    # scheduled subscription activation runs as a job, not per request
+    register_subscription_commands(app)
+    register_usage_commands(app)
+    register_envelope_commands(app)
+    register_blind_index_commands(app)
+    register_index_commands(app)
+    register_stock_balance_commands(app)
+    register_periodic_commands(app)
 
     # Register all blueprints using `api.register_blueprint(...)`
-    register_admin_routes(app, api)
+    with phase("routes", "admin"):
+        register_admin_routes(app, api, service_groups)
+
+    startup_profiler.report("admin")
 
     return app
 
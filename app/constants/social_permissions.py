@@ -18,6 +18,8 @@ Usage in resource:
       return prepared_response(False, "FORBIDDEN", "You don't have permission.")
 """
 
+import threading
+
 # ═══════════════════════════════════════════════════════════════
 # MODULE DEFINITIONS — every module and its possible actions
 # ═══════════════════════════════════════════════════════════════
@@ -614,15 +616,12 @@ def has_permission(user_info, module, action, branch_id=None):
     if module in SYSTEM_OWNER_ONLY_MODULES:
         return False
 
-    # Check user-level custom permissions first
-    custom_permissions = user_info.get("permissions")
-    if custom_permissions and isinstance(custom_permissions, dict):
-        module_perms = custom_permissions.get(module, [])
-        if action in module_perms:
-            if branch_id:
-                return _check_branch_scope(user_info, module, action, branch_id)
-            return True
-        return False
+    # Check user-level custom permissions first (compiled once per token)
+    grants = _token_grants(user_info)
+    if grants is not None and (f"{module}:{action}" in grants or _raw_token_allows(user_info, module, action)):
+        if branch_id:
+            return _check_branch_scope(user_info, module, action, branch_id)
+        return True
 
     # Fall back to role-based defaults
     role_key = _resolve_role_key(account_type)
@@ -638,6 +637,47 @@ def has_permission(user_info, module, action, branch_id=None):
     return True
 
 
+_TOKEN_GRANTS_CACHE = threading.local()
+
+
+def _token_grants(user_info):
+    """
+    The token's permissions dict as a frozenset of "module:action" grants.
+    Same answers as `action in permissions[module]`; compiled once per
+    permissions dict (the last one seen by this thread), since a request
+    checks several permissions against the same token.
+    None when the token carries no permissions (role defaults apply).
+    """
+    custom_permissions = user_info.get("permissions")
+    if not custom_permissions or not isinstance(custom_permissions, dict):
+        return None
+
+    cached = getattr(_TOKEN_GRANTS_CACHE, "entry", None)
+    if cached is not None and cached[0] is custom_permissions:
+        return cached[1]
+
+    grants = frozenset(
+        f"{module}:{action}"
+        for module, actions in custom_permissions.items()
+        if isinstance(actions, (list, tuple, set, frozenset, dict))
+        for action in actions
+        if isinstance(action, str)
+    )
+    _TOKEN_GRANTS_CACHE.entry = (custom_permissions, grants)
+    return grants
+
+
+def _raw_token_allows(user_info, module, action):
+    """Non-collection module values (e.g. a comma string) keep the plain `in` check."""
+    module_perms = user_info["permissions"].get(module, [])
+    if isinstance(module_perms, (list, tuple, set, frozenset, dict)):
+        return False
+    try:
+        return action in module_perms
+    except TypeError:
+        return False
+
+
 def _safe_account_type(value):
     """Extract account_type, decrypting if needed, always returns uppercase string."""
     if not value or not isinstance(value, str):
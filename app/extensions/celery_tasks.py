@@ -8,6 +8,8 @@ from app.jobs.trial_expiration_job import (
     process_expired_trials,
     send_trial_expiring_reminders,
 )
+from app.jobs.usage_reconcile_job import reconcile_usage_counters
+from app.jobs.blind_index_backfill_job import backfill_blind_indexes
 
 celery = Celery("tasks")
 
@@ -19,4 +21,14 @@ def process_expired_trials_task():
 
 @celery.task(name="send_trial_reminders_task")
 def send_trial_reminders_task():
-    return run_in_app_context(send_trial_expiring_reminders, days_before=3)
\ No newline at end of file
+    return run_in_app_context(send_trial_expiring_reminders, days_before=3)
+
+
+@celery.task(name="reconcile_usage_counters_task")
+def reconcile_usage_counters_task():
+    return run_in_app_context(reconcile_usage_counters)
+
+
+@celery.task(name="backfill_blind_indexes_task")
+def backfill_blind_indexes_task():
+    return run_in_app_context(backfill_blind_indexes)
@@ -1,9 +1,12 @@
 import os
 from dotenv import load_dotenv
 from pymongo import MongoClient
-from redis import Redis
 from rq import Queue
 
+from .read_routing import read_preference, current_profile
+from . import request_profiler
+from .redis_manager import get_redis, redis_manager
+
 load_dotenv()
 
 class MongoDB:
@@ -24,31 +27,25 @@ class MongoDB:
         else:
             uri = f"mongodb+srv://{username}:{password}@{cluster}.mongodb.net/{db_name}?tls=true&authSource=admin"
 
-        self.client = MongoClient(uri)
+        # e.g. the local replica set in docker/mongo-replica
+        uri = os.getenv("MONGO_URI_OVERRIDE") or uri
+
+        # per-request command tracing when REQUEST_PROFILE_ENABLED
+        self.client = MongoClient(uri, event_listeners=request_profiler.event_listeners())
         self.db = self.client[db_name]
         app.mongo = self.db
-        
-        # -------------------------------------------------
-        # ✅ CREATE INDEXES (runs once on startup)
-        # -------------------------------------------------
-
-        # stock_ledger indexes
-        self.db.stock_ledger.create_index({ "business_id": 1, "outlet_id": 1, "product_id": 1 })
-        self.db.stock_ledger.create_index({ "business_id": 1, "outlet_id": 1, "product_id": 1, "composite_variant_id": 1 })
-        self.db.stock_ledger.create_index({ "reference_type": 1, "reference_id": 1 })
-        self.db.stock_ledger.create_index({ "created_at": -1 })
-
-        # sales indexes
-        self.db.sales.create_index({ "business_id": 1, "outlet_id": 1 })
-        self.db.sales.create_index({ "business_id": 1, "user__id": 1 })
-        self.db.sales.create_index({ "business_id": 1, "status": 1 })
-        self.db.sales.create_index({ "created_at": -1 })
-        self.db.sales.create_index({ "customer_id": 1 })
 
-    def get_collection(self, name):
+    def get_collection(self, name, read=None):
+        """
+        read: read profile for this collection handle (see read_routing);
+        defaults to the enclosing @reads(...) scope, else primary.
+        """
         if self.db is None:
             raise RuntimeError("MongoDB not initialized")
-        return self.db[name]
+        pref = read_preference(read or current_profile())
+        if pref is None:
+            return self.db[name]
+        return self.db[name].with_options(read_preference=pref)
 
 class RedisConnection:
     def __init__(self):
@@ -56,9 +53,9 @@ class RedisConnection:
         self.queue = None
 
     def init_app(self, app):
-        host = os.getenv("REDIS_HOST", "localhost")
-        port = int(os.getenv("REDIS_PORT", 6379))
-        self.connection = Redis(host=host, port=port)
+        # shared "queue" role pool (see redis_manager); nothing connects here
+        redis_manager.init_app(app)
+        self.connection = get_redis("queue")
         self.queue = Queue("emails", connection=self.connection)
         app.queue = self.queue
 
@@ -9,7 +9,10 @@ from typing import Optional, Dict, Any
 from rq import Queue
 from rq_scheduler import Scheduler
 
-from .redis_conn import redis_client
+from .redis_manager import get_redis
+
+# RQ needs raw bytes replies: the "queue" role, not the decoded redis_client
+redis_client = get_redis("queue")
 
 
 # -------------------------------------------------------------------
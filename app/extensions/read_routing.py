@@ -0,0 +1,156 @@
+# app/extensions/read_routing.py
+#
+# Per-operation MongoDB read preference, so analytical reads stay off the
+# primary that takes POS sales and wallet writes.
+#
+# Key design:
+# - Named read profiles, declared once here:
+#     primary    -> primary (everything that does not declare a profile)
+#     reports    -> analytics-tagged secondary, else any secondary, else primary
+#     exports    -> same as reports
+#     dashboards -> any secondary, else primary
+#     listings   -> any secondary, else primary (transaction history pages)
+#   Every non-primary profile carries a max staleness: a secondary lagging
+#   further behind is not selected (pymongo minimum is 90 s)
+# - Operations declare their profile:
+#     @reads("reports")                        every db.get_collection() inside
+#                                              the call (model helpers included)
+#     db.get_collection(name, read="listings") one query
+#   An explicit read= wins over @reads. Writes are unaffected: MongoDB always
+#   sends them to the primary
+# - @reads sets a ContextVar for the duration of the call; generators are not
+#   supported (the scope would end before iteration), pass read= instead
+# - Env:
+#     READ_ROUTING_ENABLED=false         pin every read to primary
+#     READ_PROFILE_<NAME>="mode[:max_staleness_s]", e.g. READ_PROFILE_REPORTS="secondary:300"
+#       mode: primary | primaryPreferred | secondary | secondaryPreferred | nearest | analytics
+#     MONGO_ANALYTICS_TAGS="nodeType:ANALYTICS"   tag set used by mode "analytics"
+#
+# Local replica set for trying this out: docker/mongo-replica/docker-compose.yml
+# and app/scripts/check_read_routing.py.
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+
+
+PRIMARY = "primary"
+
+READ_ROUTING_ENABLED = (os.getenv("READ_ROUTING_ENABLED", "true") or "").strip().lower() in ("1", "true", "yes")
+
+MIN_MAX_STALENESS = 90
+
+# name -> (mode, max_staleness_seconds)
+_DEFAULT_PROFILES: Dict[str, Tuple[str, int]] = {
+    PRIMARY: ("primary", -1),
+    "reports": ("analytics", 300),
+    "exports": ("analytics", 600),
+    "dashboards": ("secondaryPreferred", 120),
+    "listings": ("secondaryPreferred", 90),
+}
+
+_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+_CURRENT: ContextVar[Optional[str]] = ContextVar("read_profile", default=None)
+
+_CACHE: Dict[str, object] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def _analytics_tags() -> Dict[str, str]:
+    raw = os.getenv("MONGO_ANALYTICS_TAGS", "nodeType:ANALYTICS")
+    tags = {}
+    for part in raw.split(","):
+        k, sep, v = part.partition(":")
+        if sep and k.strip():
+            tags[k.strip()] = v.strip()
+    return tags
+
+
+def profile_config(name: str) -> Tuple[str, int]:
+    if name not in _DEFAULT_PROFILES:
+        raise ValueError(f"Unknown read profile {name!r}; available: {sorted(_DEFAULT_PROFILES)}")
+    mode, staleness = _DEFAULT_PROFILES[name]
+
+    override = (os.getenv(f"READ_PROFILE_{name.upper()}") or "").strip()
+    if override:
+        mode_s, _, staleness_s = override.partition(":")
+        mode = mode_s.strip() or mode
+        if staleness_s.strip():
+            staleness = int(staleness_s)
+
+    if mode != "analytics" and mode not in _MODES:
+        raise ValueError(f"Unknown read mode {mode!r} for profile {name!r}")
+    if staleness != -1 and staleness < MIN_MAX_STALENESS:
+        staleness = MIN_MAX_STALENESS
+    return mode, staleness
+
+
+def _build(name: str):
+    mode, staleness = profile_config(name)
+    if mode == "primary":
+        return Primary()
+    if mode == "analytics":
+        # tagged analytics node first, then any secondary, then primary
+        return SecondaryPreferred(tag_sets=[_analytics_tags(), {}], max_staleness=staleness)
+    return _MODES[mode](max_staleness=staleness)
+
+
+def read_preference(name: Optional[str]):
+    """
+    pymongo read preference for a profile; None means read from the primary.
+    """
+    if not READ_ROUTING_ENABLED or not name or name == PRIMARY:
+        return None
+    pref = _CACHE.get(name)
+    if pref is None:
+        with _CACHE_LOCK:
+            pref = _CACHE.get(name)
+            if pref is None:
+                pref = _CACHE[name] = _build(name)
+    return pref if not isinstance(pref, Primary) else None
+
+
+def current_profile() -> Optional[str]:
+    return _CURRENT.get()
+
+
+def reads(profile: str):
+    """
+    Route every read inside the decorated call through `profile`:
+
+        @staticmethod
+        @reads("reports")
+        def generate_sales_summary(...):
+    """
+    profile_config(profile)  # fail at import on a typo
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            token = _CURRENT.set(profile)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _CURRENT.reset(token)
+        return wrapper
+
+    return decorator
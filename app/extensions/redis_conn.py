@@ -1,6 +1,13 @@
-import os
-import redis
+# app/extensions/redis_conn.py
+#
+# `redis_client`: the decoded ("default" role) client from redis_manager.
+# Resolved on attribute access so importing this module never connects and
+# every importer shares one pool.
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+from .redis_manager import get_redis
 
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
\ No newline at end of file
+
+def __getattr__(name):
+    if name == "redis_client":
+        return get_redis("default")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
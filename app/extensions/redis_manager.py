@@ -0,0 +1,261 @@
+# app/extensions/redis_manager.py
+#
+# One owner for every Redis connection in the process.
+#
+# Key design:
+# - Code asks for a logical role, not a connection:
+#     default -> decoded str replies (redis_conn.redis_client: OAuth state, principal cache, ...)
+#     cache   -> raw bytes (utils.redis get/set helpers)
+#     queue   -> raw bytes (RQ queues/scheduler, reminder ZSETs in utils.job_redis);
+#                RQ pickles job payloads and cannot use decoded replies
+#     limiter -> decoded (API rate limits, plan usage counters, entitlements)
+#     locks   -> decoded (job locks, SET NX tokens)
+# - Each role resolves to (url, decode_responses); roles with the same pair
+#   share ONE BlockingConnectionPool, so connections per process are bounded
+#   by REDIS_POOL_MAX_CONNECTIONS per distinct server, not by how many modules
+#   happen to build a client. A full pool waits (REDIS_POOL_TIMEOUT) instead
+#   of opening more sockets
+# - Nothing connects at import: pools and clients are built on first use, and
+#   sockets are opened on first command
+# - Fork safety: a forked child (gunicorn worker / RQ work horse) resets the
+#   inherited pools in place without closing the parent's sockets, so clients
+#   created before the fork keep working on fresh connections
+#   (os.register_at_fork, with a pid check as a fallback)
+# - Health: health_check_interval (PING on idle connections before reuse),
+#   TCP keepalive, socket/connect timeouts, retry on timeout
+# - get_stats(): per pool max / created / in use / idle / peak / checkouts /
+#   wait time / exhausted, plus process-wide pool creations and fork resets
+#   (`flask redis-pools`)
+#
+# Config (env):
+#   REDIS_URL                      base server (default: REDIS_HOST/REDIS_PORT/REDIS_DB/REDIS_PASSWORD)
+#   REDIS_<ROLE>_URL               per-role server, e.g. REDIS_QUEUE_URL
+#   REDIS_POOL_MAX_CONNECTIONS     per pool (default 50)
+#   REDIS_POOL_TIMEOUT             seconds to wait for a free connection (default 5)
+#   REDIS_HEALTH_CHECK_INTERVAL    seconds (default 30)
+#   REDIS_SOCKET_TIMEOUT, REDIS_CONNECT_TIMEOUT
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+import redis
+from redis import BlockingConnectionPool
+
+
+def _base_url() -> str:
+    url = os.getenv("REDIS_URL")
+    if url:
+        return url
+    host = os.getenv("REDIS_HOST", "localhost")
+    port = int(os.getenv("REDIS_PORT", "6379"))
+    db = int(os.getenv("REDIS_DB", "0"))
+    password = os.getenv("REDIS_PASSWORD")
+    auth = f":{password}@" if password else ""
+    return f"redis://{auth}{host}:{port}/{db}"
+
+
+# role -> decode_responses
+ROLES: Dict[str, bool] = {
+    "default": True,
+    "cache": False,
+    "queue": False,
+    "limiter": True,
+    "locks": True,
+}
+
+POOL_MAX_CONNECTIONS = int(os.getenv("REDIS_POOL_MAX_CONNECTIONS", "50"))
+POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "5"))
+
+
+class _MeteredPool(BlockingConnectionPool):
+    """
+    BlockingConnectionPool that counts checkouts, wait time and exhaustion.
+    Counters are per process and approximate under contention.
+    """
+
+    def reset(self):
+        # also called by redis-py itself when it notices a fork
+        super().reset()
+        self.checkouts = 0
+        self.exhausted = 0
+        self.wait_seconds = 0.0
+        self.peak_in_use = 0
+
+    def in_use(self) -> int:
+        idle = sum(1 for c in list(self.pool.queue) if c is not None)
+        return max(0, len(self._connections) - idle)
+
+    def get_connection(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            conn = super().get_connection(*args, **kwargs)
+        except redis.ConnectionError as e:
+            if "No connection available" in str(e):
+                self.exhausted += 1
+            raise
+        finally:
+            self.wait_seconds += time.perf_counter() - start
+        self.checkouts += 1
+        in_use = self.in_use()
+        if in_use > self.peak_in_use:
+            self.peak_in_use = in_use
+        return conn
+
+
+class RedisManager:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._pools: Dict[Tuple[str, bool], _MeteredPool] = {}
+        self._clients: Dict[str, redis.Redis] = {}
+        self._counters = {"pools_created": 0, "fork_resets": 0}
+
+    # -- config ---------------------------------------------------------
+    @staticmethod
+    def role_config(role: str) -> Tuple[str, bool]:
+        if role not in ROLES:
+            raise ValueError(f"Unknown Redis role {role!r}; available: {sorted(ROLES)}")
+        url = os.getenv(f"REDIS_{role.upper()}_URL") or _base_url()
+        return url, ROLES[role]
+
+    # -- fork handling --------------------------------------------------
+    def _reset_after_fork(self):
+        # The inherited sockets belong to the parent: reset the pools in place
+        # (no close), so clients already handed out stay valid in the child
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        for pool in self._pools.values():
+            pool.reset()
+        self._counters["fork_resets"] += 1
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._reset_after_fork()
+
+    # -- clients --------------------------------------------------------
+    def _pool(self, url: str, decode: bool) -> _MeteredPool:
+        key = (url, decode)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _MeteredPool.from_url(
+                url,
+                decode_responses=decode,
+                max_connections=POOL_MAX_CONNECTIONS,
+                timeout=POOL_TIMEOUT,
+                health_check_interval=HEALTH_CHECK_INTERVAL,
+                socket_timeout=SOCKET_TIMEOUT,
+                socket_connect_timeout=CONNECT_TIMEOUT,
+                socket_keepalive=True,
+                retry_on_timeout=True,
+            )
+            self._pools[key] = pool
+            self._counters["pools_created"] += 1
+        return pool
+
+    def client(self, role: str = "default") -> redis.Redis:
+        """
+        Shared client for a role. Cheap to call; never connects by itself.
+        """
+        self._check_pid()
+        client = self._clients.get(role)
+        if client is not None:
+            return client
+        url, decode = self.role_config(role)
+        with self._lock:
+            client = self._clients.get(role)
+            if client is None:
+                client = redis.Redis(connection_pool=self._pool(url, decode))
+                self._clients[role] = client
+        return client
+
+    def ping(self, role: str = "default") -> bool:
+        try:
+            return bool(self.client(role).ping())
+        except redis.RedisError:
+            return False
+
+    def close(self):
+        """
+        Disconnect every pool (process shutdown / tests).
+        """
+        with self._lock:
+            for pool in self._pools.values():
+                pool.disconnect()
+            self._pools = {}
+            self._clients = {}
+
+    # -- metrics --------------------------------------------------------
+    def get_stats(self) -> Dict[str, Any]:
+        self._check_pid()
+        with self._lock:
+            pools = dict(self._pools)
+            clients = dict(self._clients)
+
+        roles_by_pool: Dict[int, list] = {}
+        for role, client in clients.items():
+            roles_by_pool.setdefault(id(client.connection_pool), []).append(role)
+
+        rows = []
+        for (url, decode), pool in pools.items():
+            created = len(pool._connections)
+            in_use = pool.in_use()
+            rows.append({
+                "server": _redact(url),
+                "decode_responses": decode,
+                "roles": sorted(roles_by_pool.get(id(pool), [])),
+                "max_connections": pool.max_connections,
+                "created": created,
+                "in_use": in_use,
+                "idle": created - in_use,
+                "peak_in_use": pool.peak_in_use,
+                "utilization": round(in_use / pool.max_connections, 4) if pool.max_connections else 0.0,
+                "checkouts": pool.checkouts,
+                "avg_wait_ms": round(pool.wait_seconds / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+                "exhausted": pool.exhausted,
+            })
+
+        return {"pid": self._pid, **self._counters, "pools": rows}
+
+    # -- flask ----------------------------------------------------------
+    def init_app(self, app):
+        app.extensions["redis_manager"] = self
+
+        import click
+        import json
+
+        @app.cli.command("redis-pools")
+        @click.option("--ping", is_flag=True, help="PING every role first")
+        def redis_pools(ping):
+            """Show Redis pool utilisation for this process."""
+            if ping:
+                for role in ROLES:
+                    click.echo(f"{role}: {'ok' if self.ping(role) else 'unreachable'}")
+            click.echo(json.dumps(self.get_stats(), indent=2))
+
+
+def _redact(url: str) -> str:
+    if "@" not in url:
+        return url
+    scheme, _, rest = url.partition("://")
+    return f"{scheme}://***@{rest.split('@', 1)[1]}"
+
+
+redis_manager = RedisManager()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=redis_manager._reset_after_fork)
+
+
+def get_redis(role: str = "default") -> redis.Redis:
+    return redis_manager.client(role)
+
+
+def get_stats() -> Dict[str, Any]:
+    return redis_manager.get_stats()
@@ -0,0 +1,286 @@
+# app/extensions/request_profiler.py
+#
+# Opt-in per-request profiling: Mongo round trips, outbound HTTP and custom
+# spans, reported as Server-Timing headers and a slow-request log entry.
+#
+# Key design:
+# - A pymongo CommandListener (passed to MongoClient by db.init_app) records
+#   every command issued while a profiled request is active: name,
+#   collection, duration and the query *shape* (filter keys, values
+#   replaced by "?"). Outside a profiled request it returns immediately
+# - requests.Session.send is wrapped once, so provider SDK calls and webhooks
+#   show up as outbound HTTP time
+# - span("decrypt") times any other block (crypto, report loops, ...)
+# - State lives in a ContextVar set in before_request and reset in teardown,
+#   so concurrent requests / threads never mix
+# - Which requests are profiled:
+#     REQUEST_PROFILE_ENABLED=true          master switch (default off)
+#     REQUEST_PROFILE_SAMPLE_RATE=0.01      fraction of requests (default 1.0)
+#     X-Request-Profile: <REQUEST_PROFILE_TOKEN>   force one request
+# - Output for a profiled request:
+#     Server-Timing: mongo;dur=41.2;desc="23 cmds", http;dur=120.4;desc="1 calls",
+#                    decrypt;dur=3.1, app;dur=180.9
+#     slow log (>= REQUEST_PROFILE_SLOW_MS, default 500): totals, the
+#     REQUEST_PROFILE_TOP (default 5) slowest query shapes, and shapes
+#     repeated >= REQUEST_PROFILE_REPEAT (default 5) times -- the N+1 suspects
+
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from ..utils.logger import Log
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return (os.getenv(name, default) or "").strip().lower() in ("1", "true", "yes")
+
+
+PROFILE_ENABLED = _env_bool("REQUEST_PROFILE_ENABLED", "false")
+SAMPLE_RATE = float(os.getenv("REQUEST_PROFILE_SAMPLE_RATE", "1.0"))
+PROFILE_TOKEN = os.getenv("REQUEST_PROFILE_TOKEN", "")
+SLOW_MS = float(os.getenv("REQUEST_PROFILE_SLOW_MS", "500"))
+TOP_N = int(os.getenv("REQUEST_PROFILE_TOP", "5"))
+REPEAT_THRESHOLD = int(os.getenv("REQUEST_PROFILE_REPEAT", "5"))
+SERVER_TIMING = _env_bool("REQUEST_PROFILE_SERVER_TIMING", "true")
+
+PROFILE_HEADER = "X-Request-Profile"
+
+# commands whose first field is not a collection name
+_NO_COLLECTION = {"hello", "isMaster", "ismaster", "ping", "endSessions", "saslStart", "saslContinue", "buildInfo"}
+
+_CURRENT: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.mongo_ms = 0.0
+        self.mongo_count = 0
+        self.mongo_errors = 0
+        self.http_ms = 0.0
+        self.http_count = 0
+        self.spans: Dict[str, float] = {}
+        # (command, collection, shape) -> [count, total_ms, max_ms]
+        self.queries: Dict[Tuple[str, str, str], List[float]] = {}
+        self.http_calls: List[Tuple[str, float]] = []
+        self._pending: Dict[int, Tuple[str, str, str]] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def add_query(self, key: Tuple[str, str, str], ms: float):
+        row = self.queries.get(key)
+        if row is None:
+            self.queries[key] = [1, ms, ms]
+        else:
+            row[0] += 1
+            row[1] += ms
+            row[2] = max(row[2], ms)
+
+    def summary(self) -> Dict[str, Any]:
+        rows = [
+            {"command": c, "collection": coll, "shape": shape, "count": int(n), "total_ms": round(t, 2), "max_ms": round(m, 2)}
+            for (c, coll, shape), (n, t, m) in self.queries.items()
+        ]
+        return {
+            "total_ms": round(self.elapsed_ms(), 2),
+            "mongo": {"commands": self.mongo_count, "ms": round(self.mongo_ms, 2), "errors": self.mongo_errors},
+            "http": {"calls": self.http_count, "ms": round(self.http_ms, 2),
+                     "slowest": [{"url": u, "ms": round(ms, 2)} for u, ms in sorted(self.http_calls, key=lambda x: -x[1])[:TOP_N]]},
+            "spans": {k: round(v, 2) for k, v in self.spans.items()},
+            "top_queries": sorted(rows, key=lambda r: -r["total_ms"])[:TOP_N],
+            "repeated_queries": sorted(
+                (r for r in rows if r["count"] >= REPEAT_THRESHOLD), key=lambda r: -r["count"]
+            )[:TOP_N],
+        }
+
+
+def current() -> Optional[RequestProfile]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def span(name: str):
+    """
+    Time a block into the current profile (no-op when not profiling).
+    """
+    profile = _CURRENT.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.spans[name] = profile.spans.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+# ---------------------------------------------------------------------
+# Mongo
+# ---------------------------------------------------------------------
+def _shape(value: Any, depth: int = 0) -> Any:
+    if depth > 4:
+        return "?"
+    if isinstance(value, dict):
+        return {k: _shape(v, depth + 1) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shape(value[0], depth + 1)] if value and isinstance(value[0], dict) else "?"
+    return "?"
+
+
+def _command_shape(name: str, command: Dict[str, Any]) -> str:
+    if name in ("find", "count", "distinct"):
+        target = command.get("filter") or command.get("query") or {}
+    elif name == "aggregate":
+        target = [next(iter(stage), "?") for stage in command.get("pipeline") or []]
+        match = next((s["$match"] for s in command.get("pipeline") or [] if "$match" in s), None)
+        return f"{target} {_shape(match) if match is not None else ''}".strip()
+    elif name in ("update", "delete"):
+        stmts = command.get("updates") or command.get("deletes") or []
+        target = stmts[0].get("q", {}) if stmts else {}
+    elif name == "findAndModify":
+        target = command.get("query") or {}
+    else:
+        return ""
+    return str(_shape(target))
+
+
+class _CommandListener(monitoring.CommandListener):
+    def started(self, event):
+        profile = _CURRENT.get()
+        if profile is None:
+            return
+        name = event.command_name
+        coll = event.command.get(name)
+        coll = coll if isinstance(coll, str) and name not in _NO_COLLECTION else ""
+        try:
+            shape = _command_shape(name, event.command)
+        except Exception:
+            shape = ""
+        profile._pending[event.request_id] = (name, coll, shape)
+
+    def _finish(self, event, failed: bool):
+        profile = _CURRENT.get()
+        if profile is None:
+            return
+        key = profile._pending.pop(event.request_id, None) or (event.command_name, "", "")
+        ms = event.duration_micros / 1000
+        profile.mongo_count += 1
+        profile.mongo_ms += ms
+        if failed:
+            profile.mongo_errors += 1
+        profile.add_query(key, ms)
+
+    def succeeded(self, event):
+        self._finish(event, False)
+
+    def failed(self, event):
+        self._finish(event, True)
+
+
+_listener = _CommandListener()
+
+
+def event_listeners() -> List[monitoring.CommandListener]:
+    """
+    For MongoClient(event_listeners=...); empty when profiling is off.
+    """
+    return [_listener] if PROFILE_ENABLED else []
+
+
+# ---------------------------------------------------------------------
+# Outbound HTTP
+# ---------------------------------------------------------------------
+_http_patched = False
+
+
+def _patch_requests():
+    global _http_patched
+    if _http_patched:
+        return
+    try:
+        import requests
+    except ImportError:  # pragma: no cover - requests not installed
+        return
+
+    original_send = requests.Session.send
+
+    def send(self, request, **kwargs):
+        profile = _CURRENT.get()
+        if profile is None:
+            return original_send(self, request, **kwargs)
+        start = time.perf_counter()
+        try:
+            return original_send(self, request, **kwargs)
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            profile.http_count += 1
+            profile.http_ms += ms
+            profile.http_calls.append((f"{request.method} {str(request.url).split('?', 1)[0]}", ms))
+
+    requests.Session.send = send
+    _http_patched = True
+
+
+# ---------------------------------------------------------------------
+# Flask
+# ---------------------------------------------------------------------
+def _should_profile(request) -> bool:
+    forced = request.headers.get(PROFILE_HEADER)
+    if forced and PROFILE_TOKEN and hmac.compare_digest(forced, PROFILE_TOKEN):
+        return True
+    return SAMPLE_RATE >= 1.0 or random.random() < SAMPLE_RATE
+
+
+def _server_timing(profile: RequestProfile, total_ms: float) -> str:
+    parts = [
+        f'mongo;dur={profile.mongo_ms:.1f};desc="{profile.mongo_count} cmds"',
+        f'http;dur={profile.http_ms:.1f};desc="{profile.http_count} calls"',
+    ]
+    parts += [f"{name};dur={ms:.1f}" for name, ms in profile.spans.items()]
+    parts.append(f"app;dur={total_ms:.1f}")
+    return ", ".join(parts)
+
+
+def init_app(app):
+    if not PROFILE_ENABLED:
+        return
+
+    from flask import g, request
+
+    _patch_requests()
+
+    @app.before_request
+    def _start_profile():
+        if _should_profile(request):
+            g._request_profile_token = _CURRENT.set(RequestProfile())
+
+    @app.after_request
+    def _report_profile(response):
+        profile = _CURRENT.get()
+        if profile is None:
+            return response
+        total_ms = profile.elapsed_ms()
+        if SERVER_TIMING:
+            response.headers["Server-Timing"] = _server_timing(profile, total_ms)
+        if total_ms >= SLOW_MS:
+            Log.warning(
+                f"[request_profiler] slow request {request.method} {request.path} "
+                f"status={response.status_code} {json.dumps(profile.summary(), default=str)}"
+            )
+        return response
+
+    @app.teardown_request
+    def _end_profile(exc=None):
+        token = g.pop("_request_profile_token", None)
+        if token is not None:
+            _CURRENT.reset(token)
@@ -0,0 +1,70 @@
+# app/jobs/blind_index_backfill_job.py
+
+from typing import Dict, Optional
+
+from ..utils.logger import Log
+
+
+def _indexed_models():
+    from ..models.product_model import Product
+    return {cls.__name__: cls for cls in (Product,) if cls._blind_indexes}
+
+
+# =========================================================
+# BACKFILL BLIND INDEXES
+# =========================================================
+
+def backfill_blind_indexes(model_name: Optional[str] = None, business_id: Optional[str] = None,
+                           limit: Optional[int] = None) -> Dict:
+    """
+    Background job to (re)compute blind indexes (hashed_* / bidx_*) for
+    documents written before the model's current declarations.
+
+    Recommended schedule:
+    - After deploying a change to a model's _blind_indexes
+    - Nightly as a safety net (a no-op when everything is current)
+
+    Idempotent and resumable; safe to run while the app is serving traffic.
+    """
+    log_tag = "[blind_index_backfill_job][backfill_blind_indexes]"
+
+    models = _indexed_models()
+    if model_name:
+        if model_name not in models:
+            return {"success": False, "error": f"unknown blind-indexed model: {model_name}"}
+        models = {model_name: models[model_name]}
+
+    results = {}
+    success = True
+    for name, model in models.items():
+        try:
+            stats = model.backfill_blind_indexes(business_id=business_id, limit=limit)
+            results[name] = stats
+            success = success and stats.get("failed", 0) == 0
+        except Exception as e:
+            Log.critical(f"{log_tag}[{name}] Job failed catastrophically: {e}", exc_info=True)
+            results[name] = {"error": str(e)}
+            success = False
+
+    Log.info(f"{log_tag} {results}")
+    return {"success": success, "models": results}
+
+
+# =========================================================
+# FLASK CLI COMMANDS
+# =========================================================
+
+def register_blind_index_commands(app):
+    """
+    Register Flask CLI commands for manual execution.
+    """
+    import click
+
+    @app.cli.command("backfill-blind-indexes")
+    @click.option("--model", "model_name", default=None)
+    @click.option("--business-id", default=None)
+    @click.option("--limit", default=None, type=int)
+    def backfill_blind_indexes_command(model_name, business_id, limit):
+        """Compute missing or outdated blind indexes."""
+        result = backfill_blind_indexes(model_name=model_name, business_id=business_id, limit=limit)
+        print(f"[backfill-blind-indexes] {result}")
@@ -0,0 +1,56 @@
+# app/jobs/envelope_migration_job.py
+
+from typing import Dict, Optional
+
+from ..utils.logger import Log
+
+
+def _envelope_models():
+    from ..models.product_model import Product
+    return {cls.__name__: cls for cls in (Product,)}
+
+
+# =========================================================
+# MIGRATE PER-FIELD CIPHERTEXT TO ENVELOPE BLOBS
+# =========================================================
+
+def migrate_to_envelope(model_name: str, business_id: Optional[str] = None, limit: Optional[int] = None) -> Dict:
+    """
+    Background job to convert documents of an envelope-capable model from
+    per-field ciphertext to a single sealed blob.
+
+    Idempotent and resumable; safe to run while the app is serving traffic
+    (reads understand both formats).
+    """
+    log_tag = f"[envelope_migration_job][migrate_to_envelope][{model_name}]"
+
+    model = _envelope_models().get(model_name)
+    if model is None:
+        return {"success": False, "error": f"unknown envelope model: {model_name}"}
+
+    try:
+        stats = model.migrate_to_envelope(business_id=business_id, limit=limit)
+        return {"success": stats.get("failed", 0) == 0, **stats}
+    except Exception as e:
+        Log.critical(f"{log_tag} Job failed catastrophically: {e}", exc_info=True)
+        return {"success": False, "error": str(e)}
+
+
+# =========================================================
+# FLASK CLI COMMANDS
+# =========================================================
+
+def register_envelope_commands(app):
+    """
+    Register Flask CLI commands for manual execution.
+    """
+    import click
+
+    @app.cli.command("migrate-envelope")
+    @click.argument("model_name")
+    @click.option("--business-id", default=None)
+    @click.option("--limit", default=None, type=int)
+    def migrate_envelope_command(model_name, business_id, limit):
+        """Seal per-field encrypted documents of MODEL_NAME into envelope blobs."""
+        result = migrate_to_envelope(model_name, business_id=business_id, limit=limit)
+        print(f"[migrate-envelope] {result}")
@@ -0,0 +1,64 @@
+# app/jobs/index_migration_job.py
+
+import json
+
+from ..utils.index_registry import build, diff, drop
+
+
+# =========================================================
+# FLASK CLI COMMANDS
+# =========================================================
+
+def register_index_commands(app):
+    """
+    Register `flask indexes ...` (the app never creates indexes on startup).
+
+    Typical deploy:
+        flask indexes diff                    # review
+        flask indexes build                   # before rolling out code that needs them
+        flask indexes drop --unused-only      # dry run; add --yes to apply
+    """
+    import click
+
+    @app.cli.group("indexes")
+    def indexes_group():
+        """Declarative MongoDB index registry."""
+
+    @indexes_group.command("diff")
+    @click.option("--collection", "collections", multiple=True)
+    @click.option("--all", "show_all", is_flag=True, help="Include indexes that are already in sync.")
+    @click.option("--json", "as_json", is_flag=True)
+    def diff_command(collections, show_all, as_json):
+        """Compare declared indexes with the live database."""
+        rows = [r for r in diff(collections or None) if show_all or r["status"] != "ok"]
+        if as_json:
+            print(json.dumps(rows, default=str, indent=2))
+            return
+        if not rows:
+            print("[indexes diff] in sync")
+            return
+        for r in rows:
+            extra = ""
+            if r["status"] == "extra":
+                extra = f" ops={r.get('ops')}"
+            elif r["status"] == "renamed":
+                extra = f" live_name={r['live_name']}"
+            elif r["status"] == "changed":
+                extra = f" live={r['live']}"
+            print(f"{r['status']:<8} {r['collection']}.{r['name']}{extra}")
+
+    @indexes_group.command("build")
+    @click.option("--collection", "collections", multiple=True)
+    @click.option("--rebuild", is_flag=True, help="Drop and recreate changed/renamed indexes.")
+    @click.option("--dry-run", is_flag=True)
+    def build_command(collections, rebuild, dry_run):
+        """Create missing indexes (one createIndexes per collection)."""
+        print(f"[indexes build] {build(collections or None, rebuild=rebuild, dry_run=dry_run)}")
+
+    @indexes_group.command("drop")
+    @click.option("--collection", "collections", multiple=True)
+    @click.option("--unused-only", is_flag=True, help="Keep extra indexes that $indexStats reports as used.")
+    @click.option("--yes", is_flag=True, help="Actually drop (default is a dry run).")
+    def drop_command(collections, unused_only, yes):
+        """Drop indexes that are no longer declared."""
+        print(f"[indexes drop] {drop(collections or None, unused_only=unused_only, dry_run=not yes)}")
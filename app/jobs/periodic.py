@@ -0,0 +1,118 @@
+# app/jobs/periodic.py
+#
+# Recurring jobs, scheduled on rq-scheduler.
+#
+# Key design:
+# - The deployed stack is gunicorn + `rq worker publish` + `rqscheduler` (no
+#   Celery beat), so every recurring job is an rq-scheduler cron entry that
+#   lands on the publish queue
+# - Each entry has a fixed id: registering again replaces the entry instead of
+#   adding a second one, so every gunicorn worker may register at boot
+# - Cron strings come from env; an empty string disables that job
+# - Registered from wsgi.py (PERIODIC_JOBS_ENABLED) and `flask periodic-jobs register`
+# - Entries point at RQ entrypoints that set up their own app context
+
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Tuple
+
+from ..utils.logger import Log
+
+
+PERIODIC_JOBS_ENABLED = os.getenv("PERIODIC_JOBS_ENABLED", "true").lower() in ("1", "true", "yes")
+PERIODIC_JOB_TIMEOUT = int(os.getenv("PERIODIC_JOB_TIMEOUT", "1800"))  # seconds
+
+# (job id, RQ entrypoint, cron string)
+PERIODIC_JOBS: List[Tuple[str, str, str]] = [
+    (
+        "periodic:facebook_targeting_catalog",
+        "app.services.social.ads.facebook_targeting_catalog.refresh_facebook_targeting_catalog",
+        os.getenv("FB_TARGETING_REFRESH_CRON", "17 3 * * *"),
+    ),
+    (
+        "periodic:facebook_ads_insights_sync",
+        "app.services.social.ads.facebook_insights_warehouse.sync_facebook_ads_insights",
+        os.getenv("FB_ADS_INSIGHTS_SYNC_CRON", "25 * * * *"),
+    ),
+    (
+        "periodic:subscription_activation",
+        "app.jobs.subscription_activation_job.run_activate_scheduled_subscriptions",
+        os.getenv("SUBSCRIPTION_ACTIVATION_CRON", "*/5 * * * *"),
+    ),
+    (
+        "periodic:usage_reconcile",
+        "app.jobs.usage_reconcile_job.run_reconcile_usage_counters",
+        os.getenv("USAGE_RECONCILE_CRON", "* * * * *"),
+    ),
+    (
+        "periodic:stock_balance_verify",
+        "app.jobs.stock_balance_job.run_verify_stock_balances",
+        os.getenv("STOCK_BALANCE_VERIFY_CRON", "41 * * * *"),
+    ),
+]
+
+
+def register_periodic_jobs() -> Dict[str, List[str]]:
+    """
+    (Re)register every enabled job with rq-scheduler and drop disabled ones.
+    """
+    from ..extensions.queue import get_scheduler, PUBLISH_QUEUE_NAME
+
+    scheduler = get_scheduler(PUBLISH_QUEUE_NAME)
+    out: Dict[str, List[str]] = {"registered": [], "disabled": []}
+
+    for job_id, func, cron in PERIODIC_JOBS:
+        scheduler.cancel(job_id)
+        if not (cron or "").strip():
+            out["disabled"].append(job_id)
+            continue
+
+        scheduler.cron(
+            cron.strip(),
+            func=func,
+            id=job_id,
+            queue_name=PUBLISH_QUEUE_NAME,
+            timeout=PERIODIC_JOB_TIMEOUT,
+            description=job_id,
+        )
+        out["registered"].append(job_id)
+
+    return out
+
+
+def register_periodic_jobs_safely() -> None:
+    """
+    Boot-time hook: a Redis outage must not stop the web app from starting.
+    """
+    if not PERIODIC_JOBS_ENABLED:
+        return
+    try:
+        result = register_periodic_jobs()
+        Log.info(f"[periodic][register] {result}")
+    except Exception as e:
+        Log.error(f"[periodic][register] failed: {e}")
+
+
+# =========================================================
+# FLASK CLI COMMANDS
+# =========================================================
+
+def register_periodic_commands(app):
+    """
+    Register Flask CLI commands for manual execution.
+    """
+    @app.cli.group("periodic-jobs")
+    def periodic_group():
+        """Recurring rq-scheduler jobs."""
+
+    @periodic_group.command("register")
+    def register_command():
+        """Register (or replace) every recurring job with rq-scheduler."""
+        print(f"[periodic-jobs] {register_periodic_jobs()}")
+
+    @periodic_group.command("list")
+    def list_command():
+        """Show the recurring jobs and their cron strings."""
+        for job_id, func, cron in PERIODIC_JOBS:
+            print(f"{job_id:45} {cron or '(disabled)':15} {func}")
@@ -0,0 +1,66 @@
+# app/jobs/stock_balance_job.py
+
+from typing import Dict, Optional
+
+from ..services.pos_ledger_service import verify_stock_balances
+from ..utils.logger import Log
+
+
+# =========================================================
+# VERIFY MATERIALIZED STOCK BALANCES
+# =========================================================
+
+def verify_stock_balances_job(business_id: Optional[str] = None, fix: bool = False) -> Dict:
+    """
+    Background job to recompute stock_balances from stock_ledger and ACTIVE
+    stock_holds and report drift.
+
+    Schedule:
+    - Hourly on rq-scheduler, report only (app/jobs/periodic.py,
+      STOCK_BALANCE_VERIFY_CRON)
+    - Once with --fix after first deploying stock_balances, to seed rows for
+      history written before it existed
+
+    Read-only unless fix=True; drift is re-checked per key in a snapshot
+    transaction, so it is safe to run while the app is serving traffic.
+    """
+    log_tag = "[stock_balance_job][verify_stock_balances_job]"
+
+    try:
+        result = verify_stock_balances(business_id=business_id, fix=fix)
+        if result.get("drifted"):
+            Log.warning(f"{log_tag} Drift found | {result}")
+        else:
+            Log.info(f"{log_tag} Completed | checked={result.get('checked')}")
+        return result
+    except Exception as e:
+        Log.critical(f"{log_tag} Job failed catastrophically: {e}", exc_info=True)
+        return {"success": False, "error": str(e)}
+
+
+def run_verify_stock_balances() -> Dict:
+    """
+    RQ entrypoint (report only):
+      enqueue("app.jobs.stock_balance_job.run_verify_stock_balances", queue_name="publish")
+    """
+    from ..services.social.appctx import run_in_app_context
+    return run_in_app_context(verify_stock_balances_job)
+
+
+# =========================================================
+# FLASK CLI COMMANDS
+# =========================================================
+
+def register_stock_balance_commands(app):
+    """
+    Register Flask CLI commands for manual execution.
+    """
+    import click
+
+    @app.cli.command("verify-stock-balances")
+    @click.option("--business-id", default=None)
+    @click.option("--fix", is_flag=True, default=False, help="Rewrite drifted / missing rows from the ledger.")
+    def verify_stock_balances_command(business_id, fix):
+        """Recompute stock balances from the ledger and report drift."""
+        result = verify_stock_balances_job(business_id=business_id, fix=fix)
+        print(f"[verify-stock-balances] {result}")
@@ -0,0 +1,138 @@
+# app/jobs/subscription_activation_job.py
+
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from ..services.pos.subscription_service import SubscriptionService
+from ..utils.logger import Log
+
+
+# Redis keys
+LOCK_KEY = "subscription:scheduler:lock"
+LAST_RUN_KEY = "subscription:scheduler:last_run"
+STATS_KEY = "subscription:scheduler:stats"
+
+# Lock must outlive the slowest run; it is released as soon as the run ends
+LOCK_TTL_SECONDS = int(os.getenv("SUBSCRIPTION_ACTIVATION_LOCK_TTL", "600"))
+BATCH_SIZE = int(os.getenv("SUBSCRIPTION_ACTIVATION_BATCH_SIZE", "500"))
+
+# DEL the lock only if we still own it
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _redis():
+    from ..extensions.redis_manager import get_redis
+    return get_redis("locks")
+
+
+def _acquire_lock() -> Optional[str]:
+    token = uuid.uuid4().hex
+    if _redis().set(LOCK_KEY, token, nx=True, ex=LOCK_TTL_SECONDS):
+        return token
+    return None
+
+
+def _release_lock(token: str) -> None:
+    try:
+        _redis().eval(_RELEASE_LOCK, 1, LOCK_KEY, token)
+    except Exception as e:
+        Log.warning(f"[subscription_activation_job] lock release failed: {e}")
+
+
+def _record_stats(stats: Dict) -> None:
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.set(LAST_RUN_KEY, int(datetime.utcnow().timestamp()))
+        pipe.set(STATS_KEY, json.dumps(stats, default=str))
+        pipe.execute()
+    except Exception as e:
+        Log.warning(f"[subscription_activation_job] failed to record stats: {e}")
+
+
+def get_last_run_stats() -> Optional[Dict]:
+    try:
+        raw = _redis().get(STATS_KEY)
+        return json.loads(raw) if raw else None
+    except Exception:
+        return None
+
+
+# =========================================================
+# ACTIVATE DUE SCHEDULED SUBSCRIPTIONS
+# =========================================================
+
+def activate_scheduled_subscriptions() -> Dict:
+    """
+    Background job to activate Scheduled subscriptions whose start_date has passed.
+
+    Scheduled every 5 minutes on rq-scheduler (app/jobs/periodic.py,
+    SUBSCRIPTION_ACTIVATION_CRON) through run_activate_scheduled_subscriptions.
+
+    Only one run at a time across all workers (Redis lock). A run that finds
+    the lock held exits immediately with skipped=True.
+    """
+    log_tag = "[subscription_activation_job][activate_scheduled_subscriptions]"
+
+    try:
+        token = _acquire_lock()
+    except Exception as e:
+        Log.error(f"{log_tag} Could not acquire lock: {e}")
+        return {"success": False, "skipped": True, "error": str(e)}
+
+    if not token:
+        Log.info(f"{log_tag} Another run holds the lock; skipping")
+        return {"success": True, "skipped": True}
+
+    started = time.monotonic()
+    started_at = datetime.utcnow()
+
+    try:
+        Log.info(f"{log_tag} Starting job")
+        stats = SubscriptionService.activate_due_scheduled_subscriptions(batch_size=BATCH_SIZE)
+        result = {"success": True, **stats}
+    except Exception as e:
+        Log.critical(f"{log_tag} Job failed catastrophically: {e}", exc_info=True)
+        result = {"success": False, "error": str(e)}
+    finally:
+        _release_lock(token)
+
+    result["started_at"] = started_at.isoformat()
+    result["duration_ms"] = int((time.monotonic() - started) * 1000)
+    _record_stats(result)
+
+    Log.info(f"{log_tag} Completed | {result}")
+    return result
+
+
+def run_activate_scheduled_subscriptions() -> Dict:
+    """
+    RQ entrypoint:
+      enqueue("app.jobs.subscription_activation_job.run_activate_scheduled_subscriptions", queue_name="publish")
+    """
+    from ..services.social.appctx import run_in_app_context
+    return run_in_app_context(activate_scheduled_subscriptions)
+
+
+# =========================================================
+# FLASK CLI COMMANDS
+# =========================================================
+
+def register_subscription_commands(app):
+    """
+    Register Flask CLI commands for manual execution.
+    """
+
+    @app.cli.command("activate-scheduled-subscriptions")
+    def activate_scheduled_subscriptions_command():
+        """Activate Scheduled subscriptions whose start date has passed."""
+        result = activate_scheduled_subscriptions()
+        print(f"[activate-scheduled-subscriptions] {result}")
@@ -0,0 +1,59 @@
+# app/jobs/usage_reconcile_job.py
+
+from typing import Dict
+
+from ..utils.plan import usage_counters
+from ..utils.logger import Log
+
+
+# =========================================================
+# RECONCILE PLAN USAGE COUNTERS (Redis -> Mongo)
+# =========================================================
+
+def reconcile_usage_counters() -> Dict:
+    """
+    Background job to persist Redis quota counters into business_usage.
+
+    Scheduled every minute on rq-scheduler (app/jobs/periodic.py,
+    USAGE_RECONCILE_CRON).
+
+    Safe to run concurrently: each run first folds Mongo-fallback deltas into
+    the live hashes, then pops its own batch of dirty keys and writes absolute
+    counter values. After a Redis loss counters are reseeded from
+    business_usage on first use.
+    """
+    log_tag = "[usage_reconcile_job][reconcile_usage_counters]"
+
+    try:
+        stats = usage_counters.reconcile()
+        if stats.get("keys"):
+            Log.info(f"{log_tag} Completed | {stats}")
+        return {"success": stats.get("failed", 0) == 0, **stats}
+    except Exception as e:
+        Log.critical(f"{log_tag} Job failed catastrophically: {e}", exc_info=True)
+        return {"success": False, "error": str(e)}
+
+
+def run_reconcile_usage_counters() -> Dict:
+    """
+    RQ entrypoint:
+      enqueue("app.jobs.usage_reconcile_job.run_reconcile_usage_counters", queue_name="publish")
+    """
+    from ..services.social.appctx import run_in_app_context
+    return run_in_app_context(reconcile_usage_counters)
+
+
+# =========================================================
+# FLASK CLI COMMANDS
+# =========================================================
+
+def register_usage_commands(app):
+    """
+    Register Flask CLI commands for manual execution.
+    """
+
+    @app.cli.command("reconcile-usage-counters")
+    def reconcile_usage_counters_command():
+        """Persist Redis quota counters to business_usage."""
+        result = reconcile_usage_counters()
+        print(f"[reconcile-usage-counters] {result}")
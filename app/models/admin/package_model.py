@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ...models.base_model import BaseModel
@@ -33,6 +34,15 @@ class Package(BaseModel):
 
     collection_name = "packages"
 
+    _indexes = (
+        IndexModel([("hashed_status", 1), ("display_order", 1)]),
+        IndexModel([("hashed_tier", 1), ("hashed_status", 1)]),
+        IndexModel([("hashed_name", 1)]),
+        IndexModel([("is_popular", 1)]),
+        IndexModel([("max_social_accounts", 1)]),
+        IndexModel([("max_users", 1)]),
+    )
+
     # -------------------------
     # Package Tiers
     # -------------------------
@@ -571,24 +581,8 @@ class Package(BaseModel):
         # Remove any None after encrypt decisions
         updates = {k: v for k, v in updates.items() if v is not None}
 
-        return super().update(package_id, business_id, **updates)
-
-    @classmethod
-    def create_indexes(cls):
-        log_tag = f"[package.py][Package][create_indexes]"
-        try:
-            collection = db.get_collection(cls.collection_name)
-
-            collection.create_index([("hashed_status", 1), ("display_order", 1)])
-            collection.create_index([("hashed_tier", 1), ("hashed_status", 1)])
-            collection.create_index([("hashed_name", 1)])
-            collection.create_index([("is_popular", 1)])
-            collection.create_index([("max_social_accounts", 1)])
-            collection.create_index([("max_users", 1)])
-
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}")
-            return False
\ No newline at end of file
+        result = super().update(package_id, business_id, **updates)
+        if result:
+            from ...utils.plan.entitlements import invalidate_package
+            invalidate_package(package_id)
+        return result
@@ -1,6 +1,7 @@
 # models/admin/payment.py
 
 from datetime import datetime
+from pymongo import IndexModel
 from bson import ObjectId
 from ...models.base_model import BaseModel
 from ...extensions.db import db
@@ -14,6 +15,23 @@ class Payment(BaseModel):
     """
     
     collection_name = "payments"
+
+    _indexes = (
+        # Core indexes
+        IndexModel([("business_id", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("status", 1)]),
+        IndexModel([("business_id", 1), ("gateway", 1)]),
+        # Reference indexes
+        IndexModel([("reference", 1)], unique=True, sparse=True),
+        IndexModel([("order_id", 1)], unique=True, sparse=True),
+        IndexModel([("checkout_request_id", 1)], unique=True, sparse=True),
+        IndexModel([("gateway_transaction_id", 1)], sparse=True),
+        # Other indexes
+        IndexModel([("subscription_id", 1)], sparse=True),
+        IndexModel([("package_id", 1)]),
+        IndexModel([("user_id", 1), ("created_at", -1)]),
+        IndexModel([("gateway", 1), ("status", 1)]),
+    )
     
     # Payment Statuses
     STATUS_PENDING = "Pending"
@@ -646,35 +664,4 @@ class Payment(BaseModel):
         except Exception as e:
             Log.error(f"{log_tag} Error: {str(e)}")
             return False
-    
-    @classmethod
-    def create_indexes(cls):
-        """Create database indexes for optimal query performance."""
-        log_tag = f"[payment.py][Payment][create_indexes]"
-        
-        try:
-            collection = db.get_collection(cls.collection_name)
-            
-            # Core indexes
-            collection.create_index([("business_id", 1), ("created_at", -1)])
-            collection.create_index([("business_id", 1), ("status", 1)])
-            collection.create_index([("business_id", 1), ("gateway", 1)])
-            
-            # Reference indexes
-            collection.create_index([("reference", 1)], unique=True, sparse=True)
-            collection.create_index([("order_id", 1)], unique=True, sparse=True)
-            collection.create_index([("checkout_request_id", 1)], unique=True, sparse=True)
-            collection.create_index([("gateway_transaction_id", 1)], sparse=True)
-            
-            # Other indexes
-            collection.create_index([("subscription_id", 1)], sparse=True)
-            collection.create_index([("package_id", 1)])
-            collection.create_index([("user_id", 1), ("created_at", -1)])
-            collection.create_index([("gateway", 1), ("status", 1)])
-            
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-            
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}")
-            return False
\ No newline at end of file
+    
\ No newline at end of file
@@ -16,6 +16,7 @@ CRITICAL RULES (from Paystack docs):
 """
 
 from datetime import datetime
+from pymongo import IndexModel
 from bson import ObjectId
 from ...extensions.db import db
 from ...utils.logger import Log
@@ -26,6 +27,13 @@ class PaystackAuthorization:
 
     collection_name = "paystack_authorizations"
 
+    _indexes = (
+        IndexModel([("business_id", 1), ("is_active", 1), ("is_default", -1)]),
+        IndexModel([("business_id", 1), ("signature", 1)], unique=True),
+        IndexModel([("authorization_code", 1)], unique=True, sparse=True),
+        IndexModel([("user__id", 1)]),
+    )
+
     def __init__(
         self,
         business_id,
@@ -341,22 +349,3 @@ class PaystackAuthorization:
         except Exception as e:
             Log.error(f"[PaystackAuthorization][mark_charged] Error: {str(e)}")
             return False
-
-    # ------------------------------------------------------------------ #
-    #  INDEXES
-    # ------------------------------------------------------------------ #
-
-    @classmethod
-    def create_indexes(cls):
-        """Create indexes for optimal query performance."""
-        try:
-            collection = db.get_collection(cls.collection_name)
-            collection.create_index([("business_id", 1), ("is_active", 1), ("is_default", -1)])
-            collection.create_index([("business_id", 1), ("signature", 1)], unique=True)
-            collection.create_index([("authorization_code", 1)], unique=True, sparse=True)
-            collection.create_index([("user__id", 1)])
-            Log.info("[PaystackAuthorization][create_indexes] Indexes created")
-            return True
-        except Exception as e:
-            Log.error(f"[PaystackAuthorization][create_indexes] Error: {str(e)}")
-            return False
@@ -3,6 +3,7 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ...models.base_model import BaseModel
@@ -27,6 +28,13 @@ class PromoCode(BaseModel):
     """
 
     collection_name = "promo_codes"
+
+    _indexes = (
+        IndexModel([("hashed_code", 1)], unique=True),
+        IndexModel([("admin_id", 1), ("hashed_status", 1)]),
+        IndexModel([("hashed_status", 1), ("created_at", -1)]),
+    )
+
     _subscription_exempt = True
     _permission_exempt = True
 
@@ -304,18 +312,6 @@ class PromoCode(BaseModel):
                 return code
         return f"{prefix}-{random.randint(100000, 999999)}"
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("hashed_code", 1)], unique=True)
-            c.create_index([("admin_id", 1), ("hashed_status", 1)])
-            c.create_index([("hashed_status", 1), ("created_at", -1)])
-            return True
-        except Exception as e:
-            Log.error(f"[PromoCode.create_indexes] {e}")
-            return False
-
 
 # ═══════════════════════════════════════════════════════════════
 # REFERRAL (tracks which business used which promo code)
@@ -328,6 +324,13 @@ class Referral(BaseModel):
     """
 
     collection_name = "referrals"
+
+    _indexes = (
+        IndexModel([("referred_business_id", 1)], unique=True),
+        IndexModel([("admin_id", 1), ("created_at", -1)]),
+        IndexModel([("promo_code_id", 1)]),
+    )
+
     _subscription_exempt = True
     _permission_exempt = True
 
@@ -453,18 +456,6 @@ class Referral(BaseModel):
             Log.error(f"[Referral.get_by_admin] {e}")
             return {"referrals": [], "total_count": 0, "total_pages": 0, "current_page": page, "per_page": per_page}
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("referred_business_id", 1)], unique=True)
-            c.create_index([("admin_id", 1), ("created_at", -1)])
-            c.create_index([("promo_code_id", 1)])
-            return True
-        except Exception as e:
-            Log.error(f"[Referral.create_indexes] {e}")
-            return False
-
 
 # ═══════════════════════════════════════════════════════════════
 # COMMISSION WALLET (admin earnings)
@@ -477,6 +468,11 @@ class CommissionWallet(BaseModel):
     """
 
     collection_name = "commission_wallets"
+
+    _indexes = (
+        IndexModel([("admin_id", 1)], unique=True),
+    )
+
     _subscription_exempt = True
     _permission_exempt = True
 
@@ -626,16 +622,6 @@ class CommissionWallet(BaseModel):
             Log.error(f"[CommissionWallet.record_payout] {e}")
             return False
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("admin_id", 1)], unique=True)
-            return True
-        except Exception as e:
-            Log.error(f"[CommissionWallet.create_indexes] {e}")
-            return False
-
 
 # ═══════════════════════════════════════════════════════════════
 # COMMISSION LEDGER (individual commission entries)
@@ -648,6 +634,14 @@ class CommissionLedger(BaseModel):
     """
 
     collection_name = "commission_ledger"
+
+    _indexes = (
+        IndexModel([("admin_id", 1), ("created_at", -1)]),
+        IndexModel([("referral_id", 1)]),
+        IndexModel([("referred_business_id", 1)]),
+        IndexModel([("entry_type", 1), ("created_at", -1)]),
+    )
+
     _subscription_exempt = True
     _permission_exempt = True
 
@@ -753,19 +747,6 @@ class CommissionLedger(BaseModel):
             Log.error(f"[CommissionLedger.get_by_admin] {e}")
             return {"entries": [], "total_count": 0, "total_pages": 0, "current_page": page, "per_page": per_page}
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("admin_id", 1), ("created_at", -1)])
-            c.create_index([("referral_id", 1)])
-            c.create_index([("referred_business_id", 1)])
-            c.create_index([("entry_type", 1), ("created_at", -1)])
-            return True
-        except Exception as e:
-            Log.error(f"[CommissionLedger.create_indexes] {e}")
-            return False
-
 
 # ═══════════════════════════════════════════════════════════════
 # COMMISSION SERVICE (orchestrates the flow)
@@ -1,5 +1,6 @@
 # models/sale.py
 from datetime import datetime
+from pymongo import IndexModel
 from bson import ObjectId
 from ...models.base_model import BaseModel
 from ...utils.crypt import encrypt_data, decrypt_data, hash_data
@@ -15,6 +16,21 @@ class Sale(BaseModel):
 
     collection_name = "sales"
 
+    _indexes = (
+        # Core indexes for reports
+        IndexModel([("business_id", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("outlet_id", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("status", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("cashier_id", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("customer_id", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("payment_method", 1), ("created_at", -1)]),
+        IndexModel([("transaction_number", 1)], unique=True, sparse=True),
+        IndexModel([("receipt_number", 1)], sparse=True),
+        # Cashier history and customer lookups
+        IndexModel([("business_id", 1), ("user__id", 1), ("created_at", -1)]),
+        IndexModel([("customer_id", 1)]),
+    )
+
     # Sale statuses
     STATUS_COMPLETED = "Completed"
     STATUS_PENDING = "Pending"
@@ -443,31 +459,3 @@ class Sale(BaseModel):
         except Exception as e:
             Log.error(f"{log_tag} Error: {str(e)}")
             return False
-
-    @classmethod
-    def create_indexes(cls):
-        """
-        Create database indexes for optimal report query performance.
-        Run this once during setup or migration.
-        """
-        log_tag = f"[sale.py][Sale][create_indexes]"
-        
-        try:
-            collection = db.get_collection(cls.collection_name)
-            
-            # Core indexes for reports
-            collection.create_index([("business_id", 1), ("created_at", -1)])
-            collection.create_index([("business_id", 1), ("outlet_id", 1), ("created_at", -1)])
-            collection.create_index([("business_id", 1), ("status", 1), ("created_at", -1)])
-            collection.create_index([("business_id", 1), ("cashier_id", 1), ("created_at", -1)])
-            collection.create_index([("business_id", 1), ("customer_id", 1), ("created_at", -1)])
-            collection.create_index([("business_id", 1), ("payment_method", 1), ("created_at", -1)])
-            collection.create_index([("transaction_number", 1)], unique=True, sparse=True)
-            collection.create_index([("receipt_number", 1)], sparse=True)
-            
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-            
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}")
-            return False
\ No newline at end of file
@@ -1,6 +1,6 @@
 import uuid, os, bcrypt
 
-from pymongo import MongoClient
+from pymongo import MongoClient, IndexModel
 from bson.objectid import ObjectId
 from pymongo import ASCENDING
 from pymongo.errors import PyMongoError
@@ -2954,6 +2954,15 @@ class Outlet(BaseModel):
 
     collection_name = "outlets"  # Set the collection name
 
+    _indexes = (
+        IndexModel(
+            [("business_id", ASCENDING), ("hashed_name", ASCENDING)],
+            unique=True,
+            sparse=True,
+            name="uniq_business_outlet_name",
+        ),
+    )
+
     def __init__(
         self,
         business_id,
@@ -3331,24 +3340,6 @@ class Outlet(BaseModel):
 
         return super().delete(outlet_id_obj, business_id_obj)
 
-    # -------------------------------------------------
-    # UNIQUE INDEXES (real duplicate protection)
-    # -------------------------------------------------
-    @classmethod
-    def create_indexes(cls):
-        """
-        Ensure unique index on (business_id, hashed_name) so outlet names are
-        unique per business at the DB level (prevents race-condition duplicates).
-        """
-        col = db.get_collection(cls.collection_name)
-
-        col.create_index(
-            [("business_id", ASCENDING), ("hashed_name", ASCENDING)],
-            unique=True,
-            sparse=True,
-            name="uniq_business_outlet_name",
-        )
-
     # -------------------------------------------------
     # COUNT BY BUSINESS (for multi_outlet logic)
     # -------------------------------------------------
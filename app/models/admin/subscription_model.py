@@ -2,6 +2,7 @@
 
 import os
 from datetime import datetime, timedelta
+from pymongo import IndexModel
 from bson import ObjectId
 from typing import Optional, Dict, Any, List, Union
 from flask import jsonify
@@ -12,6 +13,7 @@ from ...models.base_model import BaseModel
 from ...extensions.db import db
 from ...utils.crypt import encrypt_data, decrypt_data, hash_data
 from ...utils.logger import Log
+from ...utils.plan.entitlements import invalidate_entitlements
 
 
 class Subscription(BaseModel):
@@ -23,6 +25,36 @@ class Subscription(BaseModel):
 
     collection_name = "subscriptions"
 
+    _indexes = (
+        # 1) Core access lookup (your most common query):
+        #    get current subscription for business (trial/active)
+        IndexModel(
+            [("business_id", 1), ("hashed_status", 1), ("created_at", -1)],
+            name="idx_business_status_created",
+        ),
+        # 2) Fast listing / history for a business
+        IndexModel([("business_id", 1), ("created_at", -1)], name="idx_business_created"),
+        # 3) Renewal / billing tasks
+        IndexModel([("next_payment_date", 1)], name="idx_next_payment_date"),
+        IndexModel([("end_date", 1)], name="idx_end_date"),
+        # Optional but useful for cron jobs:
+        # "find all active subs expiring soon for a business"
+        IndexModel([("hashed_status", 1), ("end_date", 1)], name="idx_status_end_date"),
+        # 4) Plan / package analytics (optional but cheap)
+        IndexModel(
+            [("business_id", 1), ("package_id", 1), ("created_at", -1)],
+            name="idx_business_package_created",
+        ),
+        # 5) 🔐 Best uniqueness rule for payment_reference
+        #    (prevents duplicates within the same business)
+        IndexModel(
+            [("business_id", 1), ("payment_reference", 1)],
+            unique=True,
+            sparse=True,
+            name="uniq_business_payment_reference",
+        ),
+    )
+
     # Subscription Statuses (store encrypted + hashed)
     STATUS_TRIAL = "Trial"
     STATUS_TRIAL_EXPIRED = "TrialExpired"
@@ -260,8 +292,14 @@ class Subscription(BaseModel):
     def insert_one(cls, doc: Dict[str, Any]) -> str:
         col = db.get_collection(cls.collection_name)
         res = col.insert_one(doc)
+        invalidate_entitlements(doc.get("business_id"), reason="subscription_insert")
         return str(res.inserted_id)
 
+    def save(self, processing_callback=False):
+        inserted_id = super().save(processing_callback=processing_callback)
+        invalidate_entitlements(self.business_id, reason="subscription_save")
+        return inserted_id
+
     @classmethod
     def get_by_id(cls, subscription_id, business_id) -> Optional[dict]:
         log_tag = f"[subscription_model.py][Subscription][get_by_id][{subscription_id}]"
@@ -606,6 +644,8 @@ class Subscription(BaseModel):
                     }
                 }
             )
+            if res.modified_count:
+                invalidate_entitlements(business_id, reason="subscription_deactivate")
             return int(res.modified_count or 0)
         except Exception as e:
             Log.error(f"{log_tag} Error: {str(e)}")
@@ -630,6 +670,8 @@ class Subscription(BaseModel):
                 update_doc["cancellation_reason"] = encrypt_data(reason)
 
             res = col.update_one({"_id": sid, "business_id": bid}, {"$set": update_doc})
+            if res.modified_count:
+                invalidate_entitlements(bid, reason="subscription_cancel")
             return res.modified_count > 0
 
         except Exception as e:
@@ -663,6 +705,8 @@ class Subscription(BaseModel):
         Update business account_status to reflect subscription status.
         """
         log_tag = log_tag or f"[Subscription][_update_business_subscription_status][{business_id}]"
+
+        invalidate_entitlements(business_id, reason="subscription_status")
         
         try:
             business_col = db.get_collection("businesses")
@@ -903,74 +947,3 @@ class Subscription(BaseModel):
             import traceback
             traceback.print_exc()
             return None
-    
-    
-    @classmethod
-    def create_indexes(cls) -> bool:
-        log_tag = f"[subscription_model.py][Subscription][create_indexes]"
-
-        try:
-            col = db.get_collection(cls.collection_name)
-
-            # --------------------------------------------------
-            # 1) Core access lookup (your most common query):
-            #    get current subscription for business (trial/active)
-            # --------------------------------------------------
-            col.create_index(
-                [("business_id", 1), ("hashed_status", 1), ("created_at", -1)],
-                name="idx_business_status_created",
-            )
-
-            # --------------------------------------------------
-            # 2) Fast listing / history for a business
-            # --------------------------------------------------
-            col.create_index(
-                [("business_id", 1), ("created_at", -1)],
-                name="idx_business_created",
-            )
-
-            # --------------------------------------------------
-            # 3) Renewal / billing tasks
-            # --------------------------------------------------
-            col.create_index(
-                [("next_payment_date", 1)],
-                name="idx_next_payment_date",
-            )
-
-            col.create_index(
-                [("end_date", 1)],
-                name="idx_end_date",
-            )
-
-            # Optional but useful for cron jobs:
-            # "find all active subs expiring soon for a business"
-            col.create_index(
-                [("hashed_status", 1), ("end_date", 1)],
-                name="idx_status_end_date",
-            )
-
-            # --------------------------------------------------
-            # 4) Plan / package analytics (optional but cheap)
-            # --------------------------------------------------
-            col.create_index(
-                [("business_id", 1), ("package_id", 1), ("created_at", -1)],
-                name="idx_business_package_created",
-            )
-
-            # --------------------------------------------------
-            # 5) 🔐 Best uniqueness rule for payment_reference
-            #    (prevents duplicates within the same business)
-            # --------------------------------------------------
-            col.create_index(
-                [("business_id", 1), ("payment_reference", 1)],
-                unique=True,
-                sparse=True,  # allows docs without payment_reference
-                name="uniq_business_payment_reference",
-            )
-
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}", exc_info=True)
-            return False
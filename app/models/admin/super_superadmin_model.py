@@ -1,14 +1,19 @@
+import os
 import uuid
 import bcrypt
 import json
 import ast
+import threading
+import time
 
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 from bson.objectid import ObjectId
 from datetime import datetime
 from ...extensions.db import db
 from ...utils.logger import Log
 from ...utils.crypt import encrypt_data, decrypt_data, hash_data
+from ...utils import principal_cache
 from ..base_model import BaseModel
 from ..user_model import User
 from ...utils.generators import generate_coupons
@@ -48,47 +53,268 @@ def _zero_permission_for(field: str) -> List[Dict[str, str]]:
     return [{a: "0" for a in actions}]
 
 
-def _decrypt_permissions_field(
-    *,
-    role_doc: Dict[str, Any],
-    module_name: str,
-) -> Dict[str, str]:
-    """
-    Supports BOTH storage formats:
-      1) dict: {"read": "<enc>", "create": "<enc>"}
-      2) list-of-dicts: [{"read": "<enc>", "create": "<enc>"}]
-    Returns:
-      {"read":"0|1", ...} with keys exactly as PERMISSION_FIELDS_FOR_ADMIN_ROLE[module_name]
-    """
-    actions = PERMISSION_FIELDS_FOR_ADMIN_ROLE.get(module_name) or []
-    raw = role_doc.get(module_name)
+# =========================================
+# COMPILED ROLE PERMISSIONS
+# =========================================
+# Role permission fields stay encrypted per action (source of truth). Each role
+# is also compiled once into:
+#   - values: the decrypted permission fields, same shape as stored
+#   - grants: frozenset of "module:action" pairs that are granted
+# The compiled form is stored on the role doc as ONE encrypted blob
+# (compiled_permissions) next to compiled_permissions_hash, an HMAC over the
+# encrypted source fields. A blob whose hash no longer matches the source is
+# ignored and recompiled. Compiled roles are also cached in-process by role id,
+# so a warm authorization check is a set lookup with no decryption at all.
+# The cache entry remembers which (updated_at, stored hash) it was checked
+# against, so re-reading an unchanged role doc skips the source hash too.
+# Authorization (has_permission -> role_permissions) trusts a cache entry for
+# ROLE_PERMISSION_CACHE_TTL seconds, then re-reads the role doc.
+
+COMPILED_PERMISSIONS_SCHEMA = 1
+ROLE_PERMISSION_CACHE_MAX = int(os.getenv("ROLE_PERMISSION_CACHE_MAX", "2048"))
+ROLE_PERMISSION_CACHE_TTL = int(os.getenv("ROLE_PERMISSION_CACHE_TTL", "60"))
+
+# Every field a role can carry permissions in (both constant sets)
+PERMISSION_SOURCE_FIELDS = tuple(
+    dict.fromkeys(list(PERMISSION_FIELDS_FOR_ADMINS) + list(PERMISSION_FIELDS_FOR_ADMIN_ROLE.keys()))
+)
 
-    if not actions:
-        return {}
+_GRANTED_VALUES = ("1", "true", "yes")
 
-    # 1) preferred: dict
-    if isinstance(raw, dict):
-        out: Dict[str, str] = {}
-        for action in actions:
-            enc_val = raw.get(action)
-            out[action] = decrypt_data(enc_val) if enc_val else "0"
-        return out
+# role_id -> (compiled, source fingerprint, monotonic time it was last checked)
+_COMPILED_CACHE: "OrderedDict[str, Tuple[CompiledPermissions, Any, float]]" = OrderedDict()
+_COMPILED_CACHE_LOCK = threading.Lock()
 
-    # 2) backward compat: list-of-dicts
+
+def _merge_permission_items(raw: Any) -> Dict[str, Any]:
+    """dict, list-of-dicts or list of granted action names -> one dict."""
+    if isinstance(raw, dict):
+        return raw
+    merged: Dict[str, Any] = {}
     if isinstance(raw, list):
-        merged: Dict[str, Any] = {}
         for item in raw:
             if isinstance(item, dict):
                 merged.update(item)
+            elif isinstance(item, str):
+                merged[item] = "1"
+    return merged
+
+
+class CompiledPermissions:
+    __slots__ = ("role_id", "source_hash", "values", "grants")
+
+    def __init__(self, role_id: str, source_hash: str, values: Dict[str, Any]):
+        self.role_id = role_id
+        self.source_hash = source_hash
+        self.values = values
+        self.grants = frozenset(
+            f"{module}:{action}"
+            for module, raw in values.items()
+            for action, value in _merge_permission_items(raw).items()
+            if str(value).strip().lower() in _GRANTED_VALUES
+        )
 
-        out: Dict[str, str] = {}
-        for action in actions:
-            enc_val = merged.get(action)
-            out[action] = decrypt_data(enc_val) if enc_val else "0"
-        return out
+    def allows(self, module: str, action: str) -> bool:
+        return f"{module}:{action}" in self.grants
+
+    def module_actions(self, module_name: str) -> Dict[str, str]:
+        """
+        {"read":"0|1", ...} with keys exactly as PERMISSION_FIELDS_FOR_ADMIN_ROLE[module_name].
+        Accepts both storage formats (dict / list-of-dicts).
+        """
+        actions = PERMISSION_FIELDS_FOR_ADMIN_ROLE.get(module_name) or []
+        if not actions:
+            return {}
+
+        raw = self.values.get(module_name)
+        if raw is None:
+            return _zero_permissions_for_module(module_name)
+
+        merged = _merge_permission_items(raw)
+        return {action: merged[action] if action in merged else "0" for action in actions}
+
+    def field_items(self, field: str) -> List[Dict[str, Any]]:
+        """
+        List-of-dicts format used by the Role read endpoints.
+        """
+        raw = self.values.get(field)
+        if raw is None:
+            return _zero_permission_for(field)
+        if isinstance(raw, dict):
+            return [dict(raw)]
+        return [dict(item) for item in raw]
+
+
+def _permission_source(role_doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {f: role_doc.get(f) for f in PERMISSION_SOURCE_FIELDS if role_doc.get(f)}
+
+
+def _source_fingerprint(role_doc: Dict[str, Any]) -> Any:
+    """
+    Cheap stand-in for the source hash: every write through Role.update bumps
+    updated_at and re-stores compiled_permissions_hash. None = must hash.
+    """
+    stored_hash = role_doc.get("compiled_permissions_hash")
+    if not stored_hash:
+        return None
+    return (str(role_doc.get("updated_at")), stored_hash)
+
+
+def _permission_source_hash(role_doc: Dict[str, Any]) -> str:
+    material = json.dumps(
+        {
+            "schema": COMPILED_PERMISSIONS_SCHEMA,
+            "role_id": str(role_doc.get("_id")),
+            "source": _permission_source(role_doc),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hash_data(material)
+
+
+def _decrypt_permission_values(raw: Any) -> Any:
+    """
+    Per-action decryption of one stored permission field (compile path only).
+    Empty ciphertexts are dropped, so they read back as "0".
+    """
+    if isinstance(raw, dict):
+        return {k: decrypt_data(v) for k, v in raw.items() if v}
+    if isinstance(raw, list):
+        return [
+            {k: decrypt_data(v) for k, v in item.items() if v}
+            for item in raw
+            if isinstance(item, dict)
+        ]
+    return None
+
+
+def _load_stored_compiled(role_doc: Dict[str, Any], role_id: str, source_hash: str) -> Optional[CompiledPermissions]:
+    blob = role_doc.get("compiled_permissions")
+    if not blob or role_doc.get("compiled_permissions_hash") != source_hash:
+        return None
+    try:
+        payload = decrypt_data(blob)
+    except Exception as e:
+        Log.info(f"[Role.compiled_permissions] unreadable blob role_id={role_id}: {e}")
+        return None
+    # the blob is bound to its role and source version
+    if (
+        not isinstance(payload, dict)
+        or payload.get("schema") != COMPILED_PERMISSIONS_SCHEMA
+        or payload.get("role_id") != role_id
+        or payload.get("source_hash") != source_hash
+    ):
+        return None
+    return CompiledPermissions(role_id, source_hash, payload.get("values") or {})
+
+
+def _store_compiled(role_obj_id: Any, compiled: CompiledPermissions) -> None:
+    blob = encrypt_data(
+        {
+            "schema": COMPILED_PERMISSIONS_SCHEMA,
+            "role_id": compiled.role_id,
+            "source_hash": compiled.source_hash,
+            "values": compiled.values,
+        }
+    )
+    try:
+        # No guard needed: if the source changed meanwhile, the stored hash will
+        # not match it and the next read recompiles.
+        db.get_collection(Role.collection_name).update_one(
+            {"_id": ObjectId(str(role_obj_id))},
+            {"$set": {"compiled_permissions": blob, "compiled_permissions_hash": compiled.source_hash}},
+        )
+    except Exception as e:
+        Log.info(f"[Role.compiled_permissions] store failed role_id={compiled.role_id}: {e}")
+
+
+def _cache_get(role_id: str) -> Optional[Tuple[CompiledPermissions, Any, float]]:
+    with _COMPILED_CACHE_LOCK:
+        entry = _COMPILED_CACHE.get(role_id)
+        if entry is not None:
+            _COMPILED_CACHE.move_to_end(role_id)
+        return entry
+
+
+def _cache_put(role_id: str, compiled: CompiledPermissions, fingerprint: Any) -> None:
+    with _COMPILED_CACHE_LOCK:
+        _COMPILED_CACHE[role_id] = (compiled, fingerprint, time.monotonic())
+        _COMPILED_CACHE.move_to_end(role_id)
+        while len(_COMPILED_CACHE) > ROLE_PERMISSION_CACHE_MAX:
+            _COMPILED_CACHE.popitem(last=False)
+
+
+def evict_compiled_permissions(role_id: Any) -> None:
+    with _COMPILED_CACHE_LOCK:
+        _COMPILED_CACHE.pop(str(role_id), None)
+
+
+def compile_role_permissions(role_doc: Dict[str, Any], persist: bool = True) -> CompiledPermissions:
+    """
+    Compiled permissions for a raw role document.
+      1. in-process cache, same fingerprint          -> no hashing, no crypto
+      2. in-process cache, same source hash           -> no crypto
+      3. stored blob with matching hash               -> one decrypt
+      4. per-action decryption of the source          -> compiled + stored
+    """
+    role_id = str(role_doc.get("_id"))
+    fingerprint = _source_fingerprint(role_doc)
+
+    entry = _cache_get(role_id)
+    if entry is not None and fingerprint is not None and entry[1] == fingerprint:
+        _cache_put(role_id, entry[0], fingerprint)
+        return entry[0]
+
+    source_hash = _permission_source_hash(role_doc)
+    if role_doc.get("compiled_permissions_hash") != source_hash:
+        # stored hash is stale (or missing): this doc state cannot be trusted by fingerprint
+        fingerprint = None
+
+    if entry is not None and entry[0].source_hash == source_hash:
+        _cache_put(role_id, entry[0], fingerprint)
+        return entry[0]
+
+    compiled = _load_stored_compiled(role_doc, role_id, source_hash)
+    if compiled is None:
+        values: Dict[str, Any] = {}
+        for field, raw in _permission_source(role_doc).items():
+            decrypted = _decrypt_permission_values(raw)
+            if decrypted is not None:
+                values[field] = decrypted
+        compiled = CompiledPermissions(role_id, source_hash, values)
+        if persist and role_doc.get("_id") is not None:
+            _store_compiled(role_doc["_id"], compiled)
+
+    _cache_put(role_id, compiled, fingerprint)
+    return compiled
+
+
+def role_permissions(role_id: Any) -> Optional[CompiledPermissions]:
+    """
+    Compiled permissions for authorization checks, by role id.
+    A cache entry younger than ROLE_PERMISSION_CACHE_TTL is used as is (no DB
+    read); older ones are re-validated against the role document.
+    """
+    if not role_id:
+        return None
+    rid = str(role_id)
+
+    entry = _cache_get(rid)
+    if entry is not None and time.monotonic() - entry[2] < ROLE_PERMISSION_CACHE_TTL:
+        return entry[0]
+
+    try:
+        role_doc = db.get_collection(Role.collection_name).find_one({"_id": ObjectId(rid)})
+    except Exception as e:
+        Log.info(f"[Role.role_permissions] load failed role_id={rid}: {e}")
+        return entry[0] if entry is not None else None
+
+    if not role_doc:
+        evict_compiled_permissions(rid)
+        return None
+    return compile_role_permissions(role_doc)
 
-    # not stored - return zero permissions
-    return _zero_permissions_for_module(module_name)
 
 def _stringify_object_ids(doc: dict) -> dict:
         """Recursively convert all ObjectId values in a document to strings."""
@@ -218,16 +444,8 @@ class Role(BaseModel):
         email = decrypt_data(data["email"]) if data.get("email") else None
         status = decrypt_data(data["status"]) if data.get("status") else None
 
-        permissions = {}
-        for field in PERMISSION_FIELDS_FOR_ADMINS:
-            encrypted_permissions = data.get(field)
-            if encrypted_permissions:
-                permissions[field] = [
-                    {k: decrypt_data(v) for k, v in item.items()}
-                    for item in encrypted_permissions
-                ]
-            else:
-                permissions[field] = _zero_permission_for(field)
+        compiled = compile_role_permissions(data)
+        permissions = {field: compiled.field_items(field) for field in PERMISSION_FIELDS_FOR_ADMINS}
 
         data.pop("hashed_name", None)
         data.pop("hashed_email", None)
@@ -273,16 +491,8 @@ class Role(BaseModel):
             email = decrypt_data(r["email"]) if r.get("email") else None
             status = decrypt_data(r["status"]) if r.get("status") else None
 
-            permissions = {}
-            for field in PERMISSION_FIELDS_FOR_ADMINS:
-                encrypted_permissions = r.get(field)
-                if encrypted_permissions:
-                    permissions[field] = [
-                        {k: decrypt_data(v) for k, v in item.items()}
-                        for item in encrypted_permissions
-                    ]
-                else:
-                    permissions[field] = _zero_permission_for(field)
+            compiled = compile_role_permissions(r)
+            permissions = {field: compiled.field_items(field) for field in PERMISSION_FIELDS_FOR_ADMINS}
 
             processed.append(
                 {
@@ -332,16 +542,8 @@ class Role(BaseModel):
             email = decrypt_data(r["email"]) if r.get("email") else None
             status = decrypt_data(r["status"]) if r.get("status") else None
 
-            permissions = {}
-            for field in PERMISSION_FIELDS_FOR_ADMINS:
-                encrypted_permissions = r.get(field)
-                if encrypted_permissions:
-                    permissions[field] = [
-                        {k: decrypt_data(v) for k, v in item.items()}
-                        for item in encrypted_permissions
-                    ]
-                else:
-                    permissions[field] = _zero_permission_for(field)
+            compiled = compile_role_permissions(r)
+            permissions = {field: compiled.field_items(field) for field in PERMISSION_FIELDS_FOR_ADMINS}
 
             processed.append(
                 {
@@ -434,7 +636,19 @@ class Role(BaseModel):
 
         Log.info(f"[Role.update] updates: {updates}")
 
-        return super().update(role_id, **updates)
+        result = super().update(role_id, **updates)
+        evict_compiled_permissions(role_id)
+        principal_cache.invalidate_role(role_id)
+
+        # compile at write time so the next authorization check does not have to
+        if any(key in updates for key in PERMISSION_SOURCE_FIELDS):
+            try:
+                role_doc = db.get_collection(cls.collection_name).find_one({"_id": ObjectId(role_id)})
+                if role_doc:
+                    compile_role_permissions(role_doc)
+            except Exception as e:
+                Log.info(f"[Role.update] compile permissions failed: {e}")
+        return result
 
     @classmethod
     def delete(cls, role_id, business_id):
@@ -444,7 +658,10 @@ class Role(BaseModel):
         except Exception:
             return False
 
-        return super().delete(role_id_obj, business_id_obj)
+        result = super().delete(role_id_obj, business_id_obj)
+        evict_compiled_permissions(role_id)
+        principal_cache.invalidate_role(role_id)
+        return result
 
 
 # =========================================
@@ -792,12 +1009,11 @@ class Admin(BaseModel):
                     role_doc = role_collection.find_one({"_id": role_obj_id})
 
                 if role_doc:
-                    permissions: Dict[str, Dict[str, str]] = {}
-                    for module_name in PERMISSION_FIELDS_FOR_ADMIN_ROLE.keys():
-                        permissions[module_name] = _decrypt_permissions_field(
-                            role_doc=role_doc,
-                            module_name=module_name,
-                        )
+                    compiled = compile_role_permissions(role_doc)
+                    permissions: Dict[str, Dict[str, str]] = {
+                        module_name: compiled.module_actions(module_name)
+                        for module_name in PERMISSION_FIELDS_FOR_ADMIN_ROLE.keys()
+                    }
 
                     role_payload = {
                         "role_id": str(role_doc["_id"]),
@@ -892,12 +1108,11 @@ class Admin(BaseModel):
                         role_doc = role_collection.find_one({"_id": role_obj_id})
 
                     if role_doc:
-                        permissions: Dict[str, Dict[str, str]] = {}
-                        for module_name in PERMISSION_FIELDS_FOR_ADMIN_ROLE.keys():
-                            permissions[module_name] = _decrypt_permissions_field(
-                                role_doc=role_doc,
-                                module_name=module_name,
-                            )
+                        compiled = compile_role_permissions(role_doc)
+                        permissions: Dict[str, Dict[str, str]] = {
+                            module_name: compiled.module_actions(module_name)
+                            for module_name in PERMISSION_FIELDS_FOR_ADMIN_ROLE.keys()
+                        }
 
                         role_payload = {
                             "role_id": str(role_doc["_id"]),
@@ -980,12 +1195,11 @@ class Admin(BaseModel):
                         role_doc = role_collection.find_one({"_id": role_obj_id})
 
                     if role_doc:
-                        permissions: Dict[str, Dict[str, str]] = {}
-                        for module_name in PERMISSION_FIELDS_FOR_ADMIN_ROLE.keys():
-                            permissions[module_name] = _decrypt_permissions_field(
-                                role_doc=role_doc,
-                                module_name=module_name,
-                            )
+                        compiled = compile_role_permissions(role_doc)
+                        permissions: Dict[str, Dict[str, str]] = {
+                            module_name: compiled.module_actions(module_name)
+                            for module_name in PERMISSION_FIELDS_FOR_ADMIN_ROLE.keys()
+                        }
 
                         role_payload = {
                             "role_id": str(role_doc["_id"]),
@@ -1272,7 +1486,10 @@ class Admin(BaseModel):
                 else pwd
             )
 
-        return super().update(system_user_id, **updates)
+        result = super().update(system_user_id, **updates)
+        if any(k in updates for k in ("role", "password", "status")):
+            principal_cache.invalidate_system_user(system_user_id)
+        return result
 
     @classmethod
     def update_account_status_by_business_id(cls, admin_id, business_id, ip_address, field, update_value):
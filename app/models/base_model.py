@@ -15,6 +15,9 @@ from ..constants.social_permissions import (
     ROLE_SUPER_ADMIN,
 )
 from ..utils.crypt import encrypt_data, hash_data, decrypt_data
+from ..utils import envelope
+from ..utils import blind_index
+from ..utils import pagination
 from ..utils.logger import Log
 
 
@@ -41,6 +44,18 @@ class BaseModel:
     _subscription_allow_read = False
     _subscription_grace_days = 0
 
+    # ── Envelope encryption (opt-in; see utils/envelope.py) ──
+    # Fields sealed together into one blob when the model is listed in
+    # ENVELOPE_ENCRYPTION_MODELS. Reads handle both formats regardless.
+    _envelope_fields = ()
+
+    # ── Blind indexes (see utils/blind_index.py) ──
+    # Tuple of BlindIndex specs: HMACs of encrypted fields that can be queried.
+    _blind_indexes = ()
+
+    # ── MongoDB indexes (IndexModel tuple; built by `flask indexes build`) ──
+    _indexes = ()
+
     # ── Models that never require subscription checks ──
     _SUBSCRIPTION_EXEMPT_MODELS = {
         "subscription", "package", "user", "admin", "token",
@@ -205,6 +220,332 @@ class BaseModel:
         except Exception:
             return None
 
+    # ═══════════════════════════════════════════════════════════════
+    # ENVELOPE ENCRYPTION
+    # ═══════════════════════════════════════════════════════════════
+
+    @classmethod
+    def envelope_enabled(cls):
+        return bool(cls._envelope_fields) and envelope.model_enabled(cls.__name__)
+
+    @classmethod
+    def _encrypt_field(cls, value):
+        """
+        Per-field encryption, or the plain value when the document will be sealed.
+        """
+        if cls.envelope_enabled():
+            return value
+        return encrypt_data(value)
+
+    @classmethod
+    def _seal_document(cls, doc):
+        """
+        Move the envelope fields of a plain document into one sealed blob.
+        """
+        values = {f: doc.pop(f) for f in cls._envelope_fields if f in doc}
+        doc[envelope.ENVELOPE_FIELD] = envelope.seal(cls.collection_name, doc["business_id"], values)
+        return doc
+
+    @classmethod
+    def _legacy_decrypt_fields(cls, doc, fields=None):
+        out = {}
+        for f in (cls._envelope_fields if fields is None else fields):
+            value = doc.get(f)
+            out[f] = decrypt_data(value) if value is not None else None
+        return out
+
+    @classmethod
+    def _open_document(cls, doc, lazy=True, plain=None, exclude=()):
+        """
+        Envelope fields of a stored document, whichever format it was written in,
+        merged over `plain` (fields in `exclude` are neither decrypted nor returned).
+
+        Sealed documents come back as a SealedRecord (decrypted on first access
+        of a sealed field) when lazy=True; otherwise a plain dict.
+        """
+        fields = [f for f in cls._envelope_fields if f not in exclude]
+        out = dict(plain or {})
+
+        blob = doc.get(envelope.ENVELOPE_FIELD)
+        if not blob:
+            out.update(cls._legacy_decrypt_fields(doc, fields))
+            return out
+        if lazy:
+            return envelope.SealedRecord(
+                out,
+                collection=cls.collection_name,
+                business_id=doc["business_id"],
+                blob=blob,
+                sealed_fields=fields,
+            )
+        values = envelope.open_sealed(cls.collection_name, doc["business_id"], blob)
+        out.update({f: values.get(f) for f in fields})
+        return out
+
+    @classmethod
+    def _envelope_update(cls, record_id, updates, business_id=None, retries=3):
+        """
+        Update envelope fields of a sealed (or legacy) document: open, merge,
+        reseal. Compare-and-swap on the previous ciphertext so concurrent
+        updates of different fields are not lost. Legacy per-field ciphertext
+        is removed (the document is migrated as a side effect) in envelope
+        mode; otherwise a legacy document keeps per-field encryption.
+        The format is read from the document loaded here, so callers need no
+        extra lookup. Plain values are expected for envelope fields.
+        """
+        cls._enforce_permission("update", model_name=cls.__name__.lower())
+
+        collection = db.get_collection(cls.collection_name)
+        updates.setdefault("updated_at", datetime.now())
+        selector = {"_id": ObjectId(record_id)}
+        if business_id is not None:
+            selector["business_id"] = ObjectId(business_id)
+
+        sealed_updates = {f: updates.pop(f) for f in cls._envelope_fields if f in updates}
+        projection = {"business_id": 1, envelope.ENVELOPE_FIELD: 1, **{f: 1 for f in cls._envelope_fields}}
+
+        for _ in range(retries):
+            doc = collection.find_one(selector, projection)
+            if not doc:
+                return False
+
+            blob = doc.get(envelope.ENVELOPE_FIELD)
+            if not blob and not cls.envelope_enabled():
+                encrypted = {f: encrypt_data(v) if v is not None else None for f, v in sealed_updates.items()}
+                result = collection.update_one(
+                    {**selector, envelope.ENVELOPE_FIELD: {"$exists": False}},
+                    {"$set": {**updates, **encrypted}},
+                )
+                if result.matched_count:
+                    return result.modified_count > 0
+                continue  # sealed concurrently: take the sealed path
+
+            current = dict(cls._open_document(doc, lazy=False))
+            current.update(sealed_updates)
+
+            guard = {**selector, f"{envelope.ENVELOPE_FIELD}.ct": blob["ct"]} if blob else {
+                **selector, envelope.ENVELOPE_FIELD: {"$exists": False}
+            }
+            update = {
+                "$set": {
+                    **updates,
+                    envelope.ENVELOPE_FIELD: envelope.seal(cls.collection_name, doc["business_id"], current),
+                }
+            }
+            legacy = [f for f in cls._envelope_fields if f in doc]
+            if legacy:
+                update["$unset"] = {f: "" for f in legacy}
+
+            result = collection.update_one(guard, update)
+            if result.matched_count:
+                return result.modified_count > 0
+
+        Log.error(f"[{cls.__name__}][_envelope_update] gave up after {retries} concurrent modifications: {record_id}")
+        return False
+
+    @classmethod
+    def migrate_to_envelope(cls, business_id=None, batch_size=200, limit=None):
+        """
+        Convert per-field ciphertext documents to a single sealed blob.
+        Idempotent and resumable: only documents without a blob are touched,
+        and each write is guarded on that.
+        """
+        from pymongo import UpdateOne
+
+        collection = db.get_collection(cls.collection_name)
+        query = {envelope.ENVELOPE_FIELD: {"$exists": False}}
+        if business_id is not None:
+            query["business_id"] = ObjectId(business_id)
+
+        projection = {"business_id": 1, **{f: 1 for f in cls._envelope_fields}}
+        stats = {"scanned": 0, "migrated": 0, "failed": 0}
+        ops = []
+
+        def _flush():
+            if not ops:
+                return
+            res = collection.bulk_write(ops, ordered=False)
+            stats["migrated"] += res.modified_count
+            ops.clear()
+
+        cursor = collection.find(query, projection, batch_size=batch_size)
+        if limit:
+            cursor = cursor.limit(int(limit))
+
+        for doc in cursor:
+            stats["scanned"] += 1
+            try:
+                values = cls._legacy_decrypt_fields(doc)
+                blob = envelope.seal(cls.collection_name, doc["business_id"], values)
+            except Exception as e:
+                stats["failed"] += 1
+                Log.error(f"[{cls.__name__}][migrate_to_envelope] {doc.get('_id')}: {e}")
+                continue
+
+            ops.append(UpdateOne(
+                {"_id": doc["_id"], envelope.ENVELOPE_FIELD: {"$exists": False}},
+                {
+                    "$set": {envelope.ENVELOPE_FIELD: blob},
+                    "$unset": {f: "" for f in cls._envelope_fields if f in doc},
+                },
+            ))
+            if len(ops) >= batch_size:
+                _flush()
+
+        _flush()
+        Log.info(f"[{cls.__name__}][migrate_to_envelope] {stats}")
+        return stats
+
+    # ═══════════════════════════════════════════════════════════════
+    # BLIND INDEXES
+    # ═══════════════════════════════════════════════════════════════
+
+    @classmethod
+    def _blind_index(cls, name):
+        for idx in cls._blind_indexes:
+            if idx.name == name:
+                return idx
+        raise KeyError(f"{cls.__name__} has no blind index {name!r}")
+
+    @classmethod
+    def blind_index_version(cls):
+        return blind_index.version_of(cls._blind_indexes)
+
+    @classmethod
+    def blind_index_values(cls, values):
+        """
+        Stored blind index fields (and version) for a document whose plain
+        field values are in `values`. Call with the plain values at construction.
+        """
+        if not cls._blind_indexes:
+            return {}
+        out = {idx.storage_field: idx.value_for(values, cls.collection_name) for idx in cls._blind_indexes}
+        out[blind_index.VERSION_FIELD] = cls.blind_index_version()
+        return out
+
+    @classmethod
+    def _plain_values(cls, doc, fields):
+        """
+        Plain values of `fields` from a stored document (per-field or sealed).
+        """
+        values = {f: doc.get(f) for f in fields if f not in cls._envelope_fields}
+        sealed = [f for f in fields if f in cls._envelope_fields]
+        if sealed:
+            values.update(cls._open_document(doc, lazy=False, exclude=[
+                f for f in cls._envelope_fields if f not in sealed
+            ]))
+        return values
+
+    @classmethod
+    def _blind_index_updates(cls, record_id, updates, business_id=None):
+        """
+        Blind index fields affected by a partial update (plain values).
+        Compound indexes whose other fields are not in `updates` are completed
+        from the stored document.
+        """
+        touched = [idx for idx in cls._blind_indexes if any(f in updates for f in idx.fields)]
+        if not touched:
+            return {}
+
+        merged = dict(updates)
+        missing = {f for idx in touched for f in idx.fields if f not in updates}
+        if missing:
+            selector = {"_id": ObjectId(record_id)}
+            if business_id is not None:
+                selector["business_id"] = ObjectId(business_id)
+            projection = {"business_id": 1, envelope.ENVELOPE_FIELD: 1, **{f: 1 for f in missing}}
+            doc = db.get_collection(cls.collection_name).find_one(selector, projection) or {}
+            if doc:
+                current = cls._plain_values(doc, missing)
+                merged = {**{f: current.get(f) for f in missing}, **updates}
+
+        return {idx.storage_field: idx.value_for(merged, cls.collection_name) for idx in touched}
+
+    @classmethod
+    def blind_match(cls, name, *values):
+        """
+        Query fragment: exact match on a blind index, e.g.
+        Product.blind_match("sku", "COF-1") -> {"hashed_sku": "..."}
+        """
+        return cls._blind_index(name).match(cls.collection_name, *values)
+
+    @classmethod
+    def blind_match_any(cls, name, values):
+        return cls._blind_index(name).match_any(cls.collection_name, values)
+
+    @classmethod
+    def blind_search(cls, name, term):
+        """
+        Query fragment for a prefix/token index, or None when `term` has
+        nothing searchable.
+        """
+        return cls._blind_index(name).search(cls.collection_name, term)
+
+    @classmethod
+    def _hashed_lookup(cls, key, value):
+        """
+        (field, hash) for a hashed_<key> lookup, honouring a declared blind index.
+        """
+        for idx in cls._blind_indexes:
+            if idx.kind == blind_index.KIND_EXACT and idx.fields == (key,):
+                return idx.storage_field, idx.match(cls.collection_name, value)[idx.storage_field]
+        return f"hashed_{key}", hash_data(value)
+
+    @classmethod
+    def backfill_blind_indexes(cls, business_id=None, batch_size=200, limit=None):
+        """
+        (Re)compute blind indexes for documents written before the current
+        declarations. Idempotent and resumable: documents carry the version
+        they were indexed with, and each write is guarded on updated_at so a
+        concurrent update is never overwritten with stale hashes.
+        """
+        from pymongo import UpdateOne
+
+        if not cls._blind_indexes:
+            return {"scanned": 0, "updated": 0, "failed": 0}
+
+        collection = db.get_collection(cls.collection_name)
+        version = cls.blind_index_version()
+        query = {blind_index.VERSION_FIELD: {"$ne": version}}
+        if business_id is not None:
+            query["business_id"] = ObjectId(business_id)
+
+        fields = sorted({f for idx in cls._blind_indexes for f in idx.fields})
+        projection = {"business_id": 1, "updated_at": 1, envelope.ENVELOPE_FIELD: 1, **{f: 1 for f in fields}}
+        stats = {"scanned": 0, "updated": 0, "failed": 0}
+        ops = []
+
+        def _flush():
+            if not ops:
+                return
+            res = collection.bulk_write(ops, ordered=False)
+            stats["updated"] += res.modified_count
+            ops.clear()
+
+        cursor = collection.find(query, projection, batch_size=batch_size)
+        if limit:
+            cursor = cursor.limit(int(limit))
+
+        for doc in cursor:
+            stats["scanned"] += 1
+            try:
+                values = cls.blind_index_values(cls._plain_values(doc, fields))
+            except Exception as e:
+                stats["failed"] += 1
+                Log.error(f"[{cls.__name__}][backfill_blind_indexes] {doc.get('_id')}: {e}")
+                continue
+
+            ops.append(UpdateOne(
+                {"_id": doc["_id"], "updated_at": doc.get("updated_at")},
+                {"$set": values},
+            ))
+            if len(ops) >= batch_size:
+                _flush()
+
+        _flush()
+        Log.info(f"[{cls.__name__}][backfill_blind_indexes] {stats}")
+        return stats
+
     # ═══════════════════════════════════════════════════════════════
     # PERMISSION SYSTEM
     # ═══════════════════════════════════════════════════════════════
@@ -299,13 +640,14 @@ class BaseModel:
             )
 
         try:
-            from ..models.admin.subscription_model import Subscription
+            from ..utils.plan.entitlements import get_entitlements
 
-            subscription = Subscription.get_active_by_business(business_id)
+            # Cached per tenant (request -> process -> Redis); dates are re-checked below
+            snapshot = get_entitlements(business_id)
+            subscription = snapshot.get("subscription")
 
             if not subscription:
-                latest = Subscription.get_latest_by_business(business_id)
-                error_info = cls._build_subscription_error(latest)
+                error_info = cls._build_subscription_error(snapshot.get("latest"))
                 raise SubscriptionError(error_info["message"], error_info["details"])
 
             sub_status = (subscription.get("status") or "").upper()
@@ -453,16 +795,38 @@ class BaseModel:
     # CRUD
     # ═══════════════════════════════════════════════════════════════
 
-    def save(self, processing_callback=False):
+    def save(self, processing_callback=False, session=None):
         self.__class__._enforce_permission(
             "create",
             skip=processing_callback,
             model_name=self.__class__.__name__.lower(),
         )
         collection = db.get_collection(self.collection_name)
-        result = collection.insert_one(self.to_dict())
+        doc = self.to_dict()
+        if self.__class__.envelope_enabled():
+            doc = self.__class__._seal_document(doc)
+        result = collection.insert_one(doc, session=session)
         return str(result.inserted_id)
 
+    @classmethod
+    def save_many(cls, instances, processing_callback=False, session=None):
+        """
+        Insert several instances with one insert_many; permission is checked once.
+        Returns the inserted ids in order.
+        """
+        cls._enforce_permission(
+            "create",
+            skip=processing_callback,
+            model_name=cls.__name__.lower(),
+        )
+        docs = [i.to_dict() for i in instances]
+        if not docs:
+            return []
+        if cls.envelope_enabled():
+            docs = [cls._seal_document(d) for d in docs]
+        result = db.get_collection(cls.collection_name).insert_many(docs, session=session)
+        return [str(i) for i in result.inserted_ids]
+
     @classmethod
     def get_by_id(cls, record_id, business_id, processing_callback=False, is_logging_in=False):
         cls._enforce_permission(
@@ -593,9 +957,9 @@ class BaseModel:
     def check_item_exists_business_id(cls, business_id, key, value):
         if isinstance(business_id, str):
             business_id = ObjectId(business_id)
-        hashed_key = hash_data(value)
+        field, hashed_key = cls._hashed_lookup(key, value)
         collection = db.get_collection(cls.collection_name)
-        return bool(collection.find_one({"business_id": business_id, f"hashed_{key}": hashed_key}))
+        return bool(collection.find_one({"business_id": business_id, field: hashed_key}))
 
     @classmethod
     def check_item_exists(cls, agent_id, key, value):
@@ -618,7 +982,8 @@ class BaseModel:
         try:
             query = {"business_id": ObjectId(business_id)}
             for key, value in fields.items():
-                query[f"hashed_{key}"] = hash_data(value)
+                field, hashed_key = cls._hashed_lookup(key, value)
+                query[field] = hashed_key
             collection = db.get_collection(cls.collection_name)
             return collection.find_one(query) is not None
         except Exception as e:
@@ -655,7 +1020,17 @@ class BaseModel:
         cls, query=None, page=None, per_page=None,
         sort=None, sort_by=None, sort_order=None,
         stringify_objectids=True,
+        cursor=None, count=None,
     ):
+        """
+        Page-number mode (default): {items, total_count, total_pages,
+        current_page, per_page} via count + skip/limit.
+
+        Cursor mode (cursor is not None; "" = first page): keyset read after
+        the signed cursor, {items, per_page, next_cursor, has_more}, plus
+        total_count when count is "exact" or "estimate" (default: no count).
+        A tampered or foreign cursor raises pagination.InvalidCursor.
+        """
         log_tag = f"[base_model.py][{cls.__name__}][paginate]"
 
         if query is None:
@@ -686,6 +1061,21 @@ class BaseModel:
         else:
             sort_spec = [("created_at", -1)]
 
+        if cursor is not None:
+            collection = db.get_collection(cls.collection_name)
+            result = pagination.keyset_page(
+                collection, query,
+                sort_spec=sort_spec, per_page=per_page_int,
+                cursor=cursor, count_mode=count or pagination.COUNT_NONE,
+            )
+            if stringify_objectids:
+                result["items"] = [pagination.stringify_ids(doc) for doc in result["items"]]
+            Log.info(
+                f"{log_tag} query={query} cursor_mode per_page={per_page_int} "
+                f"sort={sort_spec} returned={len(result['items'])} has_more={result['has_more']}"
+            )
+            return result
+
         try:
             collection = db.get_collection(cls.collection_name)
             total_count = collection.count_documents(query)
@@ -698,15 +1088,7 @@ class BaseModel:
             items = list(cursor)
 
             if stringify_objectids:
-                def _stringify(v):
-                    if isinstance(v, ObjectId):
-                        return str(v)
-                    if isinstance(v, dict):
-                        return {kk: _stringify(vv) for kk, vv in v.items()}
-                    if isinstance(v, list):
-                        return [_stringify(x) for x in v]
-                    return v
-                items = [_stringify(doc) for doc in items]
+                items = [pagination.stringify_ids(doc) for doc in items]
 
             total_pages = (total_count + per_page_int - 1) // per_page_int if per_page_int else 1
 
@@ -613,8 +613,16 @@ class Token:
 
     @classmethod
     def delete_token(cls, access_token: str) -> bool:
-        res = db.get_collection(cls.collection_name).delete_one({"access_token": access_token})
-        return res.deleted_count > 0
+        doc = db.get_collection(cls.collection_name).find_one_and_delete(
+            {"access_token": access_token},
+            projection={"user_id": 1},
+        )
+        if not doc:
+            return False
+        # logout: drop the cached principal so the next request re-resolves
+        from app.utils import principal_cache
+        principal_cache.invalidate_user(doc.get("user_id"), reason="logout")
+        return True
 
     @classmethod
     def get_refresh_token(cls, refresh_token: str):
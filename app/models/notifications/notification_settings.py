@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, IndexModel
 
 from ..base_model import BaseModel
 from ...extensions import db as db_ext
@@ -23,17 +23,15 @@ class NotificationSettings(BaseModel):
     """
     collection_name = "notification_settings"
 
+    _indexes = (
+        IndexModel([("business_id", 1), ("user__id", 1)], unique=True),
+        IndexModel([("updated_at", -1)]),
+    )
+
     @staticmethod
     def _utc_now():
         return datetime.now(timezone.utc)
 
-    @classmethod
-    def ensure_indexes(cls) -> bool:
-        col = db_ext.get_collection(cls.collection_name)
-        col.create_index([("business_id", 1), ("user__id", 1)], unique=True)
-        col.create_index([("updated_at", -1)])
-        return True
-
     @classmethod
     def get_or_create_defaults(cls, *, business_id: str) -> Dict[str, Any]:
         col = db_ext.get_collection(cls.collection_name)
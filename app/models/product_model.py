@@ -1,4 +1,5 @@
 # models/product.py
+from pymongo import IndexModel
 from bson.objectid import ObjectId
 from datetime import datetime, date
 from math import ceil
@@ -8,7 +9,9 @@ from bson.errors import InvalidId
 from ..utils.logger import Log # import logging
 from pymongo.errors import PyMongoError
 from ..utils.crypt import encrypt_data, decrypt_data, hash_data
+from ..utils import envelope
 from ..models.base_model import BaseModel
+from ..utils.blind_index import BlindIndex, normalize_code, normalize_text
 
 class Product(BaseModel):
     """
@@ -18,6 +21,48 @@ class Product(BaseModel):
 
     collection_name = "products"
 
+    _indexes = (
+        # Core indexes for product queries
+        IndexModel([("business_id", 1), ("created_at", -1)], name="business_created_at_idx"),
+        # 🔐 Enforce unique product names per business (via hashed_name)
+        IndexModel(
+            [("business_id", 1), ("hashed_name", 1)],
+            unique=True,
+            name="uniq_business_product_name",
+        ),
+        # Blind indexes (encrypted fields are only queryable via their HMACs)
+        IndexModel(
+            [("business_id", 1), ("hashed_pos_listing", 1), ("hashed_category", 1)],
+            name="business_pos_category_idx",
+        ),
+        IndexModel(
+            [("business_id", 1), ("hashed_pos_listing", 1), ("bidx_search", 1)],
+            name="business_pos_search_idx",
+        ),
+        IndexModel(
+            [("business_id", 1), ("hashed_category", 1)],
+            name="business_hashed_category_idx",
+        ),
+        # Search and lookup indexes
+        IndexModel(
+            [("business_id", 1), ("hashed_sku", 1)],
+            unique=True,
+            partialFilterExpression={"hashed_sku": {"$type": "string"}},
+            name="uniq_business_hashed_sku",
+        ),
+        IndexModel([("bidx_v", 1)], name="blind_index_version_idx"),
+        IndexModel([("business_id", 1), ("barcode", 1)], sparse=True, name="business_barcode_idx"),
+        # Inventory management indexes
+        IndexModel([("business_id", 1), ("quantity", 1)], name="business_quantity_idx"),
+        IndexModel([("business_id", 1), ("reorder_point", 1)], name="business_reorder_point_idx"),
+        # Variant index
+        IndexModel([("business_id", 1), ("has_variants", 1)], name="business_has_variants_idx"),
+        # Price and cost indexes (for reports)
+        IndexModel([("business_id", 1), ("price", 1)], name="business_price_idx"),
+        # Text search index
+        IndexModel([("name", "text"), ("description", "text")], name="product_text_search_idx"),
+    )
+
     # All encrypted fields that we need to decrypt when reading
     FIELDS_TO_DECRYPT = [
         "name", "brand", "description", "tags", "category",
@@ -29,6 +74,19 @@ class Product(BaseModel):
         "alert_quantity", "barcode_symbology", "selling_price_group"
     ]
 
+    # Sealed as one blob when "Product" is in ENVELOPE_ENCRYPTION_MODELS
+    _envelope_fields = tuple(FIELDS_TO_DECRYPT)
+
+    # Queryable HMACs of encrypted fields (hashed_* / bidx_*)
+    _blind_indexes = (
+        BlindIndex("name"),                                   # hashed_name (unique per business)
+        BlindIndex("sku", normalize=normalize_code),          # hashed_sku (upsert key)
+        BlindIndex("category"),                               # hashed_category
+        BlindIndex("sell_on_point_of_sale", "status",
+                   name="pos_listing", normalize=normalize_text),  # hashed_pos_listing
+        BlindIndex("name", "sku", kind="prefix", name="search"),   # bidx_search
+    )
+
     def __init__(
         self,
         business_id,
@@ -135,12 +193,11 @@ class Product(BaseModel):
             selling_price_group=selling_price_group,
         )
 
-        # Name + hash (required)
-        self.name = encrypt_data(name)
-        self.hashed_name = hash_data(name)
+        # Name (required); hashed_name comes with the blind indexes below
+        self.name = self._encrypt_field(name)
 
         # Required field
-        self.product_type = encrypt_data(product_type)
+        self.product_type = self._encrypt_field(product_type)
 
         # Use locals() only to get constructor parameters
         params = locals()
@@ -158,7 +215,7 @@ class Product(BaseModel):
         for field in none_default_fields:
             value = params.get(field)
             if value is not None:
-                setattr(self, field, encrypt_data(value))
+                setattr(self, field, self._encrypt_field(value))
             else:
                 setattr(self, field, None)
                 
@@ -169,7 +226,7 @@ class Product(BaseModel):
             if isinstance(tags_value, list):
                 # Convert to ObjectId strings and validate
                 normalized_tags = self._normalize_object_id_array(tags_value, "tags")
-                self.tags = encrypt_data(normalized_tags)
+                self.tags = self._encrypt_field(normalized_tags)
             else:
                 raise ValueError("tags must be a list of ObjectIds or strings")
         else:
@@ -181,7 +238,7 @@ class Product(BaseModel):
             if isinstance(suppliers_value, list):
                 # Convert to ObjectId strings and validate
                 normalized_suppliers = self._normalize_object_id_array(suppliers_value, "suppliers")
-                self.suppliers = encrypt_data(normalized_suppliers)
+                self.suppliers = self._encrypt_field(normalized_suppliers)
             else:
                 raise ValueError("suppliers must be a list of ObjectIds or strings")
         else:
@@ -193,7 +250,7 @@ class Product(BaseModel):
             if isinstance(taxes_value, list):
                 # Convert to ObjectId strings and validate
                 normalized_taxes = self._normalize_object_id_array(taxes_value, "tax")
-                self.tax = encrypt_data(normalized_taxes)
+                self.tax = self._encrypt_field(normalized_taxes)
             else:
                 raise ValueError("taxes must be a list of ObjectIds or strings")
         else:
@@ -207,9 +264,18 @@ class Product(BaseModel):
         for field, default_val in binary_fields.items():
             value = params.get(field)
             if value is not None:
-                setattr(self, field, encrypt_data(value))
+                setattr(self, field, self._encrypt_field(value))
             else:
-                setattr(self, field, encrypt_data(default_val))
+                setattr(self, field, self._encrypt_field(default_val))
+
+        # Blind indexes from the plain values
+        self.__dict__.update(self.blind_index_values({
+            "name": name,
+            "sku": sku,
+            "category": category,
+            "status": status,
+            "sell_on_point_of_sale": 1 if sell_on_point_of_sale is None else sell_on_point_of_sale,
+        }))
 
         # Timestamps
         self.created_at = datetime.utcnow()
@@ -293,27 +359,21 @@ class Product(BaseModel):
         if "admin_id" in data and data["admin_id"] is not None:
             data["admin_id"] = str(data["admin_id"])
 
-        # Decrypt configured fields
-        decrypted = {}
-        for field in getattr(cls, "FIELDS_TO_DECRYPT", []):
-            value = data.get(field)
-            decrypted[field] = decrypt_data(value) if value is not None else None
-
-        product = {
-            "_id": data.get("_id"),
-            "business_id": data.get("business_id"),
-            "user_id": data.get("user_id"),
-            "user__id": data.get("user__id"),
-            "admin_id": data.get("admin_id"),
-            **decrypted,
-            "created_at": data.get("created_at"),
-            "updated_at": data.get("updated_at"),
-        }
-
-        # Remove internal / sensitive fields if present
-        product.pop("file_path", None)   # legacy single file path
-        product.pop("hashed_name", None)
-        product.pop("file_paths", None)
+        # Decrypt configured fields (per-field ciphertext or one sealed blob,
+        # opened lazily). file_paths is internal and never decrypted.
+        product = cls._open_document(
+            data,
+            plain={
+                "_id": data.get("_id"),
+                "business_id": data.get("business_id"),
+                "user_id": data.get("user_id"),
+                "user__id": data.get("user__id"),
+                "admin_id": data.get("admin_id"),
+                "created_at": data.get("created_at"),
+                "updated_at": data.get("updated_at"),
+            },
+            exclude=("file_paths",),
+        )
 
         return product
 
@@ -447,7 +507,7 @@ class Product(BaseModel):
             business_id: Business ObjectId or string
             outlet_id: Optional outlet filter (for outlet-specific inventory)
             category_id: Optional category filter
-            search_term: Optional search term (searches name, sku)
+            search_term: Optional search term (token prefixes of name, sku)
             page: Optional page number
             per_page: Optional items per page
             
@@ -459,36 +519,29 @@ class Product(BaseModel):
         try:
             business_id = ObjectId(business_id) if not isinstance(business_id, ObjectId) else business_id
             
-            # Build query for POS products
+            # Build query for POS products (blind indexes; ciphertext is not queryable)
             query = {
                 "business_id": business_id,
-                "sell_on_point_of_sale": encrypt_data(1),
-                "status": encrypt_data("Active")
+                **cls.blind_match("pos_listing", 1, "Active"),
             }
             
             # Add category filter if provided
             if category_id:
-                category_id = ObjectId(category_id) if not isinstance(category_id, ObjectId) else category_id
-                query["category"] = encrypt_data(str(category_id))
+                query.update(cls.blind_match("category", str(category_id)))
             
-            # Note: Search by encrypted name/sku is not efficient
-            # Consider using hashed_name for exact matches or implementing full-text search
+            # Token-prefix search on name / sku
+            if search_term:
+                search_filter = cls.blind_search("search", search_term)
+                if search_filter:
+                    query.update(search_filter)
             
             result = cls.paginate(query, page, per_page)
             
-            # Decrypt all products
+            # Decrypt the page only
             processed = []
             for data in result.get("items", []):
                 product = cls._decrypt_and_normalise_product_doc(data)
                 if product is not None:
-                    # Apply search filter after decryption (not ideal for large datasets)
-                    if search_term:
-                        search_lower = search_term.lower()
-                        name_match = search_lower in (product.get("name") or "").lower()
-                        sku_match = search_lower in (product.get("sku") or "").lower()
-                        if not (name_match or sku_match):
-                            continue
-                    
                     processed.append(product)
             
             result["products"] = processed
@@ -509,7 +562,7 @@ class Product(BaseModel):
         Update a product's information by product_id.
 
         - Automatically refreshes `updated_at`.
-        - Re-hashes + re-encrypts `name` when present.
+        - Recomputes the blind indexes of any indexed field present.
         - Encrypts all FIELDS_TO_DECRYPT included in `updates`.
         
         Args:
@@ -524,16 +577,18 @@ class Product(BaseModel):
         try:
             updates["updated_at"] = datetime.utcnow()
 
-            # Handle name specially (include hashed_name)
-            if "name" in updates and updates["name"] is not None:
-                updates["hashed_name"] = hash_data(updates["name"])
-                updates["name"] = encrypt_data(updates["name"])
+            # Refresh blind indexes (hashed_name, hashed_sku, ...) from plain values
+            updates.update(cls._blind_index_updates(product_id, updates, business_id=updates.get("business_id")))
 
-            # Encrypt all other encrypted fields if present in updates
-            fields_to_encrypt = [f for f in cls.FIELDS_TO_DECRYPT if f != "name"]
-            for field in fields_to_encrypt:
-                if field in updates and updates[field] is not None:
-                    updates[field] = encrypt_data(updates[field])
+            # Envelope fields go through _envelope_update, which reads the stored
+            # format (sealed blob or per-field ciphertext) from the document it loads
+            if any(f in updates for f in cls._envelope_fields):
+                result = cls._envelope_update(product_id, updates, business_id=updates.pop("business_id", None))
+                if result:
+                    Log.info(f"{log_tag} Product updated successfully")
+                else:
+                    Log.error(f"{log_tag} Product update failed")
+                return result
 
             result = super().update(product_id, **updates)
             
@@ -587,6 +642,9 @@ class Product(BaseModel):
                 doc = obj.to_dict()
                 doc["business_id"] = business_oid
                 doc["updated_at"] = now
+                sealed = cls.envelope_enabled()
+                if sealed:
+                    doc = cls._seal_document(doc)
             except Exception as e:
                 results["errors"].append({"row": i+1, "error": str(e)})
                 continue
@@ -594,10 +652,16 @@ class Product(BaseModel):
             if mode == "create":
                 ops.append(doc)
             else:
-                # upsert by (business_id, sku)
+                # upsert by (business_id, hashed_sku); drop whichever storage
+                # format the existing document has that this write replaces
+                doc.pop("created_at", None)
+                stale = (
+                    {f: "" for f in cls._envelope_fields} if sealed
+                    else {envelope.ENVELOPE_FIELD: ""}
+                )
                 ops.append((
-                    {"business_id": business_oid, "sku": doc.get("sku")},
-                    {"$set": doc, "$setOnInsert": {"created_at": now}},
+                    {"business_id": business_oid, **cls.blind_match("sku", sku)},
+                    {"$set": doc, "$unset": stale, "$setOnInsert": {"created_at": now}},
                     True
                 ))
 
@@ -651,100 +715,6 @@ class Product(BaseModel):
             
         return result
 
-    # Add to models/product.py
-
-    @classmethod
-    def create_indexes(cls):
-        """
-        Create database indexes for optimal query performance
-        AND enforce uniqueness where required.
-        Run this once during setup or migration.
-        """
-        log_tag = "[product.py][Product][create_indexes]"
-        collection = db.get_collection(cls.collection_name)
-
-        try:
-            # Core indexes for product queries
-            collection.create_index(
-                [("business_id", 1), ("created_at", -1)],
-                name="business_created_at_idx",
-            )
-
-            # 🔐 Enforce unique product names per business (via hashed_name)
-            collection.create_index(
-                [("business_id", 1), ("hashed_name", 1)],
-                unique=True,
-                name="uniq_business_product_name",
-            )
-
-            collection.create_index(
-                [("business_id", 1), ("category", 1)],
-                name="business_category_idx",
-            )
-            collection.create_index(
-                [("business_id", 1), ("status", 1)],
-                name="business_status_idx",
-            )
-
-            # Search and lookup indexes
-            collection.create_index(
-                [("business_id", 1), ("sku", 1)],
-                unique=True,
-                sparse=True,
-                name="uniq_business_sku",
-            )
-            collection.create_index(
-                [("business_id", 1), ("barcode", 1)],
-                sparse=True,
-                name="business_barcode_idx",
-            )
-
-            # Inventory management indexes
-            collection.create_index(
-                [("business_id", 1), ("quantity", 1)],
-                name="business_quantity_idx",
-            )
-            collection.create_index(
-                [("business_id", 1), ("reorder_point", 1)],
-                name="business_reorder_point_idx",
-            )
-
-            # Variant index
-            collection.create_index(
-                [("business_id", 1), ("has_variants", 1)],
-                name="business_has_variants_idx",
-            )
-
-            # Price and cost indexes (for reports)
-            collection.create_index(
-                [("business_id", 1), ("price", 1)],
-                name="business_price_idx",
-            )
-
-            # Multi-field compound indexes for common queries
-            collection.create_index(
-                [("business_id", 1), ("category", 1), ("status", 1)],
-                name="business_category_status_idx",
-            )
-            collection.create_index(
-                [("business_id", 1), ("status", 1), ("quantity", 1)],
-                name="business_status_quantity_idx",
-            )
-
-            # Text search index
-            collection.create_index(
-                [("name", "text"), ("description", "text")],
-                name="product_text_search_idx",
-            )
-
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}")
-            # 🔴 IMPORTANT: let the caller know this failed
-            raise
-
 
 #-------------------------SALE MODEL--------------------------------------
 class Sale(BaseModel):
@@ -1112,6 +1082,14 @@ class Discount(BaseModel):
 
     collection_name = "discounts"
 
+    _indexes = (
+        # Core indexes
+        IndexModel([("business_id", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("hashed_code", 1)]),
+        IndexModel([("business_id", 1), ("current_uses", 1)]),
+        IndexModel([("business_id", 1), ("priority", -1)]),
+    )
+
     # Discount types
     TYPE_PERCENTAGE = "percentage"
     TYPE_FIXED = "fixed_amount"
@@ -1810,26 +1788,6 @@ class Discount(BaseModel):
         except Exception:
             return False
 
-    @classmethod
-    def create_indexes(cls):
-        """Create database indexes for optimal query performance."""
-        log_tag = f"[discount.py][Discount][create_indexes]"
-
-        try:
-            collection = db.get_collection(cls.collection_name)
-
-            # Core indexes
-            collection.create_index([("business_id", 1), ("created_at", -1)])
-            collection.create_index([("business_id", 1), ("hashed_code", 1)])
-            collection.create_index([("business_id", 1), ("current_uses", 1)])
-            collection.create_index([("business_id", 1), ("priority", -1)])
-
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}")
-            return False
 #-------------------------DISCOUNT MODEL--------------------------------------
 
 class SellingPriceGroup(BaseModel):
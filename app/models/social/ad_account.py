@@ -1,6 +1,7 @@
 # app/models/social/ad_account.py
 
 from datetime import datetime, timezone
+from pymongo import IndexModel
 from bson import ObjectId
 from typing import Dict, Any, List, Optional
 
@@ -19,6 +20,12 @@ class AdAccount(BaseModel):
 
     collection_name = "social_ad_accounts"
 
+    _indexes = (
+        IndexModel([("business_id", 1), ("platform", 1), ("ad_account_id", 1)], unique=True),
+        IndexModel([("business_id", 1), ("platform", 1), ("status", 1)]),
+        IndexModel([("business_id", 1), ("page_id", 1)]),
+    )
+
     STATUS_ACTIVE = "active"
     STATUS_DISABLED = "disabled"
     STATUS_PENDING_REVIEW = "pending_review"
@@ -200,6 +207,46 @@ class AdAccount(BaseModel):
 
         return items
 
+    @classmethod
+    def get_any_with_token(cls, platform: str = "facebook") -> Optional[dict]:
+        """
+        Any active ad account with a stored token (for platform-wide jobs such as
+        refreshing the targeting catalog).
+        """
+        col = db_ext.get_collection(cls.collection_name)
+        doc = col.find_one(
+            {
+                "platform": platform,
+                "status": cls.STATUS_ACTIVE,
+                "access_token": {"$ne": None},
+            },
+            sort=[("updated_at", -1)],
+        )
+        if doc:
+            doc["access_token_plain"] = decrypt_data(doc["access_token"]) if doc.get("access_token") else None
+            doc["refresh_token_plain"] = decrypt_data(doc["refresh_token"]) if doc.get("refresh_token") else None
+        return cls._oid_str(doc)
+
+    @classmethod
+    def iter_active_with_token(cls, platform: str = "facebook", business_id: str = None):
+        """
+        Yields every active ad account with a stored token (decrypted), optionally
+        limited to one business. Used by the scheduled insights sync.
+        """
+        col = db_ext.get_collection(cls.collection_name)
+        query = {
+            "platform": platform,
+            "status": cls.STATUS_ACTIVE,
+            "access_token": {"$ne": None},
+        }
+        if business_id:
+            query["business_id"] = ObjectId(str(business_id))
+
+        for doc in col.find(query).sort("business_id", 1):
+            doc["access_token_plain"] = decrypt_data(doc["access_token"]) if doc.get("access_token") else None
+            doc.pop("refresh_token", None)
+            yield cls._oid_str(doc)
+
     @classmethod
     def update(cls, account_id: str, business_id: str, updates: dict) -> bool:
         col = db_ext.get_collection(cls.collection_name)
@@ -235,14 +282,6 @@ class AdAccount(BaseModel):
         })
         return result.deleted_count > 0
 
-    @classmethod
-    def ensure_indexes(cls):
-        col = db_ext.get_collection(cls.collection_name)
-        col.create_index([("business_id", 1), ("platform", 1), ("ad_account_id", 1)], unique=True)
-        col.create_index([("business_id", 1), ("platform", 1), ("status", 1)])
-        col.create_index([("business_id", 1), ("page_id", 1)])
-        return True
-
 
 class AdCampaign(BaseModel):
     """
@@ -254,6 +293,15 @@ class AdCampaign(BaseModel):
 
     collection_name = "social_ad_campaigns"
 
+    _indexes = (
+        IndexModel([("business_id", 1), ("platform", 1), ("status", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("scheduled_post_id", 1)]),
+        IndexModel([("business_id", 1), ("ad_account_id", 1)]),
+        IndexModel([("fb_campaign_id", 1)], sparse=True),
+        IndexModel([("x_campaign_id", 1)], sparse=True),
+        IndexModel([("linkedin_campaign_id", 1)], sparse=True),
+    )
+
     # Campaign Status
     STATUS_DRAFT = "draft"
     STATUS_PENDING = "pending"
@@ -570,14 +618,3 @@ class AdCampaign(BaseModel):
     @classmethod
     def update_results(cls, campaign_id: str, business_id: str, results: dict) -> bool:
         return cls.update(campaign_id, business_id, {"results": results})
-
-    @classmethod
-    def ensure_indexes(cls):
-        col = db_ext.get_collection(cls.collection_name)
-        col.create_index([("business_id", 1), ("platform", 1), ("status", 1), ("created_at", -1)])
-        col.create_index([("business_id", 1), ("scheduled_post_id", 1)])
-        col.create_index([("business_id", 1), ("ad_account_id", 1)])
-        col.create_index([("fb_campaign_id", 1)], sparse=True)
-        col.create_index([("x_campaign_id", 1)], sparse=True)
-        col.create_index([("linkedin_campaign_id", 1)], sparse=True)
-        return True
@@ -0,0 +1,362 @@
+# app/models/social/ads_insight_daily.py
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, UpdateOne, IndexModel
+
+from ...extensions.db import db as db_ext
+
+
+# Additive metrics stored per day. Ratios (cpc/cpm/ctr, cost per action) are derived from
+# sums at read time. Reach is not additive across days (the same person is counted once per
+# day), so multi-day reads report the max daily reach as a lower bound, flagged with
+# reach_basis="max_daily"; single-day reads are exact.
+SUM_METRICS = ["impressions", "clicks", "spend"]
+
+LEVELS = ("campaign", "adset", "ad")
+
+
+def _num(v: Any) -> float:
+    try:
+        return float(v or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _actions_map(actions: Optional[List[Dict[str, Any]]]) -> Dict[str, float]:
+    """
+    Meta returns [{"action_type": "link_click", "value": "12"}, ...].
+    Stored as {"link_click": 12.0} so ranges can be summed in a pipeline.
+    """
+    out: Dict[str, float] = {}
+    for a in actions or []:
+        k = str(a.get("action_type") or "").replace(".", "_")
+        if k:
+            out[k] = out.get(k, 0.0) + _num(a.get("value"))
+    return out
+
+
+def _cost_per_action(spend: float, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"action_type": a["action_type"], "value": round(spend / _num(a["value"]), 6)}
+        for a in actions
+        if _num(a.get("value"))
+    ]
+
+
+def derive_ratios(row: Dict[str, Any]) -> Dict[str, Any]:
+    impressions = _num(row.get("impressions"))
+    clicks = _num(row.get("clicks"))
+    spend = _num(row.get("spend"))
+    row["cpc"] = round(spend / clicks, 6) if clicks else 0
+    row["cpm"] = round(spend * 1000 / impressions, 6) if impressions else 0
+    row["ctr"] = round(clicks * 100 / impressions, 6) if impressions else 0
+    return row
+
+
+class AdsInsightDaily:
+    """
+    Local warehouse of ads insights, one document per object per day.
+
+    Collection: social_ads_insights_daily
+      {
+        _id,
+        business_id: ObjectId,
+        platform: "facebook",
+        ad_account_id: "act_123",
+        level: "campaign"|"adset"|"ad",
+        object_id: "<fb id at this level>",
+        fb_campaign_id: "<fb campaign id>",    # lets adset/ad rows roll up to a campaign
+        campaign_id: ObjectId|None,            # local AdCampaign _id when we created it
+        date_ymd: "YYYY-MM-DD",                # in the ad account's timezone (as Meta reports)
+        impressions, reach, clicks, spend,
+        actions: {"link_click": 12, ...},
+        cost_per_action_type: {"link_click": 0.42, ...},   # as reported for that day
+        synced_at
+      }
+
+    Unique index:
+      (business_id, ad_account_id, level, object_id, date_ymd)
+
+    Re-pulling a day (attribution window) overwrites it; nothing is ever summed on write.
+    """
+
+    collection_name = "social_ads_insights_daily"
+
+    _indexes = (
+        IndexModel(
+            [
+                ("business_id", ASCENDING),
+                ("ad_account_id", ASCENDING),
+                ("level", ASCENDING),
+                ("object_id", ASCENDING),
+                ("date_ymd", ASCENDING),
+            ],
+            unique=True,
+            name="uniq_ads_insight_day",
+        ),
+        IndexModel(
+            [
+                ("business_id", ASCENDING),
+                ("campaign_id", ASCENDING),
+                ("level", ASCENDING),
+                ("date_ymd", ASCENDING),
+            ],
+            name="idx_ads_insight_campaign_date",
+        ),
+        IndexModel(
+            [
+                ("business_id", ASCENDING),
+                ("fb_campaign_id", ASCENDING),
+                ("level", ASCENDING),
+                ("date_ymd", ASCENDING),
+            ],
+            name="idx_ads_insight_fb_campaign_date",
+        ),
+    )
+
+    @classmethod
+    def col(cls):
+        return db_ext.get_collection(cls.collection_name)
+
+    @classmethod
+    def upsert_rows(
+        cls,
+        *,
+        business_id: str,
+        ad_account_id: str,
+        level: str,
+        rows: List[Dict[str, Any]],
+        campaign_map: Optional[Dict[str, str]] = None,
+        platform: str = "facebook",
+    ) -> int:
+        """
+        Bulk upsert raw API rows (time_increment=1, so date_start == date_stop).
+        campaign_map: fb_campaign_id -> local AdCampaign _id.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"level must be one of {LEVELS}")
+
+        campaign_map = campaign_map or {}
+        biz = ObjectId(str(business_id))
+        now = datetime.now(timezone.utc)
+
+        ops = []
+        for r in rows or []:
+            object_id = str(r.get(f"{level}_id") or "").strip()
+            date_ymd = str(r.get("date_start") or "").strip()
+            if not object_id or not date_ymd:
+                continue
+
+            fb_campaign_id = str(r.get("campaign_id") or "")
+            local_campaign = campaign_map.get(fb_campaign_id)
+
+            ops.append(
+                UpdateOne(
+                    {
+                        "business_id": biz,
+                        "ad_account_id": ad_account_id,
+                        "level": level,
+                        "object_id": object_id,
+                        "date_ymd": date_ymd,
+                    },
+                    {
+                        "$set": {
+                            "platform": platform,
+                            "fb_campaign_id": fb_campaign_id or None,
+                            "campaign_id": ObjectId(local_campaign) if local_campaign else None,
+                            "impressions": int(_num(r.get("impressions"))),
+                            "reach": int(_num(r.get("reach"))),
+                            "clicks": int(_num(r.get("clicks"))),
+                            "spend": _num(r.get("spend")),
+                            "actions": _actions_map(r.get("actions")),
+                            "cost_per_action_type": _actions_map(r.get("cost_per_action_type")),
+                            "synced_at": now,
+                        }
+                    },
+                    upsert=True,
+                )
+            )
+
+        if not ops:
+            return 0
+
+        cls.col().bulk_write(ops, ordered=False)
+        return len(ops)
+
+    @staticmethod
+    def _match(
+        business_id: str,
+        level: str,
+        object_id: str,
+        since_ymd: str,
+        until_ymd: str,
+    ) -> Dict[str, Any]:
+        return {
+            "business_id": ObjectId(str(business_id)),
+            "level": level,
+            "object_id": str(object_id),
+            "date_ymd": {"$gte": since_ymd, "$lte": until_ymd},
+        }
+
+    @classmethod
+    def has_rows(cls, *, business_id: str, level: str, object_id: str, since_ymd: str, until_ymd: str) -> bool:
+        q = cls._match(business_id, level, object_id, since_ymd, until_ymd)
+        return cls.col().find_one(q, {"_id": 1}) is not None
+
+    @classmethod
+    def summarize(
+        cls,
+        *,
+        business_id: str,
+        level: str,
+        object_id: str,
+        since_ymd: str,
+        until_ymd: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Range totals for one object, computed server-side.
+        Returns None when nothing is stored for the range.
+        """
+        group: Dict[str, Any] = {"_id": None, "days": {"$sum": 1}, "reach": {"$max": "$reach"}}
+        for k in SUM_METRICS:
+            group[k] = {"$sum": f"${k}"}
+        group["actions"] = {"$push": {"$objectToArray": {"$ifNull": ["$actions", {}]}}}
+
+        pipeline = [
+            {"$match": cls._match(business_id, level, object_id, since_ymd, until_ymd)},
+            {"$group": group},
+            # flatten the per-day action arrays and sum by action_type
+            {"$unwind": {"path": "$actions", "preserveNullAndEmptyArrays": True}},
+            {"$unwind": {"path": "$actions", "preserveNullAndEmptyArrays": True}},
+            {
+                "$group": {
+                    "_id": {"k": "$actions.k"},
+                    "days": {"$first": "$days"},
+                    "reach": {"$first": "$reach"},
+                    **{k: {"$first": f"${k}"} for k in SUM_METRICS},
+                    "value": {"$sum": {"$ifNull": ["$actions.v", 0]}},
+                }
+            },
+        ]
+
+        docs = list(cls.col().aggregate(pipeline))
+        if not docs:
+            return None
+
+        head = docs[0]
+        actions = [
+            {"action_type": d["_id"]["k"], "value": d.get("value", 0)}
+            for d in docs
+            if d["_id"].get("k")
+        ]
+        days = head.get("days", 0)
+        out: Dict[str, Any] = {
+            "impressions": head.get("impressions", 0),
+            "reach": head.get("reach", 0),
+            "reach_basis": "exact" if days <= 1 else "max_daily",
+            "clicks": head.get("clicks", 0),
+            "spend": round(_num(head.get("spend")), 2),
+            "days": days,
+            "actions": actions,
+            # daily costs cannot be summed; the range cost is spend / actions
+            "cost_per_action_type": _cost_per_action(_num(head.get("spend")), actions),
+            "date_start": since_ymd,
+            "date_stop": until_ymd,
+        }
+        return derive_ratios(out)
+
+    @classmethod
+    def daily_series(
+        cls,
+        *,
+        business_id: str,
+        level: str,
+        object_id: str,
+        since_ymd: str,
+        until_ymd: str,
+    ) -> List[Dict[str, Any]]:
+        q = cls._match(business_id, level, object_id, since_ymd, until_ymd)
+        projection = {"_id": 0, "date_ymd": 1, "impressions": 1, "reach": 1, "clicks": 1, "spend": 1}
+        rows = []
+        for d in cls.col().find(q, projection).sort("date_ymd", ASCENDING):
+            rows.append(derive_ratios(d))
+        return rows
+
+    @classmethod
+    def delete_for_account(cls, *, business_id: str, ad_account_id: str) -> int:
+        res = cls.col().delete_many({"business_id": ObjectId(str(business_id)), "ad_account_id": ad_account_id})
+        return int(res.deleted_count or 0)
+
+
+class AdsInsightSyncState:
+    """
+    Per ad account sync cursor for the insights warehouse.
+
+    Collection: social_ads_insight_sync_state
+      {
+        business_id: ObjectId,
+        ad_account_id: "act_123",
+        platform: "facebook",
+        first_synced_ymd: "YYYY-MM-DD",  # oldest day of the contiguous synced coverage
+        last_synced_ymd: "YYYY-MM-DD",   # newest day fully pulled
+        last_run_at, last_error,
+        last_stats: {"since": ..., "until": ..., "rows": {...}}
+      }
+    """
+
+    collection_name = "social_ads_insight_sync_state"
+
+    _indexes = (
+        IndexModel(
+            [("business_id", ASCENDING), ("ad_account_id", ASCENDING)],
+            unique=True,
+            name="uniq_ads_insight_sync_account",
+        ),
+        IndexModel([("last_run_at", DESCENDING)], name="idx_ads_insight_sync_last_run"),
+    )
+
+    @classmethod
+    def col(cls):
+        return db_ext.get_collection(cls.collection_name)
+
+    @classmethod
+    def get(cls, *, business_id: str, ad_account_id: str) -> Optional[Dict[str, Any]]:
+        return cls.col().find_one(
+            {"business_id": ObjectId(str(business_id)), "ad_account_id": ad_account_id},
+            {"_id": 0},
+        )
+
+    @classmethod
+    def mark(
+        cls,
+        *,
+        business_id: str,
+        ad_account_id: str,
+        first_synced_ymd: Optional[str] = None,
+        last_synced_ymd: Optional[str] = None,
+        stats: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        platform: str = "facebook",
+    ) -> None:
+        updates: Dict[str, Any] = {
+            "platform": platform,
+            "last_run_at": datetime.now(timezone.utc),
+            "last_error": error,
+        }
+        if first_synced_ymd:
+            updates["first_synced_ymd"] = first_synced_ymd
+        if last_synced_ymd:
+            updates["last_synced_ymd"] = last_synced_ymd
+        if stats is not None:
+            updates["last_stats"] = stats
+
+        cls.col().update_one(
+            {"business_id": ObjectId(str(business_id)), "ad_account_id": ad_account_id},
+            {"$set": updates},
+            upsert=True,
+        )
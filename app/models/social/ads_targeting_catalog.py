@@ -0,0 +1,123 @@
+# app/models/social/ads_targeting_catalog.py
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne, IndexModel
+
+from ...extensions.db import db as db_ext
+
+
+class AdsTargetingCatalog:
+    """
+    Locally cached ads targeting options (interests, behaviors, browse tree).
+
+    Collection design:
+      {
+        _id,
+        platform: "facebook",
+        locale: "en_US",
+        kind: "interests"|"behaviors"|"browse",
+        scope: "" | "act_123",          # browse is ad-account specific; search kinds are global
+        item_id: "6003139266461",
+        name: "Technology",
+        path: ["Interests", "Technology"],
+        audience_size_lower_bound, audience_size_upper_bound,
+        raw: {...},                     # item as returned by the API
+        refreshed_at
+      }
+
+    Unique index:
+      (platform, locale, kind, scope, item_id)
+    """
+
+    collection_name = "ads_targeting_catalog"
+
+    _indexes = (
+        IndexModel(
+            [
+                ("platform", ASCENDING),
+                ("locale", ASCENDING),
+                ("kind", ASCENDING),
+                ("scope", ASCENDING),
+                ("item_id", ASCENDING),
+            ],
+            unique=True,
+            name="uniq_targeting_item",
+        ),
+        IndexModel(
+            [
+                ("platform", ASCENDING),
+                ("locale", ASCENDING),
+                ("kind", ASCENDING),
+                ("scope", ASCENDING),
+                ("refreshed_at", DESCENDING),
+            ],
+            name="idx_targeting_refreshed",
+        ),
+    )
+
+    @classmethod
+    def col(cls):
+        return db_ext.get_collection(cls.collection_name)
+
+    @staticmethod
+    def _key(platform: str, locale: str, kind: str, scope: str = "") -> Dict[str, Any]:
+        return {
+            "platform": (platform or "").strip().lower(),
+            "locale": (locale or "").strip(),
+            "kind": (kind or "").strip().lower(),
+            "scope": (scope or "").strip(),
+        }
+
+    @classmethod
+    def upsert_items(
+        cls,
+        *,
+        platform: str,
+        locale: str,
+        kind: str,
+        items: List[Dict[str, Any]],
+        scope: str = "",
+    ) -> int:
+        """
+        Bulk upsert API items (must carry an "id"). Returns number of items written.
+        """
+        key = cls._key(platform, locale, kind, scope)
+        now = datetime.now(timezone.utc)
+
+        ops = []
+        for it in items or []:
+            item_id = str(it.get("id") or "").strip()
+            if not item_id:
+                continue
+            ops.append(
+                UpdateOne(
+                    {**key, "item_id": item_id},
+                    {
+                        "$set": {
+                            "name": it.get("name") or "",
+                            "path": it.get("path") or [],
+                            "audience_size_lower_bound": it.get("audience_size_lower_bound") or it.get("audience_size"),
+                            "audience_size_upper_bound": it.get("audience_size_upper_bound") or it.get("audience_size"),
+                            "raw": it,
+                            "refreshed_at": now,
+                        }
+                    },
+                    upsert=True,
+                )
+            )
+
+        if not ops:
+            return 0
+
+        cls.col().bulk_write(ops, ordered=False)
+        return len(ops)
+
+    @classmethod
+    def list_items(cls, *, platform: str, locale: str, kind: str, scope: str = "") -> List[Dict[str, Any]]:
+        q = cls._key(platform, locale, kind, scope)
+        return list(cls.col().find(q, {"_id": 0, "raw": 1, "item_id": 1, "name": 1, "path": 1,
+                                       "audience_size_lower_bound": 1, "audience_size_upper_bound": 1}))
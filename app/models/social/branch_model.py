@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ...models.base_model import BaseModel
@@ -19,6 +20,21 @@ class Branch(BaseModel):
     """
 
     collection_name = "branches"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("hashed_status", 1), ("display_order", 1)]),
+        IndexModel([("business_id", 1), ("hashed_branch_type", 1)]),
+        IndexModel([("business_id", 1), ("hashed_name", 1)]),
+        IndexModel([("business_id", 1), ("hashed_code", 1)]),
+        IndexModel([("business_id", 1), ("parent_branch_id", 1)]),
+        IndexModel([("business_id", 1), ("region", 1)]),
+        IndexModel([("business_id", 1), ("district", 1)]),
+        IndexModel([("business_id", 1), ("is_headquarters", 1)]),
+        IndexModel([("business_id", 1), ("is_archived", 1)]),
+        IndexModel([("business_id", 1), ("hashed_city", 1)]),
+        IndexModel([("business_id", 1), ("hashed_country", 1)]),
+    )
+
     _permission_module = "branches"
 
     TYPE_MAIN = "Main"
@@ -737,27 +753,3 @@ class Branch(BaseModel):
 
         updates = {k: v for k, v in updates.items() if v is not None}
         return super().update(branch_id, business_id, **updates)
-
-    @classmethod
-    def create_indexes(cls):
-        log_tag = f"[branch_model.py][Branch][create_indexes]"
-        try:
-            collection = db.get_collection(cls.collection_name)
-
-            collection.create_index([("business_id", 1), ("hashed_status", 1), ("display_order", 1)])
-            collection.create_index([("business_id", 1), ("hashed_branch_type", 1)])
-            collection.create_index([("business_id", 1), ("hashed_name", 1)])
-            collection.create_index([("business_id", 1), ("hashed_code", 1)])
-            collection.create_index([("business_id", 1), ("parent_branch_id", 1)])
-            collection.create_index([("business_id", 1), ("region", 1)])
-            collection.create_index([("business_id", 1), ("district", 1)])
-            collection.create_index([("business_id", 1), ("is_headquarters", 1)])
-            collection.create_index([("business_id", 1), ("is_archived", 1)])
-            collection.create_index([("business_id", 1), ("hashed_city", 1)])
-            collection.create_index([("business_id", 1), ("hashed_country", 1)])
-
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}")
-            return False
\ No newline at end of file
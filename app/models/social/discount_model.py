@@ -3,6 +3,7 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ...models.base_model import BaseModel
@@ -30,6 +31,13 @@ class Discount(BaseModel):
     """
 
     collection_name = "discounts"
+
+    _indexes = (
+        IndexModel([("hashed_code", 1)], unique=True),
+        IndexModel([("hashed_status", 1), ("created_at", -1)]),
+        IndexModel([("end_date", 1)]),
+    )
+
     _subscription_exempt = True
     _permission_exempt = True
     _permission_module = "billing"
@@ -547,16 +555,3 @@ class Discount(BaseModel):
         except Exception as e:
             Log.error(f"[Discount.expire_outdated] {e}")
             return 0
-
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("hashed_code", 1)], unique=True)
-            c.create_index([("hashed_status", 1), ("created_at", -1)])
-            c.create_index([("end_date", 1)])
-            Log.info("[Discount.create_indexes] Indexes created")
-            return True
-        except Exception as e:
-            Log.error(f"[Discount.create_indexes] {e}")
-            return False
@@ -3,6 +3,7 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+from pymongo import IndexModel
 from bson import ObjectId
 import uuid
 
@@ -20,6 +21,11 @@ class StorageQuota(BaseModel):
     """
 
     collection_name = "storage_quotas"
+
+    _indexes = (
+        IndexModel([("business_id", 1)], unique=True),
+    )
+
     _permission_module = "storage"
 
     def __init__(self, storage_limit_bytes=None, addon_storage_bytes=0,
@@ -245,21 +251,20 @@ class StorageQuota(BaseModel):
             Log.error(f"[StorageQuota.sync_with_package] {e}")
             return False
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("business_id", 1)], unique=True)
-            return True
-        except Exception:
-            return False
-
 class Form(BaseModel):
     """
     Custom form definition with fields and settings.
     """
 
     collection_name = "forms"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("branch_id", 1), ("hashed_status", 1)]),
+        IndexModel([("business_id", 1), ("slug", 1)], unique=True),
+        IndexModel([("business_id", 1), ("template_type", 1)]),
+        IndexModel([("business_id", 1), ("hashed_title", 1)]),
+    )
+
     _permission_module = "forms"
 
     FIELD_TEXT = "text"
@@ -570,18 +575,6 @@ class Form(BaseModel):
             Log.error(f"[Form.update] {e}")
             return False
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("business_id", 1), ("branch_id", 1), ("hashed_status", 1)])
-            c.create_index([("business_id", 1), ("slug", 1)], unique=True)
-            c.create_index([("business_id", 1), ("template_type", 1)])
-            c.create_index([("business_id", 1), ("hashed_title", 1)])
-            return True
-        except Exception:
-            return False
-
 
 class FormSubmission(BaseModel):
     """
@@ -589,6 +582,13 @@ class FormSubmission(BaseModel):
     """
 
     collection_name = "form_submissions"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("form_id", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("branch_id", 1)]),
+        IndexModel([("business_id", 1), ("member_id", 1)]),
+    )
+
     _permission_module = "forms"
 
     FIELDS_TO_DECRYPT = ["submitter_name", "submitter_email"]
@@ -816,14 +816,3 @@ class FormSubmission(BaseModel):
         except Exception as e:
             Log.error(f"[FormSubmission.get_analytics] {e}")
             return {"total_submissions": 0}
-
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("business_id", 1), ("form_id", 1), ("created_at", -1)])
-            c.create_index([("business_id", 1), ("branch_id", 1)])
-            c.create_index([("business_id", 1), ("member_id", 1)])
-            return True
-        except Exception:
-            return False
\ No newline at end of file
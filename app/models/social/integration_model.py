@@ -3,6 +3,7 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict
+from pymongo import IndexModel
 from bson import ObjectId
 import uuid
 
@@ -23,6 +24,12 @@ class Integration(BaseModel):
     """
 
     collection_name = "integrations"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("branch_id", 1), ("provider", 1)], unique=True),
+        IndexModel([("business_id", 1), ("category", 1), ("hashed_status", 1)]),
+    )
+
     _permission_module = "integrations"
 
     CAT_PAYMENT = "Payment Gateway"
@@ -329,16 +336,6 @@ class Integration(BaseModel):
             })
         return sorted(providers, key=lambda x: (x["category"], x["label"]))
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("business_id", 1), ("branch_id", 1), ("provider", 1)], unique=True)
-            c.create_index([("business_id", 1), ("category", 1), ("hashed_status", 1)])
-            return True
-        except Exception:
-            return False
-
 
 # ═══════════════════════════════════════════════════════════════
 # WEBHOOK
@@ -351,6 +348,12 @@ class Webhook(BaseModel):
     """
 
     collection_name = "webhooks"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("is_active", 1), ("event_types", 1)]),
+        IndexModel([("business_id", 1), ("branch_id", 1)]),
+    )
+
     _permission_module = "integrations"
 
     EVENT_TYPES = [
@@ -531,16 +534,6 @@ class Webhook(BaseModel):
                 updates[oid] = ObjectId(updates[oid])
         return super().update(webhook_id, business_id, **updates)
 
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("business_id", 1), ("is_active", 1), ("event_types", 1)])
-            c.create_index([("business_id", 1), ("branch_id", 1)])
-            return True
-        except Exception:
-            return False
-
 
 # ═══════════════════════════════════════════════════════════════
 # EMBED WIDGET
@@ -553,6 +546,12 @@ class EmbedWidget(BaseModel):
     """
 
     collection_name = "embed_widgets"
+
+    _indexes = (
+        IndexModel([("embed_key", 1)], unique=True),
+        IndexModel([("business_id", 1), ("branch_id", 1), ("widget_type", 1)]),
+    )
+
     _permission_module = "integrations"
 
     WIDGET_TYPES = ["calendar", "giving", "forms", "events", "sermons", "custom"]
@@ -682,13 +681,3 @@ class EmbedWidget(BaseModel):
             if oid in updates and updates[oid]:
                 updates[oid] = ObjectId(updates[oid])
         return super().update(widget_id, business_id, **updates)
-
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("embed_key", 1)], unique=True)
-            c.create_index([("business_id", 1), ("branch_id", 1), ("widget_type", 1)])
-            return True
-        except Exception:
-            return False
\ No newline at end of file
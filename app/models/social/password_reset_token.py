@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from pymongo import IndexModel
 from bson.objectid import ObjectId
 from ...extensions.db import db
 from ...utils.logger import Log
@@ -14,6 +15,13 @@ class PasswordResetToken:
 
     collection_name = "password_reset_tokens"
 
+    _indexes = (
+        IndexModel("hashed_token", unique=True),
+        IndexModel("hashed_email"),
+        IndexModel("expires_at", expireAfterSeconds=0),
+        IndexModel([("business_id", 1), ("created_at", -1)]),
+    )
+
     def __init__(
         self,
         email,
@@ -175,30 +183,3 @@ class PasswordResetToken:
         except Exception as e:
             Log.error(f"{log_tag} Error: {str(e)}", exc_info=True)
             return False
-
-    # ------------------------------------------------------------------
-    # INDEXES
-    # ------------------------------------------------------------------
-    @classmethod
-    def create_indexes(cls):
-        log_tag = "[PasswordResetToken][create_indexes]"
-
-        try:
-            collection = db.get_collection(cls.collection_name)
-
-            collection.create_index("hashed_token", unique=True)
-            collection.create_index("hashed_email")
-            collection.create_index(
-                "expires_at",
-                expireAfterSeconds=0,
-            )
-            collection.create_index(
-                [("business_id", 1), ("created_at", -1)]
-            )
-
-            Log.info(f"{log_tag} Indexes created successfully")
-            return True
-
-        except Exception as e:
-            Log.error(f"{log_tag} Error creating indexes: {str(e)}", exc_info=True)
-            return False
\ No newline at end of file
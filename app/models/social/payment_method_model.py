@@ -3,6 +3,7 @@
 from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ...models.base_model import BaseModel
@@ -28,6 +29,15 @@ class PaymentMethod(BaseModel):
     """
 
     collection_name = "payment_methods"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("is_primary", -1), ("hashed_status", 1)]),
+        IndexModel([("business_id", 1), ("hashed_status", 1), ("reusable", 1)]),
+        IndexModel([("business_id", 1), ("hashed_email", 1)]),
+        # Unique sparse: prevents duplicate cards per business (same Paystack signature)
+        IndexModel([("business_id", 1), ("hashed_signature", 1)], unique=True, sparse=True),
+    )
+
     _subscription_exempt = True  # Users must manage cards even with expired subscription
 
     PROVIDER_PAYSTACK = "paystack"
@@ -659,18 +669,3 @@ class PaymentMethod(BaseModel):
         except Exception as e:
             Log.error(f"[PaymentMethod.get_card_summary] {e}")
             return {"total_cards": 0, "has_primary": False, "primary_card": None, "cards": []}
-
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("business_id", 1), ("is_primary", -1), ("hashed_status", 1)])
-            c.create_index([("business_id", 1), ("hashed_status", 1), ("reusable", 1)])
-            c.create_index([("business_id", 1), ("hashed_email", 1)])
-            # Unique sparse: prevents duplicate cards per business (same Paystack signature)
-            c.create_index([("business_id", 1), ("hashed_signature", 1)], unique=True, sparse=True)
-            Log.info("[PaymentMethod.create_indexes] Indexes created successfully")
-            return True
-        except Exception as e:
-            Log.error(f"[PaymentMethod.create_indexes] {e}")
-            return False
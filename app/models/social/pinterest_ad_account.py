@@ -1,6 +1,7 @@
 # app/models/social/pinterest_ad_account.py
 
 from datetime import datetime, timezone
+from pymongo import IndexModel
 from bson import ObjectId
 from typing import Dict, Any, List, Optional
 
@@ -16,6 +17,11 @@ class PinterestAdAccount(BaseModel):
     """
     
     collection_name = "pinterest_ad_accounts"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("ad_account_id", 1)], unique=True),
+        IndexModel([("business_id", 1), ("status", 1)]),
+    )
     
     STATUS_ACTIVE = "active"
     STATUS_DISABLED = "disabled"
@@ -189,13 +195,6 @@ class PinterestAdAccount(BaseModel):
         })
         return result.deleted_count > 0
 
-    @classmethod
-    def ensure_indexes(cls):
-        col = db_ext.get_collection(cls.collection_name)
-        col.create_index([("business_id", 1), ("ad_account_id", 1)], unique=True)
-        col.create_index([("business_id", 1), ("status", 1)])
-        return True
-
 
 class PinterestAdCampaign(BaseModel):
     """
@@ -203,6 +202,12 @@ class PinterestAdCampaign(BaseModel):
     """
     
     collection_name = "pinterest_ad_campaigns"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("status", 1), ("created_at", -1)]),
+        IndexModel([("business_id", 1), ("ad_account_id", 1)]),
+        IndexModel([("pinterest_campaign_id", 1)]),
+    )
     
     STATUS_DRAFT = "draft"
     STATUS_PENDING = "pending"
@@ -445,11 +450,3 @@ class PinterestAdCampaign(BaseModel):
     @classmethod
     def update_results(cls, campaign_id: str, business_id: str, results: dict) -> bool:
         return cls.update(campaign_id, business_id, {"results": results})
-
-    @classmethod
-    def ensure_indexes(cls):
-        col = db_ext.get_collection(cls.collection_name)
-        col.create_index([("business_id", 1), ("status", 1), ("created_at", -1)])
-        col.create_index([("business_id", 1), ("ad_account_id", 1)])
-        col.create_index([("pinterest_campaign_id", 1)])
-        return True
\ No newline at end of file
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ...models.base_model import BaseModel
@@ -14,6 +15,11 @@ class ProviderSetting(BaseModel):
     """
 
     collection_name = "business_provider_settings"
+
+    _indexes = (
+        IndexModel([("business_id", 1), ("branch_id", 1)], unique=True),
+    )
+
     _permission_module = "integrations"
 
     SUPPORTED_KEYS = [
@@ -183,13 +189,3 @@ class ProviderSetting(BaseModel):
         except Exception as e:
             Log.error(f"[ProviderSetting.clear_defaults] {e}")
             return None
-
-    @classmethod
-    def create_indexes(cls):
-        try:
-            c = db.get_collection(cls.collection_name)
-            c.create_index([("business_id", 1), ("branch_id", 1)], unique=True)
-            return True
-        except Exception as e:
-            Log.error(f"[ProviderSetting.create_indexes] {e}")
-            return False
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, IndexModel
 from typing import Optional, Dict, Any, List, Union
 
 from ..base_model import BaseModel
@@ -10,9 +10,33 @@ from ...extensions import db as db_ext
 from ...utils.logger import Log
 
 
+# Canonical per-post metrics stored on provider_results[].metrics
+POST_METRIC_KEYS = [
+    "impressions",
+    "reach",
+    "engagements",
+    "clicks",
+    "likes",
+    "comments",
+    "shares",
+    "reactions",
+]
+
+
 class ScheduledPost(BaseModel):
     collection_name = "scheduled_posts"
 
+    _indexes = (
+        # scheduler reads
+        IndexModel([("status", 1), ("scheduled_at_utc", 1)]),
+        # listing per tenant/user
+        IndexModel([("business_id", 1), ("user__id", 1), ("created_at", -1)]),
+        # optional: faster multi-destination queries later
+        IndexModel([("business_id", 1), ("status", 1), ("scheduled_at_utc", 1)]),
+        # per-post metrics write-through (record_provider_metrics)
+        IndexModel([("business_id", 1), ("provider_results.provider_post_id", 1)]),
+    )
+
     STATUS_DRAFT = "draft"
     STATUS_SCHEDULED = "scheduled"
     STATUS_ENQUEUED = "enqueued"
@@ -273,6 +297,40 @@ class ScheduledPost(BaseModel):
         )
         return res.modified_count > 0
 
+    @classmethod
+    def record_provider_metrics(
+        cls,
+        *,
+        business_id: str,
+        platform: str,
+        provider_post_id: str,
+        metrics: Dict[str, Any],
+    ) -> bool:
+        """
+        Store the latest canonical metrics on the matching provider_results entry.
+        Unknown keys are dropped; posts not published through us match nothing.
+        """
+        clean = {k: metrics[k] for k in POST_METRIC_KEYS if metrics.get(k) is not None}
+        if not clean or not provider_post_id:
+            return False
+
+        col = db_ext.get_collection(cls.collection_name)
+        res = col.update_one(
+            {
+                "business_id": ObjectId(str(business_id)),
+                "provider_results": {
+                    "$elemMatch": {"platform": platform, "provider_post_id": str(provider_post_id)}
+                },
+            },
+            {
+                "$set": {
+                    "provider_results.$.metrics": clean,
+                    "provider_results.$.metrics_updated_at": datetime.now(timezone.utc),
+                }
+            },
+        )
+        return res.modified_count > 0
+
     # ----------------------------------------
     # LIST BY BUSINESS
     # ----------------------------------------
@@ -534,17 +592,4 @@ class ScheduledPost(BaseModel):
 
         return cls.update_fields(post_id, business_id, extra)
     
-    
-    @classmethod
-    def ensure_indexes(cls):
-        col = db_ext.get_collection(cls.collection_name)
-
-        # scheduler reads
-        col.create_index([("status", 1), ("scheduled_at_utc", 1)])
-
-        # listing per tenant/user
-        col.create_index([("business_id", 1), ("user__id", 1), ("created_at", -1)])
-
-        # optional: faster multi-destination queries later
-        col.create_index([("business_id", 1), ("status", 1), ("scheduled_at_utc", 1)])
-        return True
\ No newline at end of file
+    
\ No newline at end of file
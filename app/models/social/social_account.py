@@ -1,6 +1,7 @@
 #app/models/social/social_account.py
 
 from datetime import datetime
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ..base_model import BaseModel
@@ -29,6 +30,14 @@ class SocialAccount(BaseModel):
 
     collection_name = "social_accounts"
 
+    _indexes = (
+        IndexModel(
+            [("business_id", 1), ("user__id", 1), ("platform", 1), ("destination_id", 1)],
+            unique=True,
+        ),
+        IndexModel([("business_id", 1), ("user__id", 1), ("platform", 1), ("created_at", -1)]),
+    )
+
     def __init__(
         self,
         business_id,
@@ -333,14 +342,4 @@ class SocialAccount(BaseModel):
         except Exception:
             return False
     
-    @classmethod
-    def ensure_indexes(cls):
-        col = db_ext.get_collection(cls.collection_name)
-        col.create_index(
-            [("business_id", 1), ("user__id", 1), ("platform", 1), ("destination_id", 1)],
-            unique=True
-        )
-        col.create_index([("business_id", 1), ("user__id", 1), ("platform", 1), ("created_at", -1)])
-        return True
-    
     
\ No newline at end of file
@@ -0,0 +1,109 @@
+# app/models/social/social_analytics_export.py
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from ...extensions.db import db as db_ext
+
+
+class SocialAnalyticsExport:
+    """
+    Background analytics export jobs (large ranges).
+
+    Collection: social_analytics_exports
+      {
+        _id,
+        business_id: ObjectId,
+        user__id: ObjectId,
+        dataset: "snapshots"|"posts",
+        file_format: "csv"|"xlsx",
+        since_ymd, until_ymd,
+        status: "queued"|"running"|"done"|"failed",
+        rows: 123,
+        url: None,                   # unused: exports are private objects
+        public_id: "exports/...",    # signed into a short-lived link on status reads
+        error: None,
+        created_at, updated_at, finished_at
+      }
+    """
+
+    collection_name = "social_analytics_exports"
+
+    _indexes = (
+        IndexModel(
+            [("business_id", ASCENDING), ("user__id", ASCENDING), ("created_at", DESCENDING)],
+            name="idx_export_owner_created",
+        ),
+    )
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    @classmethod
+    def col(cls):
+        return db_ext.get_collection(cls.collection_name)
+
+    @staticmethod
+    def _normalize(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not doc:
+            return None
+        doc["_id"] = str(doc["_id"])
+        doc["business_id"] = str(doc["business_id"])
+        doc["user__id"] = str(doc["user__id"])
+        return doc
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        business_id: str,
+        user__id: str,
+        dataset: str,
+        file_format: str,
+        since_ymd: str,
+        until_ymd: str,
+    ) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        doc = {
+            "business_id": ObjectId(str(business_id)),
+            "user__id": ObjectId(str(user__id)),
+            "dataset": dataset,
+            "file_format": file_format,
+            "since_ymd": since_ymd,
+            "until_ymd": until_ymd,
+            "status": cls.STATUS_QUEUED,
+            "rows": 0,
+            "url": None,
+            "public_id": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        }
+        res = cls.col().insert_one(doc)
+        doc["_id"] = res.inserted_id
+        return cls._normalize(doc)
+
+    @classmethod
+    def get_by_id(cls, export_id: str, business_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(str(export_id)):
+            return None
+        q: Dict[str, Any] = {"_id": ObjectId(str(export_id))}
+        if business_id:
+            q["business_id"] = ObjectId(str(business_id))
+        return cls._normalize(cls.col().find_one(q))
+
+    @classmethod
+    def update_status(cls, export_id: str, status: str, **extra) -> None:
+        now = datetime.now(timezone.utc)
+        updates = {"status": status, "updated_at": now, **extra}
+        if status in (cls.STATUS_DONE, cls.STATUS_FAILED):
+            updates["finished_at"] = now
+        cls.col().update_one({"_id": ObjectId(str(export_id))}, {"$set": updates})
@@ -2,6 +2,7 @@
 
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
+from pymongo import IndexModel
 from bson import ObjectId
 
 from ...extensions.db import db
@@ -18,6 +19,13 @@ class SocialAuth:
     """
     
     collection_name = "social_auth"
+
+    _indexes = (
+        IndexModel("provider_user_id_hashed", unique=True),
+        IndexModel([("provider", 1), ("email_hashed", 1)]),
+        IndexModel([("business_id", 1), ("user__id", 1)]),
+        IndexModel([("business_id", 1), ("user__id", 1), ("provider", 1)]),
+    )
     
     # Supported providers
     PROVIDER_FACEBOOK = "facebook"
@@ -296,15 +304,4 @@ class SocialAuth:
         )
         
         return result.modified_count > 0
-    
-    @classmethod
-    def ensure_indexes(cls):
-        """Create indexes for efficient queries."""
-        col = db.get_collection(cls.collection_name)
-        
-        col.create_index("provider_user_id_hashed", unique=True)
-        col.create_index([("provider", 1), ("email_hashed", 1)])
-        col.create_index([("business_id", 1), ("user__id", 1)])
-        col.create_index([("business_id", 1), ("user__id", 1), ("provider", 1)])
-        
-        return True
\ No newline at end of file
+    
\ No newline at end of file
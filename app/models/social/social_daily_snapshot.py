@@ -6,9 +6,10 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
 from bson import ObjectId
-from pymongo import ASCENDING, DESCENDING
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, IndexModel
 
 from ...extensions.db import db as db_ext
+from .social_snapshot_rollup import SocialSnapshotRollup, SUM_KEYS as ROLLUP_SUM_KEYS
 
 
 CANON_KEYS = [
@@ -81,19 +82,16 @@ class SocialDailySnapshot:
 
     Unique index:
       (business_id, user__id, platform, destination_id, date_ymd)
+
+    Every upsert also folds the day into SocialSnapshotRollup (week/month/quarter),
+    so long-range reads do not have to scan day rows.
     """
 
     collection_name = "social_daily_snapshots"
 
-    @classmethod
-    def col(cls):
-        return db_ext.get_collection(cls.collection_name)
-
-    @classmethod
-    def ensure_indexes(cls):
-        c = cls.col()
+    _indexes = (
         # Unique per-day snapshot per destination
-        c.create_index(
+        IndexModel(
             [
                 ("business_id", ASCENDING),
                 ("user__id", ASCENDING),
@@ -103,9 +101,9 @@ class SocialDailySnapshot:
             ],
             unique=True,
             name="uniq_daily_snapshot",
-        )
+        ),
         # For range queries
-        c.create_index(
+        IndexModel(
             [
                 ("business_id", ASCENDING),
                 ("user__id", ASCENDING),
@@ -114,7 +112,17 @@ class SocialDailySnapshot:
                 ("date_ymd", DESCENDING),
             ],
             name="idx_daily_snapshot_range",
-        )
+        ),
+        # For cross-destination range scans (analytics export)
+        IndexModel(
+            [("business_id", ASCENDING), ("user__id", ASCENDING), ("date_ymd", ASCENDING)],
+            name="idx_daily_snapshot_owner_date",
+        ),
+    )
+
+    @classmethod
+    def col(cls, read=None):
+        return db_ext.get_collection(cls.collection_name, read=read)
 
     @classmethod
     def upsert_snapshot(
@@ -129,7 +137,7 @@ class SocialDailySnapshot:
         meta: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
-        Upsert a day snapshot.
+        Upsert a day snapshot and apply the change to its rollups.
         """
         c = cls.col()
 
@@ -154,15 +162,35 @@ class SocialDailySnapshot:
                 "meta": meta or {},
                 "updated_at": now,
             },
-            "$setOnInsert": {"created_at": now},
+            # own _id so the BEFORE image below can still report it on insert
+            "$setOnInsert": {"_id": ObjectId(), "created_at": now},
         }
 
-        res = c.update_one(q, upd, upsert=True)
+        # BEFORE image lets rollups be maintained with $inc deltas (no day re-reads)
+        before = c.find_one_and_update(
+            q,
+            upd,
+            upsert=True,
+            projection={"data": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+        prev_data = (before or {}).get("data") or {}
+
+        SocialSnapshotRollup.apply_day_delta(
+            business_id=bid,
+            user__id=uid,
+            platform=q["platform"],
+            destination_id=q["destination_id"],
+            date_ymd=q["date_ymd"],
+            delta={k: doc_data[k] - _num(prev_data.get(k)) for k in ROLLUP_SUM_KEYS},
+            followers=doc_data["followers"],
+            is_new_day=before is None,
+        )
 
         return {
-            "matched": res.matched_count,
-            "modified": res.modified_count,
-            "upserted_id": str(res.upserted_id) if res.upserted_id else None,
+            "matched": 0 if before is None else 1,
+            "modified": 0 if before is None else 1,
+            "upserted_id": str(upd["$setOnInsert"]["_id"]) if before is None else None,
         }
 
     @classmethod
@@ -200,6 +228,55 @@ class SocialDailySnapshot:
             x["user__id"] = str(x["user__id"])
         return items
 
+    @classmethod
+    def updated_since(
+        cls,
+        *,
+        business_id: str,
+        user__id: str,
+        platform: str,
+        destination_id: str,
+        since: datetime,
+    ) -> bool:
+        """
+        True when any day row of the destination was written at or after `since`.
+        """
+        q = {
+            "business_id": _as_oid(business_id),
+            "user__id": _as_oid(user__id),
+            "platform": (platform or "").strip().lower(),
+            "destination_id": str(destination_id or "").strip(),
+            "updated_at": {"$gte": since},
+        }
+        return cls.col().find_one(q, {"_id": 1}) is not None
+
+    @classmethod
+    def get_dates(
+        cls,
+        *,
+        business_id: str,
+        user__id: str,
+        platform: str,
+        destination_id: str,
+        dates_ymd: List[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the snapshots for an explicit list of days, ascending by date.
+        Used by rollup reads to fill partial periods at the edges of a range.
+        """
+        if not dates_ymd:
+            return []
+
+        c = cls.col()
+        q = {
+            "business_id": _as_oid(business_id),
+            "user__id": _as_oid(user__id),
+            "platform": (platform or "").strip().lower(),
+            "destination_id": str(destination_id or "").strip(),
+            "date_ymd": {"$in": list(dates_ymd)},
+        }
+        return list(c.find(q, {"_id": 0, "date_ymd": 1, "data": 1}).sort("date_ymd", ASCENDING))
+
     @classmethod
     def latest(
         cls,
@@ -0,0 +1,357 @@
+# app/models/social/social_snapshot_rollup.py
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, UpdateOne, IndexModel
+
+from ...extensions.db import db as db_ext
+
+
+# Granularities, finest -> coarsest (day rows live in social_daily_snapshots)
+GRANULARITIES = ["week", "month", "quarter"]
+
+# Delta-type metrics are summed into a rollup.
+# "followers" is a point-in-time value: a rollup keeps the latest one inside the period.
+SUM_KEYS = [
+    "new_followers",
+    "posts",
+    "impressions",
+    "engagements",
+    "likes",
+    "comments",
+    "shares",
+    "reactions",
+]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_oid(x: Any) -> Any:
+    try:
+        if isinstance(x, ObjectId):
+            return x
+        if isinstance(x, str) and ObjectId.is_valid(x):
+            return ObjectId(x)
+    except Exception:
+        pass
+    return x
+
+
+def _to_date(ymd: str) -> date:
+    return datetime.strptime(ymd, "%Y-%m-%d").date()
+
+
+def _ymd(d: date) -> str:
+    return d.strftime("%Y-%m-%d")
+
+
+# -----------------------------
+# Period helpers
+# -----------------------------
+def period_bounds(granularity: str, d: date) -> Tuple[date, date]:
+    """
+    Returns (start, end) of the period containing `d` (both inclusive).
+      - week: ISO week (Monday -> Sunday)
+      - month: calendar month
+      - quarter: calendar quarter
+    """
+    if granularity == "day":
+        return d, d
+
+    if granularity == "week":
+        start = d - timedelta(days=d.weekday())
+        return start, start + timedelta(days=6)
+
+    if granularity == "month":
+        start = d.replace(day=1)
+    elif granularity == "quarter":
+        start = d.replace(month=((d.month - 1) // 3) * 3 + 1, day=1)
+    else:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    months = 1 if granularity == "month" else 3
+    y, m = divmod(start.month - 1 + months, 12)
+    next_start = start.replace(year=start.year + y, month=m + 1)
+    return start, next_start - timedelta(days=1)
+
+
+def finer_granularities(granularity: str) -> List[str]:
+    """
+    Granularities strictly finer than `granularity`, coarsest first (ends with "day").
+    """
+    if granularity == "day":
+        return []
+    idx = GRANULARITIES.index(granularity)
+    return list(reversed(GRANULARITIES[:idx])) + ["day"]
+
+
+def decompose_range(since: date, until: date, granularities: Iterable[str]) -> List[Tuple[str, date, date]]:
+    """
+    Covers [since, until] with the coarsest whole periods that fit, then fills the
+    gaps left at the edges with the next finer granularity (and finally single days).
+
+    Returns [(granularity, period_start, period_end), ...] in date order.
+    """
+    order = [g for g in granularities if g != "day"]
+
+    if since > until:
+        return []
+
+    if not order:
+        out = []
+        cur = since
+        while cur <= until:
+            out.append(("day", cur, cur))
+            cur += timedelta(days=1)
+        return out
+
+    g, finer = order[0], order[1:]
+
+    # first whole period starting on/after `since`
+    start, end = period_bounds(g, since)
+    if start != since:
+        start = end + timedelta(days=1)
+
+    whole: List[Tuple[str, date, date]] = []
+    cur = start
+    while True:
+        p_start, p_end = period_bounds(g, cur)
+        if p_end > until:
+            break
+        whole.append((g, p_start, p_end))
+        cur = p_end + timedelta(days=1)
+
+    if not whole:
+        return decompose_range(since, until, finer)
+
+    head = decompose_range(since, whole[0][1] - timedelta(days=1), finer)
+    tail = decompose_range(whole[-1][2] + timedelta(days=1), until, finer)
+    return head + whole + tail
+
+
+class SocialSnapshotRollup:
+    """
+    Incrementally maintained week/month/quarter rollups of social_daily_snapshots.
+
+    Collection design:
+      {
+        _id,
+        business_id: ObjectId,
+        user__id: ObjectId,
+        platform: "facebook"|"instagram"|...,
+        destination_id: "12345",
+        granularity: "week"|"month"|"quarter",
+        period_start: "2026-02-02",
+        period_end: "2026-02-08",
+        days: 7,                          # number of day snapshots folded in
+        data: { new_followers, posts, impressions, engagements, likes, comments, shares, reactions },
+        followers: 1234,                  # latest follower snapshot inside the period
+        followers_date: "2026-02-08",
+        created_at,
+        updated_at
+      }
+
+    Unique index:
+      (business_id, user__id, platform, destination_id, granularity, period_start)
+
+    Maintenance:
+      SocialDailySnapshot.upsert_snapshot() calls apply_day_delta() with the
+      difference between the new and the previous day values, so rollups never
+      need to re-read day rows.
+    """
+
+    collection_name = "social_snapshot_rollups"
+
+    _indexes = (
+        IndexModel(
+            [
+                ("business_id", ASCENDING),
+                ("user__id", ASCENDING),
+                ("platform", ASCENDING),
+                ("destination_id", ASCENDING),
+                ("granularity", ASCENDING),
+                ("period_start", ASCENDING),
+            ],
+            unique=True,
+            name="uniq_snapshot_rollup",
+        ),
+    )
+
+    @classmethod
+    def col(cls, read=None):
+        return db_ext.get_collection(cls.collection_name, read=read)
+
+    @staticmethod
+    def _key(
+        *,
+        business_id: Any,
+        user__id: Any,
+        platform: str,
+        destination_id: str,
+    ) -> Dict[str, Any]:
+        return {
+            "business_id": _as_oid(business_id),
+            "user__id": _as_oid(user__id),
+            "platform": (platform or "").strip().lower(),
+            "destination_id": str(destination_id or "").strip(),
+        }
+
+    @classmethod
+    def apply_day_delta(
+        cls,
+        *,
+        business_id: Any,
+        user__id: Any,
+        platform: str,
+        destination_id: str,
+        date_ymd: str,
+        delta: Dict[str, float],
+        followers: float,
+        is_new_day: bool,
+    ) -> None:
+        """
+        Fold one day write into every rollup granularity with a single bulk_write.
+
+        - delta: new - previous values of SUM_KEYS for that day
+        - followers: the day's follower snapshot (kept if it is the latest in the period)
+        - is_new_day: True when the day row was inserted (not replaced)
+        """
+        d = _to_date(date_ymd)
+        key = cls._key(
+            business_id=business_id,
+            user__id=user__id,
+            platform=platform,
+            destination_id=destination_id,
+        )
+        now = _utcnow()
+
+        inc = {f"data.{k}": float(delta.get(k) or 0.0) for k in SUM_KEYS if delta.get(k)}
+        if is_new_day:
+            inc["days"] = 1
+
+        ops: List[UpdateOne] = []
+        for g in GRANULARITIES:
+            start, end = period_bounds(g, d)
+            q = {**key, "granularity": g, "period_start": _ymd(start)}
+
+            upd: Dict[str, Any] = {
+                "$set": {"updated_at": now},
+                "$setOnInsert": {
+                    "period_end": _ymd(end),
+                    "followers": 0.0,
+                    "followers_date": "",
+                    "created_at": now,
+                },
+            }
+            if inc:
+                upd["$inc"] = inc
+            ops.append(UpdateOne(q, upd, upsert=True))
+
+            # followers: only overwrite when this day is the latest one seen for the period
+            ops.append(
+                UpdateOne(
+                    {**q, "followers_date": {"$lte": date_ymd}},
+                    {"$set": {"followers": float(followers or 0.0), "followers_date": date_ymd}},
+                )
+            )
+
+        cls.col().bulk_write(ops, ordered=True)
+
+    @classmethod
+    def get_periods(
+        cls,
+        *,
+        business_id: str,
+        user__id: str,
+        platform: str,
+        destination_id: str,
+        granularity: str,
+        period_starts: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns {period_start: rollup_doc} for the requested periods.
+        """
+        if not period_starts:
+            return {}
+
+        q = {
+            **cls._key(
+                business_id=business_id,
+                user__id=user__id,
+                platform=platform,
+                destination_id=destination_id,
+            ),
+            "granularity": granularity,
+            "period_start": {"$in": list(period_starts)},
+        }
+        projection = {"_id": 0, "period_start": 1, "period_end": 1, "days": 1, "data": 1, "followers": 1, "followers_date": 1}
+        return {doc["period_start"]: doc for doc in cls.col().find(q, projection)}
+
+    @classmethod
+    def replace_for_destination(
+        cls,
+        *,
+        business_id: str,
+        user__id: str,
+        platform: str,
+        destination_id: str,
+        days: Iterable[Dict[str, Any]],
+    ) -> int:
+        """
+        Rewrite every rollup of one destination from its day rows ({date_ymd, data}).
+
+        Each period is recomputed in memory and written with $set (upsert), so
+        readers never see an empty or half-refilled destination; periods left
+        without any day rows are deleted afterwards. Returns periods written.
+        """
+        key = cls._key(
+            business_id=business_id,
+            user__id=user__id,
+            platform=platform,
+            destination_id=destination_id,
+        )
+        now = _utcnow()
+
+        periods: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for r in days:
+            ymd = r.get("date_ymd")
+            data = r.get("data") or {}
+            d = _to_date(ymd)
+            for g in GRANULARITIES:
+                start, end = period_bounds(g, d)
+                p = periods.setdefault((g, _ymd(start)), {
+                    "period_end": _ymd(end),
+                    "days": 0,
+                    "data": {k: 0.0 for k in SUM_KEYS},
+                    "followers": 0.0,
+                    "followers_date": "",
+                })
+                p["days"] += 1
+                for k in SUM_KEYS:
+                    p["data"][k] += float(data.get(k) or 0.0)
+                if ymd >= p["followers_date"]:
+                    p["followers"] = float(data.get("followers") or 0.0)
+                    p["followers_date"] = ymd
+
+        ops = [
+            UpdateOne(
+                {**key, "granularity": g, "period_start": start},
+                {"$set": {**p, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+                upsert=True,
+            )
+            for (g, start), p in periods.items()
+        ]
+        if ops:
+            cls.col().bulk_write(ops, ordered=False)
+
+        for g in GRANULARITIES:
+            keep = [start for (pg, start) in periods if pg == g]
+            cls.col().delete_many({**key, "granularity": g, "period_start": {"$nin": keep}})
+
+        return len(ops)
@@ -1,8 +1,10 @@
 from bson.objectid import ObjectId
 import os
+from pymongo import IndexModel
 from datetime import datetime, timedelta
 from app.extensions.db import db
 from ..models.base_model import BaseModel
+from ..utils import pagination
 
 def _prune_empty(value):
         """
@@ -38,6 +40,19 @@ class Transaction(BaseModel):
 
     collection_name = "transactions"
 
+    # Listing keysets: (filter, created_at desc, _id desc)
+    _indexes = (
+        IndexModel([("user_id", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("agent_id", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("sender_id", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("business_id", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("business_id", 1), ("agent_id", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("business_id", 1), ("sender_id", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("business_id", 1), ("account", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("business_id", 1), ("senderId", 1), ("created_at", -1), ("_id", -1)]),
+        IndexModel([("business_id", 1), ("receiverId", 1), ("created_at", -1), ("_id", -1)]),
+    )
+
     def __init__(self, tenant_id, business_id=None, user_id=None, user__id=None, beneficiary_id=None, beneficiary_account=None,
                  sender_id=None, senderId=None,receiverId=None, agent_id=None, is_external_partner=False, payment_mode=None, 
                  billpay_id=None, sender_account=None, pin_number=None, extr_id=None, receiver_country=None, system_reference=None, 
@@ -322,8 +337,41 @@ class Transaction(BaseModel):
             print(f"Error occurred: {e}")
             return False
 
+    # newest first; (created_at, _id) is also the keyset for cursor pages
+    LISTING_SORT = [("created_at", -1), ("_id", -1)]
+
     @classmethod
-    def get_by_user_id(cls, user_id, page=1, per_page=10):
+    def _listing_page(cls, query, page, per_page, cursor=None, count=None):
+        """
+        Rows + paging fields for a listing.
+
+        cursor is None -> page-number mode, unchanged:
+            total_count, total_pages, current_page, per_page
+        cursor given ("" = first page) -> keyset mode over LISTING_SORT:
+            per_page, next_cursor, has_more (+ total_count if count is
+            "exact" or "estimate"); raises pagination.InvalidCursor
+        """
+        transaction_collection = db.get_collection(cls.collection_name, read="listings")
+
+        if cursor is None:
+            total_count = transaction_collection.count_documents(query)
+            rows = transaction_collection.find(query).skip((page - 1) * per_page).limit(per_page)
+            return rows, {
+                "total_count": total_count,
+                "total_pages": (total_count + per_page - 1) // per_page,
+                "current_page": page,
+                "per_page": per_page,
+            }
+
+        data = pagination.keyset_page(
+            transaction_collection, query,
+            sort_spec=cls.LISTING_SORT, per_page=per_page,
+            cursor=cursor, count_mode=count or pagination.COUNT_NONE,
+        )
+        return data.pop("items"), data
+
+    @classmethod
+    def get_by_user_id(cls, user_id, page=1, per_page=10, cursor=None, count=None):
         if isinstance(user_id, str):
             try:
                 user_id = ObjectId(user_id)
@@ -336,10 +384,7 @@ class Transaction(BaseModel):
         page = int(page) if page else int(default_page)
         per_page = int(per_page) if per_page else int(default_per_page)
         
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find({"user_id": user_id})
-        total_count = transaction_collection.count_documents({"user_id": user_id})
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page({"user_id": user_id}, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -351,15 +396,7 @@ class Transaction(BaseModel):
             transaction["agent_id"] = str(transaction.get("agent_id")) if transaction.get("agent_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
     @classmethod
     def update(cls, transaction_id, processing_callback=False, **updates):
@@ -462,7 +499,7 @@ class Transaction(BaseModel):
         return data
 
     @classmethod
-    def get_by_agent_id(cls, agent_id, page=1, per_page=10):
+    def get_by_agent_id(cls, agent_id, page=1, per_page=10, cursor=None, count=None):
         if isinstance(agent_id, str):
             try:
                 agent_id = ObjectId(agent_id)
@@ -475,10 +512,7 @@ class Transaction(BaseModel):
         page = int(page) if page else int(default_page)
         per_page = int(per_page) if per_page else int(default_per_page)
 
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find({"agent_id": agent_id})
-        total_count = transaction_collection.count_documents({"agent_id": agent_id})
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page({"agent_id": agent_id}, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -490,18 +524,10 @@ class Transaction(BaseModel):
             transaction["agent_id"] = str(transaction.get("agent_id")) if transaction.get("agent_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
     @classmethod
-    def get_by_sender_id(cls, sender_id, page=1, per_page=10):
+    def get_by_sender_id(cls, sender_id, page=1, per_page=10, cursor=None, count=None):
         if isinstance(sender_id, str):
             try:
                 sender_id = ObjectId(sender_id)
@@ -514,10 +540,7 @@ class Transaction(BaseModel):
         page = int(page) if page else int(default_page)
         per_page = int(per_page) if per_page else int(default_per_page)
 
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find({"sender_id": sender_id})
-        total_count = transaction_collection.count_documents({"sender_id": sender_id})
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page({"sender_id": sender_id}, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -530,15 +553,7 @@ class Transaction(BaseModel):
             transaction["sender_id"] = str(transaction.get("sender_id")) if transaction.get("sender_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
     @classmethod
     def get_by_pin_number(cls, pin_number):
@@ -570,7 +585,9 @@ class Transaction(BaseModel):
         per_page=10,
         start_date=None,
         end_date=None,
-        partner_name=None
+        partner_name=None,
+        cursor=None,
+        count=None
     ):
         if isinstance(business_id, str):
             try:
@@ -628,27 +645,17 @@ class Transaction(BaseModel):
         if partner_name:
             query["partner_name"] = partner_name
 
-        col = db.get_collection(cls.collection_name)
-        cursor = col.find(query)
-        total_count = col.count_documents(query)
-        cursor = cursor.skip((page - 1) * per_page).limit(per_page)
+        rows, page_info = cls._listing_page(query, page, per_page, cursor=cursor, count=count)
 
         result = []
-        for doc in cursor:
+        for doc in rows:
             doc["_id"] = str(doc.get("_id"))
             for f in ["business_id", "user_id", "user__id", "beneficiary_id", "agent_id", "sender_id"]:
                 if doc.get(f):
                     doc[f] = str(doc[f])
             result.append(doc)
 
-        total_pages = (total_count + per_page - 1) // per_page
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
   
     @classmethod
@@ -659,7 +666,9 @@ class Transaction(BaseModel):
         page=1,
         per_page=10,
         start_date=None,
-        end_date=None
+        end_date=None,
+        cursor=None,
+        count=None
     ):
         if not business_id or not agent_id:
             raise ValueError("Both business_id and agent_id are required.")
@@ -700,10 +709,7 @@ class Transaction(BaseModel):
         if date_filter:
             query["created_at"] = date_filter  # Use your actual date field name if different
 
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find(query)
-        total_count = transaction_collection.count_documents(query)
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page(query, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -716,15 +722,7 @@ class Transaction(BaseModel):
             transaction["sender_id"] = str(transaction.get("sender_id")) if transaction.get("sender_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
         
     @classmethod
     def get_by_business_id_and_sender_id(
@@ -734,7 +732,9 @@ class Transaction(BaseModel):
         page=1,
         per_page=10,
         start_date=None,
-        end_date=None
+        end_date=None,
+        cursor=None,
+        count=None
     ):
         if not business_id or not sender_id:
             raise ValueError("Both business_id and sender_id are required.")
@@ -775,10 +775,7 @@ class Transaction(BaseModel):
         if date_filter:
             query["created_at"] = date_filter  # Use your actual date field name if different
 
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find(query)
-        total_count = transaction_collection.count_documents(query)
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page(query, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -791,15 +788,7 @@ class Transaction(BaseModel):
             transaction["sender_id"] = str(transaction.get("sender_id")) if transaction.get("sender_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
     @classmethod
     def get_by_business_id_and_pin_number(cls, business_id, pin_number):
@@ -907,7 +896,9 @@ class Transaction(BaseModel):
         page=1,
         per_page=10,
         start_date=None,
-        end_date=None
+        end_date=None,
+        cursor=None,
+        count=None
     ):
         if not business_id or not account:
             raise ValueError("Both business_id and account are required.")
@@ -944,10 +935,7 @@ class Transaction(BaseModel):
         if date_filter:
             query["created_at"] = date_filter
 
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find(query)
-        total_count = transaction_collection.count_documents(query)
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page(query, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -961,15 +949,7 @@ class Transaction(BaseModel):
             transaction["agent_id"] = str(transaction.get("agent_id")) if transaction.get("agent_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
     @classmethod
     def search_by_business_id_and_senderId(
@@ -979,7 +959,9 @@ class Transaction(BaseModel):
         page=1,
         per_page=10,
         start_date=None,
-        end_date=None
+        end_date=None,
+        cursor=None,
+        count=None
     ):
         if not business_id or not sender_id:
             raise ValueError("Both business_id and sender_id are required.")
@@ -1016,10 +998,7 @@ class Transaction(BaseModel):
         if date_filter:
             query["created_at"] = date_filter
 
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find(query)
-        total_count = transaction_collection.count_documents(query)
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page(query, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -1033,15 +1012,7 @@ class Transaction(BaseModel):
             transaction["agent_id"] = str(transaction.get("agent_id")) if transaction.get("agent_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
     @classmethod
     def get_by_business_id_and_receiverId(
@@ -1051,7 +1022,9 @@ class Transaction(BaseModel):
         page=1,
         per_page=10,
         start_date=None,
-        end_date=None
+        end_date=None,
+        cursor=None,
+        count=None
     ):
         if not business_id or not receiverId:
             raise ValueError("Both business_id and receiverId are required.")
@@ -1088,10 +1061,7 @@ class Transaction(BaseModel):
         if date_filter:
             query["created_at"] = date_filter
 
-        transaction_collection = db.get_collection(cls.collection_name)
-        transactions_cursor = transaction_collection.find(query)
-        total_count = transaction_collection.count_documents(query)
-        transactions_cursor = transactions_cursor.skip((page - 1) * per_page).limit(per_page)
+        transactions_cursor, page_info = cls._listing_page(query, page, per_page, cursor=cursor, count=count)
 
         result = []
         for transaction in transactions_cursor:
@@ -1106,15 +1076,7 @@ class Transaction(BaseModel):
             transaction["agent_id"] = str(transaction.get("agent_id")) if transaction.get("agent_id") else None
             result.append(transaction)
 
-        total_pages = (total_count + per_page - 1) // per_page
-
-        return {
-            "transactions": result,
-            "total_count": total_count,
-            "total_pages": total_pages,
-            "current_page": page,
-            "per_page": per_page
-        }
+        return {"transactions": result, **page_info}
 
     @classmethod
     def transaction_summary_by_business(cls, business_id, partner_name=None):
@@ -1140,7 +1102,7 @@ class Transaction(BaseModel):
 
         partner_name = _normalize_partner(partner_name)
 
-        transaction_collection = db.get_collection(cls.collection_name)
+        transaction_collection = db.get_collection(cls.collection_name, read="listings")
 
         now = datetime.now()
         start_today = datetime(now.year, now.month, now.day)
@@ -6,6 +6,7 @@ from ..utils.logger import Log  # import logging
 from ..utils.generators import generate_promo_code, generate_agent_id
 from ..utils.crypt import encrypt_data, decrypt_data, hash_data
 from ..models.base_model import BaseModel
+from ..utils import principal_cache
 
 ENCRYPT_AT_REST = {"status"}
 
@@ -281,6 +282,12 @@ class User(BaseModel):
             Log.info(f"[user_model.py][verify_password] error: {e}")
             return False
     
+    @classmethod
+    def update(cls, record_id, business_id, **kwargs):
+        result = super().update(record_id, business_id, **kwargs)
+        principal_cache.invalidate_user(record_id, reason="user_update")
+        return result
+
     @classmethod
     def update_password(cls, *, user_id: str, business_id: str, new_password: str, password_chosen=False) -> bool:
         """
@@ -311,6 +318,7 @@ class User(BaseModel):
             )
 
             Log.info(f"{log_tag} modified_count={res.modified_count}")
+            principal_cache.invalidate_user(user_id, reason="password_change")
             return res.modified_count > 0
 
         except Exception as e:
@@ -1,124 +1,154 @@
-#POS Admin Resources
-from .doseal.admin.super_superadmin_resource import (
-    blp_admin_role,
-    blp_system_admin_user,
-    # blp_admin_expense,
-    blp_expense
-)
-from .doseal.admin.admin_transaction_resource import blp_admin_transaction
-from .doseal.admin.admin_notice_board_resource import blp_notice_board
-from .doseal.admin.admin_messaging_resource import blp_messaging
-from .doseal.admin.admin_agent_management_resource import blp_agent_management
-from .doseal.admin.admin_commission_resource import blp_commission
-from .doseal.admin.admin_payable_resource import blp_payable
-from .doseal.admin.admin_promo_resource import blp_promo
-from .doseal.admin.admin_setup_resource import (
-    blp_unit, blp_store, blp_category, blp_sub_category, blp_brand, blp_variant, blp_tax,
-    blp_warranty, blp_supplier, blp_tag, blp_gift_card, blp_outlet, blp_business_location,
-    blp_composite_variant
-)
-from .doseal.admin.admin_discount_resource import (
-    blp_discount, blp_selling_price_group
-)
-from .doseal.admin.admin_pos_resource import pos_blp
-from .doseal.admin.admin_sale_resource import sale_blp
-from .doseal.admin.admin_stock_resource import stock_blp
-from .doseal.admin.admin_cash_resource import cash_blp
-from .doseal.admin.admin_purchase_resource import purchase_blp
-from .doseal.admin.admin_product_resource import blp_product
-from .doseal.admin.report.admin_reports_resource import (
-    blp_reports, blp_sales_reports, blp_stock_reports,
-    blp_customer_reports, blp_operational, blp_performance,
-    blp_inventory_optimisation
-)
-from .doseal.admin.payments.payment_resource import payment_blp
-from .doseal.admin.admin_coupon_resource import coupon_blp
-from .doseal.admin.report.financial_reports_resource import (
-    blp_financial_reports
-)
-from .doseal.admin.admin_package_resource import blp_package
-from .doseal.admin.admin_subscription_resource import blp_subscription
-from .doseal.webhooks.payment_webhook_resource import payment_webhook_blp
-from .doseal.admin.admin_customer_resource import (
-    blp_customer, blp_customer_group
-)
-from .doseal.admin.product_import_resource import blp_product_import
-# Instnmny Resources
-from .doseal.admin.admin_business_resource import (
-    blp_business_auth, blp_admin_preauth
-)
-from .doseal.register_resource import blp as blp_user
-from .doseal.auth_resource import blp as blp_login
-from .doseal.business_oauth_resource import blp as blp_auth
-from .doseal.essentials_resource import blp_essentials, blp_preauth
-from .doseal.transaction_resource import blp_transaction
-#Instntmny Subscriber Only
-from .doseal.subscribers.subscriber_authenticaiton import blp_subscriber_registration
-from .doseal.subscribers.subscriber_login import blp_subscriber_login
-from .doseal.subscribers.subscriber_benefiary_resource import blp_subscriber_beneficiary
-from .doseal.subscribers.subscriber_transaction_resource import blp_subscriber_transaction
-from .doseal.billpay_resource import blp_billpay
+# app/resources/__init__.py
+#
+# Blueprints are imported on first access, not when this package is imported:
+# resource modules pull in pandas, reportlab, twilio and the provider SDKs, and
+# most processes (workers, enqueuer, single-group APIs) need few or none of
+# them. `from app.resources import blp_x` still works (PEP 562 __getattr__)
+# and imports only the module that defines blp_x.
+#
+# name -> "module" (attribute has the same name) or "module:attribute"
 
-#socials
-from .social.oauth_facebook_resource import blp_meta_oauth
-from .social.facebook_webhook_resource import blp_fb_webhook
-from .social.scheduled_posts_resource import blp_scheduled_posts
-from .social.oauth_x_resource import blp_x_oauth
-from .social.oauth_tiktok_resource import blp_tiktok_oauth
-from .social.social_posts_resource import blp_social_posts
-from .social.oauth_linkedin_resource import blp_linkedin_oauth
-from .social.oauth_youtube_resource import blp_youtube_oauth
-from .social.oauth_youtube_resource import blp_youtube_oauth
-from .social.oauth_whatsapp_resource import blp_whatsapp_oauth
-from .social.send_now_resource import blp_send_now
-from .social.oauth_pinterest_resource import blp_pinterest_oauth
-from .social.social_publish_resource import blp_unified_publish
-from .social.social_drafts_resources import blp_drafts
-from .social.schwriter_resource import blp_schwriter
-from .social.schwriter_batch_resource import blp_schwriter_batch
-from .social.insights.instagram_insights_resource import blp_instagram_insights
-from .social.insights.facebook_insights_resource import blp_meta_impression
-from .social.insights.x_insights_resource import blp_twitter_insights
-from .social.insights.linkedin_insights_resource import blp_linkedin_insights
-from .social.insights.tiktok_insights_resources import blp_tiktok_insights
-from .social.insights.pinterest_insights_resource import blp_pinterest_insights
-from .social.insights.social_dashboard_resource import blp_social_dashboard
-from .social.business_suspension_resource import blp_business_suspension
-from .notifications.notification_settings_resource import blp_notifications
-#ads
-from .social.campaigns.facebook_ads_resource import blp_facebook_ads
-from .social.campaigns.instagram_ads_resource import blp_instagram_ads
-from .social.campaigns.pinterest_ads_resource import blp_pinterest_ads
-from .social.campaigns.x_ads_resource import blp_x_ads
-from .social.campaigns.linkedin_ads_resource import blp_linkedin_ads
-from .social.campaigns.tiktok_ads_resource import blp_tiktok_ads
-from .social.campaigns.youtube_ads_resource import blp_youtube_ads
+import importlib
 
-from .social.auth.facebook_login_resource import blp_facebook_login
-from .social.auth.instagram_login_resource import blp_instagram_login
-from .social.auth.x_login_resource import blp_x_login
-from .social.auth.linkedin_login_resource import blp_linkedin_login
-from .social.auth.youtube_login_resource import blp_youtube_login
-from .social.auth.tiktok_login_resource import blp_tiktok_login
-from .social.auth.pinterest_login_resource import blp_pinterest_login
-from .doseal.admin.trial_subscription_resource import blp_trial_subscription
-from .social.media_management_resource import blp_media_management
-from .doseal.admin.admin_legal_page_resource import blp_legal_admin
-from .social.legal_page_public_resource import blp_legal_public
-from .social.branch_resource import blp_branch
-from .social.integration_resource import blp_integration
-from .social.provider_setting_resource import blp_provider_setting
-from .social.discount_resource import blp_admin_discount
-from .social.form_resource import blp_form
 
-#webhooks
-from .doseal.webhooks.paystack_webhook_resource import paystack_blp
-from .doseal.webhooks.hubtel_webhook_resource import hubtel_blp
-from .doseal.webhooks.asoriba_webhook_resource import asoriba_blp
-from .doseal.webhooks.stripe_webhook_resource import stripe_blp
-from .doseal.webhooks.paypal_webhook_resource import paypal_blp
-from .doseal.webhooks.flutterwave_webhook_resource import flutterwave_blp
-from .doseal.webhooks.mpesa_webhook_resource import mpesa_blp
+_BLUEPRINTS = {
+    # POS Admin Resources
+    "blp_admin_role": ".doseal.admin.super_superadmin_resource",
+    "blp_system_admin_user": ".doseal.admin.super_superadmin_resource",
+    "blp_expense": ".doseal.admin.super_superadmin_resource",
+    "blp_admin_transaction": ".doseal.admin.admin_transaction_resource",
+    "blp_notice_board": ".doseal.admin.admin_notice_board_resource",
+    "blp_messaging": ".doseal.admin.admin_messaging_resource",
+    "blp_agent_management": ".doseal.admin.admin_agent_management_resource",
+    "blp_commission": ".doseal.admin.admin_commission_resource",
+    "blp_payable": ".doseal.admin.admin_payable_resource",
+    "blp_promo": ".doseal.admin.admin_promo_resource",
+    "blp_unit": ".doseal.admin.admin_setup_resource",
+    "blp_store": ".doseal.admin.admin_setup_resource",
+    "blp_category": ".doseal.admin.admin_setup_resource",
+    "blp_sub_category": ".doseal.admin.admin_setup_resource",
+    "blp_brand": ".doseal.admin.admin_setup_resource",
+    "blp_variant": ".doseal.admin.admin_setup_resource",
+    "blp_tax": ".doseal.admin.admin_setup_resource",
+    "blp_warranty": ".doseal.admin.admin_setup_resource",
+    "blp_supplier": ".doseal.admin.admin_setup_resource",
+    "blp_tag": ".doseal.admin.admin_setup_resource",
+    "blp_gift_card": ".doseal.admin.admin_setup_resource",
+    "blp_outlet": ".doseal.admin.admin_setup_resource",
+    "blp_business_location": ".doseal.admin.admin_setup_resource",
+    "blp_composite_variant": ".doseal.admin.admin_setup_resource",
+    "blp_discount": ".doseal.admin.admin_discount_resource",
+    "blp_selling_price_group": ".doseal.admin.admin_discount_resource",
+    "pos_blp": ".doseal.admin.admin_pos_resource",
+    "sale_blp": ".doseal.admin.admin_sale_resource",
+    "stock_blp": ".doseal.admin.admin_stock_resource",
+    "cash_blp": ".doseal.admin.admin_cash_resource",
+    "purchase_blp": ".doseal.admin.admin_purchase_resource",
+    "blp_product": ".doseal.admin.admin_product_resource",
+    "blp_reports": ".doseal.admin.report.admin_reports_resource",
+    "blp_sales_reports": ".doseal.admin.report.admin_reports_resource",
+    "blp_stock_reports": ".doseal.admin.report.admin_reports_resource",
+    "blp_customer_reports": ".doseal.admin.report.admin_reports_resource",
+    "blp_operational": ".doseal.admin.report.admin_reports_resource",
+    "blp_performance": ".doseal.admin.report.admin_reports_resource",
+    "blp_inventory_optimisation": ".doseal.admin.report.admin_reports_resource",
+    "payment_blp": ".doseal.admin.payments.payment_resource",
+    "coupon_blp": ".doseal.admin.admin_coupon_resource",
+    "blp_financial_reports": ".doseal.admin.report.financial_reports_resource",
+    "blp_package": ".doseal.admin.admin_package_resource",
+    "blp_subscription": ".doseal.admin.admin_subscription_resource",
+    "payment_webhook_blp": ".doseal.webhooks.payment_webhook_resource",
+    "blp_customer": ".doseal.admin.admin_customer_resource",
+    "blp_customer_group": ".doseal.admin.admin_customer_resource",
+    "blp_product_import": ".doseal.admin.product_import_resource",
+    # Instnmny Resources
+    "blp_business_auth": ".doseal.admin.admin_business_resource",
+    "blp_admin_preauth": ".doseal.admin.admin_business_resource",
+    "blp_user": ".doseal.register_resource:blp",
+    "blp_login": ".doseal.auth_resource:blp",
+    "blp_auth": ".doseal.business_oauth_resource:blp",
+    "blp_essentials": ".doseal.essentials_resource",
+    "blp_preauth": ".doseal.essentials_resource",
+    "blp_transaction": ".doseal.transaction_resource",
+    # Instntmny Subscriber Only
+    "blp_subscriber_registration": ".doseal.subscribers.subscriber_authenticaiton",
+    "blp_subscriber_login": ".doseal.subscribers.subscriber_login",
+    "blp_subscriber_beneficiary": ".doseal.subscribers.subscriber_benefiary_resource",
+    "blp_subscriber_transaction": ".doseal.subscribers.subscriber_transaction_resource",
+    "blp_billpay": ".doseal.billpay_resource",
+    # socials
+    "blp_meta_oauth": ".social.oauth_facebook_resource",
+    "blp_fb_webhook": ".social.facebook_webhook_resource",
+    "blp_scheduled_posts": ".social.scheduled_posts_resource",
+    "blp_x_oauth": ".social.oauth_x_resource",
+    "blp_tiktok_oauth": ".social.oauth_tiktok_resource",
+    "blp_social_posts": ".social.social_posts_resource",
+    "blp_linkedin_oauth": ".social.oauth_linkedin_resource",
+    "blp_youtube_oauth": ".social.oauth_youtube_resource",
+    "blp_whatsapp_oauth": ".social.oauth_whatsapp_resource",
+    "blp_send_now": ".social.send_now_resource",
+    "blp_pinterest_oauth": ".social.oauth_pinterest_resource",
+    "blp_unified_publish": ".social.social_publish_resource",
+    "blp_drafts": ".social.social_drafts_resources",
+    "blp_schwriter": ".social.schwriter_resource",
+    "blp_schwriter_batch": ".social.schwriter_batch_resource",
+    "blp_instagram_insights": ".social.insights.instagram_insights_resource",
+    "blp_meta_impression": ".social.insights.facebook_insights_resource",
+    "blp_twitter_insights": ".social.insights.x_insights_resource",
+    "blp_linkedin_insights": ".social.insights.linkedin_insights_resource",
+    "blp_tiktok_insights": ".social.insights.tiktok_insights_resources",
+    "blp_pinterest_insights": ".social.insights.pinterest_insights_resource",
+    "blp_social_dashboard": ".social.insights.social_dashboard_resource",
+    "blp_social_analytics_export": ".social.insights.social_analytics_export_resource",
+    "blp_business_suspension": ".social.business_suspension_resource",
+    "blp_notifications": ".notifications.notification_settings_resource",
+    # ads
+    "blp_facebook_ads": ".social.campaigns.facebook_ads_resource",
+    "blp_instagram_ads": ".social.campaigns.instagram_ads_resource",
+    "blp_pinterest_ads": ".social.campaigns.pinterest_ads_resource",
+    "blp_x_ads": ".social.campaigns.x_ads_resource",
+    "blp_linkedin_ads": ".social.campaigns.linkedin_ads_resource",
+    "blp_tiktok_ads": ".social.campaigns.tiktok_ads_resource",
+    "blp_youtube_ads": ".social.campaigns.youtube_ads_resource",
+    "blp_facebook_login": ".social.auth.facebook_login_resource",
+    "blp_instagram_login": ".social.auth.instagram_login_resource",
+    "blp_x_login": ".social.auth.x_login_resource",
+    "blp_linkedin_login": ".social.auth.linkedin_login_resource",
+    "blp_youtube_login": ".social.auth.youtube_login_resource",
+    "blp_tiktok_login": ".social.auth.tiktok_login_resource",
+    "blp_pinterest_login": ".social.auth.pinterest_login_resource",
+    "blp_trial_subscription": ".doseal.admin.trial_subscription_resource",
+    "blp_media_management": ".social.media_management_resource",
+    "blp_legal_admin": ".doseal.admin.admin_legal_page_resource",
+    "blp_legal_public": ".social.legal_page_public_resource",
+    "blp_branch": ".social.branch_resource",
+    "blp_integration": ".social.integration_resource",
+    "blp_provider_setting": ".social.provider_setting_resource",
+    "blp_admin_discount": ".social.discount_resource",
+    "blp_form": ".social.form_resource",
+    # webhooks
+    "paystack_blp": ".doseal.webhooks.paystack_webhook_resource",
+    "hubtel_blp": ".doseal.webhooks.hubtel_webhook_resource",
+    "asoriba_blp": ".doseal.webhooks.asoriba_webhook_resource",
+    "stripe_blp": ".doseal.webhooks.stripe_webhook_resource",
+    "paypal_blp": ".doseal.webhooks.paypal_webhook_resource",
+    "flutterwave_blp": ".doseal.webhooks.flutterwave_webhook_resource",
+    "mpesa_blp": ".doseal.webhooks.mpesa_webhook_resource",
+}
+
+
+def __getattr__(name):
+    target = _BLUEPRINTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, _, attr = target.partition(":")
+    blueprint = getattr(importlib.import_module(module_name, __name__), attr or name)
+    globals()[name] = blueprint
+    return blueprint
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_BLUEPRINTS))
 
 
 __all__ = [
@@ -155,6 +185,7 @@ __all__ = [
     "blp_linkedin_insights",
     "blp_tiktok_insights",
     "blp_social_dashboard",
+    "blp_social_analytics_export",
     "blp_pinterest_insights",
     "blp_business_suspension",
     "blp_notifications",
@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 import uuid
 import bcrypt, jwt, os, time, secrets, json
 from functools import wraps
-from redis import Redis
+from ....extensions.redis_manager import get_redis as get_redis_client
 from functools import wraps
 from flask import current_app, g
 from flask_smorest import Blueprint, abort
@@ -50,6 +50,7 @@ from ....schemas.social.change_password_schema import ChoosePasswordSchema
 from ....utils.logger import Log # import logging
 from ....utils.generators import generate_client_id, generate_client_secret
 from ....utils.crypt import encrypt_data, decrypt_data, hash_data
+from ....utils import principal_cache
 from ....utils.json_response import prepared_response
 from ....utils.calculation_engine import hash_transaction
 from ....utils.redis import (
@@ -92,6 +93,7 @@ from ....utils.rate_limits import (
     profile_retrieval_limiter,
     forgot_password_rate_limiter,
 )
+from ....utils.social.api_rate_limiter import check_api_rate_limit
 from ....utils.generators import generate_registration_verification_token
 from ....utils.helpers import resolve_target_business_id_from_payload
 from ....services.seeders.social_role_seeder import SocialRoleSeeder
@@ -101,9 +103,7 @@ def _utc_now() -> datetime:
 
 SECRET_KEY = os.getenv("SECRET_KEY") 
 
-REDIS_HOST = os.getenv("REDIS_HOST")
-connection = Redis(host=REDIS_HOST, port=6379)
-queue = Queue("emails", connection=connection)
+queue = Queue("emails", connection=get_redis_client("queue"))
 
 blp_business_auth = Blueprint("Business Auth", __name__, url_prefix="/v1/auth", description="Authentication Management")
 blp_admin_preauth = Blueprint("Admin Pre Auth", __name__, url_prefix="/v1/auth", description="Admin Pre Auth Management")
@@ -127,30 +127,38 @@ def token_required(f):
             # Decode the access token
             data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
 
-            try:
-                user = User.get_user_by_user__id(data.get("user_id"))
-            except Exception as e:
-                Log.info(f"{log_tag} error retrieving user: {str(e)}")
-            
+            # Resolved principal (user + agent_id + decrypted account_type) is cached per token
+            tid = principal_cache.token_id(token, data)
+            user = principal_cache.get_principal(data.get("user_id"), tid)
+
             if user is None:
-                abort(401, message="Invalid access token")
+                try:
+                    user = User.get_user_by_user__id(data.get("user_id"))
+                except Exception as e:
+                    Log.info(f"{log_tag} error retrieving user: {str(e)}")
                 
-            try:
-                s_user = User.get_system_user_by__id(user.get("system_user_id"))
-                if s_user:
-                    user["agent_id"] = s_user.get("agent_id")
-            except Exception as e:
-                Log.info(f"{log_tag} system user error: {str(e)}")
+                if user is None:
+                    abort(401, message="Invalid access token")
+                    
+                try:
+                    s_user = User.get_system_user_by__id(user.get("system_user_id"))
+                    if s_user:
+                        user["agent_id"] = s_user.get("agent_id")
+                except Exception as e:
+                    Log.info(f"{log_tag} system user error: {str(e)}")
+
+                # Clean up sensitive data
+                user.pop('password', None)
+                user.pop('email_hashed', None)
+                user.pop('client_id_hashed', None)
+                user.pop('email_verified', None)
+                user.pop('updated_at', None)
+                user.pop('pin', None)
+                
+                user['account_type'] = decrypt_data(user.get("account_type"))
+                principal_cache.set_principal(data.get("user_id"), tid, user)
 
-            # Clean up sensitive data
-            user.pop('password', None)
-            user.pop('email_hashed', None)
-            user.pop('client_id_hashed', None)
-            user.pop('email_verified', None)
-            user.pop('updated_at', None)
-            user.pop('pin', None)
-            
-            account_type = decrypt_data(user.get("account_type"))
+            account_type = user.get('account_type')
             # Log.info(f"{log_tag}: account_type: {account_type}" )
             
             if account_type not in (SYSTEM_USERS["SYSTEM_OWNER"], SYSTEM_USERS["SUPER_ADMIN"], SYSTEM_USERS["BUSINESS_OWNER"]):
@@ -187,7 +195,9 @@ def token_required(f):
                 new_access_token = jwt.encode({
                     'user_id': user_id,
                     'account_type': refresh_data.get('account_type'),  # Include account_type if needed
-                    'exp': datetime.utcnow() + timedelta(minutes=15)
+                    'exp': datetime.utcnow() + timedelta(minutes=15),
+                    'iat': datetime.utcnow(),
+                    'jti': uuid.uuid4().hex,
                 }, SECRET_KEY, algorithm='HS256')
 
                 # Update token in database
@@ -238,6 +248,11 @@ def token_required(f):
         if not stored_token:
             abort(401, message="Invalid token")
 
+        # Per-business plan rate limit (one Redis round trip; 429 via ApiRateLimitError)
+        business_id = (g.get("current_user") or {}).get("business_id")
+        if business_id:
+            check_api_rate_limit(business_id)
+
         return f(*args, **kwargs)
 
     return decorated
@@ -5,7 +5,7 @@ import time
 import secrets
 from bson.objectid import ObjectId
 from functools import wraps
-from redis import Redis
+from ....extensions.redis_manager import get_redis
 from functools import wraps
 from flask import current_app, g
 from flask_smorest import Blueprint, abort
@@ -64,9 +64,7 @@ from ....models.admin.setup_model import (
 
 SECRET_KEY = os.getenv("SECRET_KEY") 
 
-REDIS_HOST = os.getenv("REDIS_HOST")
-connection = Redis(host=REDIS_HOST, port=6379)
-queue = Queue("emails", connection=connection)
+queue = Queue("emails", connection=get_redis("queue"))
 
 
 blp_store = Blueprint("Store", __name__, description="Store Management")
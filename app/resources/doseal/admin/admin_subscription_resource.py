@@ -21,6 +21,7 @@ from ....utils.helpers import make_log_tag
 from ....utils.json_response import prepared_response
 from ....utils.crypt import decrypt_data
 from ....utils.logger import Log
+from ....utils.social.api_rate_limiter import get_api_usage
 from ....constants.service_code import (
     HTTP_STATUS_CODES, SYSTEM_USERS
 )
@@ -290,6 +291,8 @@ class GetCurrentSubscription(MethodView):
             except Exception as e:
                 Log.info(f"{log_tag} Error retreiving business: {str(e)}")
                 
+            payload["api_usage"] = get_api_usage(auth_business_id)
+
             try:
                 billing_history = Payment.get_all(auth_business_id)
                 if len(billing_history) > 0:
@@ -23,6 +23,7 @@ from ....utils.redis import get_redis
 from ....utils.generic import delete_model
 from ....utils.validation import validate_payment_details
 from ....utils.json_response import prepared_response
+from ....utils.pagination import InvalidCursor
 #helper functions
 
 from ....services.gateways.transaction_gateway_service import TransactionGatewayService
@@ -218,6 +219,8 @@ class TransactionsResource(MethodView):
                business_id=business_id,
                page=item_data.get("page"),
                per_page=item_data.get("per_page"),
+               cursor=item_data.get("cursor"),
+               count=item_data.get("count"),
                start_date=item_data.get("start_date"),
                end_date=item_data.get("end_date"),
                partner_name=item_data.get("partner_name"),
@@ -236,6 +239,10 @@ class TransactionsResource(MethodView):
                 "data": transaction
             }), HTTP_STATUS_CODES["OK"]
 
+        except InvalidCursor as e:
+            Log.info(f"{log_tag} Invalid cursor: {str(e)}")
+            return prepared_response(False, "BAD_REQUEST", "Invalid cursor.")
+
         except PyMongoError as e:
             Log.info(f"{log_tag} Database error occurred while retrieving transaction.")
             return prepared_response(False, "INTERNAL_SERVER_ERROR", f"Database error occurred while retrieving transaction. {str(e)}")
@@ -417,6 +424,8 @@ class TransactionsAgentResource(MethodView):
                agent_id=agent_id,
                page=item_data.get("page"),
                per_page=item_data.get("per_page"),
+               cursor=item_data.get("cursor"),
+               count=item_data.get("count"),
                start_date=item_data.get("start_date"),
                end_date=item_data.get("end_date"),
             )  
@@ -434,6 +443,10 @@ class TransactionsAgentResource(MethodView):
                 "data": transaction
             }), HTTP_STATUS_CODES["OK"]
 
+        except InvalidCursor as e:
+            Log.info(f"{log_tag} Invalid cursor: {str(e)}")
+            return prepared_response(False, "BAD_REQUEST", "Invalid cursor.")
+
         except PyMongoError as e:
             Log.info(f"{log_tag} Database error occurred while retrieving transaction.")
             return prepared_response(False, "INTERNAL_SERVER_ERROR", f"Database error occurred while retrieving transaction. {str(e)}")
@@ -614,6 +627,8 @@ class TransactionsSenderResource(MethodView):
                sender_id=sender_id,
                page=item_data.get("page"),
                per_page=item_data.get("per_page"),
+               cursor=item_data.get("cursor"),
+               count=item_data.get("count"),
                start_date=item_data.get("start_date"),
                end_date=item_data.get("end_date"),
             )  
@@ -631,6 +646,10 @@ class TransactionsSenderResource(MethodView):
                 "data": transaction
             }), HTTP_STATUS_CODES["OK"]
 
+        except InvalidCursor as e:
+            Log.info(f"{log_tag} Invalid cursor: {str(e)}")
+            return prepared_response(False, "BAD_REQUEST", "Invalid cursor.")
+
         except PyMongoError as e:
             Log.info(f"{log_tag} Database error occurred while retrieving transaction.")
             return prepared_response(False, "INTERNAL_SERVER_ERROR", f"Database error occurred while retrieving transaction. {str(e)}")
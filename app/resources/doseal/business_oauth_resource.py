@@ -1,7 +1,7 @@
 import bcrypt
 import jwt
 import os
-from redis import Redis
+from ...extensions.redis_manager import get_redis
 from functools import wraps
 
 from flask import current_app, g
@@ -25,9 +25,7 @@ from app.schemas.business_schema import OAuthCredentialsSchema
 
 SECRET_KEY = os.getenv("SECRET_KEY") 
 
-REDIS_HOST = os.getenv("REDIS_HOST")
-connection = Redis(host=REDIS_HOST, port=6379)
-queue = Queue("emails", connection=connection)
+queue = Queue("emails", connection=get_redis("queue"))
 
 
 blp = Blueprint("OAuth2", __name__, url_prefix="/auth", description="Oauth2 management")
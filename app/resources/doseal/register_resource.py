@@ -1,6 +1,6 @@
 import bcrypt
 import os
-from redis import Redis
+from ...extensions.redis_manager import get_redis
 
 from flask import current_app
 from flask_smorest import Blueprint, abort
@@ -19,9 +19,7 @@ from app.models.user_model import User
 from app.schemas.user_schema import UserSchema
 from tasks import send_user_registration_email
 
-REDIS_HOST = os.getenv("REDIS_HOST")
-connection = Redis(host=REDIS_HOST, port=6379)
-queue = Queue("emails", connection=connection)
+queue = Queue("emails", connection=get_redis("queue"))
 
 
 blp = Blueprint("User", __name__, url_prefix="/auth", description="User management")
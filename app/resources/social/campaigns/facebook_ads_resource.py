@@ -13,10 +13,13 @@ from ....constants.service_code import HTTP_STATUS_CODES, SYSTEM_USERS
 from ....utils.logger import Log
 from ....utils.helpers import make_log_tag
 from ....utils.json_response import prepared_response
+from ....extensions.queue import enqueue
 
 from ....models.social.social_account import SocialAccount
 from ....models.social.ad_account import AdAccount, AdCampaign
 from ....services.social.ads.facebook_ads_service import FacebookAdsService
+from ....services.social.ads.facebook_targeting_catalog import lookup_cached, search_targeting
+from ....services.social.ads.facebook_insights_warehouse import read_campaign_insights
 
 #schemas
 from ....schemas.social.social_schema import (
@@ -27,6 +30,15 @@ from ....schemas.social.social_schema import (
 blp_facebook_ads = Blueprint("facebook_ads", __name__)
 
 
+def _interest_payload(i: dict) -> dict:
+    return {
+        "id": i.get("id"),
+        "name": i.get("name"),
+        "audience_size": i.get("audience_size") or i.get("audience_size_upper_bound"),
+        "path": i.get("path"),
+    }
+
+
 def _update_campaign_status(campaign_id: str, fb_status: str, local_status: str):
     """Helper to update campaign status on Facebook and locally."""
     user = g.get("current_user", {}) or {}
@@ -325,6 +337,17 @@ class FacebookAdAccountConnectResource(MethodView):
             duration = end_time - start_time
             
             Log.info(f"{log_tag}[{client_ip}] Creating AdAccount completed in {duration:.2f} seconds")
+
+            # Backfill the insights warehouse for the new account
+            try:
+                enqueue(
+                    "app.services.social.ads.facebook_insights_warehouse.sync_facebook_ads_insights_for_business",
+                    business_id,
+                    queue_name="publish",
+                    job_timeout=1800,
+                )
+            except Exception as e:
+                Log.error(f"{log_tag} insights backfill enqueue failed: {e}")
         
             
             return jsonify({
@@ -657,6 +680,24 @@ class FacebookCampaignInsightsResource(MethodView):
                 return jsonify({"success": False, "message": "Campaign not found"}), 404
 
             ad_account = AdAccount.get_by_ad_account_id(business_id, campaign["ad_account_id"])
+
+            # 1) Local warehouse (synced on a schedule)
+            stored = read_campaign_insights(
+                business_id=business_id,
+                ad_account=ad_account,
+                fb_campaign_id=campaign["fb_campaign_id"],
+                date_preset=date_preset,
+            )
+            if stored is not None:
+                duration = time.time() - start_time
+                Log.info(f"{log_tag} Insights served from warehouse in {duration:.2f}s")
+                return jsonify({
+                    "success": True,
+                    "data": [stored],
+                    "source": "warehouse",
+                }), HTTP_STATUS_CODES["OK"]
+
+            # 2) Range not synced yet -> live
             service = FacebookAdsService(
                 ad_account["access_token_plain"],
                 campaign["ad_account_id"],
@@ -668,11 +709,12 @@ class FacebookCampaignInsightsResource(MethodView):
             )
 
             duration = time.time() - start_time
-            Log.info(f"{log_tag} Insights fetched in {duration:.2f}s")
+            Log.info(f"{log_tag} Insights fetched live in {duration:.2f}s")
 
             return jsonify({
                 "success": True,
                 "data": result.get("data", {}).get("data", []),
+                "source": "live",
             }), HTTP_STATUS_CODES["OK"]
 
         except Exception as e:
@@ -744,6 +786,17 @@ class FacebookTargetingInterestsResource(MethodView):
                 "message": "Query must be at least 2 characters",
             }), HTTP_STATUS_CODES["BAD_REQUEST"]
         
+        locale = request.args.get("locale") or None
+
+        # Serve typeahead from the local catalog; no token/ad account lookup needed on a hit
+        cached = lookup_cached("interests", query, locale=locale)
+        if cached:
+            Log.info(f"{log_tag} Facebook search interests (cache) in {time.time() - fb_start:.3f}s")
+            return jsonify({
+                "success": True,
+                "data": [_interest_payload(i) for i in cached],
+            }), HTTP_STATUS_CODES["OK"]
+        
         # Get any ad account for the search
         ad_accounts = AdAccount.list_by_business(business_id)
         if not ad_accounts:
@@ -765,11 +818,11 @@ class FacebookTargetingInterestsResource(MethodView):
                 ad_account["ad_account_id"]
             )
             
-            result = service.search_interests(query)
+            result = search_targeting(service, "interests", query, locale=locale)
             
             fb_duration = time.time() - fb_start
 
-            Log.info(f"{log_tag} Facebook search interests in {fb_duration:.2f}s")
+            Log.info(f"{log_tag} Facebook search interests ({result.get('source')}) in {fb_duration:.3f}s")
             
             if not result.get("success"):
                 return jsonify({
@@ -781,15 +834,7 @@ class FacebookTargetingInterestsResource(MethodView):
             
             return jsonify({
                 "success": True,
-                "data": [
-                    {
-                        "id": i.get("id"),
-                        "name": i.get("name"),
-                        "audience_size": i.get("audience_size"),
-                        "path": i.get("path"),
-                    }
-                    for i in interests
-                ],
+                "data": [_interest_payload(i) for i in interests],
             }), HTTP_STATUS_CODES["OK"]
         
         except Exception as e:
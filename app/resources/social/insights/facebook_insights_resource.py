@@ -31,6 +31,7 @@ from flask_smorest import Blueprint
 
 from ....constants.service_code import HTTP_STATUS_CODES
 from ....models.social.social_account import SocialAccount
+from ....models.social.scheduled_post import ScheduledPost
 from ....utils.logger import Log
 from ...doseal.admin.admin_business_resource import token_required
 
@@ -648,6 +649,29 @@ def _fetch_post_insights(
     }
 
 
+def _canonical_post_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map Graph post metrics onto the canonical keys stored on scheduled posts.
+    """
+    out: Dict[str, Any] = {}
+    simple = {
+        "post_impressions": "impressions",
+        "post_impressions_unique": "reach",
+        "post_engaged_users": "engagements",
+        "post_clicks": "clicks",
+    }
+    for fb_key, key in simple.items():
+        if isinstance(metrics.get(fb_key), (int, float)):
+            out[key] = metrics[fb_key]
+
+    reactions = metrics.get("post_reactions_by_type_total")
+    if isinstance(reactions, dict):
+        out["reactions"] = sum(v for v in reactions.values() if isinstance(v, (int, float)))
+        if isinstance(reactions.get("like"), (int, float)):
+            out["likes"] = reactions["like"]
+    return out
+
+
 # -------------------------------
 # Post details fetching
 # -------------------------------
@@ -1283,6 +1307,17 @@ class FacebookPostInsightsResource(MethodView):
                 "error": error,
             }), HTTP_STATUS_CODES["BAD_REQUEST"]
 
+        # Write-through so analytics exports carry per-post metrics
+        try:
+            ScheduledPost.record_provider_metrics(
+                business_id=business_id,
+                platform=PLATFORM_ID,
+                provider_post_id=post_id,
+                metrics=_canonical_post_metrics(insights.get("metrics") or {}),
+            )
+        except Exception as e:
+            Log.info(f"{log_tag} post metrics write-through failed: {e}")
+
         result = {
             "platform": PLATFORM_ID,
             "graph_version": GRAPH_VERSION,
@@ -0,0 +1,157 @@
+# app/resources/social/insights/social_analytics_export_resource.py
+
+from __future__ import annotations
+
+from flask import Response, g, jsonify, request, stream_with_context
+from flask.views import MethodView
+from flask_smorest import Blueprint
+
+from ....constants.service_code import HTTP_STATUS_CODES
+from ....utils.logger import Log
+from ...doseal.admin.admin_business_resource import token_required
+from ....models.social.social_analytics_export import SocialAnalyticsExport
+from ....services.social.analytics_export import (
+    CONTENT_TYPES,
+    DATASETS,
+    FILE_FORMATS,
+    EXPORT_DOWNLOAD_URL_TTL,
+    export_download_url,
+    export_filename,
+    should_run_in_background,
+    stream_export,
+)
+from ....extensions.queue import enqueue
+from .social_dashboard_resource import _get_range_from_query
+
+
+blp_social_analytics_export = Blueprint("social_analytics_export", __name__)
+
+
+@blp_social_analytics_export.route("/social/analytics/export", methods=["GET"])
+class SocialAnalyticsExportResource(MethodView):
+    """
+    Bulk export of stored analytics (no provider API calls).
+
+    Query args:
+      - dataset: snapshots (default) | posts
+      - format: csv (default) | xlsx
+      - since/until (YYYY-MM-DD) or days
+      - background: true to force a background job
+
+    Small ranges are streamed back with chunked transfer.
+    Large ranges (or background=true) return 202 with an export_id to poll.
+    """
+
+    @token_required
+    def get(self):
+        client_ip = request.remote_addr
+        log_tag = f"[social_analytics_export_resource.py][SocialAnalyticsExportResource][get][{client_ip}]"
+
+        user = g.get("current_user") or {}
+        business_id = str(user.get("business_id") or "")
+        user__id = str(user.get("_id") or "")
+
+        if not business_id or not user__id:
+            return jsonify({"success": False, "message": "Unauthorized"}), HTTP_STATUS_CODES["UNAUTHORIZED"]
+
+        dataset = (request.args.get("dataset") or "snapshots").strip().lower()
+        file_format = (request.args.get("format") or "csv").strip().lower()
+        force_background = (request.args.get("background") or "").strip().lower() in ("1", "true", "yes")
+
+        if dataset not in DATASETS:
+            return jsonify({"success": False, "message": f"dataset must be one of {list(DATASETS)}"}), HTTP_STATUS_CODES["BAD_REQUEST"]
+
+        if file_format not in FILE_FORMATS:
+            return jsonify({"success": False, "message": f"format must be one of {list(FILE_FORMATS)}"}), HTTP_STATUS_CODES["BAD_REQUEST"]
+
+        since, until, err = _get_range_from_query()
+        if err:
+            return jsonify({"success": False, "message": err}), HTTP_STATUS_CODES["BAD_REQUEST"]
+
+        # 1) Large range -> background job + download link
+        if force_background or should_run_in_background(since, until):
+            try:
+                job = SocialAnalyticsExport.create(
+                    business_id=business_id,
+                    user__id=user__id,
+                    dataset=dataset,
+                    file_format=file_format,
+                    since_ymd=since,
+                    until_ymd=until,
+                )
+                enqueue(
+                    "app.services.social.analytics_export.run_analytics_export",
+                    job["_id"],
+                    queue_name="publish",
+                    job_timeout=1800,
+                )
+                return jsonify(
+                    {
+                        "success": True,
+                        "message": "Export job enqueued",
+                        "data": {"export_id": job["_id"], "status": job["status"]},
+                    }
+                ), 202
+            except Exception as e:
+                Log.error(f"{log_tag} enqueue failed: {e}")
+                return jsonify({"success": False, "message": "Internal error"}), HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"]
+
+        # 2) Small range -> stream (no Content-Length => chunked transfer)
+        try:
+            chunks = stream_export(
+                dataset=dataset,
+                file_format=file_format,
+                business_id=business_id,
+                user__id=user__id,
+                since_ymd=since,
+                until_ymd=until,
+            )
+        except Exception as e:
+            Log.error(f"{log_tag} export failed: {e}")
+            return jsonify({"success": False, "message": "Internal error"}), HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"]
+
+        filename = export_filename(dataset, file_format, since, until)
+        return Response(
+            stream_with_context(chunks),
+            mimetype=CONTENT_TYPES[file_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Cache-Control": "no-store",
+            },
+        )
+
+
+@blp_social_analytics_export.route("/social/analytics/export/<export_id>", methods=["GET"])
+class SocialAnalyticsExportStatusResource(MethodView):
+    @token_required
+    def get(self, export_id):
+        user = g.get("current_user") or {}
+        business_id = str(user.get("business_id") or "")
+
+        if not business_id:
+            return jsonify({"success": False, "message": "Unauthorized"}), HTTP_STATUS_CODES["UNAUTHORIZED"]
+
+        job = SocialAnalyticsExport.get_by_id(export_id, business_id=business_id)
+        if not job:
+            return jsonify({"success": False, "message": "Export not found"}), HTTP_STATUS_CODES["NOT_FOUND"]
+
+        # Exports are private objects; each status read signs a fresh short-lived link
+        download_url = export_download_url(job)
+
+        return jsonify(
+            {
+                "success": True,
+                "data": {
+                    "export_id": job["_id"],
+                    "status": job.get("status"),
+                    "dataset": job.get("dataset"),
+                    "format": job.get("file_format"),
+                    "since": job.get("since_ymd"),
+                    "until": job.get("until_ymd"),
+                    "rows": job.get("rows"),
+                    "download_url": download_url,
+                    "download_url_expires_in": EXPORT_DOWNLOAD_URL_TTL if download_url else None,
+                    "error": job.get("error"),
+                },
+            }
+        ), HTTP_STATUS_CODES["OK"]
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import json
 from typing import Any, Dict, List
 
 from flask.views import MethodView
-from flask import request, jsonify, g
+from flask import Response, request, jsonify, g, stream_with_context
 from flask_smorest import Blueprint
 from marshmallow import Schema, fields, validate, ValidationError
 
@@ -37,6 +38,13 @@ class SchWriterBatchSchema(Schema):
     content = fields.Dict(required=True)
     brand = fields.Dict(required=False, allow_none=True)
     preferences = fields.Dict(required=False, allow_none=True)
+    regenerate = fields.Bool(required=False, load_default=False)
+    stream = fields.Str(
+        required=False,
+        allow_none=True,
+        load_default=None,
+        validate=validate.OneOf(["ndjson", "sse"]),
+    )
 
 
 @blp_schwriter_batch.route("/social/ai/schwriter/enhance/batch", methods=["POST"])
@@ -50,9 +58,13 @@ class SchWriterEnhanceBatchResource(MethodView):
         "action": "full",
         "content": {"text":"...", "link":"...", "media":[...]},
         "brand": {...},
-        "preferences": {...}
+        "preferences": {...},
+        "regenerate": false,       # true skips cached results
+        "stream": "ndjson"         # optional: "ndjson" | "sse"
       }
 
+    Platforms are generated concurrently (capped per LLM backend).
+
     Response:
       data = {
         "results": [
@@ -60,6 +72,11 @@ class SchWriterEnhanceBatchResource(MethodView):
           {"platform":"instagram", ...},
         ]
       }
+
+    Streaming response (one event per platform as soon as it is ready):
+      {"type": "result", "platform": "facebook", "data": {...}}
+      {"type": "error", "platform": "x", "error": "..."}
+      {"type": "done", "count": 2, "errors": 1}
     """
 
     @token_required
@@ -83,10 +100,12 @@ class SchWriterEnhanceBatchResource(MethodView):
         )
 
         platforms = [(p or "").lower().strip() for p in (payload.get("platforms") or []) if p]
+        platforms = list(dict.fromkeys(p for p in platforms if p))  # de-dupe, keep order
         action = (payload.get("action") or "full").lower().strip()
         content = payload.get("content") or {}
         brand = payload.get("brand") or {}
         preferences = payload.get("preferences") or {}
+        regenerate = bool(payload.get("regenerate"))
 
         if not platforms:
             return jsonify({
@@ -94,22 +113,40 @@ class SchWriterEnhanceBatchResource(MethodView):
                 "message": "platforms is required"
             }), HTTP_STATUS_CODES["BAD_REQUEST"]
 
-        results: List[Dict[str, Any]] = []
+        reqs = [
+            SchWriterRequest(
+                platform=p,
+                action=action,
+                content=content,
+                brand=brand,
+                preferences=preferences,
+                platform_rules=PLATFORM_RULES.get(p, {}),
+                business_id=business_id,
+                regenerate=regenerate,
+            )
+            for p in platforms
+        ]
+
+        stream = payload.get("stream")
+        if stream:
+            return Response(
+                stream_with_context(_stream_events(reqs, stream, log_tag)),
+                mimetype="text/event-stream" if stream == "sse" else "application/x-ndjson",
+                headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+            )
+
+        by_platform: Dict[str, Dict[str, Any]] = {}
         errors: Dict[str, Any] = {}
 
-        for p in platforms:
-            try:
-                r = SchWriterService.enhance(SchWriterRequest(
-                    platform=p,
-                    action=action,
-                    content=content,
-                    brand=brand,
-                    preferences=preferences,
-                    platform_rules=PLATFORM_RULES.get(p, {}),
-                ))
-                results.append(r)
-            except Exception as e:
-                errors[p] = str(e)
+        for p, r, err in SchWriterService.enhance_many(reqs):
+            if err is not None:
+                Log.info(f"{log_tag} schwriter failed platform={p}: {err}")
+                errors[p] = err
+            else:
+                by_platform[p] = r
+
+        # keep request order in the non-streaming response
+        results: List[Dict[str, Any]] = [by_platform[p] for p in platforms if p in by_platform]
 
         return jsonify({
             "success": True,
@@ -118,4 +155,26 @@ class SchWriterEnhanceBatchResource(MethodView):
                 "results": results,
                 "errors": errors or None,
             }
-        }), HTTP_STATUS_CODES["OK"]
\ No newline at end of file
+        }), HTTP_STATUS_CODES["OK"]
+
+
+def _format_event(event: Dict[str, Any], stream: str) -> str:
+    body = json.dumps(event, ensure_ascii=False, default=str)
+    if stream == "sse":
+        return f"event: {event['type']}\ndata: {body}\n\n"
+    return body + "\n"
+
+
+def _stream_events(reqs: List[SchWriterRequest], stream: str, log_tag: str):
+    count = 0
+    failed = 0
+    for p, r, err in SchWriterService.enhance_many(reqs):
+        if err is not None:
+            failed += 1
+            Log.info(f"{log_tag} schwriter failed platform={p}: {err}")
+            yield _format_event({"type": "error", "platform": p, "error": err}, stream)
+        else:
+            count += 1
+            yield _format_event({"type": "result", "platform": p, "data": r}, stream)
+
+    yield _format_event({"type": "done", "count": count, "errors": failed}, stream)
@@ -63,6 +63,7 @@ class SchWriterEnhanceResource(MethodView):
         content = payload.get("content") or {}
         brand = payload.get("brand") or {}
         preferences = payload.get("preferences") or {}
+        regenerate = bool(payload.get("regenerate"))
 
         if not platforms:
             return jsonify({
@@ -82,6 +83,8 @@ class SchWriterEnhanceResource(MethodView):
                     brand=brand,
                     preferences=preferences,
                     platform_rules=PLATFORM_RULES.get(p, {}),
+                    business_id=business_id,
+                    regenerate=regenerate,
                 ))
                 results.append(r)
             except Exception as e:
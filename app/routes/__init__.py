@@ -1,219 +1,216 @@
-#Blueprints for Admin only
-from ..resources import (
-    blp_business_auth,
-    blp_preauth,
-    blp_admin_preauth,
-    blp_admin_role,
-    blp_system_admin_user,
-    # blp_admin_expense,
-    blp_admin_transaction,
-    blp_notice_board,
-    blp_messaging,
-    blp_commission,
-    blp_agent_management,
-    blp_essentials,
-    blp_payable,
-    blp_promo,
-    blp_unit, 
-    blp_store, 
-    blp_category, 
-    blp_sub_category, 
-    blp_brand, 
-    blp_variant, 
-    blp_tax,
-    blp_warranty, 
-    blp_supplier, 
-    blp_tag, 
-    blp_gift_card, 
-    blp_outlet, 
-    blp_business_location,
-    blp_expense,
-    blp_discount, 
-    blp_selling_price_group,
-    blp_customer,
-    blp_customer_group,
-    blp_composite_variant,
-    pos_blp,
-    sale_blp,
-    stock_blp,
-    cash_blp,
-    purchase_blp,
-    blp_product,
-    blp_reports,
-    blp_sales_reports,
-    blp_stock_reports,
-    blp_customer_reports,
-    blp_financial_reports,
-    blp_performance,
-    blp_operational,
-    blp_inventory_optimisation,
-    coupon_blp,
-    blp_package,
-    blp_subscription,
-    payment_webhook_blp,
-    payment_blp,
-    blp_product_import,
-    blp_branch,
-    blp_integration,
-    blp_provider_setting,
-    blp_admin_discount,
-    blp_form,
+# app/routes/__init__.py
+#
+# Blueprints per app, grouped by service.
+#
+# Key design:
+# - Nothing is imported here at module level: a blueprint's resource module
+#   (and pandas / reportlab / twilio / provider SDKs behind it) is imported only
+#   when its group is enabled and the app registers it (see app/resources)
+# - SERVICE_GROUPS (env, comma-separated) or create_*_app(service_groups=...)
+#   selects the groups; empty / "all" registers everything (the default, same
+#   routes as before). Processes that serve no HTTP (workers, enqueuer) pass
+#   service_groups=() and register only "/" and "/health"
+# - Unknown group names fail at boot instead of silently dropping routes
+
+import os
+
+from .. import resources
+
+
+ALL_GROUPS = "all"
+
+#Subscriber (social) app: (group, blueprint), in registration order
+SOCIAL_BLUEPRINTS = (
+    ("core", "blp_preauth"),
+    ("core", "blp_business_auth"),
+    ("core", "blp_system_admin_user"),
+    ("core", "blp_admin_role"),
+    ("core", "blp_essentials"),
+    ("publishing", "blp_scheduled_posts"),
+    ("oauth", "blp_meta_oauth"),
+    ("oauth", "blp_x_oauth"),
+    ("oauth", "blp_tiktok_oauth"),
+    ("oauth", "blp_linkedin_oauth"),
+    ("oauth", "blp_youtube_oauth"),
+    ("oauth", "blp_whatsapp_oauth"),
+    ("publishing", "blp_social_posts"),
+    ("oauth", "blp_fb_webhook"),
+    ("publishing", "blp_send_now"),
+    ("oauth", "blp_pinterest_oauth"),
+    ("publishing", "blp_unified_publish"),
+    ("publishing", "blp_drafts"),
+    ("publishing", "blp_schwriter"),
+    ("publishing", "blp_schwriter_batch"),
+    ("insights", "blp_meta_impression"),
+    ("insights", "blp_instagram_insights"),
+    ("insights", "blp_twitter_insights"),
+    ("insights", "blp_linkedin_insights"),
+    ("insights", "blp_tiktok_insights"),
+    ("insights", "blp_pinterest_insights"),
+    ("insights", "blp_social_dashboard"),
+    ("insights", "blp_social_analytics_export"),
+    ("core", "blp_business_suspension"),
+    ("core", "blp_notifications"),
+    ("core", "blp_subscription"),
+    ("ads", "blp_facebook_ads"),
+    ("ads", "blp_instagram_ads"),
+    ("ads", "blp_pinterest_ads"),
+    ("ads", "blp_x_ads"),
+    ("ads", "blp_linkedin_ads"),
+    ("ads", "blp_tiktok_ads"),
+    ("ads", "blp_youtube_ads"),
+    ("social_login", "blp_facebook_login"),
+    ("social_login", "blp_instagram_login"),
+    ("social_login", "blp_x_login"),
+    ("social_login", "blp_linkedin_login"),
+    ("social_login", "blp_youtube_login"),
+    ("social_login", "blp_tiktok_login"),
+    ("social_login", "blp_pinterest_login"),
+    ("core", "blp_trial_subscription"),
+    ("publishing", "blp_media_management"),
+    ("core", "blp_legal_admin"),
+    ("core", "blp_legal_public"),
+)
+
+# Admin (POS) app
+ADMIN_BLUEPRINTS = (
+    ("core", "blp_preauth"),
+    ("core", "blp_business_auth"),
+    ("core", "blp_package"),
+    ("core", "blp_admin_role"),
+    ("core", "blp_system_admin_user"),
+    # blp_admin_expense, blp_admin_transaction, blp_notice_board, blp_messaging,
+    # blp_commission, blp_agent_management, blp_payable, blp_promo
+    ("pos", "blp_unit"),
+    ("pos", "blp_store"),
+    ("pos", "blp_category"),
+    ("pos", "blp_sub_category"),
+    ("pos", "blp_brand"),
+    ("pos", "blp_variant"),
+    ("pos", "blp_tax"),
+    ("pos", "blp_warranty"),
+    ("pos", "blp_supplier"),
+    ("pos", "blp_tag"),
+    ("pos", "blp_gift_card"),
+    ("pos", "blp_outlet"),
+    ("pos", "blp_business_location"),
+    ("pos", "blp_expense"),
+    ("pos", "blp_discount"),
+    ("pos", "blp_selling_price_group"),
+    ("pos", "blp_customer"),
+    ("pos", "blp_customer_group"),
+    ("pos", "blp_composite_variant"),
+    ("pos", "blp_product"),
+    ("pos", "pos_blp"),
+    ("pos", "sale_blp"),
+    ("pos", "stock_blp"),
+    ("pos", "cash_blp"),
+    ("pos", "purchase_blp"),
+    ("reports", "blp_reports"),
+    ("reports", "blp_sales_reports"),
+    ("reports", "blp_stock_reports"),
+    ("reports", "blp_customer_reports"),
+    ("reports", "blp_financial_reports"),
+    ("reports", "blp_performance"),
+    ("reports", "blp_operational"),
+    ("reports", "blp_inventory_optimisation"),
+    ("pos", "coupon_blp"),
+    ("core", "blp_subscription"),
+    ("payments", "payment_webhook_blp"),
+    ("payments", "payment_blp"),
+    ("pos", "blp_product_import"),
+    ("business", "blp_branch"),
+    ("business", "blp_integration"),
+    ("business", "blp_provider_setting"),
+    ("business", "blp_admin_discount"),
+    ("business", "blp_form"),
     #webhooks
-    hubtel_blp,
-    asoriba_blp,
-    stripe_blp,
-    paypal_blp,
-    flutterwave_blp,
-    mpesa_blp,
-    paystack_blp,
+    ("payments", "hubtel_blp"),
+    ("payments", "asoriba_blp"),
+    ("payments", "stripe_blp"),
+    ("payments", "paypal_blp"),
+    ("payments", "flutterwave_blp"),
+    ("payments", "mpesa_blp"),
+    ("payments", "paystack_blp"),
 )
 
+# confirm-account / send-sms / twilio status (twilio client)
+INTERNAL_GROUP = "internal"
+# IP-restricted gateway callbacks on the social app
+CALLBACKS_GROUP = "callbacks"
 
-# Blueprints for Doseal Subscriber only
-from ..resources import (
-    blp_subscriber_registration,
-    blp_subscriber_login,
-    blp_subscriber_beneficiary,
-    blp_subscriber_transaction,
-    blp_billpay,
-    #socials
-    blp_subscription,
-    blp_meta_oauth,
-    blp_fb_webhook,
-    blp_scheduled_posts,
-    blp_x_oauth,
-    blp_tiktok_oauth,
-    blp_linkedin_oauth,
-    blp_youtube_oauth,
-    blp_whatsapp_oauth,
-    blp_social_posts,
-    blp_send_now,
-    blp_pinterest_oauth,
-    blp_unified_publish,
-    blp_drafts,
-    blp_schwriter,
-    blp_schwriter_batch,
-    blp_meta_impression,
-    blp_instagram_insights,
-    blp_twitter_insights,
-    blp_linkedin_insights,
-    blp_tiktok_insights,
-    blp_social_dashboard,
-    blp_pinterest_insights,
-    blp_business_suspension,
-    blp_notifications,
-    blp_facebook_ads,
-    blp_instagram_ads,
-    blp_x_ads,
-    blp_linkedin_ads,
-    blp_pinterest_ads,
-    blp_tiktok_ads,
-    blp_youtube_ads,
-    blp_facebook_login,
-    blp_instagram_login,
-    blp_x_login,
-    blp_linkedin_login,
-    blp_youtube_login,
-    blp_tiktok_login,
-    blp_pinterest_login,
-    blp_trial_subscription,
-    blp_media_management,
-    blp_legal_admin,
-    blp_legal_public,
-    
-)
+SOCIAL_GROUPS = frozenset(g for g, _ in SOCIAL_BLUEPRINTS) | {INTERNAL_GROUP, CALLBACKS_GROUP}
+ADMIN_GROUPS = frozenset(g for g, _ in ADMIN_BLUEPRINTS) | {INTERNAL_GROUP}
 
 
-from ..controllers.internal_controller import (
-    get_confirm_account, 
-    post_send_sms, 
-    twilio_status_webhook,
-)
-from app.controllers.callback_controller import (
-    process_volume_transaction_callback,
-    process_transaction_third_party_callback,
-    process_intermex_transaction_callback,
-    #PAYMENT WEBHOOKS
-    process_hubtel_payment_webhook
-)
-from app.decorators.ip_decorator import restrict_ip
-from app.constants.service_code import ALLOWED_IPS
-
-
-#Subscrivber Routes 
-def register_social_routes(app, api):
-    blueprints = [
-        blp_preauth,
-        blp_business_auth,
-        blp_system_admin_user,
-        blp_admin_role,
-        blp_essentials,
-        blp_scheduled_posts,
-        blp_meta_oauth,
-        blp_x_oauth,
-        blp_tiktok_oauth,
-        blp_linkedin_oauth,
-        blp_youtube_oauth,
-        blp_whatsapp_oauth,
-        blp_social_posts,
-        blp_fb_webhook,
-        blp_send_now,
-        blp_pinterest_oauth,
-        blp_unified_publish,
-        blp_drafts,
-        blp_schwriter,
-        blp_schwriter_batch,
-        blp_meta_impression,
-        blp_instagram_insights,
-        blp_twitter_insights,
-        blp_linkedin_insights,
-        blp_tiktok_insights,
-        blp_pinterest_insights,
-        blp_social_dashboard,
-        blp_business_suspension,
-        blp_notifications,
-        blp_subscription,
-        blp_facebook_ads,
-        blp_instagram_ads,
-        blp_pinterest_ads,
-        blp_x_ads,
-        blp_linkedin_ads,
-        blp_tiktok_ads,
-        blp_youtube_ads,
-        blp_facebook_login,
-        blp_instagram_login,
-        blp_x_login,
-        blp_linkedin_login,
-        blp_youtube_login,
-        blp_tiktok_login,
-        blp_pinterest_login,
-        blp_trial_subscription,
-        blp_media_management,
-        blp_legal_admin,
-        blp_legal_public,
-    ]
-
-    for blueprint in blueprints:
-        api.register_blueprint(blueprint, url_prefix="/api/v1")
+def enabled_groups(available, service_groups=None):
+    """
+    Groups to register: service_groups (str or iterable) if given, else
+    SERVICE_GROUPS. Empty / "all" -> every available group.
+    """
+    if service_groups is None:
+        service_groups = os.getenv("SERVICE_GROUPS", ALL_GROUPS)
+    if isinstance(service_groups, str):
+        service_groups = [g.strip() for g in service_groups.split(",") if g.strip()]
+        if not service_groups:
+            service_groups = [ALL_GROUPS]
+
+    groups = set(service_groups)
+    if ALL_GROUPS in groups:
+        return frozenset(available)
+
+    unknown = groups - set(available)
+    if unknown:
+        raise ValueError(f"Unknown service groups {sorted(unknown)}; available: {sorted(available)}")
+    return frozenset(groups)
+
+
+def _register_blueprints(api, table, groups):
+    for group, name in table:
+        if group in groups:
+            api.register_blueprint(getattr(resources, name), url_prefix="/api/v1")
+
+
+def _register_internal_routes(app):
+    from ..controllers.internal_controller import get_confirm_account, post_send_sms
 
-    # Internal endpoints
     app.add_url_rule('/confirm-account', 'get_confirm_account', get_confirm_account, methods=['GET'])
     app.add_url_rule('/api/v1/send-sms', 'post_send_sms', post_send_sms, methods=['POST'])
 
+
+#Subscrivber Routes
+def register_social_routes(app, api, service_groups=None):
+    groups = enabled_groups(SOCIAL_GROUPS, service_groups)
+    app.config["SERVICE_GROUPS"] = sorted(groups)
+
+    _register_blueprints(api, SOCIAL_BLUEPRINTS, groups)
+
+    # Internal endpoints
+    if INTERNAL_GROUP in groups:
+        _register_internal_routes(app)
+
     # Callback endpoints (with IP restriction)
-    app.add_url_rule(
-        '/api/v1/webhooks/payment/hubtel',
-        'process_volume_transaction_callback',
-        restrict_ip(ALLOWED_IPS)(process_volume_transaction_callback),
-        methods=['POST']
-    )
-
-    app.add_url_rule(
-        '/api/v1/transactions/zeepay-third-party/callback',
-        'process_transaction_third_party_callback',
-        restrict_ip(ALLOWED_IPS)(process_transaction_third_party_callback),
-        methods=['POST']
-    )
+    if CALLBACKS_GROUP in groups:
+        from app.controllers.callback_controller import (
+            process_volume_transaction_callback,
+            process_transaction_third_party_callback,
+        )
+        from app.decorators.ip_decorator import restrict_ip
+        from app.constants.service_code import ALLOWED_IPS
+
+        app.add_url_rule(
+            '/api/v1/webhooks/payment/hubtel',
+            'process_volume_transaction_callback',
+            restrict_ip(ALLOWED_IPS)(process_volume_transaction_callback),
+            methods=['POST']
+        )
+
+        app.add_url_rule(
+            '/api/v1/transactions/zeepay-third-party/callback',
+            'process_transaction_third_party_callback',
+            restrict_ip(ALLOWED_IPS)(process_transaction_third_party_callback),
+            methods=['POST']
+        )
 
     # Root route
     @app.route('/')
@@ -222,107 +219,23 @@ def register_social_routes(app, api):
 
 
 # Admin Routes
-def register_admin_routes(app, api):
-    blueprints = [
-        blp_preauth,
-        blp_business_auth,
-        blp_package,
-        blp_admin_role,
-        blp_system_admin_user,
-        # blp_admin_expense,
-        # blp_admin_transaction,
-        # blp_notice_board,
-        # blp_messaging,
-        # blp_commission,
-        # blp_agent_management,
-        # blp_payable,
-        # blp_promo,
-        blp_unit, 
-        blp_store, 
-        blp_category, 
-        blp_sub_category, 
-        blp_brand, 
-        blp_variant, 
-        blp_tax,
-        blp_warranty, 
-        blp_supplier, 
-        blp_tag, 
-        blp_gift_card, 
-        blp_outlet, 
-        blp_business_location,
-        blp_expense,
-        blp_discount, 
-        blp_selling_price_group,
-        blp_customer,
-        blp_customer_group,
-        blp_composite_variant,
-        blp_product,
-        pos_blp,
-        sale_blp,
-        stock_blp,
-        cash_blp,
-        purchase_blp,
-        blp_reports,
-        blp_sales_reports,
-        blp_stock_reports,
-        blp_customer_reports,
-        blp_financial_reports,
-        blp_performance,
-        blp_operational,
-        blp_inventory_optimisation,
-        coupon_blp,
-        blp_subscription,
-        payment_webhook_blp,
-        payment_blp,
-        blp_product_import,
-        blp_branch,
-        blp_integration,
-        blp_provider_setting,
-        blp_admin_discount,
-        blp_form,
-        #webhooks
-        hubtel_blp,
-        asoriba_blp,
-        stripe_blp,
-        paypal_blp,
-        flutterwave_blp,
-        mpesa_blp,
-        paystack_blp,
-        
-    ]
-
-    for blueprint in blueprints:
-        api.register_blueprint(blueprint, url_prefix="/api/v1")
+def register_admin_routes(app, api, service_groups=None):
+    groups = enabled_groups(ADMIN_GROUPS, service_groups)
+    app.config["SERVICE_GROUPS"] = sorted(groups)
+
+    _register_blueprints(api, ADMIN_BLUEPRINTS, groups)
 
     # Internal endpoints
-    app.add_url_rule('/confirm-account', 'get_confirm_account', get_confirm_account, methods=['GET'])
-    app.add_url_rule('/api/v1/send-sms', 'post_send_sms', post_send_sms, methods=['POST'])
-    
-    app.add_url_rule('/api/v1/webhooks/twilio/status', 'twilio_status_webhook', twilio_status_webhook, methods=['POST'])
-    
-    # process hubtel payment webhook
-    # app.add_url_rule(
-    #     '/webhooks/payment/hubtel',
-    #     'process_intermex_transaction_callback',
-    #     restrict_ip(ALLOWED_IPS)(process_hubtel_payment_webhook),
-    #     methods=['POST']
-    # )
-    
-    # Callback endpoints (with IP restriction)
-    # app.add_url_rule(
-    #     '/api/v1/transactions/callback',
-    #     'process_intermex_transaction_callback',
-    #     restrict_ip(ALLOWED_IPS)(process_intermex_transaction_callback),
-    #     methods=['POST']
-    # )
-    
-    
-    
+    if INTERNAL_GROUP in groups:
+        from ..controllers.internal_controller import twilio_status_webhook
+
+        _register_internal_routes(app)
+        app.add_url_rule('/api/v1/webhooks/twilio/status', 'twilio_status_webhook', twilio_status_webhook, methods=['POST'])
+
+    # process hubtel payment webhook / intermex callback: see callback_controller
+    # (process_hubtel_payment_webhook, process_intermex_transaction_callback)
 
-    # Callback endpoints (with IP restriction)
-   
     # Root route
     @app.route('/')
     def index():
         return {"message": "Schedulefy — API is healthy and ready to receive requests."}
-
@@ -151,6 +151,17 @@ class TransactionQuerySchema(Schema):
             "invalid": "Per_page must be a non-negative integer."
         }
     )
+    cursor = fields.Str(
+        required=False,
+        allow_none=True,
+        description="Opaque next_cursor from the previous page; send empty for the first page. Switches to cursor paging."
+    )
+    count = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.OneOf(["none", "estimate", "exact"]),
+        description="Cursor paging only: include total_count ('estimate' or 'exact'). Default 'none'."
+    )
     partner_name = fields.String(
         required=False,
         allow_none=True,
@@ -183,6 +194,17 @@ class TransactionAgentQuerySchema(Schema):
             "invalid": "Per_page must be a non-negative integer."
         }
     )
+    cursor = fields.Str(
+        required=False,
+        allow_none=True,
+        description="Opaque next_cursor from the previous page; send empty for the first page. Switches to cursor paging."
+    )
+    count = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.OneOf(["none", "estimate", "exact"]),
+        description="Cursor paging only: include total_count ('estimate' or 'exact'). Default 'none'."
+    )
     agent_id = fields.Str(
         required=True, 
         validate=validate_objectid, 
@@ -216,6 +238,17 @@ class TransactionSenderQuerySchema(Schema):
             "invalid": "Per_page must be a non-negative integer."
         }
     )
+    cursor = fields.Str(
+        required=False,
+        allow_none=True,
+        description="Opaque next_cursor from the previous page; send empty for the first page. Switches to cursor paging."
+    )
+    count = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.OneOf(["none", "estimate", "exact"]),
+        description="Cursor paging only: include total_count ('estimate' or 'exact'). Default 'none'."
+    )
     sender_id = fields.Str(
         required=True, 
         validate=validate_objectid, 
@@ -30,6 +30,8 @@ class SchWriterRequestSchema(Schema):
     content = fields.Nested(SchWriterContentSchema, required=True)
     brand = fields.Dict(required=False, allow_none=True)
     preferences = fields.Dict(required=False, allow_none=True)
+    # true -> skip cached generations and ask the model again
+    regenerate = fields.Bool(required=False, load_default=False)
 
     @validates_schema
     def validate_payload(self, data, **kwargs):
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-field encryption vs document-level envelope encryption.
+
+Encrypts/decrypts N synthetic product documents both ways and reports
+crypto time and stored size per document.
+
+Usage:
+    SECRET_KEY=... python app/scripts/bench_envelope_encryption.py [N]
+"""
+
+import json
+import os
+import sys
+import time
+
+# Add app root to sys.path (same convention as daily_log_ping.py)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM  # noqa: E402
+
+from utils.crypt import encrypt_data, decrypt_data  # noqa: E402
+from utils.envelope import seal_with_key, open_with_key  # noqa: E402
+
+try:
+    import bson
+
+    def _size(doc):
+        return len(bson.encode(doc))
+except ImportError:  # pragma: no cover - pymongo not installed
+    def _size(doc):
+        return len(json.dumps(doc, default=str).encode())
+
+
+PRODUCT_FIELDS = {
+    "name": "Organic Arabica Coffee 500g",
+    "brand": "64f1c0a2e4b0a1b2c3d4e5f6",
+    "description": "Single-origin medium roast, whole bean.",
+    "tags": ["64f1c0a2e4b0a1b2c3d4e5f7", "64f1c0a2e4b0a1b2c3d4e5f8"],
+    "category": "64f1c0a2e4b0a1b2c3d4e5f9",
+    "sell_on_point_of_sale": 1,
+    "images": ["https://cdn.example.com/p/1.jpg"],
+    "file_paths": ["/uploads/p/1.jpg"],
+    "product_type": "Single",
+    "sku": "COF-ARA-500",
+    "suppliers": ["64f1c0a2e4b0a1b2c3d4e5fa"],
+    "track_inventory": 1,
+    "product_location": "Aisle 4",
+    "tax": ["64f1c0a2e4b0a1b2c3d4e5fb"],
+    "prices": {"cost": 7.5, "selling": 12.99},
+    "variants": None,
+    "composite_product": None,
+    "status": "Active",
+    "warranty": None,
+    "manufacturer": "Roasters Ltd",
+    "manufactured_date": "2025-01-10",
+    "expiry_on": "2026-01-10",
+    "subcategory": "64f1c0a2e4b0a1b2c3d4e5fc",
+    "unit": "64f1c0a2e4b0a1b2c3d4e5fd",
+    "alert_quantity": 10,
+    "barcode_symbology": "EAN13",
+    "selling_price_group": None,
+}
+
+
+def _timeit(fn, n):
+    start = time.perf_counter()
+    out = None
+    for _ in range(n):
+        out = fn()
+    return (time.perf_counter() - start) / n, out
+
+
+def main(n=500):
+    aead = AESGCM(AESGCM.generate_key(bit_length=256))
+    aad = b"products:64f1c0a2e4b0a1b2c3d4e5f0"
+    fields = list(PRODUCT_FIELDS)
+
+    def per_field_encrypt():
+        return {f: encrypt_data(v) for f, v in PRODUCT_FIELDS.items() if v is not None}
+
+    def envelope_encrypt():
+        return {"_enc": seal_with_key(aead, "bench", PRODUCT_FIELDS, aad)}
+
+    pf_enc_s, pf_doc = _timeit(per_field_encrypt, n)
+    ev_enc_s, ev_doc = _timeit(envelope_encrypt, n)
+
+    pf_dec_s, _ = _timeit(lambda: {f: decrypt_data(v) for f, v in pf_doc.items()}, n)
+    ev_dec_s, _ = _timeit(lambda: open_with_key(aead, ev_doc["_enc"], aad), n)
+
+    pf_ops = len(pf_doc)
+    rows = [
+        ("per-field", pf_ops, pf_enc_s, pf_dec_s, _size(pf_doc)),
+        ("envelope", 1, ev_enc_s, ev_dec_s, _size(ev_doc)),
+    ]
+
+    print(f"documents={n} fields={len(fields)}")
+    print(f"{'mode':<10} {'aead ops/doc':>12} {'encrypt us':>11} {'decrypt us':>11} {'bytes/doc':>10}")
+    for mode, ops, enc_s, dec_s, size in rows:
+        print(f"{mode:<10} {ops:>12} {enc_s * 1e6:>11.1f} {dec_s * 1e6:>11.1f} {size:>10}")
+    print(
+        f"listing {n} docs: per-field decrypt {pf_dec_s * n * 1000:.1f} ms, "
+        f"envelope decrypt {ev_dec_s * n * 1000:.1f} ms "
+        f"({pf_dec_s / ev_dec_s:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON response encoding, current path vs the orjson fast path.
+
+Encodes one listing response of N synthetic transaction documents (ObjectId,
+datetime, Decimal, nested lists) three ways and reports time per response:
+
+    current  recursive ObjectId stringify + Flask DefaultJSONProvider
+    fast     FastJSONProvider (orjson, native handlers, no pre-walk)
+    stream   stream_array() chunks joined (cost of the streaming encoder)
+
+Usage:
+    python app/scripts/bench_json_response.py [N] [ROUNDS]
+"""
+
+import copy
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+# Add app root to sys.path (same convention as bench_envelope_encryption.py)
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from bson import ObjectId  # noqa: E402
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from utils import fast_json  # noqa: E402
+from utils.fast_json import FastJSONProvider, stream_array  # noqa: E402
+
+
+def _doc(i, base):
+    return {
+        "_id": ObjectId(),
+        "business_id": ObjectId(),
+        "agent_id": ObjectId(),
+        "sender_id": ObjectId(),
+        "beneficiary_id": ObjectId(),
+        "internal_reference": f"TRX{i:010d}",
+        "status": "Successful",
+        "partner_name": "Intermex",
+        "amount_details": {
+            "send_amount": Decimal("125.50"),
+            "receive_amount": Decimal("1510.26"),
+            "fee": Decimal("2.99"),
+            "rate": Decimal("12.0340"),
+            "currency": "GBP",
+        },
+        "receiver": {"name": "Ama Mensah", "msisdn": "233201234567", "country": "GH"},
+        "history": [
+            {"status": s, "by": ObjectId(), "at": base + timedelta(minutes=k)}
+            for k, s in enumerate(("Pending", "Processing", "Successful"))
+        ],
+        "created_at": base + timedelta(seconds=i),
+        "updated_at": base + timedelta(seconds=i, minutes=3),
+    }
+
+
+def _stringify(v):
+    # what listing handlers do today before jsonify
+    if isinstance(v, ObjectId):
+        return str(v)
+    if isinstance(v, dict):
+        return {kk: _stringify(vv) for kk, vv in v.items()}
+    if isinstance(v, list):
+        return [_stringify(x) for x in v]
+    return v
+
+
+def _timeit(fn, rounds):
+    fn()  # warm up
+    start = time.perf_counter()
+    out = None
+    for _ in range(rounds):
+        out = fn()
+    return (time.perf_counter() - start) / rounds, out
+
+
+def main(n=2000, rounds=20):
+    app = Flask("bench")
+    current = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    base = datetime(2025, 1, 1, 8, 0, 0)
+    docs = [_doc(i, base) for i in range(n)]
+
+    def envelope(items):
+        return {"success": True, "status_code": 200, "message": "OK", "data": {"transactions": items, "total_count": n}}
+
+    def current_path():
+        # stringify copies, like the handlers do
+        return current.dumps(envelope([_stringify(d) for d in docs])).encode()
+
+    def fast_path():
+        return fast_json.dumps_bytes(envelope(docs))
+
+    def stream_path():
+        return b"".join(stream_array(docs, head={"success": True, "status_code": 200, "message": "OK"}))
+
+    rows = []
+    for name, fn in (("current", current_path), ("fast", fast_path), ("stream", stream_path)):
+        secs, body = _timeit(fn, rounds)
+        rows.append((name, secs, len(body)))
+
+    # sanity: same values once decoded (with Flask's http-date datetimes)
+    if fast_json.DATETIME_FORMAT == "http":
+        assert fast.loads(fast_path()) == current.loads(current_path())
+
+    print(f"orjson={'yes' if fast_json.orjson is not None else 'NO (stdlib fallback)'} "
+          f"datetime_format={fast_json.DATETIME_FORMAT} documents={n} rounds={rounds}")
+    print(f"{'path':<8} {'ms/response':>12} {'MB/s':>8} {'bytes':>10} {'speedup':>8}")
+    base_secs = rows[0][1]
+    for name, secs, size in rows:
+        print(f"{name:<8} {secs * 1000:>12.2f} {size / secs / 1e6:>8.1f} {size:>10} {base_secs / secs:>7.1f}x")
+
+    # the pre-walk alone, which the fast path no longer needs
+    walk_secs, _ = _timeit(lambda: [_stringify(copy.copy(d)) for d in docs], rounds)
+    print(f"recursive stringify alone: {walk_secs * 1000:.2f} ms ({walk_secs / base_secs:.0%} of current)")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
@@ -0,0 +1,7 @@
+# app/scripts/benchmarks
+#
+# Hot-path benchmark suite; run with app/scripts/run_benchmarks.py.
+#
+#   harness.py  timing, results, baseline compare
+#   seed.py     synthetic tenants in a throwaway local database
+#   cases.py    the benchmarks (@case registry)
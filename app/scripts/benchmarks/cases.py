@@ -0,0 +1,239 @@
+# app/scripts/benchmarks/cases.py
+#
+# Hot paths under benchmark. Each factory gets the seeded context
+# ({"app", "tenants", ...}) and returns the timed op.
+#
+# Provider calls are faked (no network): _publish_scheduled_post runs its real
+# orchestration (post lookup, status writes, text/link resolution) against
+# fake platform publishers, and the follow-up email enqueue is a no-op.
+
+from __future__ import annotations
+
+import uuid
+
+from .harness import case
+
+
+def _tenant(ctx, i=0):
+    return ctx["tenants"][i % len(ctx["tenants"])]
+
+
+# ---------------------------------------------------------------------
+# Auth
+# ---------------------------------------------------------------------
+def _token_required_op(ctx, cold: bool):
+    from app.resources.doseal.admin.admin_business_resource import token_required
+    from app.utils import principal_cache
+
+    app = ctx["app"]
+    user = _tenant(ctx)["user"]
+    headers = {"Authorization": f"Bearer {user['access_token']}"}
+    view = token_required(lambda: "ok")
+
+    def op():
+        with app.test_request_context("/bench", headers=headers):
+            view()
+        if cold:
+            return lambda: principal_cache.invalidate_user(user["user_id"], reason="bench")
+    return op
+
+
+@case("auth.token_required.cached", group="auth")
+def token_required_cached(ctx):
+    return _token_required_op(ctx, cold=False)
+
+
+@case("auth.token_required.cold", group="auth")
+def token_required_cold(ctx):
+    return _token_required_op(ctx, cold=True)
+
+
+# ---------------------------------------------------------------------
+# Listings
+# ---------------------------------------------------------------------
+@case("paginate.page_1", group="listing")
+def paginate_first(ctx):
+    from app.models.admin.sale import Sale
+
+    query = {"business_id": _tenant(ctx)["business_id"]}
+    return lambda: Sale.paginate(dict(query), page=1, per_page=50)
+
+
+@case("paginate.page_100", group="listing")
+def paginate_deep(ctx):
+    from app.models.admin.sale import Sale
+
+    query = {"business_id": _tenant(ctx)["business_id"]}
+    return lambda: Sale.paginate(dict(query), page=100, per_page=50)
+
+
+@case("paginate.cursor_page_100", group="listing")
+def paginate_cursor_deep(ctx):
+    from app.models.admin.sale import Sale
+
+    query = {"business_id": _tenant(ctx)["business_id"]}
+    cursor = ""
+    for _ in range(99):
+        cursor = Sale.paginate(dict(query), per_page=50, cursor=cursor)["next_cursor"]
+    return lambda: Sale.paginate(dict(query), per_page=50, cursor=cursor)
+
+
+# ---------------------------------------------------------------------
+# Crypto
+# ---------------------------------------------------------------------
+PLAINTEXT = "Bench Owner 0 <owner0@bench.local> +447000000000"
+
+
+@case("crypt.encrypt_data", group="crypto")
+def encrypt(ctx):
+    from app.utils.crypt import encrypt_data
+    return lambda: encrypt_data(PLAINTEXT)
+
+
+@case("crypt.decrypt_data", group="crypto")
+def decrypt(ctx):
+    from app.utils.crypt import encrypt_data, decrypt_data
+    token = encrypt_data(PLAINTEXT)
+    return lambda: decrypt_data(token)
+
+
+# ---------------------------------------------------------------------
+# POS
+# ---------------------------------------------------------------------
+def _cart(products, lines=3):
+    cart_lines, subtotal, cost = [], 0.0, 0.0
+    for p in products[:lines]:
+        cart_lines.append({**p, "quantity": 1, "tax_rate": 0, "tax_amount": 0, "line_total": p["unit_price"]})
+        subtotal += p["unit_price"]
+        cost += p["unit_cost"]
+    return {
+        "lines": cart_lines,
+        "totals": {"subtotal": subtotal, "total_discount": 0, "total_tax": 0, "total_cost": cost, "grand_total": subtotal},
+    }
+
+
+@case("pos.create_sale_from_cart", group="pos", rounds=50)
+def create_sale(ctx):
+    from app.services.pos.sale.sale_service import SaleService
+
+    t = _tenant(ctx)
+    cart = _cart(t["products"])
+
+    def op():
+        SaleService.create_sale_from_cart(
+            business_id=t["business_id"],
+            outlet_id=t["outlet_id"],
+            user_id=t["user"]["user_id"],
+            user__id=t["user"]["user__id"],
+            cart=cart,
+            payment_method="Cash",
+        )
+    return op
+
+
+def _place_hold_op(ctx, lines):
+    from app.services.pos_ledger_service import place_stock_hold, release_stock_hold
+
+    t = _tenant(ctx)
+    items = [{"product_id": p["product_id"], "qty": 1} for p in t["products"][:lines]]
+
+    def op():
+        res = place_stock_hold(
+            business_id=t["business_id"],
+            outlet_id=t["outlet_id"],
+            cashier_id=t["user"]["user__id"],
+            cart_id=uuid.uuid4().hex,
+            items=items,
+            idempotency_key=f"bench-hold-{uuid.uuid4().hex}",
+            purpose="bench",
+            ref="bench",
+        )
+        # released outside the timer, so active holds do not pile up
+        return lambda: release_stock_hold(
+            business_id=t["business_id"], hold_id=res["hold_id"],
+            idempotency_key=f"bench-release-{uuid.uuid4().hex}", reason="bench",
+        )
+    return op
+
+
+@case("pos.place_stock_hold", group="pos", rounds=50)
+def place_hold(ctx):
+    return _place_hold_op(ctx, lines=3)
+
+
+@case("pos.place_stock_hold.wide", group="pos", rounds=50)
+def place_hold_wide(ctx):
+    # every seeded product (BENCH_PRODUCTS) in one basket
+    return _place_hold_op(ctx, lines=len(_tenant(ctx)["products"]))
+
+
+@case("pos.validate_stock_availability.wide", group="pos")
+def validate_stock_wide(ctx):
+    from app.services.pos.inventory_service import InventoryService
+
+    t = _tenant(ctx)
+    items = [{"product_id": p["product_id"], "quantity": 1} for p in t["products"]]
+    return lambda: InventoryService.validate_stock_availability(t["business_id"], t["outlet_id"], items)
+
+
+# ---------------------------------------------------------------------
+# Social publishing
+# ---------------------------------------------------------------------
+def _fake_publisher(platform):
+    def publish(*, post, dest, text, link, media):
+        return {
+            "platform": platform,
+            "destination_id": str(dest.get("destination_id") or ""),
+            "status": "success",
+            "provider_post_id": f"fake-{uuid.uuid4().hex[:12]}",
+            "raw": {"id": "fake", "text_length": len(text or "")},
+        }
+    return publish
+
+
+@case("social.publish_scheduled_post", group="social", rounds=100)
+def publish_post(ctx):
+    from app.extensions import queue as queue_ext
+    from app.services.social import jobs
+
+    for platform in ("facebook", "x", "linkedin"):
+        setattr(jobs, f"_publish_to_{platform}", _fake_publisher(platform))
+    queue_ext.enqueue = lambda *args, **kwargs: None
+
+    t = _tenant(ctx)
+    app = ctx["app"]
+
+    def op():
+        with app.app_context():
+            jobs._publish_scheduled_post(t["post_id"], str(t["business_id"]))
+    return op
+
+
+# ---------------------------------------------------------------------
+# Fees
+# ---------------------------------------------------------------------
+@case("fees.composite_fee", group="fees")
+def composite_fee(ctx):
+    from app.utils.calculate_composite_fee import calculate_composite_fee
+
+    amounts = [25.0, 180.0, 450.0, 990.0, 2500.0]
+
+    def op():
+        for currency in ("NGN", "GHS", "BBD"):
+            for amount in amounts:
+                calculate_composite_fee(currency, amount)
+        calculate_composite_fee("GHS", 120.0, transaction_type="billpay")
+    return op
+
+
+@case("fees.calculation_engine", group="fees")
+def engine_fees(ctx):
+    from app.utils import calculation_engine as ce
+
+    def op():
+        fee = ce.calculate_fee("BANK", 250.0) + ce.calculate_fee("WALLET", 250.0)
+        ce.calculate_composite_fee("NGN", 450.0)
+        receive = ce.cal_receive_amount_with_rate(250.0, "15.4321")
+        ce.cal_total_send_amount(250.0, fee)
+        ce.cal_total_receive_amount(receive, 2.5)
+    return op
@@ -0,0 +1,99 @@
+# app/scripts/benchmarks/harness.py
+#
+# Key design:
+# - A case is a factory: case(ctx) -> op, called once after seeding. op() is
+#   the timed unit; it may return a callable that undoes its side effects
+#   (release a hold, ...), which runs outside the timer
+# - Each case runs `warmup` untimed ops, then `rounds` timed ops; results are
+#   per-op median / p95 / min in ms
+# - Baselines are a JSON file keyed by case name. A case regresses when its
+#   median exceeds baseline * (1 + threshold) AND the absolute slowdown is
+#   above a noise floor (tiny ops jitter by more than 20 %)
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+CASES: Dict[str, Dict[str, Any]] = {}
+
+NOISE_FLOOR_MS = float(os.getenv("BENCH_NOISE_FLOOR_MS", "0.05"))
+
+
+def case(name: str, *, group: str, rounds: Optional[int] = None):
+    """
+    Register a benchmark: @case("crypt.encrypt_data", group="crypto").
+    rounds overrides the runner default for slow (write-heavy) cases.
+    """
+    def decorator(factory: Callable):
+        CASES[name] = {"factory": factory, "group": group, "rounds": rounds}
+        return factory
+    return decorator
+
+
+def run_case(name: str, ctx: Dict[str, Any], rounds: int, warmup: int) -> Dict[str, Any]:
+    spec = CASES[name]
+    rounds = spec["rounds"] or rounds
+    op = spec["factory"](ctx)
+
+    def _once() -> float:
+        start = time.perf_counter()
+        undo = op()
+        elapsed = (time.perf_counter() - start) * 1000
+        if callable(undo):
+            undo()
+        return elapsed
+
+    for _ in range(warmup):
+        _once()
+    samples = sorted(_once() for _ in range(rounds))
+
+    return {
+        "case": name,
+        "group": spec["group"],
+        "rounds": rounds,
+        "median_ms": round(statistics.median(samples), 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min_ms": round(samples[0], 4),
+    }
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fh:
+        return json.load(fh).get("cases", {})
+
+
+def save_baseline(path: str, results: List[Dict[str, Any]], meta: Dict[str, Any]):
+    existing = load_baseline(path)
+    existing.update({r["case"]: {"median_ms": r["median_ms"], "p95_ms": r["p95_ms"]} for r in results})
+    with open(path, "w") as fh:
+        json.dump({"meta": meta, "cases": dict(sorted(existing.items()))}, fh, indent=2)
+        fh.write("\n")
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Annotates each result with baseline / change / status; returns the regressions.
+    """
+    regressions = []
+    for r in results:
+        base = baseline.get(r["case"])
+        if not base:
+            r["status"] = "new"
+            continue
+        r["baseline_ms"] = base["median_ms"]
+        r["change"] = round(r["median_ms"] / base["median_ms"] - 1, 4) if base["median_ms"] else 0.0
+        slower_ms = r["median_ms"] - base["median_ms"]
+        if r["change"] > threshold and slower_ms > NOISE_FLOOR_MS:
+            r["status"] = "REGRESSED"
+            regressions.append(r)
+        elif r["change"] < -threshold and -slower_ms > NOISE_FLOOR_MS:
+            r["status"] = "improved"
+        else:
+            r["status"] = "ok"
+    return regressions
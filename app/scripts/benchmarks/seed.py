@@ -0,0 +1,160 @@
+# app/scripts/benchmarks/seed.py
+#
+# Synthetic tenants for the benchmark suite.
+#
+# Key design:
+# - Everything goes into BENCH_DB_NAME (default doseal_bench), which is
+#   dropped first; reset() refuses any database whose name lacks "bench"
+# - Data is created through the real models/services (User, Token,
+#   InventoryService, ScheduledPost), so encrypted fields and ledger rows look
+#   like production; bulk listing rows (sales) are inserted directly
+# - Indexes come from the index registry (`flask indexes build`), so queries
+#   run against the production index set
+# - Deterministic: fixed random seed, fixed sizes (BENCH_TENANTS,
+#   BENCH_PRODUCTS, BENCH_SALES)
+
+from __future__ import annotations
+
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import jwt
+from bson import ObjectId
+
+from app.constants.service_code import SYSTEM_USERS
+from app.extensions.db import db
+from app.models.admin.stock_ledger import StockLedger
+from app.models.business_model import Token
+from app.models.social.scheduled_post import ScheduledPost
+from app.models.user_model import User
+from app.services.pos.inventory_service import InventoryService
+from app.utils import index_registry
+
+
+TENANTS = int(os.getenv("BENCH_TENANTS", "3"))
+PRODUCTS = int(os.getenv("BENCH_PRODUCTS", "20"))
+SALES = int(os.getenv("BENCH_SALES", "10000"))
+OPENING_STOCK = 10_000_000
+
+
+def reset():
+    name = db.db.name
+    if "bench" not in name:
+        raise SystemExit(f"refusing to drop database {name!r}: benchmark database names must contain 'bench'")
+    db.client.drop_database(name)
+
+
+def _user(business_id: ObjectId, i: int) -> Dict[str, Any]:
+    client_id = f"bench-client-{i}"
+    user__id = User(
+        phone_number=f"+44700000{i:04d}",
+        password="$2b$12$benchbenchbenchbenchbenchbenchbenchbenchbenchbenchbe",  # pre-hashed: skip bcrypt
+        client_id=client_id,
+        business_id=str(business_id),
+        fullname=f"Bench Owner {i}",
+        email=f"owner{i}@bench.local",
+        status="Active",
+        account_type=SYSTEM_USERS["BUSINESS_OWNER"],
+        tenant_id="1",
+    ).save()
+
+    now = datetime.now(timezone.utc)
+    access_token = jwt.encode(
+        {"user_id": str(user__id), "exp": now + timedelta(days=1), "iat": now, "jti": uuid.uuid4().hex},
+        os.getenv("SECRET_KEY"), algorithm="HS256",
+    )
+    Token.create_token(client_id, str(user__id), access_token, uuid.uuid4().hex, 86400, 604800)
+    return {"user__id": user__id, "user_id": str(user__id), "access_token": access_token}
+
+
+def _products(business_id: ObjectId, outlet_id: ObjectId, user: Dict[str, Any], rng: random.Random) -> List[Dict[str, Any]]:
+    products = []
+    for p in range(PRODUCTS):
+        product_id = ObjectId()
+        InventoryService.increase_stock(
+            business_id=business_id,
+            outlet_id=outlet_id,
+            product_id=product_id,
+            quantity=OPENING_STOCK,
+            reference_type=StockLedger.REF_TYPE_OPENING_STOCK,
+            user_id=user["user_id"],
+            user__id=user["user__id"],
+            note="bench opening stock",
+            unit_cost=round(rng.uniform(1, 50), 2),
+        )
+        products.append({
+            "product_id": str(product_id),
+            "product_name": f"Bench Product {p}",
+            "category": "Bench",
+            "unit_price": round(rng.uniform(5, 100), 2),
+            "unit_cost": round(rng.uniform(1, 5), 2),
+        })
+    return products
+
+
+def _sales(business_id: ObjectId, outlet_id: ObjectId, user: Dict[str, Any], products, rng: random.Random):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for n in range(SALES):
+        line = rng.choice(products)
+        qty = rng.randint(1, 5)
+        total = round(line["unit_price"] * qty, 2)
+        batch.append({
+            "business_id": business_id,
+            "outlet_id": outlet_id,
+            "user__id": user["user__id"],
+            "cashier_id": user["user__id"],
+            "status": "Completed",
+            "payment_method": rng.choice(["Cash", "Card", "Mobile Money"]),
+            "cart": {
+                "lines": [{**line, "quantity": qty, "line_total": total, "tax_rate": 0, "tax_amount": 0}],
+                "totals": {"subtotal": total, "total_discount": 0, "total_tax": 0, "total_cost": line["unit_cost"] * qty, "grand_total": total},
+            },
+            "created_at": start + timedelta(minutes=n),
+        })
+        if len(batch) == 1000:
+            db.get_collection("sales").insert_many(batch)
+            batch = []
+    if batch:
+        db.get_collection("sales").insert_many(batch)
+
+
+def _scheduled_post(business_id: ObjectId, user: Dict[str, Any]) -> str:
+    post = ScheduledPost.create({
+        "business_id": business_id,
+        "user__id": user["user__id"],
+        "scheduled_at_utc": datetime.now(timezone.utc),
+        "content": {"text": "Bench post: weekend opening hours #bench", "link": "https://bench.local/hours"},
+        "destinations": [
+            {"platform": "facebook", "destination_id": "bench-page", "destination_type": "page"},
+            {"platform": "x", "destination_id": "bench-x", "destination_type": "user"},
+            {"platform": "linkedin", "destination_id": "bench-org", "destination_type": "organization"},
+        ],
+    })
+    return str(post["_id"])
+
+
+def seed() -> Dict[str, Any]:
+    rng = random.Random(42)
+    reset()
+
+    tenants = []
+    for i in range(TENANTS):
+        business_id = ObjectId()
+        outlet_id = ObjectId()
+        user = _user(business_id, i)
+        products = _products(business_id, outlet_id, user, rng)
+        _sales(business_id, outlet_id, user, products, rng)
+        tenants.append({
+            "business_id": business_id,
+            "outlet_id": outlet_id,
+            "user": user,
+            "products": products,
+            "post_id": _scheduled_post(business_id, user),
+        })
+
+    index_registry.build()
+    return {"tenants": tenants, "sizes": {"tenants": TENANTS, "products": PRODUCTS, "sales": SALES}}
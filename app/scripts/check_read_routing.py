@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Check read routing against a replica set: which member serves each read
+profile (app/extensions/read_routing.py).
+
+Runs `hello` with every profile's read preference and prints the member that
+answered, its role and tags. Against docker/mongo-replica the expected result
+is primary -> rs-primary, reports/exports -> rs-analytics, dashboards/listings
+-> a secondary.
+
+Usage:
+    MONGO_URI_OVERRIDE="mongodb://localhost:27117,localhost:27118,localhost:27119/doseal?replicaSet=rs0" \\
+        python app/scripts/check_read_routing.py
+"""
+
+import os
+import sys
+
+# Repo root on sys.path so `app` imports as a package
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+from pymongo import MongoClient  # noqa: E402
+
+from app.extensions import read_routing  # noqa: E402
+
+
+def main():
+    uri = os.getenv("MONGO_URI_OVERRIDE")
+    if not uri:
+        sys.exit("MONGO_URI_OVERRIDE is required (replica set URI)")
+
+    client = MongoClient(uri, serverSelectionTimeoutMS=10000)
+    admin = client.get_database("admin")
+
+    members = {m["name"]: m for m in admin.command("replSetGetConfig")["config"]["members"]}
+
+    print(f"{'profile':<12} {'mode':<20} {'staleness':>9}  served by")
+    for name in sorted(read_routing._DEFAULT_PROFILES):
+        mode, staleness = read_routing.profile_config(name)
+        pref = read_routing.read_preference(name)
+        hello = admin.command("hello", read_preference=pref) if pref else admin.command("hello")
+        me = hello.get("me")
+        role = "primary" if hello.get("isWritablePrimary") else "secondary"
+        tags = (members.get(me) or {}).get("tags") or {}
+        print(f"{name:<12} {mode:<20} {staleness:>9}  {me} ({role}) {tags or ''}")
+
+
+if __name__ == "__main__":
+    main()
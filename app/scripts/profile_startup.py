@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Startup profile: import and initialisation cost per module for the app
+factories, optionally for a subset of route groups.
+
+Builds the app(s) with STARTUP_PROFILE=1 and prints the slowest modules, the
+cost per top-level package and the init phases.
+
+Usage:
+    python app/scripts/profile_startup.py [admin|social|both] [--groups core,pos] [--top 30] [--json out.json]
+
+Compare a full boot with a single-purpose one:
+    python app/scripts/profile_startup.py social
+    python app/scripts/profile_startup.py social --groups ""      # worker / enqueuer
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Repo root on sys.path so `app` imports as a package
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+# must be set before `app` is imported: the profiler installs itself on import
+os.environ["STARTUP_PROFILE"] = "1"
+
+
+def _print(data, elapsed_ms):
+    print(f"\n== {data['label']}: {elapsed_ms:.1f} ms to build, "
+          f"{data['modules_imported']} modules imported ({data['import_ms']} ms) ==")
+    print("phases:")
+    for row in data["phases"]:
+        print(f"  {row['phase']:<24} {row['ms']:>10.1f} ms")
+    print("packages (self time):")
+    for row in data["packages"]:
+        print(f"  {row['package']:<24} {row['ms']:>10.1f} ms  {row['modules']:>5} modules")
+    print("modules (self / inclusive):")
+    for row in data["slowest_self"]:
+        print(f"  {row['module']:<60} {row['self_ms']:>9.1f} {row['inclusive_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("target", nargs="?", default="both", choices=["admin", "social", "both"])
+    parser.add_argument("--groups", default=None, help='route groups (comma-separated, "" = none); default SERVICE_GROUPS')
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    import app  # noqa: E402
+    from app.utils import startup_profiler  # noqa: E402
+    import_ms = (time.perf_counter() - t0) * 1000
+    print(f"import app: {import_ms:.1f} ms")
+
+    groups = None if args.groups is None else [g for g in args.groups.split(",") if g.strip()]
+    targets = ["admin", "social"] if args.target == "both" else [args.target]
+    factories = {"admin": app.create_mto_admin_app, "social": app.create_social_app}
+
+    results = []
+    for label in targets:
+        start = time.perf_counter()
+        factories[label](service_groups=groups)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        data = startup_profiler.snapshot(label, args.top)
+        data["build_ms"] = round(elapsed_ms, 2)
+        _print(data, elapsed_ms)
+        results.append(data)
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump({"import_ms": round(import_ms, 2), "apps": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Hot-path benchmark suite with stored baselines.
+
+Seeds synthetic tenants into a throwaway local database, times each case
+(app/scripts/benchmarks/cases.py) and compares the medians with the stored
+baseline. Exits 1 when a case is slower than baseline by more than the
+threshold, so it can gate a local run.
+
+Needs the local replica set (stock holds use transactions) and Redis:
+    docker compose -f docker/mongo-replica/docker-compose.yml up -d
+    docker compose up -d redis
+
+Usage:
+    python app/scripts/run_benchmarks.py                      # run + compare
+    python app/scripts/run_benchmarks.py --update-baseline    # record new baseline
+    python app/scripts/run_benchmarks.py --only pos,fees --rounds 500 --threshold 0.15
+    python app/scripts/run_benchmarks.py --list
+
+Defaults (override via env): MONGO_URI_OVERRIDE -> local replica set,
+DB_NAME=doseal_bench, REDIS_URL=redis://localhost:6379/15. Baselines are
+machine-specific: record them on the machine that runs the comparison. No
+baseline is committed; comparing without one exits 2 before anything runs
+(record one with --update-baseline, or pass --json for a plain report).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+# Repo root on sys.path so `app` imports as a package
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, project_root)
+
+# local, throwaway services unless told otherwise; must be set before `app` is imported
+os.environ.setdefault("DB_NAME", os.getenv("BENCH_DB_NAME", "doseal_bench"))
+os.environ.setdefault(
+    "MONGO_URI_OVERRIDE",
+    f"mongodb://localhost:27117,localhost:27118,localhost:27119/{os.environ['DB_NAME']}?replicaSet=rs0",
+)
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/15")
+os.environ.setdefault("SECRET_KEY", "bench-secret-key-bench-secret-key-0123")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["REQUEST_PROFILE_ENABLED"] = "false"
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "benchmarks", "baseline.json")
+
+
+def _print(results):
+    print(f"{'case':<34} {'median ms':>10} {'p95 ms':>10} {'baseline':>10} {'change':>8}  status")
+    for r in results:
+        base = f"{r['baseline_ms']:.4f}" if "baseline_ms" in r else "-"
+        change = f"{r['change']:+.1%}" if "change" in r else "-"
+        print(f"{r['case']:<34} {r['median_ms']:>10.4f} {r['p95_ms']:>10.4f} {base:>10} {change:>8}  {r.get('status', '')}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", default="", help="comma-separated case names or groups")
+    parser.add_argument("--rounds", type=int, default=int(os.getenv("BENCH_ROUNDS", "200")))
+    parser.add_argument("--warmup", type=int, default=int(os.getenv("BENCH_WARMUP", "10")))
+    parser.add_argument("--threshold", type=float, default=float(os.getenv("BENCH_THRESHOLD", "0.20")),
+                        help="allowed median slowdown vs baseline (0.20 = 20%%)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", dest="json_path", default=None)
+    parser.add_argument("--list", action="store_true")
+    args = parser.parse_args()
+
+    from app.scripts.benchmarks import cases  # noqa: F401,E402  (registers cases)
+    from app.scripts.benchmarks.harness import CASES, compare, load_baseline, run_case, save_baseline  # noqa: E402
+
+    wanted = {w.strip() for w in args.only.split(",") if w.strip()}
+    names = [n for n, spec in CASES.items() if not wanted or n in wanted or spec["group"] in wanted]
+    if args.list or not names:
+        for n, spec in CASES.items():
+            print(f"{spec['group']:<8} {n}")
+        return 0 if args.list else 2
+
+    comparing = not args.update_baseline and not args.json_path
+    if comparing and not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}: record one on this machine with --update-baseline "
+              f"(or pass --json to only report timings)", file=sys.stderr)
+        return 2
+    if comparing:
+        with open(args.baseline) as fh:
+            recorded_on = (json.load(fh).get("meta") or {}).get("machine")
+        if recorded_on and recorded_on != platform.node():
+            print(f"warning: baseline was recorded on {recorded_on}, this is {platform.node()}; "
+                  f"timings are not comparable across machines", file=sys.stderr)
+
+    from app import create_mto_admin_app  # noqa: E402
+    from app.scripts.benchmarks.seed import seed  # noqa: E402
+
+    app = create_mto_admin_app(service_groups=())
+    with app.app_context():
+        ctx = seed()
+        ctx["app"] = app
+        print(f"seeded {ctx['sizes']} into {os.environ['DB_NAME']}")
+
+        results = []
+        for name in names:
+            results.append(run_case(name, ctx, args.rounds, args.warmup))
+            print(f"  {name}: {results[-1]['median_ms']:.4f} ms")
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    print()
+    _print(results)
+
+    meta = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "rounds": args.rounds,
+        "sizes": ctx["sizes"],
+    }
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump({"meta": meta, "results": results}, fh, indent=2)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, meta)
+        print(f"\nbaseline updated: {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: "
+              + ", ".join(r["case"] for r in regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
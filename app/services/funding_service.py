@@ -24,13 +24,14 @@ def _money(x) -> str:
 def _col():
     return db.get_collection("funding_requests")
 
-# -------- indexes (call once at startup) --------
-def setup_funding_indexes():
-    _col().create_indexes([
+# -------- indexes (built by `flask indexes build`) --------
+INDEXES = {
+    "funding_requests": (
         IndexModel([("business_id", ASCENDING), ("created_at", ASCENDING)], name="biz_created"),
         IndexModel([("agent_id", ASCENDING), ("created_at", ASCENDING)], name="agent_created"),
         IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created"),
-    ])
+    ),
+}
 
 # -------- API: create + execute in one step --------
 def start_funding_request(
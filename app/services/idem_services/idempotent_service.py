@@ -6,7 +6,8 @@ from ..pos_ledger_service import (
     place_stock_hold,
     capture_stock_hold,
     release_stock_hold,
-    release_expired_stock_holds
+    release_expired_stock_holds,
+    InsufficientStock
 )
 from ...utils.pos_idempotent_keys import (
     keys_for_stock_hold,
@@ -86,11 +87,14 @@ def place_hold_service(cart, business_id, outlet_id, cashier_id, checksum_privat
         # Inventory helpers raise ValueError("INSUFFICIENT_STOCK") when reservation would oversell
         Log.info("[idempotent_service.py] Inventory helpers raise ValueError('INSUFFICIENT_STOCK') when reservation would oversell.")
         msg = str(ve)
-        return {
+        res = {
             "success": False,
             "status_code": 422 if "INSUFFICIENT_STOCK" in msg else 400,
             "message": msg
         }
+        if isinstance(ve, InsufficientStock):
+            res["shortfalls"] = ve.shortfalls
+        return res
     
     except Exception as e:
         Log.info(f"[idempotent_service.py] Error occurred: {str(e)}")
@@ -3,13 +3,28 @@ from bson import ObjectId
 from ...models.admin.stock_ledger import StockLedger
 from ...utils.logger import Log
 from ...extensions.db import db
+from ..pos_ledger_service import (
+    apply_ledger_to_balance,
+    apply_ledger_rows_to_balances,
+    get_available_for_lines,
+    get_available_for_product,
+    run_stock_transaction,
+)
 
 
 class InventoryService:
     """
     Service layer for inventory/stock management.
     All stock operations go through this service to ensure consistency.
+    Ledger writes also update the materialized stock_balances
+    (services/pos_ledger_service.py) in the same transaction.
     """
+
+    @staticmethod
+    def _save_ledger(ledger, session):
+        ledger_id = ledger.save(session=session)
+        apply_ledger_to_balance(ledger.to_dict(), session=session)
+        return ledger_id
     
     @staticmethod
     def increase_stock(
@@ -73,7 +88,9 @@ class InventoryService:
                 admin_id=admin_id
             )
             
-            ledger_id = ledger.save()
+            # Ledger row and its stock_balances delta commit together
+            # (retried on write conflicts with concurrent stock movements)
+            ledger_id = run_stock_transaction(lambda s: InventoryService._save_ledger(ledger, s))
             
             if ledger_id:
                 Log.info(f"{log_tag} Stock increased by {quantity} for product {product_id}, ledger: {ledger_id}")
@@ -137,7 +154,9 @@ class InventoryService:
                 admin_id=admin_id
             )
             
-            ledger_id = ledger.save()
+            # Ledger row and its stock_balances delta commit together
+            # (retried on write conflicts with concurrent stock movements)
+            ledger_id = run_stock_transaction(lambda s: InventoryService._save_ledger(ledger, s))
             
             if ledger_id:
                 Log.info(f"{log_tag} Stock decreased by {quantity} for product {product_id}, ledger: {ledger_id}")
@@ -150,11 +169,83 @@ class InventoryService:
             Log.error(f"{log_tag} Error: {str(e)}")
             return None
     
+    @staticmethod
+    def decrease_stock_lines(
+        business_id,
+        outlet_id,
+        lines,
+        reference_type,
+        user_id,
+        user__id,
+        reference_id=None,
+        agent_id=None,
+        admin_id=None
+    ):
+        """
+        Decrease stock for several lines at once (e.g. all lines of a sale):
+        one transaction, one insert_many into the ledger and one bulk write
+        to stock_balances, instead of a transaction per line.
+        
+        Args:
+            Same as decrease_stock, except:
+            lines: List of dicts with keys:
+                - product_id: Product ObjectId or string
+                - quantity: Float - amount to decrease (must be positive)
+                - composite_variant_id: Optional variant ObjectId or string
+                - note: Optional note about the movement
+                - unit_cost: Optional cost per unit
+            
+        Returns:
+            List of string ledger entry IDs (in line order) if successful, None otherwise
+        """
+        log_tag = f"[inventory_service.py][InventoryService][decrease_stock_lines][{business_id}][{outlet_id}]"
+        
+        try:
+            bad = [line for line in lines if float(line.get("quantity", 0)) <= 0]
+            if bad:
+                Log.error(f"{log_tag} Quantity must be positive, got: {[line.get('quantity') for line in bad]}")
+                return None
+            
+            ledgers = [
+                StockLedger(
+                    business_id=business_id,
+                    outlet_id=outlet_id,
+                    product_id=line["product_id"],
+                    quantity_delta=-float(line["quantity"]),
+                    reference_type=reference_type,
+                    user_id=user_id,
+                    user__id=user__id,
+                    composite_variant_id=line.get("composite_variant_id"),
+                    reference_id=reference_id,
+                    note=line.get("note"),
+                    unit_cost=line.get("unit_cost"),
+                    agent_id=agent_id,
+                    admin_id=admin_id
+                )
+                for line in lines
+            ]
+            if not ledgers:
+                return []
+            
+            def _txn(s):
+                ids = StockLedger.save_many(ledgers, session=s)
+                apply_ledger_rows_to_balances([ledger.to_dict() for ledger in ledgers], session=s)
+                return ids
+
+            ledger_ids = run_stock_transaction(_txn)
+            
+            Log.info(f"{log_tag} Stock decreased for {len(ledger_ids)} lines")
+            return ledger_ids
+                
+        except Exception as e:
+            Log.error(f"{log_tag} Error: {str(e)}")
+            return None
+    
     @staticmethod
     def get_available_stock(business_id, outlet_id, product_id, composite_variant_id=None):
         """
-        Calculate current available stock by summing all quantity_deltas.
-        This is the single source of truth for stock levels.
+        Current stock (sum of all quantity_deltas), read from the materialized
+        stock_balances row(s); the ledger remains the source of truth.
         
         Args:
             business_id: Business ObjectId or string
@@ -172,37 +263,16 @@ class InventoryService:
             outlet_id = ObjectId(outlet_id) if not isinstance(outlet_id, ObjectId) else outlet_id
             product_id = ObjectId(product_id) if not isinstance(product_id, ObjectId) else product_id
             
-            # Build query
-            match_query = {
-                "business_id": business_id,
-                "outlet_id": outlet_id,
-                "product_id": product_id
-            }
-            
-            
-            if composite_variant_id:
-                composite_variant_id = ObjectId(composite_variant_id) if not isinstance(composite_variant_id, ObjectId) else composite_variant_id
-                match_query["composite_variant_id"] = composite_variant_id
-            
-            # Aggregate sum of quantity_delta
-            collection = db.get_collection(StockLedger.collection_name)
-            pipeline = [
-                {"$match": match_query},
-                {"$group": {
-                    "_id": None,
-                    "total_quantity": {"$sum": "$quantity_delta"}
-                }}
-            ]
-            
-            result = list(collection.aggregate(pipeline))
-            
-            if result and len(result) > 0:
-                stock = float(result[0].get("total_quantity", 0))
-                Log.info(f"{log_tag} Available stock: {stock}")
-                return stock
-            else:
-                Log.info(f"{log_tag} No stock records found, returning 0")
-                return 0.0
+            # Materialized balance (falls back to the ledger sum if not seeded yet)
+            balance = get_available_for_product(
+                business_id=business_id,
+                outlet_id=outlet_id,
+                product_id=product_id,
+                composite_variant_id=composite_variant_id
+            )
+            stock = float(balance["on_hand"])
+            Log.info(f"{log_tag} Available stock: {stock}")
+            return stock
                 
         except Exception as e:
             Log.error(f"{log_tag} Error: {str(e)}")
@@ -289,28 +359,24 @@ class InventoryService:
         log_tag = f"[inventory_service.py][InventoryService][validate_stock_availability][{business_id}][{outlet_id}]"
         
         try:
-            insufficient_items = []
-            
-            for item in items:
-                product_id = item.get("product_id")
-                composite_variant_id = item.get("composite_variant_id")
-                required_qty = float(item.get("quantity", 0))
-                
-                available = InventoryService.get_available_stock(
-                    business_id=business_id,
-                    outlet_id=outlet_id,
-                    product_id=product_id,
-                    composite_variant_id=composite_variant_id
-                )
-                
-                if available < required_qty:
-                    insufficient_items.append({
-                        "product_id": str(product_id),
-                        "composite_variant_id": str(composite_variant_id) if composite_variant_id else None,
-                        "required": required_qty,
-                        "available": available,
-                        "shortfall": required_qty - available
-                    })
+            # One grouped read for every line; repeated products are summed
+            lines = get_available_for_lines(
+                business_id=business_id,
+                outlet_id=outlet_id,
+                items=items,
+                qty_field="quantity"
+            )
+            insufficient_items = [
+                {
+                    "product_id": line["product_id"],
+                    "composite_variant_id": line["composite_variant_id"],
+                    "required": line["required"],
+                    "available": line["on_hand"],
+                    "shortfall": line["required"] - line["on_hand"]
+                }
+                for line in lines
+                if line["on_hand"] < line["required"]
+            ]
             
             if insufficient_items:
                 Log.error(f"{log_tag} Insufficient stock for {len(insufficient_items)} items")
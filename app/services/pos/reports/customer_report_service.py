@@ -4,6 +4,7 @@ from bson import ObjectId
 from ....models.admin.sale import Sale
 from app import db
 from ....utils.logger import Log
+from ....extensions.read_routing import reads
 from ....models.admin.customer_model import Customer
 
 
@@ -11,6 +12,7 @@ class CustomerReportService:
     """Service for generating customer reports and analytics."""
     
     @staticmethod
+    @reads("reports")
     def generate_top_customers_report(business_id, start_date, end_date, limit=50):
         """
         Generate top customers by revenue report.
@@ -136,6 +138,7 @@ class CustomerReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_customer_purchase_history(business_id, customer_id, start_date=None, end_date=None, limit=100):
         """
         Generate detailed purchase history for a specific customer.
@@ -260,6 +263,7 @@ class CustomerReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_customer_segmentation_report(business_id):
         """
         Generate customer segmentation analysis.
@@ -365,6 +369,7 @@ class CustomerReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_customer_retention_report(business_id):
         """
         Generate customer retention and churn analysis.
@@ -464,6 +469,7 @@ class CustomerReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_new_vs_returning_report(business_id, start_date, end_date):
         """
         Generate new vs returning customers analysis.
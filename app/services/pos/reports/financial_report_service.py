@@ -4,12 +4,14 @@ from bson import ObjectId
 from ....models.admin.sale import Sale
 from app import db
 from ....utils.logger import Log
+from ....extensions.read_routing import reads
 
 
 class FinancialReportService:
     """Service for generating financial reports and analytics."""
     
     @staticmethod
+    @reads("reports")
     def generate_payment_methods_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate payment methods analysis report.
@@ -105,6 +107,7 @@ class FinancialReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_cash_flow_report(business_id, date, outlet_id=None):
         """
         Generate daily cash flow report.
@@ -218,6 +221,7 @@ class FinancialReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_tax_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate tax collection report.
@@ -326,6 +330,7 @@ class FinancialReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_profit_loss_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate profit and loss statement.
@@ -443,7 +448,9 @@ class FinancialReportService:
             Log.error(f"{log_tag} Error: {str(e)}")
             return None
     
+    # end-of-day cash-up: must include the last sales, never stale
     @staticmethod
+    @reads("primary")
     def generate_z_report(business_id, date, outlet_id, cashier_id=None):
         """
         Generate end-of-day Z-report (daily sales summary).
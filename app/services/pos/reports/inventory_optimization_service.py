@@ -5,12 +5,14 @@ from ....models.product_model import Product
 from ....models.admin.sale import Sale
 from app import db
 from ....utils.logger import Log
+from ....extensions.read_routing import reads
 
 
 class InventoryOptimizationService:
     """Service for generating inventory optimization reports."""
     
     @staticmethod
+    @reads("reports")
     def generate_dead_stock_report(business_id, days_threshold=60, outlet_id=None):
         """
         Generate dead stock report (slow-moving/non-moving inventory).
@@ -118,6 +120,7 @@ class InventoryOptimizationService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_stock_turnover_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate stock turnover report.
@@ -277,6 +280,7 @@ class InventoryOptimizationService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_stockout_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate stockout report.
@@ -393,6 +397,7 @@ class InventoryOptimizationService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_abc_analysis_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate ABC analysis report.
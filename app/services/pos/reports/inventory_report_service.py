@@ -3,6 +3,7 @@ from datetime import datetime
 from bson import ObjectId
 from app import db
 from ....utils.logger import Log
+from ....extensions.read_routing import reads
 from ..inventory_service import InventoryService
 from ....models.product_model import Product
 
@@ -11,6 +12,7 @@ class InventoryReportService:
     """Service for generating inventory reports."""
     
     @staticmethod
+    @reads("reports")
     def generate_current_stock_report(business_id, outlet_id, include_zero_stock=False):
         """
         Generate current stock levels report.
@@ -122,6 +124,7 @@ class InventoryReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_stock_movement_report(business_id, outlet_id, start_date, end_date):
         """
         Generate stock movement report by type.
@@ -235,6 +238,7 @@ class InventoryReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_stock_valuation_report(business_id, outlet_id):
         """
         Generate stock valuation report.
@@ -353,6 +357,7 @@ class InventoryReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_reorder_report(business_id, outlet_id):
         """
         Generate reorder suggestions report.
@@ -6,12 +6,14 @@ from ....models.admin.sale import Sale
 from ....models.user_model import User
 from app import db
 from ....utils.logger import Log
+from ....extensions.read_routing import reads
 
 
 class OperationalReportService:
     """Service for generating operational reports and analytics."""
     
     @staticmethod
+    @reads("reports")
     def generate_refunds_returns_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate refunds and returns report.
@@ -180,6 +182,7 @@ class OperationalReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_voids_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate voided transactions report.
@@ -308,6 +311,7 @@ class OperationalReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_atv_report(business_id, start_date, end_date, outlet_id=None):
         """
         Generate Average Transaction Value report.
@@ -475,6 +479,7 @@ class OperationalReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_enhanced_cashier_performance(business_id, start_date, end_date, outlet_id=None):
         """
         Generate enhanced cashier performance report.
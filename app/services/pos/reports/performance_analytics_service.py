@@ -5,6 +5,7 @@ from ....models.admin.sale import Sale
 from ....models.product_model import Product
 from app import db
 from ....utils.logger import Log
+from ....extensions.read_routing import reads
 from collections import defaultdict
 from itertools import combinations
 
@@ -13,6 +14,7 @@ class PerformanceAnalyticsService:
     """Service for generating performance and analytics reports."""
     
     @staticmethod
+    @reads("reports")
     def generate_outlet_performance_report(business_id, start_date, end_date):
         """
         Generate outlet performance comparison report.
@@ -104,6 +106,7 @@ class PerformanceAnalyticsService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_time_based_analysis(business_id, start_date, end_date, outlet_id=None):
         """
         Generate time-based sales analysis.
@@ -223,6 +226,7 @@ class PerformanceAnalyticsService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_category_performance(business_id, start_date, end_date, outlet_id=None):
         """
         Generate category performance report.
@@ -317,6 +321,7 @@ class PerformanceAnalyticsService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_discount_analysis(business_id, start_date, end_date, outlet_id=None):
         """
         Generate discount and promotion analysis.
@@ -452,6 +457,7 @@ class PerformanceAnalyticsService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_product_affinity_report(business_id, start_date, end_date, min_support=0.01):
         """
         Generate product affinity (bought together) analysis.
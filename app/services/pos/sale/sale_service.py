@@ -6,6 +6,8 @@ from app import db
 from ....models.admin.stock_ledger import StockLedger
 from ..inventory_service import InventoryService
 from ..cart_service import CartService
+from ...pos_ledger_service import release_stock_hold
+from ....utils.pos_idempotent_keys import keys_for_stock_release
 from ....utils.logger import Log
 
 
@@ -15,6 +17,9 @@ class SaleService:
     Handles sale creation, stock adjustments, and sale modifications.
     Supports comprehensive reporting schema.
     """
+
+    # Attempts at recording a sale's stock movement before the sale is marked failed
+    STOCK_WRITE_ATTEMPTS = 3
     
     @staticmethod
     def create_sale_from_cart(
@@ -183,29 +188,47 @@ class SaleService:
             
             Log.info(f"{log_tag} Sale created: {sale_id} (txn: {transaction_number})")
             
-            # Step 7: Create stock ledger entries (decrease stock for each line)
-            ledger_ids = []
-            for line in cart.get("lines", []):
-                ledger_id = InventoryService.decrease_stock(
+            # Step 7: Create stock ledger entries (decrease stock for all lines in one transaction).
+            # Write conflicts are retried inside the transaction; a failed attempt is
+            # retried here unless its rows did commit. A sale whose stock movement
+            # cannot be recorded is marked Failed instead of completing without it, and
+            # the cart's stock hold is released so the reserved units go back on sale.
+            ledger_lines = [
+                {
+                    "product_id": line["product_id"],
+                    "composite_variant_id": line.get("composite_variant_id"),
+                    "quantity": line["quantity"],
+                    "note": f"Sale {transaction_number} - {line.get('product_name', 'Product')}",
+                    "unit_cost": line.get("unit_cost"),  # Use cost from cart line
+                }
+                for line in cart.get("lines", [])
+            ]
+            ledger_ids = None
+            for attempt in range(1, SaleService.STOCK_WRITE_ATTEMPTS + 1):
+                ledger_ids = InventoryService.decrease_stock_lines(
                     business_id=business_id,
                     outlet_id=outlet_id,
-                    product_id=line["product_id"],
-                    quantity=line["quantity"],
+                    lines=ledger_lines,
                     reference_type=StockLedger.REF_TYPE_SALE,
                     user_id=user_id,
                     user__id=user__id,
-                    composite_variant_id=line.get("composite_variant_id"),
                     reference_id=sale_id,
-                    note=f"Sale {transaction_number} - {line.get('product_name', 'Product')}",
-                    unit_cost=line.get("unit_cost"),  # Use cost from cart line
                     agent_id=agent_id,
                     admin_id=admin_id
                 )
-                
-                if ledger_id:
-                    ledger_ids.append(ledger_id)
-                else:
-                    Log.error(f"{log_tag} Failed to create ledger entry for product {line['product_id']}")
+                if ledger_ids is not None:
+                    break
+                committed = StockLedger.get_by_reference(business_id, StockLedger.REF_TYPE_SALE, sale_id)
+                if committed:
+                    ledger_ids = [entry["_id"] for entry in committed]
+                    break
+                Log.warning(f"{log_tag} Ledger write failed for sale {sale_id} (attempt {attempt})")
+            
+            if ledger_ids is None:
+                Log.error(f"{log_tag} Failed to create ledger entries for sale {sale_id}; marking it failed")
+                Sale.update_status(sale_id=sale_id, business_id=business_id, new_status=Sale.STATUS_FAILED)
+                SaleService._release_failed_sale_hold(business_id, hold_id, log_tag)
+                return False, None, "Failed to record stock movement for sale", None, None
             
             Log.info(f"{log_tag} Created {len(ledger_ids)} stock ledger entries for sale {sale_id}")
             
@@ -215,6 +238,27 @@ class SaleService:
             Log.error(f"{log_tag} Error: {str(e)}")
             return False, None, str(e)
     
+    @staticmethod
+    def _release_failed_sale_hold(business_id, hold_id, log_tag):
+        """
+        Release the cart's stock hold for a sale marked Failed.
+        The sale's checksum is spent, so the hold can never be captured; a
+        release that fails (hold already expired/released) is only logged.
+        """
+        if not hold_id:
+            return
+        try:
+            k = keys_for_stock_release(str(business_id), hold_id, reason="sale_failed")
+            release_stock_hold(
+                business_id=business_id,
+                hold_id=hold_id,
+                idempotency_key=k.idem,
+                reason="sale_failed",
+            )
+            Log.info(f"{log_tag} Released stock hold {hold_id} for failed sale")
+        except Exception as e:
+            Log.error(f"{log_tag} Failed to release stock hold {hold_id}: {str(e)}")
+    
     @staticmethod
     def void_sale(sale_id, business_id, outlet_id, user_id, user__id, reason=None, authorized_by=None, agent_id=None, admin_id=None):
         """
@@ -4,12 +4,14 @@ from bson import ObjectId
 from app import db
 from ....models.admin.sale import Sale
 from ....utils.logger import Log
+from ....extensions.read_routing import reads
 
 
 class SalesReportService:
     """Service for generating sales reports with MongoDB aggregations."""
     
     @staticmethod
+    @reads("reports")
     def generate_sales_summary(business_id, start_date, end_date, outlet_id=None, user_id=None):
         """
         Generate comprehensive sales summary report.
@@ -257,6 +259,7 @@ class SalesReportService:
         return daily
     
     @staticmethod
+    @reads("reports")
     def generate_sales_by_product(business_id, start_date, end_date, outlet_id=None, limit=50):
         """
         Generate sales by product report.
@@ -353,6 +356,7 @@ class SalesReportService:
             return None
     
     @staticmethod
+    @reads("reports")
     def generate_sales_by_cashier(business_id, start_date, end_date, outlet_id=None):
         """
         Generate sales by cashier performance report.
@@ -2,6 +2,7 @@
 
 from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo import UpdateMany, UpdateOne
 from typing import Optional, Tuple
 
 from ...models.admin.package_model import Package
@@ -10,6 +11,7 @@ from ...models.admin.subscription_model import Subscription
 from ...utils.logger import Log
 from ...extensions.db import db
 from ...utils.plan.plan_change import PlanChangeService
+from ...utils.plan.entitlements import invalidate_entitlements
 from ...utils.crypt import hash_data, encrypt_data, decrypt_data
 from ...utils.json_response import prepared_response
 
@@ -297,6 +299,7 @@ class SubscriptionService:
                 # already cancelled or same values
                 return True, None
 
+            invalidate_entitlements(business_id, reason="subscription_cancel")
             Log.info(f"{log_tag} cancelled")
             return True, None
 
@@ -477,56 +480,149 @@ class SubscriptionService:
     # ---------------------------------------------------------
 
     @staticmethod
-    def activate_due_scheduled_subscriptions():
+    def activate_due_scheduled_subscriptions(batch_size: int = 500) -> dict:
+        """
+        Activate every Scheduled subscription whose start_date has passed.
+
+        Per batch of due subscriptions:
+          1. activate each business's winner (latest start_date), guarded on
+             hashed_status so a concurrent or repeated run is a no-op
+          2. re-read which winners are Active now
+          3. for those businesses only, expire the previous Active/Trial
+             subscriptions and the superseded due ones
+        All three run in one transaction per batch. A winner whose guard did
+        not match never expires the subscription it was meant to replace, so a
+        business is never left without one.
+        Entitlements and plan limits are then refreshed once per business.
+
+        Returns run stats (counts are documents actually modified).
+        """
+        log_tag = "[SubscriptionService][activate_due_scheduled_subscriptions]"
         now = datetime.utcnow()
+        stats = {
+            "due": 0,
+            "businesses": 0,
+            "activated": 0,
+            "expired": 0,
+            "superseded": 0,
+            "batches": 0,
+            "errors": 0,
+        }
 
         col = db.get_collection(Subscription.collection_name)
 
-        due = col.find({
-            "hashed_status": hash_data(Subscription.STATUS_SCHEDULED),
-            "start_date": {"$lte": now},
-        })
-
+        scheduled_hash = hash_data(Subscription.STATUS_SCHEDULED)
+        active_hash = hash_data(Subscription.STATUS_ACTIVE)
+        live_hashes = [
+            active_hash,
+            hash_data(Subscription.STATUS_TRIAL),
+        ]
+        expired_set = {
+            "status": encrypt_data(Subscription.STATUS_EXPIRED),
+            "hashed_status": hash_data(Subscription.STATUS_EXPIRED),
+            "updated_at": now,
+        }
+        active_set = {
+            "status": encrypt_data(Subscription.STATUS_ACTIVE),
+            "hashed_status": active_hash,
+            "updated_at": now,
+        }
+
+        due = col.find(
+            {"hashed_status": scheduled_hash, "start_date": {"$lte": now}},
+            {"_id": 1, "business_id": 1, "package_id": 1, "start_date": 1},
+        ).sort([("business_id", 1), ("start_date", 1), ("_id", 1)])
+
+        # business_id -> due subs (ascending start_date; last one wins)
+        by_business = {}
         for sub in due:
-            business_id = sub["business_id"]
-
-            # expire old actives
-            col.update_many(
-                {
-                    "business_id": business_id,
-                    "hashed_status": {
-                        "$in": [
-                            hash_data(Subscription.STATUS_ACTIVE),
-                            hash_data(Subscription.STATUS_TRIAL),
-                        ]
-                    },
-                },
-                {
-                    "$set": {
-                        "status": encrypt_data(Subscription.STATUS_EXPIRED),
-                        "hashed_status": hash_data(Subscription.STATUS_EXPIRED),
-                        "updated_at": now,
-                    }
-                },
-            )
-
-            # activate scheduled
-            col.update_one(
-                {"_id": sub["_id"]},
-                {
-                    "$set": {
-                        "status": encrypt_data(Subscription.STATUS_ACTIVE),
-                        "hashed_status": hash_data(Subscription.STATUS_ACTIVE),
-                        "updated_at": now,
-                    }
-                },
-            )
-
-            Log.info(f"[SubscriptionService] Activated scheduled subscription {sub['_id']}")
-
-            pkg = Package.get_by_id(str(sub["package_id"]))
-            PlanChangeService.enforce_all_limits(str(business_id), pkg)
+            stats["due"] += 1
+            by_business.setdefault(sub["business_id"], []).append(sub)
+
+        package_cache = {}
+        business_ids = list(by_business.keys())
+
+        for i in range(0, len(business_ids), batch_size):
+            chunk = business_ids[i:i + batch_size]
+            candidates = {business_id: by_business[business_id][-1] for business_id in chunk}
+
+            def _apply_batch(session):
+                # 1. guarded activation
+                activated = col.bulk_write(
+                    [
+                        UpdateOne(
+                            {"_id": winner["_id"], "hashed_status": scheduled_hash},
+                            {"$set": active_set},
+                        )
+                        for winner in candidates.values()
+                    ],
+                    ordered=False,
+                    session=session,
+                )
+
+                # 2. only winners that are Active now may replace anything
+                active_ids = {
+                    d["_id"]
+                    for d in col.find(
+                        {"_id": {"$in": [w["_id"] for w in candidates.values()]}, "hashed_status": active_hash},
+                        {"_id": 1},
+                        session=session,
+                    )
+                }
+                winners = {b: w for b, w in candidates.items() if w["_id"] in active_ids}
+
+                # 3. retire what the winners replace
+                expire_ops = []
+                supersede_ops = []
+                for business_id, winner in winners.items():
+                    expire_ops.append(UpdateMany(
+                        {
+                            "business_id": business_id,
+                            "hashed_status": {"$in": live_hashes},
+                            "_id": {"$ne": winner["_id"]},
+                        },
+                        {"$set": expired_set},
+                    ))
+                    superseded = [s["_id"] for s in by_business[business_id][:-1]]
+                    if superseded:
+                        supersede_ops.append(UpdateMany(
+                            {"_id": {"$in": superseded}, "hashed_status": scheduled_hash},
+                            {"$set": expired_set},
+                        ))
+
+                expired = col.bulk_write(expire_ops, ordered=False, session=session).modified_count if expire_ops else 0
+                retired = col.bulk_write(supersede_ops, ordered=False, session=session).modified_count if supersede_ops else 0
+                return winners, activated.modified_count, expired, retired
 
+            try:
+                # one transaction per batch; with_transaction retries transient aborts
+                with db.client.start_session() as session:
+                    winners, activated, expired, retired = session.with_transaction(_apply_batch)
+            except Exception as e:
+                stats["errors"] += 1
+                Log.error(f"{log_tag} batch failed: {e}")
+                continue
+
+            stats["activated"] += activated
+            stats["expired"] += expired
+            stats["superseded"] += retired
+            stats["batches"] += 1
+            stats["businesses"] += len(winners)
+
+            for business_id, winner in winners.items():
+                invalidate_entitlements(business_id, reason="scheduled_activation")
+                Log.info(f"[SubscriptionService] Activated scheduled subscription {winner['_id']}")
+
+                package_id = str(winner.get("package_id"))
+                if package_id not in package_cache:
+                    package_cache[package_id] = Package.get_by_id(package_id)
+                try:
+                    PlanChangeService.enforce_all_limits(str(business_id), package_cache[package_id])
+                except Exception as e:
+                    stats["errors"] += 1
+                    Log.error(f"[SubscriptionService] enforce_all_limits failed business={business_id}: {e}")
+
+        return stats
 
     @staticmethod
     def renew_subscription_by_id(
@@ -1,13 +1,14 @@
 # services/pos_ledger_service.py
 from __future__ import annotations
+import os
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Iterable, Dict, Any
 from bson import ObjectId
-from pymongo import ASCENDING, DESCENDING, IndexModel
-from pymongo.errors import DuplicateKeyError
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.read_concern import ReadConcern
 
 from ..extensions.db import db
-from ..utils.doseal.ensure_index import ensure_index
 from ..utils.pos_idempotent_keys import (
     keys_for_stock_hold,
     keys_for_stock_release_expired,
@@ -51,53 +52,95 @@ def _stock_holds():
 def _idem():
     return db.get_collection("idempotency")
 
+def _stock_balances():
+    return db.get_collection("stock_balances")
+
 # ---------- Indexes ----------
-def setup_indexes(idempotency_ttl_seconds: int = 30 * 24 * 3600):
-    # ---- stock_ledger ----
-    sl = _stock_ledger()
-    ensure_index(sl, IndexModel(
-        [("business_id", ASCENDING), ("outlet_id", ASCENDING), ("product_id", ASCENDING),
-         ("composite_variant_id", ASCENDING), ("created_at", ASCENDING)],
-        name="stock_identity_time"
-    ))
-    ensure_index(sl, IndexModel(
-        [("business_id", ASCENDING), ("outlet_id", ASCENDING), ("product_id", ASCENDING),
-         ("created_at", ASCENDING)],
-        name="stock_identity_time_no_variant"
-    ))
-    ensure_index(sl, IndexModel(
-        [("reference_type", ASCENDING), ("reference_id", ASCENDING), ("created_at", ASCENDING)],
-        name="reference_lookup"
-    ))
-
-    # ---- stock_holds ----
-    sh = _stock_holds()
-    ensure_index(sh, IndexModel(
-        [("hold_id", ASCENDING)],
-        name="hold_unique",
-        unique=True
-    ))
-    ensure_index(sh, IndexModel(
-        [("business_id", ASCENDING), ("outlet_id", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)],
-        name="holds_by_status"
-    ))
-    ensure_index(sh, IndexModel(
-        [("business_id", ASCENDING), ("cart_id", ASCENDING), ("status", ASCENDING)],
-        name="holds_cart_active"
-    ))
-
-    # ---- idempotency ----
-    idem = _idem()
-    ensure_index(idem, IndexModel(
-        [("key", ASCENDING)],
-        name="idem_key_unique",
-        unique=True
-    ))
-    ensure_index(idem, IndexModel(
-        [("created_at", ASCENDING)],
-        name="idem_ttl",
-        expireAfterSeconds=idempotency_ttl_seconds
-    ))
+# Built by `flask indexes build` (utils/index_registry.py)
+IDEMPOTENCY_TTL_SECONDS = 30 * 24 * 3600
+
+INDEXES = {
+    "stock_ledger": (
+        IndexModel(
+            [("business_id", ASCENDING), ("outlet_id", ASCENDING), ("product_id", ASCENDING),
+             ("composite_variant_id", ASCENDING), ("created_at", ASCENDING)],
+            name="stock_identity_time"
+        ),
+        IndexModel(
+            [("business_id", ASCENDING), ("outlet_id", ASCENDING), ("product_id", ASCENDING),
+             ("created_at", ASCENDING)],
+            name="stock_identity_time_no_variant"
+        ),
+        IndexModel(
+            [("reference_type", ASCENDING), ("reference_id", ASCENDING), ("created_at", ASCENDING)],
+            name="reference_lookup"
+        ),
+        IndexModel([("created_at", DESCENDING)]),
+    ),
+    "stock_holds": (
+        IndexModel(
+            [("hold_id", ASCENDING)],
+            name="hold_unique",
+            unique=True
+        ),
+        IndexModel(
+            [("business_id", ASCENDING), ("outlet_id", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)],
+            name="holds_by_status"
+        ),
+        IndexModel(
+            [("business_id", ASCENDING), ("cart_id", ASCENDING), ("status", ASCENDING)],
+            name="holds_cart_active"
+        ),
+    ),
+    "idempotency": (
+        IndexModel(
+            [("key", ASCENDING)],
+            name="idem_key_unique",
+            unique=True
+        ),
+        IndexModel(
+            [("created_at", ASCENDING)],
+            name="idem_ttl",
+            expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS
+        ),
+    ),
+    "stock_balances": (
+        IndexModel(
+            [("business_id", ASCENDING), ("outlet_id", ASCENDING), ("product_id", ASCENDING),
+             ("composite_variant_id", ASCENDING)],
+            name="balance_identity_unique",
+            unique=True
+        ),
+    ),
+}
+
+# ---------- Transactions ----------
+# Balance rows are where concurrent stock writes collide. The losing
+# transaction gets a WriteConflict (TransientTransactionError), which
+# with_transaction retries by re-running the whole callback. Seeding a missing
+# row can instead lose the insert race (DuplicateKey); that restarts the
+# transaction too, and on the next attempt the row exists and is $inc'ed.
+STOCK_TXN_MAX_ATTEMPTS = int(os.getenv("STOCK_TXN_MAX_ATTEMPTS", "3"))
+
+class BalanceSeedConflict(Exception):
+    """
+    A concurrent transaction created the balance row this one was seeding.
+    """
+
+def run_stock_transaction(callback, *, read_concern=None):
+    """
+    Run callback(session) in a transaction and return its result.
+    Transient errors and unknown commit results are retried by
+    with_transaction; seed races restart it, up to STOCK_TXN_MAX_ATTEMPTS.
+    The callback must be safe to re-run (build documents inside it).
+    """
+    for attempt in range(1, STOCK_TXN_MAX_ATTEMPTS + 1):
+        with db.client.start_session() as s:
+            try:
+                return s.with_transaction(callback, read_concern=read_concern)
+            except BalanceSeedConflict:
+                if attempt == STOCK_TXN_MAX_ATTEMPTS:
+                    raise
 
 # ---------- Idempotency ----------
 def _idempotency_guard(key: str, meta: Optional[dict] = None, session=None):
@@ -108,12 +151,17 @@ def _idempotency_guard(key: str, meta: Optional[dict] = None, session=None):
         raise RuntimeError("IDEMPOTENT_REPLAY")
 
 # ---------- Stock maths ----------
+# Slow path: sums over the full history. Used to seed / verify stock_balances
+# and for keys that have not been materialized yet.
+# exact_variant=True restricts a call without composite_variant_id to the base
+# product (rows without a variant) instead of the product across all variants.
 def _sum_on_hand(
     *,
     business_id,
     outlet_id,
     product_id,
     composite_variant_id: Optional[str | ObjectId] = None,
+    exact_variant: bool = False,
     session=None
 ) -> float:
     match = {
@@ -123,6 +171,8 @@ def _sum_on_hand(
     }
     if composite_variant_id:
         match["composite_variant_id"] = {"$in": _id_variants(composite_variant_id)}
+    elif exact_variant:
+        match["composite_variant_id"] = None
     pipeline = [
         {"$match": match},
         {"$group": {"_id": None, "on_hand": {"$sum": "$quantity_delta"}}}
@@ -136,24 +186,332 @@ def _sum_committed_active(
     outlet_id,
     product_id,
     composite_variant_id: Optional[str | ObjectId] = None,
+    exact_variant: bool = False,
     session=None
 ) -> float:
-    match = {
-        "business_id": {"$in": _id_variants(business_id)},
-        "outlet_id":   {"$in": _id_variants(outlet_id)},
-        "product_id":  {"$in": _id_variants(product_id)},
-        "status": "ACTIVE",
-    }
+    # product / variant live on the hold's line items, not on the hold itself
+    item_match = {"items.product_id": {"$in": _id_variants(product_id)}}
     if composite_variant_id:
-        match["composite_variant_id"] = {"$in": _id_variants(composite_variant_id)}
+        item_match["items.composite_variant_id"] = {"$in": _id_variants(composite_variant_id)}
+    elif exact_variant:
+        item_match["items.composite_variant_id"] = None
     pipeline = [
-        {"$match": match},
+        {"$match": {
+            "business_id": {"$in": _id_variants(business_id)},
+            "outlet_id":   {"$in": _id_variants(outlet_id)},
+            "status": "ACTIVE",
+            "items.product_id": item_match["items.product_id"],
+        }},
         {"$unwind": "$items"},
+        {"$match": item_match},
         {"$group": {"_id": None, "committed": {"$sum": "$items.qty"}}}
     ]
     agg = list(_stock_holds().aggregate(pipeline, session=session))
     return float(agg[0]["committed"]) if agg else 0.0
 
+# ---------- Materialized balances ----------
+# stock_balances keeps one row per business x outlet x product x variant
+# (composite_variant_id None for the base product):
+#   {on_hand, committed, available, updated_at}
+# Every ledger append and hold transition applies its delta in the same
+# transaction, so availability is an indexed lookup however long the ledger
+# grows. verify_stock_balances() recomputes from the ledger and reports drift.
+BALANCE_DRIFT_TOLERANCE = 1e-6
+
+def _balance_key(business_id, outlet_id, product_id, composite_variant_id=None) -> dict:
+    return {
+        "business_id": _as_oid(business_id),
+        "outlet_id":   _as_oid(outlet_id),
+        "product_id":  _as_oid(product_id),
+        "composite_variant_id": _as_oid(composite_variant_id) if composite_variant_id else None,
+    }
+
+def _recompute_balance(key: dict, session=None) -> Dict[str, float]:
+    ident = dict(
+        business_id=key["business_id"],
+        outlet_id=key["outlet_id"],
+        product_id=key["product_id"],
+        composite_variant_id=key["composite_variant_id"],
+        exact_variant=True,
+        session=session,
+    )
+    on_hand = _sum_on_hand(**ident)
+    committed = _sum_committed_active(**ident)
+    return {"on_hand": on_hand, "committed": committed, "available": on_hand - committed}
+
+def _apply_balance(key: dict, *, on_hand_delta: float = 0.0, committed_delta: float = 0.0, session=None):
+    """
+    Apply a movement to its balance row. Call AFTER the ledger / hold write, in
+    the same transaction: a missing row is seeded from the history, which
+    already includes that write.
+    """
+    res = _stock_balances().update_one(
+        key,
+        {
+            "$inc": {
+                "on_hand": on_hand_delta,
+                "committed": committed_delta,
+                "available": on_hand_delta - committed_delta,
+            },
+            "$set": {"updated_at": _now()},
+        },
+        session=session
+    )
+    if res.matched_count:
+        return
+    try:
+        _stock_balances().update_one(
+            key,
+            {"$set": {**_recompute_balance(key, session=session), "updated_at": _now()}},
+            upsert=True,
+            session=session
+        )
+    except DuplicateKeyError as e:
+        raise BalanceSeedConflict(str(e)) from e
+
+def _read_balance(
+    *,
+    business_id,
+    outlet_id,
+    product_id,
+    composite_variant_id: Optional[str | ObjectId] = None,
+    session=None
+) -> Dict[str, float]:
+    """
+    on_hand / committed / available for a variant, or for the product across
+    all its variants when composite_variant_id is None (same scope as the
+    ledger sums). Keys without a row yet are recomputed from history
+    (see get_available_for_lines).
+    """
+    line = get_available_for_lines(
+        business_id=business_id,
+        outlet_id=outlet_id,
+        items=[{"product_id": product_id, "composite_variant_id": composite_variant_id, "qty": 0}],
+        session=session,
+    )[0]
+    return {"on_hand": line["on_hand"], "committed": line["committed"], "available": line["available"]}
+
+def apply_ledger_to_balance(row: Dict[str, Any], session=None):
+    """
+    Apply a stock_ledger row (already inserted with `session`) to stock_balances.
+    Every writer of stock_ledger must call this inside the same transaction.
+    """
+    key = _balance_key(row["business_id"], row["outlet_id"], row["product_id"], row.get("composite_variant_id"))
+    _apply_balance(key, on_hand_delta=float(row["quantity_delta"]), session=session)
+
+# ---------- Batched (multi-line) ----------
+# A cart touches many product/variant keys; these do one grouped read and one
+# bulk write per cart instead of a round trip per line, which keeps the
+# transaction short for large baskets. Lines for the same key are summed.
+class InsufficientStock(ValueError):
+    """
+    Raised by place_stock_hold when one or more lines cannot be reserved.
+    str(e) stays "INSUFFICIENT_STOCK"; e.shortfalls lists the lines
+    (see get_available_for_lines).
+    """
+    def __init__(self, shortfalls: list):
+        super().__init__("INSUFFICIENT_STOCK")
+        self.shortfalls = shortfalls
+
+def _line_key(product_id, composite_variant_id=None) -> tuple:
+    return (str(_as_oid(product_id)), str(_as_oid(composite_variant_id)) if composite_variant_id else None)
+
+def _group_lines(items: Iterable[Dict[str, Any]], qty_field: str) -> Dict[tuple, float]:
+    required: Dict[tuple, float] = {}
+    for it in items:
+        k = _line_key(it["product_id"], it.get("composite_variant_id"))
+        required[k] = required.get(k, 0.0) + float(it[qty_field])
+    return required
+
+def _recompute_balances(business_oid, outlet_oid, product_ids, session=None) -> Dict[tuple, Dict[str, float]]:
+    """
+    Exact-key balances for several products from history: one grouped ledger
+    and one grouped holds aggregation. Keyed by _line_key.
+    """
+    pid_variants = [v for p in product_ids for v in _id_variants(p)]
+    scope = {
+        "business_id": {"$in": _id_variants(business_oid)},
+        "outlet_id":   {"$in": _id_variants(outlet_oid)},
+    }
+    out: Dict[tuple, Dict[str, float]] = {}
+
+    def _row(i):
+        return out.setdefault(_line_key(i["p"], i.get("v")), {"on_hand": 0.0, "committed": 0.0})
+
+    for r in _stock_ledger().aggregate([
+        {"$match": {**scope, "product_id": {"$in": pid_variants}}},
+        {"$group": {"_id": {"p": "$product_id", "v": "$composite_variant_id"}, "on_hand": {"$sum": "$quantity_delta"}}},
+    ], session=session):
+        _row(r["_id"])["on_hand"] += float(r["on_hand"] or 0)
+
+    for r in _stock_holds().aggregate([
+        {"$match": {**scope, "status": "ACTIVE", "items.product_id": {"$in": pid_variants}}},
+        {"$unwind": "$items"},
+        {"$match": {"items.product_id": {"$in": pid_variants}}},
+        {"$group": {"_id": {"p": "$items.product_id", "v": "$items.composite_variant_id"}, "committed": {"$sum": "$items.qty"}}},
+    ], session=session):
+        _row(r["_id"])["committed"] += float(r["committed"] or 0)
+
+    for bal in out.values():
+        bal["available"] = bal["on_hand"] - bal["committed"]
+    return out
+
+def _apply_balances(business_oid, outlet_oid, deltas: Dict[tuple, tuple], session=None):
+    """
+    Batched _apply_balance: deltas is {_line_key: (on_hand_delta, committed_delta)}.
+    Same contract (after the ledger / hold writes, same transaction); rows
+    that do not exist yet are seeded with one grouped recompute.
+    """
+    if not deltas:
+        return
+    keys = {k: _balance_key(business_oid, outlet_oid, *k) for k in deltas}
+    existing = {
+        _line_key(r["product_id"], r.get("composite_variant_id"))
+        for r in _stock_balances().find(
+            {
+                "business_id": _as_oid(business_oid),
+                "outlet_id": _as_oid(outlet_oid),
+                "product_id": {"$in": list({key["product_id"] for key in keys.values()})},
+            },
+            {"product_id": 1, "composite_variant_id": 1},
+            session=session
+        )
+    }
+    missing = {k[0] for k in deltas if k not in existing}
+    seeded = _recompute_balances(business_oid, outlet_oid, missing, session=session) if missing else {}
+
+    now = _now()
+    ops = []
+    for k, (on_hand_delta, committed_delta) in deltas.items():
+        if k in existing:
+            ops.append(UpdateOne(keys[k], {
+                "$inc": {
+                    "on_hand": on_hand_delta,
+                    "committed": committed_delta,
+                    "available": on_hand_delta - committed_delta,
+                },
+                "$set": {"updated_at": now},
+            }))
+        else:
+            bal = seeded.get(k, {"on_hand": 0.0, "committed": 0.0, "available": 0.0})
+            ops.append(UpdateOne(keys[k], {"$set": {**bal, "updated_at": now}}, upsert=True))
+    try:
+        _stock_balances().bulk_write(ops, ordered=False, session=session)
+    except BulkWriteError as e:
+        if any(err.get("code") == 11000 for err in e.details.get("writeErrors", [])):
+            raise BalanceSeedConflict(str(e)) from e
+        raise
+
+def apply_ledger_rows_to_balances(rows: Iterable[Dict[str, Any]], session=None):
+    """
+    Batched apply_ledger_to_balance for rows inserted together (insert_many).
+    """
+    by_scope: Dict[tuple, Dict[tuple, tuple]] = {}
+    for row in rows:
+        deltas = by_scope.setdefault((str(row["business_id"]), str(row["outlet_id"])), {})
+        k = _line_key(row["product_id"], row.get("composite_variant_id"))
+        on_hand, committed = deltas.get(k, (0.0, 0.0))
+        deltas[k] = (on_hand + float(row["quantity_delta"]), committed)
+    for (business_id, outlet_id), deltas in by_scope.items():
+        _apply_balances(business_id, outlet_id, deltas, session=session)
+
+def _has_unmaterialized_keys(business_oid, outlet_oid, product_id: str, rows: Dict[tuple, Any], session=None) -> bool:
+    """
+    True when the ledger has a variant (or the base product) of product_id
+    with no balance row yet. One DISTINCT_SCAN on stock_identity_time.
+    """
+    scope = {
+        "business_id": {"$in": _id_variants(business_oid)},
+        "outlet_id":   {"$in": _id_variants(outlet_oid)},
+        "product_id":  {"$in": _id_variants(product_id)},
+    }
+    for vid in _stock_ledger().distinct("composite_variant_id", scope, session=session):
+        try:
+            if _line_key(product_id, vid) not in rows:
+                return True
+        except Exception:
+            continue  # non-ObjectId ids cannot be materialized
+    if (product_id, None) not in rows:
+        return _stock_ledger().find_one({**scope, "composite_variant_id": None}, {"_id": 1}, session=session) is not None
+    return False
+
+def get_available_for_lines(
+    *,
+    business_id,
+    outlet_id,
+    items: Iterable[Dict[str, Any]],
+    qty_field: str = "qty",
+    session=None
+) -> list:
+    """
+    Availability for many cart lines with one grouped read on stock_balances
+    (plus one grouped recompute for keys not materialized yet; a product-wide
+    line also checks the ledger for variants that have no row).
+    Each item: product_id, optional composite_variant_id, and `qty_field`.
+
+    Returns one entry per distinct product/variant, in first-seen order:
+      {product_id, composite_variant_id, required, on_hand, committed,
+       available, shortfall}
+    composite_variant_id None means the product across all its variants,
+    as in get_available_for_product.
+    """
+    business_oid = _as_oid(business_id)
+    outlet_oid   = _as_oid(outlet_id)
+    required = _group_lines(items, qty_field)
+    if not required:
+        return []
+
+    rows: Dict[tuple, Dict[str, float]] = {}
+    for r in _stock_balances().find(
+        {
+            "business_id": business_oid,
+            "outlet_id": outlet_oid,
+            "product_id": {"$in": list({_as_oid(pid) for pid, _ in required})},
+        },
+        {"product_id": 1, "composite_variant_id": 1, "on_hand": 1, "committed": 1},
+        session=session
+    ):
+        rows[_line_key(r["product_id"], r.get("composite_variant_id"))] = {
+            "on_hand": float(r.get("on_hand") or 0),
+            "committed": float(r.get("committed") or 0),
+        }
+
+    materialized = {pid for pid, _ in rows}
+    unseeded = set()
+    for pid, vid in required:
+        if vid:
+            if (pid, vid) not in rows:
+                unseeded.add(pid)
+        elif pid not in materialized or _has_unmaterialized_keys(business_oid, outlet_oid, pid, rows, session=session):
+            # product-wide line: every variant with history must be counted
+            unseeded.add(pid)
+    if unseeded:
+        rows.update(_recompute_balances(business_oid, outlet_oid, unseeded, session=session))
+
+    by_product: Dict[str, list] = {}
+    for (pid, _), bal in rows.items():
+        by_product.setdefault(pid, []).append(bal)
+
+    out = []
+    for (pid, vid), req in required.items():
+        if vid:
+            picked = [rows[(pid, vid)]] if (pid, vid) in rows else []
+        else:
+            picked = by_product.get(pid, [])
+        on_hand = sum(b["on_hand"] for b in picked)
+        committed = sum(b["committed"] for b in picked)
+        available = on_hand - committed
+        out.append({
+            "product_id": pid,
+            "composite_variant_id": vid,
+            "required": req,
+            "on_hand": on_hand,
+            "committed": committed,
+            "available": available,
+            "shortfall": max(0.0, req - available),
+        })
+    return out
+
 # ---------- Public API: stock holds ----------
 def place_stock_hold(
     *,
@@ -173,6 +531,7 @@ def place_stock_hold(
       - product_id (preferred) or sku
       - qty (int)
       - optional composite_variant_id
+    Raises InsufficientStock (a ValueError) listing every short line.
     """
     hold_id = f"stock-hold-{ObjectId()}"
     business_oid = _as_oid(business_id)
@@ -196,25 +555,24 @@ def place_stock_hold(
             raise ValueError("Each item must have product_id or sku")
         norm.append(rec)
 
-    with db.client.start_session() as s, s.start_transaction():
+    def _txn(s):
         _idempotency_guard(
             idempotency_key,
             {"op": "stock_hold", "business_id": business_oid, "cart_id": cart_id, "ref": ref},
             session=s
         )
 
-        # Availability check per line (product_id path)
-        for it in norm:
-            if "product_id" not in it:
-                # If your deployment uses SKU-driven identity, add that path here.
-                raise ValueError("INSUFFICIENT_STOCK: Missing product_id path support in this deployment")
-            pid = it["product_id"]
-            vid = it.get("composite_variant_id")
-            on_hand   = _sum_on_hand(business_id=business_oid, outlet_id=outlet_oid, product_id=pid, composite_variant_id=vid, session=s)
-            committed = _sum_committed_active(business_id=business_oid, outlet_id=outlet_oid, product_id=pid, composite_variant_id=vid, session=s)
-            available = on_hand - committed
-            if available < it["qty"]:
-                raise ValueError("INSUFFICIENT_STOCK")
+        if any("product_id" not in it for it in norm):
+            # If your deployment uses SKU-driven identity, add that path here.
+            raise ValueError("INSUFFICIENT_STOCK: Missing product_id path support in this deployment")
+
+        # One grouped availability read for the whole cart
+        shortfalls = [
+            line for line in get_available_for_lines(business_id=business_oid, outlet_id=outlet_oid, items=norm, session=s)
+            if line["shortfall"] > 0
+        ]
+        if shortfalls:
+            raise InsufficientStock(shortfalls)
 
         doc = {
             "hold_id": hold_id,
@@ -232,6 +590,16 @@ def place_stock_hold(
         }
         _stock_holds().insert_one(doc, session=s)
 
+        # Reserve on the balance rows (one bulk write); concurrent holds on the
+        # same row conflict here and one transaction aborts instead of overselling.
+        _apply_balances(
+            business_oid, outlet_oid,
+            {k: (0.0, qty) for k, qty in _group_lines(norm, "qty").items()},
+            session=s
+        )
+
+    run_stock_transaction(_txn)
+
     return {"success": True, "status_code": 200, "hold_id": hold_id}
 
 def capture_stock_hold(
@@ -246,9 +614,11 @@ def capture_stock_hold(
     Finalize a reserved cart:
       - Append SALE rows (negative quantity) to stock_ledger
       - Mark the hold CAPTURED
+      - Move on_hand and committed on stock_balances
     """
     business_oid = _as_oid(business_id)
-    with db.client.start_session() as s, s.start_transaction():
+
+    def _txn(s):
         hold = _stock_holds().find_one({"hold_id": hold_id}, session=s)
         if not hold or hold.get("status") != "ACTIVE":
             raise ValueError("Hold not found or not active")
@@ -261,7 +631,8 @@ def capture_stock_hold(
             session=s
         )
 
-        # Post SALE entries
+        # Post SALE entries (one insert_many)
+        rows = []
         for it in hold["items"]:
             pid = it.get("product_id")
             if not pid:
@@ -284,7 +655,9 @@ def capture_stock_hold(
                 row["composite_variant_id"] = ObjectId(it["composite_variant_id"])
             if meta:
                 row["meta"] = meta
-            _stock_ledger().insert_one(row, session=s)
+            rows.append(row)
+        if rows:
+            _stock_ledger().insert_many(rows, session=s)
 
         _stock_holds().update_one(
             {"_id": hold["_id"]},
@@ -292,6 +665,15 @@ def capture_stock_hold(
             session=s
         )
 
+        # Stock leaves on_hand and the reservation is consumed
+        _apply_balances(
+            business_oid, hold["outlet_id"],
+            {k: (-qty, -qty) for k, qty in _group_lines(hold["items"], "qty").items()},
+            session=s
+        )
+
+    run_stock_transaction(_txn)
+
     return {"success": True, "status_code": 200, "hold_id": hold_id, "captured": True}
 
 def release_stock_hold(
@@ -304,10 +686,11 @@ def release_stock_hold(
     """
     Cancel/timeout a reservation:
       - Mark hold RELEASED
-      - No ledger writes (reservation only)
+      - No ledger writes (reservation only); committed drops on stock_balances
     """
     business_oid = _as_oid(business_id)
-    with db.client.start_session() as s, s.start_transaction():
+
+    def _txn(s):
         hold = _stock_holds().find_one({"hold_id": hold_id}, session=s)
         if not hold or hold.get("status") != "ACTIVE":
             raise ValueError("Hold not found or not active")
@@ -324,6 +707,13 @@ def release_stock_hold(
             {"$set": {"status": "RELEASED", "release_reason": reason, "updated_at": _now()}},
             session=s
         )
+        _apply_balances(
+            business_oid, hold["outlet_id"],
+            {k: (0.0, -qty) for k, qty in _group_lines([it for it in hold["items"] if it.get("product_id")], "qty").items()},
+            session=s
+        )
+
+    run_stock_transaction(_txn)
 
     return {"success": True, "status_code": 200, "hold_id": hold_id, "released": True}
 
@@ -378,12 +768,123 @@ def get_available_for_product(
         "available_to_reserve": float
       }
     """
-    business_oid = _as_oid(business_id)
-    outlet_oid   = _as_oid(outlet_id)
-    on_hand   = _sum_on_hand(business_id=business_oid, outlet_id=outlet_oid, product_id=product_id, composite_variant_id=composite_variant_id)
-    committed = _sum_committed_active(business_id=business_oid, outlet_id=outlet_oid, product_id=product_id, composite_variant_id=composite_variant_id)
+    balance = _read_balance(
+        business_id=business_id, outlet_id=outlet_id,
+        product_id=product_id, composite_variant_id=composite_variant_id
+    )
+    return {
+        "on_hand": balance["on_hand"],
+        "committed": balance["committed"],
+        "available_to_reserve": balance["available"]
+    }
+
+# ---------- Balance verification ----------
+def _confirm_balance_drift(key: dict, fix: bool) -> Optional[Dict[str, Any]]:
+    """
+    Re-check one key in a snapshot transaction, so writes landing between the
+    bulk scan and now are not reported as drift. Repairs it when fix=True.
+    """
+    def _txn(s):
+        expected = _recompute_balance(key, session=s)
+        row = _stock_balances().find_one(key, session=s)
+        actual = {f: float(row.get(f) or 0) for f in ("on_hand", "committed", "available")} if row else None
+        if actual and all(abs(actual[f] - expected[f]) <= BALANCE_DRIFT_TOLERANCE for f in expected):
+            return None
+        if fix:
+            try:
+                _stock_balances().update_one(
+                    key, {"$set": {**expected, "updated_at": _now()}}, upsert=True, session=s
+                )
+            except DuplicateKeyError as e:
+                raise BalanceSeedConflict(str(e)) from e
+        return {
+            **{k: (str(v) if v else None) for k, v in key.items()},
+            "expected": expected,
+            "actual": actual,
+            "fixed": fix,
+        }
+
+    return run_stock_transaction(_txn, read_concern=ReadConcern("snapshot"))
+
+def verify_stock_balances(
+    *,
+    business_id: Optional[str] = None,
+    fix: bool = False,
+    sample: int = 20
+) -> Dict[str, Any]:
+    """
+    Recompute every balance from stock_ledger + ACTIVE holds and compare with
+    stock_balances. Keys that differ in the bulk pass are confirmed one by one
+    (see _confirm_balance_drift) before being reported / repaired.
+
+    Returns:
+      {"success", "checked", "drifted", "fixed", "missing", "samples": [...]}
+    """
+    scope = {"business_id": {"$in": _id_variants(business_id)}} if business_id else {}
+
+    def _k(b, o, p, v):
+        return (str(b), str(o), str(p), str(v) if v else None)
+
+    expected: Dict[tuple, Dict[str, float]] = {}
+
+    ledger = _stock_ledger().aggregate([
+        {"$match": scope},
+        {"$group": {
+            "_id": {"b": "$business_id", "o": "$outlet_id", "p": "$product_id", "v": "$composite_variant_id"},
+            "on_hand": {"$sum": "$quantity_delta"},
+        }},
+    ], allowDiskUse=True)
+    for r in ledger:
+        i = r["_id"]
+        e = expected.setdefault(_k(i.get("b"), i.get("o"), i.get("p"), i.get("v")), {"on_hand": 0.0, "committed": 0.0})
+        e["on_hand"] += float(r["on_hand"] or 0)
+
+    holds = _stock_holds().aggregate([
+        {"$match": {**scope, "status": "ACTIVE"}},
+        {"$unwind": "$items"},
+        {"$match": {"items.product_id": {"$nin": [None, ""]}}},
+        {"$group": {
+            "_id": {"b": "$business_id", "o": "$outlet_id", "p": "$items.product_id", "v": "$items.composite_variant_id"},
+            "committed": {"$sum": "$items.qty"},
+        }},
+    ], allowDiskUse=True)
+    for r in holds:
+        i = r["_id"]
+        e = expected.setdefault(_k(i.get("b"), i.get("o"), i.get("p"), i.get("v")), {"on_hand": 0.0, "committed": 0.0})
+        e["committed"] += float(r["committed"] or 0)
+
+    candidates = set()
+    seen = set()
+    for row in _stock_balances().find(scope):
+        k = _k(row["business_id"], row["outlet_id"], row["product_id"], row.get("composite_variant_id"))
+        seen.add(k)
+        e = expected.get(k, {"on_hand": 0.0, "committed": 0.0})
+        on_hand, committed = float(row.get("on_hand") or 0), float(row.get("committed") or 0)
+        if (abs(on_hand - e["on_hand"]) > BALANCE_DRIFT_TOLERANCE
+                or abs(committed - e["committed"]) > BALANCE_DRIFT_TOLERANCE
+                or abs(float(row.get("available") or 0) - (on_hand - committed)) > BALANCE_DRIFT_TOLERANCE):
+            candidates.add(k)
+    missing = set(expected) - seen
+    candidates |= missing
+
+    drift, invalid = [], 0
+    for k in sorted(candidates, key=lambda t: tuple(x or "" for x in t)):
+        try:
+            key = _balance_key(*k)
+        except Exception:
+            # ids that are not ObjectIds cannot be materialized; leave to the slow path
+            invalid += 1
+            continue
+        found = _confirm_balance_drift(key, fix)
+        if found:
+            drift.append(found)
+
     return {
-        "on_hand": on_hand,
-        "committed": committed,
-        "available_to_reserve": on_hand - committed
+        "success": True,
+        "checked": len(seen | set(expected)),
+        "drifted": len(drift),
+        "fixed": len(drift) if fix else 0,
+        "missing": len([d for d in drift if d["actual"] is None]),
+        "invalid": invalid,
+        "samples": drift[:sample],
     }
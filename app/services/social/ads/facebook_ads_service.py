@@ -248,31 +248,33 @@ class FacebookAdsService:
         """Update ad set status."""
         return self._request("POST", adset_id, data={"status": status})
 
-    def search_interests(self, query: str, limit: int = 20) -> Dict[str, Any]:
+    def search_interests(self, query: str, limit: int = 20, locale: str = None) -> Dict[str, Any]:
         """
         Search for interest targeting options.
         Returns objects with 'id' and 'name'.
         Use 'id' in targeting — name alone is rejected by the API.
         Example: [{"id": "6003139266461", "name": "Technology"}]
-        """
-        return self._request(
-            "GET",
-            "search",
-            params={"type": "adinterest", "q": query, "limit": limit},
-        )
-
-    def search_behaviors(self, query: str, limit: int = 20) -> Dict[str, Any]:
-        """Search for behavior targeting options."""
-        return self._request(
-            "GET",
-            "search",
-            params={"type": "adTargetingCategory", "class": "behaviors", "q": query, "limit": limit},
-        )
 
-    def get_targeting_browse(self) -> Dict[str, Any]:
+        Hits the Marketing API directly; typeahead callers should go through
+        facebook_targeting_catalog.search_targeting() instead.
+        """
+        params = {"type": "adinterest", "q": query, "limit": limit}
+        if locale:
+            params["locale"] = locale
+        return self._request("GET", "search", params=params)
+
+    def search_behaviors(self, query: str, limit: int = 20, locale: str = None) -> Dict[str, Any]:
+        """Search for behavior targeting options (empty query returns the full list)."""
+        params = {"type": "adTargetingCategory", "class": "behaviors", "q": query, "limit": limit}
+        if locale:
+            params["locale"] = locale
+        return self._request("GET", "search", params=params)
+
+    def get_targeting_browse(self, locale: str = None) -> Dict[str, Any]:
         """Get available targeting categories."""
         self._require_ad_account()
-        return self._request("GET", f"{self.ad_account_id}/targetingbrowse")
+        params = {"locale": locale} if locale else None
+        return self._request("GET", f"{self.ad_account_id}/targetingbrowse", params=params)
 
     # =========================================
     # AD CREATIVE MANAGEMENT
@@ -434,6 +436,50 @@ class FacebookAdsService:
             },
         )
 
+    def get_account_insights_daily(
+        self,
+        level: str,
+        since: str,
+        until: str,
+        fields: str = None,
+        limit: int = 500,
+        max_pages: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        Daily rows (time_increment=1) for every campaign/adset/ad in the ad account
+        over an explicit time_range, following cursor pagination.
+
+        One call per level per account replaces one call per object per request.
+        """
+        self._require_ad_account()
+        if not fields:
+            fields = "campaign_id,adset_id,ad_id,impressions,reach,clicks,spend,actions,cost_per_action_type"
+
+        params = {
+            "level": level,
+            "fields": fields,
+            "time_increment": 1,
+            "time_range": json.dumps({"since": since, "until": until}),
+            "limit": limit,
+        }
+
+        rows: List[Dict[str, Any]] = []
+        for _ in range(max_pages):
+            resp = self._request("GET", f"{self.ad_account_id}/insights", params=dict(params), timeout=60)
+            if not resp.get("success"):
+                return {"success": False, "error": resp.get("error"), "data": rows}
+
+            body = resp.get("data") or {}
+            rows.extend(body.get("data") or [])
+
+            paging = body.get("paging") or {}
+            after = (paging.get("cursors") or {}).get("after")
+            if not paging.get("next") or not after:
+                break
+            params["after"] = after
+
+        return {"success": True, "data": rows}
+
     # =========================================
     # REACH ESTIMATE
     # =========================================
@@ -0,0 +1,339 @@
+# app/services/social/ads/facebook_insights_warehouse.py
+#
+# Local warehouse for Facebook Ads insights.
+#
+# Key design:
+# - A scheduled job pulls daily rows (time_increment=1) per ad account and level
+#   with ONE paged account-level call, instead of one live call per campaign view
+# - Incremental: each run starts from the account's last synced day, minus the
+#   attribution window (Meta keeps restating conversions/spend for recent days)
+# - Coverage is tracked as [first_synced_ymd, last_synced_ymd]; each run also
+#   extends it one chunk further back until FB_ADS_INSIGHTS_HISTORY_DAYS
+# - Rows land in social_ads_insights_daily keyed on (ad account, level, object, date)
+# - Insights endpoints read range totals via an aggregation pipeline and only
+#   fall back to a live API call when the warehouse has not covered the range yet
+# - Scheduled by app/jobs/periodic.py (FB_ADS_INSIGHTS_SYNC_CRON)
+#
+# RQ entrypoints:
+#   - app.services.social.ads.facebook_insights_warehouse.sync_facebook_ads_insights
+#   - app.services.social.ads.facebook_insights_warehouse.sync_facebook_ads_insights_for_business
+
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+
+from ....extensions.db import db as db_ext
+from ....utils.logger import Log
+from ....models.social.ad_account import AdAccount, AdCampaign
+from ....models.social.ads_insight_daily import LEVELS, AdsInsightDaily, AdsInsightSyncState
+from .facebook_ads_service import FacebookAdsService
+
+
+PLATFORM = "facebook"
+
+# -----------------------------
+# Config
+# -----------------------------
+# Days re-pulled on every run so late attributed conversions/spend are picked up
+ATTRIBUTION_WINDOW_DAYS = int(os.getenv("FB_ADS_INSIGHTS_ATTRIBUTION_DAYS", "7"))
+# First sync of an account backfills this many days
+INITIAL_BACKFILL_DAYS = int(os.getenv("FB_ADS_INSIGHTS_BACKFILL_DAYS", "90"))
+# Later runs extend coverage backwards (one chunk per run) up to this many days
+HISTORY_DAYS = int(os.getenv("FB_ADS_INSIGHTS_HISTORY_DAYS", "400"))
+# Max days per API request (Meta rejects very large time_increment=1 ranges)
+MAX_DAYS_PER_REQUEST = int(os.getenv("FB_ADS_INSIGHTS_CHUNK_DAYS", "30"))
+# Levels to sync (campaign is enough for the campaign insights endpoint)
+SYNC_LEVELS = [
+    x.strip() for x in (os.getenv("FB_ADS_INSIGHTS_LEVELS") or "campaign").split(",")
+    if x.strip() in LEVELS
+]
+
+
+# -----------------------------
+# Date helpers
+# -----------------------------
+def _account_today(timezone_name: Optional[str]) -> date:
+    """
+    Meta reports insights days in the ad account's timezone.
+    """
+    if timezone_name:
+        try:
+            from zoneinfo import ZoneInfo
+            return datetime.now(ZoneInfo(timezone_name)).date()
+        except Exception:
+            pass
+    return datetime.now(timezone.utc).date()
+
+
+def _ymd(d: date) -> str:
+    return d.strftime("%Y-%m-%d")
+
+
+def _parse_ymd(s: str) -> date:
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+def preset_to_range(date_preset: str, timezone_name: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """
+    Map a Marketing API date_preset to an explicit (since, until) in account time.
+    Returns None for presets we do not mirror (caller goes live).
+    """
+    today = _account_today(timezone_name)
+    p = (date_preset or "").strip().lower()
+
+    if p == "today":
+        return _ymd(today), _ymd(today)
+    if p == "yesterday":
+        y = today - timedelta(days=1)
+        return _ymd(y), _ymd(y)
+    if p.startswith("last_") and p.endswith("d") and p[5:-1].isdigit():
+        n = int(p[5:-1])
+        return _ymd(today - timedelta(days=n)), _ymd(today - timedelta(days=1))
+    if p == "this_week":
+        return _ymd(today - timedelta(days=today.weekday())), _ymd(today)
+    if p == "last_week":
+        start = today - timedelta(days=today.weekday() + 7)
+        return _ymd(start), _ymd(start + timedelta(days=6))
+    if p == "this_month":
+        return _ymd(today.replace(day=1)), _ymd(today)
+    if p == "last_month":
+        end = today.replace(day=1) - timedelta(days=1)
+        return _ymd(end.replace(day=1)), _ymd(end)
+    return None
+
+
+def _sync_window(state: Optional[Dict[str, Any]], today: date) -> Tuple[date, date]:
+    state = state or {}
+    last = state.get("last_synced_ymd")
+    if last and state.get("first_synced_ymd"):
+        since = _parse_ymd(last) - timedelta(days=ATTRIBUTION_WINDOW_DAYS)
+    else:
+        # no (known) coverage start: pull the full initial window
+        since = today - timedelta(days=INITIAL_BACKFILL_DAYS)
+    return min(since, today), today
+
+
+def _backfill_window(first_ymd: str, today: date) -> Optional[Tuple[date, date]]:
+    """
+    The next chunk before the covered range, or None once HISTORY_DAYS is covered.
+    """
+    horizon = today - timedelta(days=HISTORY_DAYS)
+    first = _parse_ymd(first_ymd)
+    if first <= horizon:
+        return None
+    return max(horizon, first - timedelta(days=MAX_DAYS_PER_REQUEST)), first - timedelta(days=1)
+
+
+def _chunks(since: date, until: date):
+    cur = since
+    while cur <= until:
+        end = min(until, cur + timedelta(days=MAX_DAYS_PER_REQUEST - 1))
+        yield cur, end
+        cur = end + timedelta(days=1)
+
+
+def _campaign_map(business_id: str, ad_account_id: str) -> Dict[str, str]:
+    """
+    fb_campaign_id -> local AdCampaign _id for campaigns we created.
+    """
+    col = db_ext.get_collection(AdCampaign.collection_name)
+    cursor = col.find(
+        {
+            "business_id": ObjectId(str(business_id)),
+            "ad_account_id": ad_account_id,
+            "fb_campaign_id": {"$ne": None},
+        },
+        {"_id": 1, "fb_campaign_id": 1},
+    )
+    return {str(d["fb_campaign_id"]): str(d["_id"]) for d in cursor}
+
+
+# -----------------------------
+# Sync
+# -----------------------------
+def _pull_range(
+    service: FacebookAdsService,
+    *,
+    business_id: str,
+    ad_account_id: str,
+    campaign_map: Dict[str, str],
+    since: date,
+    until: date,
+    rows: Dict[str, int],
+    log_tag: str,
+) -> Optional[str]:
+    """
+    Pull every configured level for [since, until]. Returns the error, if any.
+    """
+    for level in SYNC_LEVELS:
+        for c_since, c_until in _chunks(since, until):
+            resp = service.get_account_insights_daily(level, _ymd(c_since), _ymd(c_until))
+            # persist whatever pages we did get, then stop this account
+            rows[level] = rows.get(level, 0) + AdsInsightDaily.upsert_rows(
+                business_id=business_id,
+                ad_account_id=ad_account_id,
+                level=level,
+                rows=resp.get("data") or [],
+                campaign_map=campaign_map,
+                platform=PLATFORM,
+            )
+            if not resp.get("success"):
+                err = str(resp.get("error"))
+                Log.error(f"{log_tag} level={level} {_ymd(c_since)}..{_ymd(c_until)} failed: {err}")
+                return err
+    return None
+
+
+def sync_ad_account(account: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Incremental sync of one ad account (all configured levels), then one chunk
+    of history backfill.
+    """
+    business_id = str(account["business_id"])
+    ad_account_id = account["ad_account_id"]
+    log_tag = f"[facebook_insights_warehouse][sync_ad_account][{business_id}][{ad_account_id}]"
+
+    token = account.get("access_token_plain")
+    if not token:
+        Log.info(f"{log_tag} no token; skipping")
+        return {"skipped": True}
+
+    today = _account_today(account.get("timezone_name"))
+    state = AdsInsightSyncState.get(business_id=business_id, ad_account_id=ad_account_id) or {}
+    since, until = _sync_window(state, today)
+
+    service = FacebookAdsService(token, ad_account_id)
+    campaign_map = _campaign_map(business_id, ad_account_id)
+    pull = dict(
+        business_id=business_id,
+        ad_account_id=ad_account_id,
+        campaign_map=campaign_map,
+        log_tag=log_tag,
+    )
+
+    stats: Dict[str, Any] = {"since": _ymd(since), "until": _ymd(until), "rows": {}}
+    err = _pull_range(service, since=since, until=until, rows=stats["rows"], **pull)
+    if err:
+        AdsInsightSyncState.mark(
+            business_id=business_id,
+            ad_account_id=ad_account_id,
+            stats=stats,
+            error=err,
+            platform=PLATFORM,
+        )
+        return stats
+
+    first_ymd = state.get("first_synced_ymd")
+    if not first_ymd or not state.get("last_synced_ymd"):
+        first_ymd = _ymd(since)
+
+    # coverage only moves back once a whole backfill chunk landed
+    backfill = _backfill_window(first_ymd, today)
+    if backfill:
+        stats["backfill"] = {"since": _ymd(backfill[0]), "until": _ymd(backfill[1]), "rows": {}}
+        err = _pull_range(service, since=backfill[0], until=backfill[1], rows=stats["backfill"]["rows"], **pull)
+        if not err:
+            first_ymd = _ymd(backfill[0])
+
+    AdsInsightSyncState.mark(
+        business_id=business_id,
+        ad_account_id=ad_account_id,
+        first_synced_ymd=first_ymd,
+        last_synced_ymd=_ymd(until),
+        stats=stats,
+        error=err,
+        platform=PLATFORM,
+    )
+    Log.info(f"{log_tag} synced {stats}")
+    return stats
+
+
+def _sync_accounts(business_id: Optional[str] = None) -> Dict[str, int]:
+    log_tag = f"[facebook_insights_warehouse][sync][{business_id or 'all'}]"
+    summary = {"accounts": 0, "failed": 0}
+
+    for account in AdAccount.iter_active_with_token(platform=PLATFORM, business_id=business_id):
+        summary["accounts"] += 1
+        try:
+            sync_ad_account(account)
+        except Exception as e:
+            summary["failed"] += 1
+            Log.error(f"{log_tag} account={account.get('ad_account_id')} failed: {e}")
+
+    Log.info(f"{log_tag} done {summary}")
+    return summary
+
+
+# -----------------------------
+# Reads
+# -----------------------------
+def is_range_synced(business_id: str, ad_account_id: str, since_ymd: str, until_ymd: str) -> bool:
+    """
+    True only when both ends of the range fall inside the synced coverage.
+    """
+    state = AdsInsightSyncState.get(business_id=business_id, ad_account_id=ad_account_id) or {}
+    first = state.get("first_synced_ymd")
+    last = state.get("last_synced_ymd")
+    return bool(first and last) and first <= since_ymd and last >= until_ymd
+
+
+def read_campaign_insights(
+    *,
+    business_id: str,
+    ad_account: Dict[str, Any],
+    fb_campaign_id: str,
+    date_preset: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Campaign totals for a date_preset from the warehouse, shaped like a Marketing
+    API insights row. Returns None when the range is not covered locally yet.
+    """
+    rng = preset_to_range(date_preset, ad_account.get("timezone_name"))
+    if not rng:
+        return None
+
+    since, until = rng
+    if not is_range_synced(business_id, ad_account["ad_account_id"], since, until):
+        return None
+
+    row = AdsInsightDaily.summarize(
+        business_id=business_id,
+        level="campaign",
+        object_id=fb_campaign_id,
+        since_ymd=since,
+        until_ymd=until,
+    )
+    if row is None:
+        # synced but no delivery in range
+        row = {
+            "impressions": 0, "reach": 0, "reach_basis": "exact", "clicks": 0, "spend": 0,
+            "cpc": 0, "cpm": 0, "ctr": 0, "actions": [], "cost_per_action_type": [], "days": 0,
+            "date_start": since, "date_stop": until,
+        }
+    return row
+
+
+# -----------------------------
+# RQ entrypoints
+# -----------------------------
+def sync_facebook_ads_insights():
+    """
+    RQ entrypoint (scheduled by app/jobs/periodic.py, FB_ADS_INSIGHTS_SYNC_CRON):
+      enqueue("app.services.social.ads.facebook_insights_warehouse.sync_facebook_ads_insights", queue_name="publish")
+    """
+    from ..appctx import run_in_app_context
+    return run_in_app_context(_sync_accounts)
+
+
+def sync_facebook_ads_insights_for_business(business_id: str):
+    """
+    RQ entrypoint (e.g. right after an ad account is connected):
+      enqueue("app.services.social.ads.facebook_insights_warehouse.sync_facebook_ads_insights_for_business",
+              business_id, queue_name="publish")
+    """
+    from ..appctx import run_in_app_context
+    return run_in_app_context(_sync_accounts, business_id)
@@ -0,0 +1,364 @@
+# app/services/social/ads/facebook_targeting_catalog.py
+#
+# Cached Facebook Ads targeting catalog with in-process typeahead search.
+#
+# Key design:
+# - Targeting options are persisted per locale in ads_targeting_catalog (Mongo)
+# - Each process keeps a prefix + trigram index per (locale, kind), reloaded
+#   from Mongo every FB_TARGETING_INDEX_TTL seconds
+# - Typeahead is answered from the index; the Marketing API is only called on a
+#   cache miss, and whatever it returns is written to Mongo and added to the
+#   live index in place (no rebuild on the typing path)
+# - A periodic job (app/jobs/periodic.py) re-pulls targetingbrowse + the
+#   behaviors list per locale
+#
+# RQ entrypoint:
+#   - app.services.social.ads.facebook_targeting_catalog.refresh_facebook_targeting_catalog
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ....utils.logger import Log
+from ....models.social.ads_targeting_catalog import AdsTargetingCatalog
+from .facebook_ads_service import FacebookAdsService
+
+
+PLATFORM = "facebook"
+
+# -----------------------------
+# Config
+# -----------------------------
+DEFAULT_LOCALE = os.getenv("FB_TARGETING_DEFAULT_LOCALE", "en_US")
+REFRESH_LOCALES = [
+    x.strip() for x in (os.getenv("FB_TARGETING_LOCALES") or DEFAULT_LOCALE).split(",") if x.strip()
+]
+# In-process index lifetime before it is rebuilt from Mongo
+INDEX_TTL_SECONDS = int(os.getenv("FB_TARGETING_INDEX_TTL", "600"))
+
+SEARCH_KINDS = ("interests", "behaviors")
+
+# Index tuning
+MAX_PREFIX_LEN = 12
+TRIGRAM_MIN_SCORE = 0.5
+
+# targetingbrowse "type" -> catalog kind
+BROWSE_TYPE_TO_KIND = {
+    "interests": "interests",
+    "behaviors": "behaviors",
+}
+
+
+# -----------------------------
+# Text helpers
+# -----------------------------
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return text.lower().strip()
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(_normalize(text))
+
+
+def _trigrams(text: str) -> Set[str]:
+    t = f"  {' '.join(_tokens(text))} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+def _audience(item: Dict[str, Any]) -> int:
+    try:
+        return int(item.get("audience_size_upper_bound") or item.get("audience_size") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# -----------------------------
+# In-process search index
+# -----------------------------
+class TargetingIndex:
+    """
+    Prefix map (token prefix -> item ids) for typeahead, with a trigram map as
+    a typo-tolerant fallback when no item matches every typed token.
+
+    Live misses are added in place; the per-index lock keeps a search from
+    seeing a half-inserted item (both sides are in-memory and short).
+    """
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self._names: Dict[str, str] = {}
+        self._tokens: Dict[str, List[str]] = {}
+        self._prefix: Dict[str, Set[str]] = defaultdict(set)
+        self._trigram: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+        for it in items:
+            self._add(it)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add_many(self, items: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for it in items:
+                self._add(it)
+
+    def _add(self, item: Dict[str, Any]) -> None:
+        item_id = str(item.get("id") or "").strip()
+        if not item_id:
+            return
+        if item_id in self.items:
+            self._remove(item_id)
+
+        self.items[item_id] = item
+        name = item.get("name") or ""
+        toks = _tokens(name)
+
+        self._names[item_id] = _normalize(name)
+        self._tokens[item_id] = toks
+
+        for tok in toks:
+            for n in range(1, min(len(tok), MAX_PREFIX_LEN) + 1):
+                self._prefix[tok[:n]].add(item_id)
+
+        for tg in _trigrams(name):
+            self._trigram[tg].add(item_id)
+
+    def _remove(self, item_id: str) -> None:
+        for tok in self._tokens.pop(item_id, []):
+            for n in range(1, min(len(tok), MAX_PREFIX_LEN) + 1):
+                self._prefix.get(tok[:n], set()).discard(item_id)
+        for tg in _trigrams(self.items[item_id].get("name") or ""):
+            self._trigram.get(tg, set()).discard(item_id)
+        self._names.pop(item_id, None)
+        self.items.pop(item_id, None)
+
+    def _prefix_candidates(self, q_tokens: List[str]) -> Set[str]:
+        result: Optional[Set[str]] = None
+        for qt in q_tokens:
+            ids = self._prefix.get(qt[:MAX_PREFIX_LEN], set())
+            if len(qt) > MAX_PREFIX_LEN:
+                ids = {i for i in ids if any(t.startswith(qt) for t in self._tokens[i])}
+            result = set(ids) if result is None else (result & ids)
+            if not result:
+                return set()
+        return result or set()
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        q_norm = _normalize(query)
+        q_tokens = _tokens(query)
+        if not q_tokens:
+            return []
+
+        with self._lock:
+            return self._search(query, q_norm, q_tokens, limit)
+
+    def _search(self, query: str, q_norm: str, q_tokens: List[str], limit: int) -> List[Dict[str, Any]]:
+        scores: Dict[str, float] = {i: 1.0 for i in self._prefix_candidates(q_tokens)}
+
+        if not scores:
+            q_tri = _trigrams(query)
+            counts: Dict[str, int] = defaultdict(int)
+            for tg in q_tri:
+                for i in self._trigram.get(tg, ()):
+                    counts[i] += 1
+            need = max(1, len(q_tri)) * TRIGRAM_MIN_SCORE
+            scores = {i: c / max(1, len(q_tri)) for i, c in counts.items() if c >= need}
+
+        def rank(item_id: str) -> Tuple:
+            name = self._names[item_id]
+            return (
+                name != q_norm,
+                not name.startswith(q_norm),
+                -scores[item_id],
+                -_audience(self.items[item_id]),
+                name,
+            )
+
+        return [self.items[i] for i in sorted(scores, key=rank)[:limit]]
+
+
+_INDEXES: Dict[Tuple[str, str], Tuple[TargetingIndex, float]] = {}
+# guards the two dicts below; a build only holds its own (locale, kind) lock
+_LOCK = threading.Lock()
+_BUILD_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+
+
+def _load_index(locale: str, kind: str) -> TargetingIndex:
+    rows = AdsTargetingCatalog.list_items(platform=PLATFORM, locale=locale, kind=kind)
+    return TargetingIndex([r.get("raw") or {"id": r.get("item_id"), "name": r.get("name")} for r in rows])
+
+
+def get_index(locale: str, kind: str) -> TargetingIndex:
+    key = (locale, kind)
+    now = time.monotonic()
+
+    cached = _INDEXES.get(key)
+    if cached and now - cached[1] < INDEX_TTL_SECONDS:
+        return cached[0]
+
+    with _LOCK:
+        build_lock = _BUILD_LOCKS.setdefault(key, threading.Lock())
+
+    with build_lock:
+        cached = _INDEXES.get(key)
+        if cached and now - cached[1] < INDEX_TTL_SECONDS:
+            return cached[0]
+
+        idx = _load_index(locale, kind)
+        with _LOCK:
+            _INDEXES[key] = (idx, time.monotonic())
+        return idx
+
+
+def invalidate_index(locale: Optional[str] = None, kind: Optional[str] = None) -> None:
+    with _LOCK:
+        for key in list(_INDEXES.keys()):
+            if (locale is None or key[0] == locale) and (kind is None or key[1] == kind):
+                _INDEXES.pop(key, None)
+
+
+def _ingest(locale: str, kind: str, items: List[Dict[str, Any]], scope: str = "") -> int:
+    written = AdsTargetingCatalog.upsert_items(
+        platform=PLATFORM, locale=locale, kind=kind, items=items, scope=scope
+    )
+    if written and not scope:
+        # fold into the live index; a process without one loads it from Mongo
+        cached = _INDEXES.get((locale, kind))
+        if cached:
+            cached[0].add_many(items)
+    return written
+
+
+# -----------------------------
+# Public API (typeahead)
+# -----------------------------
+def lookup_cached(kind: str, query: str, limit: int = 20, locale: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    In-process index lookup only (no API call, no token needed). Empty list = miss.
+    """
+    if kind not in SEARCH_KINDS:
+        raise ValueError(f"Unsupported targeting kind: {kind}")
+
+    locale = locale or DEFAULT_LOCALE
+    try:
+        return get_index(locale, kind).search(query, limit=limit)
+    except Exception as e:
+        Log.error(f"[facebook_targeting_catalog][lookup_cached][{kind}][{locale}] index lookup failed: {e}")
+        return []
+
+
+def search_targeting(
+    service: FacebookAdsService,
+    kind: str,
+    query: str,
+    limit: int = 20,
+    locale: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Same response shape as FacebookAdsService.search_interests/search_behaviors,
+    plus "source": "cache" | "live".
+    """
+    locale = locale or DEFAULT_LOCALE
+    log_tag = f"[facebook_targeting_catalog][search_targeting][{kind}][{locale}]"
+
+    hits = lookup_cached(kind, query, limit=limit, locale=locale)
+    if hits:
+        return {"success": True, "data": {"data": hits}, "source": "cache"}
+
+    # Cache miss -> live, then remember the answer
+    if kind == "interests":
+        result = service.search_interests(query, limit=limit, locale=locale)
+    else:
+        result = service.search_behaviors(query, limit=limit, locale=locale)
+
+    if result.get("success"):
+        items = (result.get("data") or {}).get("data") or []
+        try:
+            _ingest(locale, kind, items)
+        except Exception as e:
+            Log.error(f"{log_tag} ingest failed: {e}")
+
+    result["source"] = "live"
+    return result
+
+
+def _ingest_browse(locale: str, scope: str, items: List[Dict[str, Any]]) -> None:
+    _ingest(locale, "browse", items, scope=scope)
+
+    by_kind: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for it in items:
+        kind = BROWSE_TYPE_TO_KIND.get((it.get("type") or "").lower())
+        if kind:
+            by_kind[kind].append(it)
+
+    for kind, kind_items in by_kind.items():
+        _ingest(locale, kind, kind_items)
+
+
+# -----------------------------
+# Periodic refresh
+# -----------------------------
+def refresh_catalog(service: FacebookAdsService, locale: str) -> Dict[str, Any]:
+    """
+    Re-pull the browse tree (interests + behaviors) and the full behaviors list.
+    """
+    log_tag = f"[facebook_targeting_catalog][refresh_catalog][{locale}]"
+    stats = {"locale": locale, "browse": 0, "behaviors": 0}
+
+    browse = service.get_targeting_browse(locale=locale)
+    if browse.get("success"):
+        items = (browse.get("data") or {}).get("data") or []
+        _ingest_browse(locale, service.ad_account_id or "", items)
+        stats["browse"] = len(items)
+    else:
+        Log.info(f"{log_tag} browse failed: {browse.get('error')}")
+
+    behaviors = service.search_behaviors("", limit=1000, locale=locale)
+    if behaviors.get("success"):
+        items = (behaviors.get("data") or {}).get("data") or []
+        stats["behaviors"] = _ingest(locale, "behaviors", items)
+    else:
+        Log.info(f"{log_tag} behaviors failed: {behaviors.get('error')}")
+
+    invalidate_index(locale=locale)
+    return stats
+
+
+def _run_refresh_facebook_targeting_catalog():
+    log_tag = "[facebook_targeting_catalog][refresh_job]"
+
+    from ....models.social.ad_account import AdAccount
+
+    account = AdAccount.get_any_with_token(platform=PLATFORM)
+    if not account:
+        Log.info(f"{log_tag} no active facebook ad account with a token; skipping")
+        return
+
+    service = FacebookAdsService(account["access_token_plain"], account["ad_account_id"])
+    for locale in REFRESH_LOCALES:
+        try:
+            stats = refresh_catalog(service, locale)
+            Log.info(f"{log_tag} refreshed {stats}")
+        except Exception as e:
+            Log.error(f"{log_tag} locale={locale} failed: {e}")
+
+
+def refresh_facebook_targeting_catalog():
+    """
+    RQ entrypoint (scheduled by app/jobs/periodic.py, FB_TARGETING_REFRESH_CRON):
+      enqueue("app.services.social.ads.facebook_targeting_catalog.refresh_facebook_targeting_catalog", queue_name="publish")
+    """
+    from ..appctx import run_in_app_context
+    return run_in_app_context(_run_refresh_facebook_targeting_catalog)
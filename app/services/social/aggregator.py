@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any, Dict, List
 
 from .providers.base import ProviderResult
@@ -16,6 +17,8 @@ from .providers.pinterest_provider import PinterestProvider
 
 from ...models.social.social_account import SocialAccount
 from ...models.social.social_dashboard_summary import SocialDashboardSummary  # ✅ NEW
+from ...models.social.social_snapshot_rollup import period_bounds
+from .snapshot_store import pick_granularity
 
 
 CANON_KEYS = [
@@ -41,6 +44,33 @@ def _merge_totals(dst: Dict[str, float], src: Dict[str, Any]) -> Dict[str, float
     return dst
 
 
+def _bucket_timeline(points: List[Dict[str, Any]], since_ymd: str, granularity: str) -> List[Dict[str, Any]]:
+    """
+    Re-key one destination's timeline onto `granularity` periods (clipped at
+    `since`), the same keys snapshot rollup reads produce, so live daily points
+    and rollup fallbacks merge. Followers keep the latest value in a bucket.
+    """
+    if granularity == "day":
+        return points or []
+
+    since = datetime.strptime(since_ymd, "%Y-%m-%d").date()
+    buckets: Dict[str, Dict[str, Any]] = {}
+    for pt in sorted(points or [], key=lambda p: p.get("date") or ""):
+        d = pt.get("date")
+        if not d:
+            continue
+        start = max(period_bounds(granularity, datetime.strptime(d[:10], "%Y-%m-%d").date())[0], since)
+        key = start.strftime("%Y-%m-%d")
+        agg = buckets.setdefault(key, {"date": key})
+        for k in CANON_KEYS:
+            if k == "followers":
+                if pt.get("followers") is not None:
+                    agg["followers"] = pt.get("followers")
+            else:
+                agg[k] = int(agg.get(k) or 0) + int(pt.get(k) or 0)
+    return list(buckets.values())
+
+
 def _merge_timeline(all_points: Dict[str, Dict[str, Any]], platform_points: List[Dict[str, Any]]):
     for pt in platform_points or []:
         d = pt.get("date")
@@ -91,6 +121,9 @@ class SocialAggregator:
         Persistence target: social_dashboard_summaries
           key = (business_id, user__id, since_ymd, until_ymd)
         """
+        # Long ranges chart per week/month/quarter; snapshot fallbacks then read rollups
+        granularity = pick_granularity(since_ymd, until_ymd)
+
         # Pull all destinations from SocialAccount collection
         all_accounts: List[Dict[str, Any]] = []
         for platform in self.providers.keys():
@@ -141,12 +174,13 @@ class SocialAggregator:
             # global totals
             _merge_totals(totals, res.totals or {})
             # timeline
-            _merge_timeline(timeline_map, res.timeline or [])
+            _merge_timeline(timeline_map, _bucket_timeline(res.timeline or [], since_ymd, granularity))
 
         timeline = [timeline_map[k] for k in sorted(timeline_map.keys())]
 
         payload: Dict[str, Any] = {
             "range": {"since": since_ymd, "until": until_ymd},
+            "granularity": granularity,
             "totals": totals,
             "by_platform": by_platform_totals,
             "timeline": timeline,
@@ -0,0 +1,364 @@
+# app/services/social/analytics_export.py
+#
+# Bulk export of stored social analytics (CSV / XLSX).
+#
+# Key design:
+# - Reads ONLY local data (social_daily_snapshots, scheduled_posts); never calls provider APIs
+# - Server-side cursors with a fixed batch_size -> constant memory regardless of range
+# - Reads use the "exports" read profile (secondaries, see extensions/read_routing.py)
+# - Small ranges stream straight to the client (chunked transfer)
+# - Large ranges run as an RQ job that writes a temp file and uploads it for download
+#
+# RQ entrypoint:
+#   - app.services.social.analytics_export.run_analytics_export
+
+from __future__ import annotations
+
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from bson import ObjectId
+
+from ...extensions.db import db as db_ext
+from ...utils.logger import Log
+from ...models.social.social_daily_snapshot import SocialDailySnapshot, CANON_KEYS
+from ...models.social.scheduled_post import ScheduledPost, POST_METRIC_KEYS
+from ...models.social.social_analytics_export import SocialAnalyticsExport
+from .appctx import run_in_app_context
+
+
+# -----------------------------
+# Config
+# -----------------------------
+# Ranges up to this many days are streamed inline; longer ones become a background job.
+EXPORT_SYNC_MAX_DAYS = int(os.getenv("SOCIAL_EXPORT_SYNC_MAX_DAYS", "92"))
+# Mongo cursor batch size (documents per round trip)
+EXPORT_CURSOR_BATCH = int(os.getenv("SOCIAL_EXPORT_CURSOR_BATCH", "500"))
+# CSV rows buffered before a chunk is yielded
+EXPORT_CSV_FLUSH_ROWS = int(os.getenv("SOCIAL_EXPORT_CSV_FLUSH_ROWS", "200"))
+# Lifetime (seconds) of the signed link handed out for a finished background export
+EXPORT_DOWNLOAD_URL_TTL = int(os.getenv("SOCIAL_EXPORT_DOWNLOAD_URL_TTL", "900"))
+
+DATASETS = ("snapshots", "posts")
+FILE_FORMATS = ("csv", "xlsx")
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+SNAPSHOT_COLUMNS = ["date", "platform", "destination_id"] + CANON_KEYS
+
+POST_COLUMNS = [
+    "post_id",
+    "scheduled_at_utc",
+    "post_status",
+    "platform",
+    "destination_id",
+    "destination_type",
+    "placement",
+    "status",
+    "provider_post_id",
+    "error",
+    "metrics_updated_at",
+] + POST_METRIC_KEYS
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def _parse_ymd(s: str) -> datetime:
+    return datetime.strptime(s, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+def range_days(since_ymd: str, until_ymd: str) -> int:
+    return (_parse_ymd(until_ymd) - _parse_ymd(since_ymd)).days + 1
+
+
+def should_run_in_background(since_ymd: str, until_ymd: str) -> bool:
+    return range_days(since_ymd, until_ymd) > EXPORT_SYNC_MAX_DAYS
+
+
+def export_filename(dataset: str, file_format: str, since_ymd: str, until_ymd: str) -> str:
+    return f"social-{dataset}-{since_ymd}_{until_ymd}.{file_format}"
+
+
+def columns_for(dataset: str) -> List[str]:
+    return SNAPSHOT_COLUMNS if dataset == "snapshots" else POST_COLUMNS
+
+
+# -----------------------------
+# Row sources (server-side cursors)
+# -----------------------------
+def iter_snapshot_rows(*, business_id: str, user__id: str, since_ymd: str, until_ymd: str) -> Iterator[List[Any]]:
+    q = {
+        "business_id": ObjectId(str(business_id)),
+        "user__id": ObjectId(str(user__id)),
+        "date_ymd": {"$gte": since_ymd, "$lte": until_ymd},
+    }
+    projection = {"_id": 0, "date_ymd": 1, "platform": 1, "destination_id": 1, "data": 1}
+
+    cursor = (
+        SocialDailySnapshot.col(read="exports")
+        .find(q, projection)
+        .sort([("date_ymd", 1), ("platform", 1), ("destination_id", 1)])
+        .batch_size(EXPORT_CURSOR_BATCH)
+    )
+    try:
+        for doc in cursor:
+            data = doc.get("data") or {}
+            yield [doc.get("date_ymd"), doc.get("platform"), doc.get("destination_id")] + [
+                data.get(k, 0) for k in CANON_KEYS
+            ]
+    finally:
+        cursor.close()
+
+
+def iter_post_rows(*, business_id: str, user__id: str, since_ymd: str, until_ymd: str) -> Iterator[List[Any]]:
+    """
+    One row per post destination (provider_results), as stored after publishing.
+    Metric columns come from provider_results[].metrics (written through when
+    post insights are fetched) and are blank for posts never measured.
+    """
+    q = {
+        "business_id": ObjectId(str(business_id)),
+        "user__id": ObjectId(str(user__id)),
+        "scheduled_at_utc": {
+            "$gte": _parse_ymd(since_ymd),
+            "$lt": _parse_ymd(until_ymd) + timedelta(days=1),
+        },
+    }
+    projection = {"_id": 1, "scheduled_at_utc": 1, "status": 1, "provider_results": 1}
+
+    cursor = (
+        db_ext.get_collection(ScheduledPost.collection_name, read="exports")
+        .find(q, projection)
+        .sort("scheduled_at_utc", 1)
+        .batch_size(EXPORT_CURSOR_BATCH)
+    )
+    try:
+        for doc in cursor:
+            post_id = str(doc.get("_id"))
+            scheduled = doc.get("scheduled_at_utc")
+            scheduled = scheduled.isoformat() if isinstance(scheduled, datetime) else scheduled
+            results = doc.get("provider_results") or [{}]
+
+            for r in results:
+                metrics = r.get("metrics") or {}
+                measured = r.get("metrics_updated_at")
+                measured = measured.isoformat() if isinstance(measured, datetime) else measured
+                yield [
+                    post_id,
+                    scheduled,
+                    doc.get("status"),
+                    r.get("platform"),
+                    r.get("destination_id"),
+                    r.get("destination_type"),
+                    r.get("placement"),
+                    r.get("status"),
+                    r.get("provider_post_id"),
+                    r.get("error"),
+                    measured,
+                ] + [metrics.get(k) for k in POST_METRIC_KEYS]
+    finally:
+        cursor.close()
+
+
+def iter_rows(*, dataset: str, business_id: str, user__id: str, since_ymd: str, until_ymd: str) -> Iterator[List[Any]]:
+    source = iter_snapshot_rows if dataset == "snapshots" else iter_post_rows
+    return source(business_id=business_id, user__id=user__id, since_ymd=since_ymd, until_ymd=until_ymd)
+
+
+# -----------------------------
+# Writers
+# -----------------------------
+def stream_csv(columns: List[str], rows: Iterable[List[Any]]) -> Iterator[bytes]:
+    """
+    Yields CSV chunks; holds at most EXPORT_CSV_FLUSH_ROWS rows in memory.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= EXPORT_CSV_FLUSH_ROWS:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate(0)
+            pending = 0
+
+    tail = buf.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def write_csv_file(path: str, columns: List[str], rows: Iterable[List[Any]]) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_xlsx_file(path: str, columns: List[str], rows: Iterable[List[Any]], sheet_title: str = "export") -> int:
+    """
+    openpyxl write-only mode streams rows to disk instead of building the sheet in memory.
+    """
+    from openpyxl import Workbook  # heavy import: only when an XLSX is requested
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title[:31])
+    ws.append(columns)
+
+    count = 0
+    for row in rows:
+        ws.append(row)
+        count += 1
+
+    wb.save(path)
+    return count
+
+
+def write_file(path: str, file_format: str, dataset: str, rows: Iterable[List[Any]]) -> int:
+    columns = columns_for(dataset)
+    if file_format == "xlsx":
+        return write_xlsx_file(path, columns, rows, sheet_title=dataset)
+    return write_csv_file(path, columns, rows)
+
+
+def stream_file(path: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Yields a file in chunks and removes it afterwards.
+    """
+    try:
+        with open(path, "rb") as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def stream_export(
+    *,
+    dataset: str,
+    file_format: str,
+    business_id: str,
+    user__id: str,
+    since_ymd: str,
+    until_ymd: str,
+) -> Iterator[bytes]:
+    """
+    Inline (chunked) export for small ranges.
+    CSV is produced row by row; XLSX needs a finished zip container, so it is
+    written to a temp file first and then streamed from disk.
+    """
+    rows = iter_rows(
+        dataset=dataset,
+        business_id=business_id,
+        user__id=user__id,
+        since_ymd=since_ymd,
+        until_ymd=until_ymd,
+    )
+
+    if file_format == "csv":
+        return stream_csv(columns_for(dataset), rows)
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    write_file(path, file_format, dataset, rows)
+    return stream_file(path)
+
+
+# -----------------------------
+# Background job (large ranges)
+# -----------------------------
+def _run_analytics_export(export_id: str):
+    log_tag = f"[analytics_export][run][{export_id}]"
+
+    job = SocialAnalyticsExport.get_by_id(export_id)
+    if not job:
+        Log.info(f"{log_tag} export not found")
+        return
+
+    SocialAnalyticsExport.update_status(export_id, SocialAnalyticsExport.STATUS_RUNNING)
+
+    dataset = job["dataset"]
+    file_format = job["file_format"]
+    filename = export_filename(dataset, file_format, job["since_ymd"], job["until_ymd"])
+
+    fd, path = tempfile.mkstemp(suffix=f".{file_format}")
+    os.close(fd)
+
+    try:
+        rows = iter_rows(
+            dataset=dataset,
+            business_id=job["business_id"],
+            user__id=job["user__id"],
+            since_ymd=job["since_ymd"],
+            until_ymd=job["until_ymd"],
+        )
+        count = write_file(path, file_format, dataset, rows)
+
+        from ...utils.media.storage_router import upload_raw_file
+
+        # Uploaded straight from disk so the export never sits in memory whole.
+        # The object is private; the status endpoint signs a short-lived link.
+        uploaded = upload_raw_file(
+            path,
+            folder=f"exports/{job['business_id']}/{job['user__id']}",
+            filename=filename,
+            public_id=f"{dataset}_{export_id}",
+            content_type=CONTENT_TYPES[file_format],
+        )
+
+        SocialAnalyticsExport.update_status(
+            export_id,
+            SocialAnalyticsExport.STATUS_DONE,
+            rows=count,
+            public_id=uploaded.get("public_id"),
+        )
+        Log.info(f"{log_tag} done rows={count} file={filename}")
+
+    except Exception as e:
+        Log.error(f"{log_tag} failed: {e}")
+        SocialAnalyticsExport.update_status(export_id, SocialAnalyticsExport.STATUS_FAILED, error=str(e))
+
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def export_download_url(job: Dict[str, Any]) -> Optional[str]:
+    """Short-lived signed link to a finished export's private file, else None."""
+    if job.get("status") != SocialAnalyticsExport.STATUS_DONE or not job.get("public_id"):
+        return None
+
+    from ...utils.media.storage_router import get_private_download_url
+
+    return get_private_download_url(job["public_id"], expires_in=EXPORT_DOWNLOAD_URL_TTL)
+
+
+def run_analytics_export(export_id: str):
+    """
+    RQ entrypoint:
+      enqueue("app.services.social.analytics_export.run_analytics_export", export_id, queue_name="publish")
+    """
+    return run_in_app_context(_run_analytics_export, export_id)
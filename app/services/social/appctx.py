@@ -1,12 +1,27 @@
+import threading
+
 from flask import Flask
 
+_APP = None
+_APP_LOCK = threading.Lock()
+
 # IMPORTANT:
 # Only import the factory inside the function to avoid circular imports
 def get_app() -> Flask:
-    from app import create_social_app  # local import prevents circular import
-    return create_social_app()
+    """
+    One app per process for background jobs. Jobs need the app context
+    (config, db, redis), not HTTP routes, so no route groups are registered
+    and none of the resource modules are imported.
+    """
+    global _APP
+    if _APP is None:
+        with _APP_LOCK:
+            if _APP is None:
+                from app import create_social_app  # local import prevents circular import
+                _APP = create_social_app(service_groups=())
+    return _APP
 
 def run_in_app_context(fn, *args, **kwargs):
     app = get_app()
     with app.app_context():
-        return fn(*args, **kwargs)
\ No newline at end of file
+        return fn(*args, **kwargs)
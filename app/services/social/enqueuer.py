@@ -40,7 +40,7 @@ def enqueue_due_posts(
     limit = limit if limit is not None else _env_int("ENQUEUER_LIMIT", 50)
     queue_name = (queue_name or os.getenv("RQ_PUBLISH_QUEUE") or "publish").strip() or "publish"
 
-    app = create_app()
+    app = create_app(service_groups=())
     q = get_queue(queue_name)
 
     with app.app_context():
@@ -15,6 +15,7 @@
 # RQ entrypoints:
 #   - app.services.social.jobs_snapshot.snapshot_daily
 #   - app.services.social.jobs_snapshot.snapshot_daily_for_business
+#   - app.services.social.jobs_snapshot.rebuild_snapshot_rollups_for_business
 
 from __future__ import annotations
 
@@ -24,6 +25,7 @@ from typing import Any, Dict, List, Optional
 from ...utils.logger import Log
 from ...models.social.social_account import SocialAccount
 from ...models.social.social_daily_snapshot import SocialDailySnapshot
+from .snapshot_store import SnapshotStore
 from .appctx import run_in_app_context
 
 
@@ -432,4 +434,49 @@ def snapshot_daily():
     RQ entrypoint (recommended):
       enqueue("app.services.social.jobs_snapshot.snapshot_daily", queue_name="publish")
     """
-    return run_in_app_context(_run_snapshot_daily_all)
\ No newline at end of file
+    return run_in_app_context(_run_snapshot_daily_all)
+
+
+# -----------------------------
+# Runner: rollup backfill for ONE business_id
+# -----------------------------
+def _run_rebuild_snapshot_rollups_for_business(business_id: str):
+    """
+    Recomputes week/month/quarter rollups from stored day snapshots.
+    Only needed for history written before rollups existed (or after manual edits).
+    """
+    log_tag = "[jobs_snapshot][rebuild_rollups_for_business]"
+
+    accounts = SocialAccount.get_all_by_business_id(business_id) or []
+    rebuilt = 0
+
+    for acct in accounts:
+        try:
+            user__id = str(acct.get("user__id") or "")
+            platform = (acct.get("platform") or "").strip().lower()
+            destination_id = str(acct.get("destination_id") or "").strip()
+
+            if not user__id or not platform or not destination_id:
+                continue
+
+            res = SnapshotStore.rebuild_rollups(
+                business_id=business_id,
+                user__id=user__id,
+                platform=platform,
+                destination_id=destination_id,
+            )
+            rebuilt += 1
+            Log.info(f"{log_tag} rebuilt {platform}:{destination_id} days={res.get('days')}")
+
+        except Exception as e:
+            Log.info(f"{log_tag} failed acct={acct.get('platform')}:{acct.get('destination_id')} err={e}")
+
+    Log.info(f"{log_tag} business_id={business_id} rebuilt_destinations={rebuilt}")
+
+
+def rebuild_snapshot_rollups_for_business(business_id: str):
+    """
+    RQ entrypoint:
+      enqueue("app.services.social.jobs_snapshot.rebuild_snapshot_rollups_for_business", business_id, queue_name="publish")
+    """
+    return run_in_app_context(_run_rebuild_snapshot_rollups_for_business, business_id)
@@ -0,0 +1,149 @@
+# app/services/social/llm/llm_cache.py
+#
+# Response cache for LLM JSON generations.
+#
+# Key design:
+# - Key = sha256 of the normalized system + user prompt, provider, model and
+#   generation params, namespaced per tenant (business) so cached output never
+#   crosses businesses
+# - Values are the parsed JSON result, stored in Redis with a TTL
+# - Hit / miss / store counters per tenant (HINCRBY) for dashboards
+# - "regenerate" skips the read but still refreshes the stored value
+# - Fail-open: any Redis error behaves like a miss
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Optional
+
+from ....utils.logger import Log
+
+
+LLM_CACHE_ENABLED = (os.getenv("LLM_CACHE_ENABLED", "true") or "").strip().lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+# Hard cap for per-call TTL overrides
+LLM_CACHE_MAX_TTL_SECONDS = int(os.getenv("LLM_CACHE_MAX_TTL_SECONDS", str(7 * 86400)))
+
+KEY_PREFIX = "llm:cache"
+STATS_PREFIX = "llm:cache:stats"
+GLOBAL_SCOPE = "global"
+
+# Params that change the output and therefore belong in the key
+KEY_PARAMS = ("temperature", "max_tokens", "options")
+
+_SPACES_RE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _redis():
+    from ....extensions.redis_conn import redis_client
+    return redis_client
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Whitespace/unicode normalization so trivially different prompts share a key.
+    Line breaks are kept (they are meaningful in captions).
+    """
+    s = unicodedata.normalize("NFC", text or "")
+    s = s.replace("\r\n", "\n").replace("\r", "\n")
+    s = "\n".join(_SPACES_RE.sub(" ", line).strip() for line in s.split("\n"))
+    s = _BLANK_LINES_RE.sub("\n\n", s)
+    return s.strip()
+
+
+def cache_key(
+    *,
+    system: str,
+    prompt: str,
+    provider: str,
+    model: str,
+    params: Optional[Dict[str, Any]] = None,
+    scope: Optional[str] = None,
+) -> str:
+    params = params or {}
+    material = {
+        "system": normalize_prompt(system),
+        "prompt": normalize_prompt(prompt),
+        "provider": (provider or "").lower(),
+        "model": model or "",
+        "params": {k: params.get(k) for k in KEY_PARAMS if params.get(k) is not None},
+    }
+    digest = hashlib.sha256(
+        json.dumps(material, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{KEY_PREFIX}:{scope or GLOBAL_SCOPE}:{digest}"
+
+
+def bump_stat(scope: Optional[str], field: str) -> None:
+    try:
+        _redis().hincrby(f"{STATS_PREFIX}:{scope or GLOBAL_SCOPE}", field, 1)
+    except Exception:
+        pass
+
+
+def get_cached(key: str, *, scope: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    try:
+        raw = _redis().get(key)
+    except Exception as e:
+        Log.warning(f"[llm_cache][get] redis unavailable: {e}")
+        return None
+
+    if raw is None:
+        bump_stat(scope, "misses")
+        return None
+
+    try:
+        value = json.loads(raw)
+    except Exception:
+        bump_stat(scope, "misses")
+        return None
+
+    bump_stat(scope, "hits")
+    return value
+
+
+def store(key: str, value: Dict[str, Any], *, scope: Optional[str] = None, ttl: Optional[int] = None) -> None:
+    ttl = int(ttl or LLM_CACHE_TTL_SECONDS)
+    ttl = max(1, min(ttl, LLM_CACHE_MAX_TTL_SECONDS))
+    try:
+        _redis().setex(key, ttl, json.dumps(value, ensure_ascii=False, default=str))
+        bump_stat(scope, "stores")
+    except Exception as e:
+        Log.warning(f"[llm_cache][store] redis unavailable: {e}")
+
+
+def get_cache_stats(scope: Optional[str] = None) -> Dict[str, Any]:
+    try:
+        raw = _redis().hgetall(f"{STATS_PREFIX}:{scope or GLOBAL_SCOPE}") or {}
+    except Exception:
+        raw = {}
+
+    stats = {k: int(raw.get(k) or 0) for k in ("hits", "misses", "stores", "regenerates")}
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def invalidate_scope(scope: str, batch: int = 500) -> int:
+    """
+    Drop every cached generation for a tenant (e.g. after brand settings change).
+    """
+    deleted = 0
+    try:
+        r = _redis()
+        keys = []
+        for k in r.scan_iter(match=f"{KEY_PREFIX}:{scope}:*", count=batch):
+            keys.append(k)
+            if len(keys) >= batch:
+                deleted += int(r.delete(*keys) or 0)
+                keys = []
+        if keys:
+            deleted += int(r.delete(*keys) or 0)
+    except Exception as e:
+        Log.warning(f"[llm_cache][invalidate_scope] failed scope={scope}: {e}")
+    return deleted
@@ -5,6 +5,7 @@ from __future__ import annotations
 import os
 import json
 import re
+import threading
 import time
 import uuid
 from dataclasses import dataclass
@@ -13,6 +14,7 @@ from typing import Any, Dict, Optional
 import requests
 
 from ....utils.logger import Log  # adjust if your relative path differs
+from . import llm_cache
 
 
 # ---------------------------------------------------------------------
@@ -22,6 +24,41 @@ DEFAULT_TIMEOUT_SECONDS = int(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
 DEFAULT_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))  # total attempts = 1 + retries
 DEFAULT_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
 DEFAULT_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "900"))
+# In-flight generations per backend per process (override per provider with
+# LLM_MAX_CONCURRENCY_<PROVIDER>, e.g. LLM_MAX_CONCURRENCY_OLLAMA=1 on CPU hosts)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+
+# ---------------------------------------------------------------------
+# Per-backend concurrency
+# ---------------------------------------------------------------------
+_SEMAPHORES: Dict[str, threading.BoundedSemaphore] = {}
+_SEMAPHORES_LOCK = threading.Lock()
+
+
+def max_concurrency_for(provider: str) -> int:
+    raw = os.getenv(f"LLM_MAX_CONCURRENCY_{(provider or '').upper()}")
+    try:
+        return max(1, int(raw)) if raw else max(1, DEFAULT_MAX_CONCURRENCY)
+    except ValueError:
+        return max(1, DEFAULT_MAX_CONCURRENCY)
+
+
+def configured_provider() -> str:
+    """
+    Provider name as the client reports it, without building a client.
+    """
+    provider = (os.getenv("LLM_PROVIDER") or "mock").lower().strip()
+    return {"gemini": "google", "huggingface": "hf"}.get(provider, provider)
+
+
+def _backend_semaphore(provider: str) -> threading.BoundedSemaphore:
+    with _SEMAPHORES_LOCK:
+        sem = _SEMAPHORES.get(provider)
+        if sem is None:
+            sem = threading.BoundedSemaphore(max_concurrency_for(provider))
+            _SEMAPHORES[provider] = sem
+        return sem
 
 
 # ---------------------------------------------------------------------
@@ -389,16 +426,54 @@ def get_llm_client() -> BaseLLMClient:
 
 def llm_generate_json(*, system: str, prompt: str, **kwargs) -> Dict[str, Any]:
     """
-    Convenience wrapper with retries.
+    Convenience wrapper with retries and a response cache.
+
+    Cache kwargs (not forwarded to the client):
+      - cache_scope: tenant namespace (business_id); defaults to a global scope
+      - regenerate: skip the cached value and refresh it
+      - cache_ttl: seconds to keep this result (defaults to LLM_CACHE_TTL_SECONDS)
+      - use_cache: False to bypass the cache entirely
     """
     trace_id = kwargs.pop("trace_id", None) or _new_trace_id()
+    scope = kwargs.pop("cache_scope", None)
+    regenerate = bool(kwargs.pop("regenerate", False))
+    cache_ttl = kwargs.pop("cache_ttl", None)
+    use_cache = bool(kwargs.pop("use_cache", True)) and llm_cache.LLM_CACHE_ENABLED
+
     client = get_llm_client()
 
+    # the mock client is instant; caching it would only hide provider switches
+    if client.provider == "mock":
+        use_cache = False
+
+    key = None
+    if use_cache:
+        key = llm_cache.cache_key(
+            system=system,
+            prompt=prompt,
+            provider=client.provider,
+            model=getattr(client, "model", ""),
+            params=kwargs,
+            scope=scope,
+        )
+        if regenerate:
+            llm_cache.bump_stat(scope, "regenerates")
+        else:
+            cached = llm_cache.get_cached(key, scope=scope)
+            if cached is not None:
+                Log.info(f"[llm_router][{trace_id}] cache hit provider={client.provider}")
+                return cached
+
     def _call():
-        return client.generate_json(system=system, prompt=prompt, trace_id=trace_id, **kwargs)
+        with _backend_semaphore(client.provider):
+            return client.generate_json(system=system, prompt=prompt, trace_id=trace_id, **kwargs)
 
     try:
-        return _retry_call(_call, retries=DEFAULT_MAX_RETRIES, trace_id=trace_id)
+        result = _retry_call(_call, retries=DEFAULT_MAX_RETRIES, trace_id=trace_id)
     except Exception as e:
         Log.warning(f"[llm_router][{trace_id}] generate_json failed: {e}")
-        raise
\ No newline at end of file
+        raise
+
+    if key:
+        llm_cache.store(key, result, scope=scope, ttl=cache_ttl)
+    return result
\ No newline at end of file
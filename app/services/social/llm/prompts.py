@@ -6,6 +6,32 @@ import json
 from typing import Any, Dict, List, Optional
 
 
+SCHWRITER_RESPONSE_SCHEMA = {
+    "platform": "string",
+    "action": "string",
+    "suggestions": [
+        {
+            "type": "string",
+            "title": "string",
+            "details": ["string"],
+        }
+    ],
+    "platform_notes": ["string"],
+    "warnings": ["string"],
+    "rewrites": {
+        "recommended_text": "string|null",
+        "alternatives": ["string"],
+    },
+    "metrics": {
+        "original_length": "int",
+        "recommended_length": "int|null",
+        "hashtag_count": "int",
+        "emoji_count": "int",
+        "link_present": "bool",
+    },
+}
+
+
 def _safe_json(obj: Any) -> str:
     try:
         return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
@@ -56,30 +82,7 @@ def build_schwriter_user_prompt(
     platform = (platform or "multi").lower().strip()
     action = (action or "full").lower().strip()
 
-    req_schema = {
-        "platform": "string",
-        "action": "string",
-        "suggestions": [
-            {
-                "type": "string",
-                "title": "string",
-                "details": ["string"],
-            }
-        ],
-        "platform_notes": ["string"],
-        "warnings": ["string"],
-        "rewrites": {
-            "recommended_text": "string|null",
-            "alternatives": ["string"],
-        },
-        "metrics": {
-            "original_length": "int",
-            "recommended_length": "int|null",
-            "hashtag_count": "int",
-            "emoji_count": "int",
-            "link_present": "bool",
-        },
-    }
+    req_schema = SCHWRITER_RESPONSE_SCHEMA
 
     return f"""
             ACTION: {action}
@@ -101,4 +104,58 @@ def build_schwriter_user_prompt(
 
             Return ONLY JSON matching this schema:
             {_safe_json(req_schema)}
-        """.strip()
\ No newline at end of file
+        """.strip()
+
+# ---------------------------------------------------------------------
+# Batch (multi-platform) prompts
+# ---------------------------------------------------------------------
+# The batch path sends the SAME system prompt and the SAME leading user-prompt
+# block for every platform; only the short tail differs. Backends that cache
+# prompt prefixes (OpenAI automatic prefix caching, Ollama KV reuse) can then
+# skip re-processing the shared part for platforms 2..N.
+
+def build_schwriter_batch_system_prompt() -> str:
+    return build_schwriter_system_prompt(platform="multi")
+
+
+def build_schwriter_shared_context(
+    *,
+    action: str,
+    content: Dict[str, Any],
+    brand: Optional[Dict[str, Any]] = None,
+    preferences: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Platform-independent prefix shared by every platform in a batch.
+    """
+    action = (action or "full").lower().strip()
+    req_schema = SCHWRITER_RESPONSE_SCHEMA
+
+    return f"""
+            ACTION: {action}
+
+            You will produce SchWriter recommendations for ONE platform (given at the end).
+
+            Input:
+            content={_safe_json(content)}
+            brand={_safe_json(brand or {})}
+            preferences={_safe_json(preferences or {})}
+
+            Rules:
+            - If the platform does not support clickable links, recommend placing the link inside the text (append it).
+            - Respect max_text if provided.
+            - If media is provided, suggest improvements relevant to media type (image/video/document).
+            - Provide at least 2 suggestions if action is "full"; otherwise focus only on the selected action.
+
+            Return ONLY JSON matching this schema:
+            {_safe_json(req_schema)}
+        """.strip()
+
+
+def build_schwriter_platform_suffix(*, platform: str, platform_rules: Optional[Dict[str, Any]] = None) -> str:
+    platform = (platform or "multi").lower().strip()
+    return f"""
+            Target platform:
+            platform="{platform}"
+            platform_rules={_safe_json(platform_rules or {})}
+        """.strip()
@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from .llm_router import llm_generate_json
-from .prompts import build_schwriter_system_prompt, build_schwriter_user_prompt
+from .llm_router import llm_generate_json, configured_provider, max_concurrency_for
+from .prompts import (
+    build_schwriter_system_prompt,
+    build_schwriter_user_prompt,
+    build_schwriter_batch_system_prompt,
+    build_schwriter_shared_context,
+    build_schwriter_platform_suffix,
+)
 
 
 @dataclass
@@ -17,35 +24,20 @@ class SchWriterRequest:
     brand: Optional[Dict[str, Any]] = None
     preferences: Optional[Dict[str, Any]] = None
     platform_rules: Optional[Dict[str, Any]] = None
+    business_id: Optional[str] = None  # cache namespace
+    regenerate: bool = False  # bypass cached result
 
 
 class SchWriterService:
     """
     Thin service that:
       - builds prompts
-      - calls LLM router
+      - calls LLM router (cached per business; regenerate=True forces a fresh call)
       - returns JSON for UI
     """
 
     @staticmethod
-    def enhance(req: SchWriterRequest) -> Dict[str, Any]:
-        system = build_schwriter_system_prompt(platform=req.platform)
-        prompt = build_schwriter_user_prompt(
-            action=req.action,
-            platform=req.platform,
-            content=req.content,
-            platform_rules=req.platform_rules,
-            brand=req.brand,
-            preferences=req.preferences,
-        )
-
-        result = llm_generate_json(
-            system=system,
-            prompt=prompt,
-            max_tokens=900,
-            temperature=0.2,
-        )
-
+    def _normalize(result: Dict[str, Any], req: SchWriterRequest) -> Dict[str, Any]:
         # minimal normalization
         result.setdefault("platform", (req.platform or "").lower().strip() or "multi")
         result.setdefault("action", (req.action or "full").lower().strip())
@@ -60,5 +52,74 @@ class SchWriterService:
             "emoji_count": 0,
             "link_present": False,
         })
+        return result
+
+    @staticmethod
+    def _generate(req: SchWriterRequest, system: str, prompt: str) -> Dict[str, Any]:
+        result = llm_generate_json(
+            system=system,
+            prompt=prompt,
+            max_tokens=900,
+            temperature=0.2,
+            cache_scope=req.business_id,
+            regenerate=req.regenerate,
+        )
+        return SchWriterService._normalize(result, req)
+
+    @staticmethod
+    def enhance(req: SchWriterRequest) -> Dict[str, Any]:
+        system = build_schwriter_system_prompt(platform=req.platform)
+        prompt = build_schwriter_user_prompt(
+            action=req.action,
+            platform=req.platform,
+            content=req.content,
+            platform_rules=req.platform_rules,
+            brand=req.brand,
+            preferences=req.preferences,
+        )
+        return SchWriterService._generate(req, system, prompt)
+
+    @staticmethod
+    def enhance_many(reqs: List[SchWriterRequest]) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Runs one generation per platform concurrently and yields
+        (platform, result, error) in completion order.
+
+        All requests share the system prompt and the leading context block of the
+        user prompt; only the platform suffix differs (prompt-prefix caching).
+        In-flight calls are capped per backend by the router.
+        """
+        if not reqs:
+            return
+
+        first = reqs[0]
+        system = build_schwriter_batch_system_prompt()
+        shared = build_schwriter_shared_context(
+            action=first.action,
+            content=first.content,
+            brand=first.brand,
+            preferences=first.preferences,
+        )
+
+        workers = min(len(reqs), max_concurrency_for(configured_provider()))
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="schwriter")
+        try:
+            futures = {}
+            for req in reqs:
+                prompt = f"{shared}\n\n{build_schwriter_platform_suffix(platform=req.platform, platform_rules=req.platform_rules)}"
+                futures[pool.submit(SchWriterService._generate, req, system, prompt)] = req.platform
 
-        return result
\ No newline at end of file
+            for fut in as_completed(futures):
+                platform = futures[fut]
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    yield platform, None, str(e)
+                    continue
+                # shared system prompt says "multi"; pin the real platform
+                result["platform"] = platform
+                yield platform, result, None
+        finally:
+            # client went away mid-stream -> drop queued platforms
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -3,10 +3,32 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 # from ...models.social.social_daily_snapshot import SocialDailySnapshot, CANON_KEYS
 from ...models.social.social_daily_snapshot import SocialDailySnapshot, CANON_KEYS
+from ...models.social.social_snapshot_rollup import (
+    SocialSnapshotRollup,
+    GRANULARITIES,
+    SUM_KEYS,
+    decompose_range,
+    finer_granularities,
+    period_bounds,
+)
+from ...extensions.read_routing import reads
+
+
+# Range length (days, inclusive) -> coarsest timeline granularity for granularity="auto".
+# Short ranges keep the day-by-day timeline; longer ones read rollups.
+AUTO_GRANULARITY_MAX_DAYS = [
+    (62, "day"),
+    (184, "week"),
+    (731, "month"),
+]
+
+# rebuild_rollups: passes before giving up on a destination that keeps changing
+REBUILD_MAX_PASSES = 3
 
 
 def _f(v: Any) -> float:
@@ -28,6 +50,21 @@ def _zero() -> Dict[str, float]:
     return {k: 0.0 for k in CANON_KEYS}
 
 
+def _parse_ymd(s: str):
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+def pick_granularity(since_ymd: str, until_ymd: str) -> str:
+    """
+    Coarsest granularity that still gives a useful chart for the range.
+    """
+    days = (_parse_ymd(until_ymd) - _parse_ymd(since_ymd)).days + 1
+    for max_days, g in AUTO_GRANULARITY_MAX_DAYS:
+        if days <= max_days:
+            return g
+    return "quarter"
+
+
 @dataclass
 class ProviderResult:
     platform: str
@@ -43,12 +80,9 @@ class SnapshotStore:
     A small service layer that:
       - writes day snapshots from a ProviderResult timeline
       - reads snapshots and returns ProviderResult-like data (for fallback)
+      - serves long ranges from week/month/quarter rollups
     """
 
-    @staticmethod
-    def ensure_indexes():
-        SocialDailySnapshot.ensure_indexes()
-
     @staticmethod
     def write_from_provider_result(
         *,
@@ -128,6 +162,7 @@ class SnapshotStore:
         return {"writes": 0, "mode": "skip"}
 
     @staticmethod
+    @reads("dashboards")
     def read_range_as_provider_result(
         *,
         business_id: str,
@@ -138,12 +173,38 @@ class SnapshotStore:
         until_ymd: str,
         destination_name: Optional[str] = None,
         debug: Optional[Dict[str, Any]] = None,
+        granularity: str = "auto",
     ) -> ProviderResult:
         """
         Read snapshots from DB and shape them into ProviderResult so your Aggregator can merge it.
+
+        granularity:
+          - "auto" (default): picked from the range length (see
+            AUTO_GRANULARITY_MAX_DAYS); long ranges are read from rollups.
+            SocialAggregator buckets live timelines with the same rule, so
+            provider fallbacks merge with live points
+          - "day": one timeline point per stored day, for callers that need
+            the per-day series whatever the range
+          - "week" | "month" | "quarter": one point per period, read from rollups
         """
         platform = (platform or "").lower().strip()
 
+        if granularity == "auto":
+            granularity = pick_granularity(since_ymd, until_ymd)
+
+        if granularity != "day":
+            return SnapshotStore._read_rollup_range(
+                business_id=business_id,
+                user__id=user__id,
+                platform=platform,
+                destination_id=destination_id,
+                since_ymd=since_ymd,
+                until_ymd=until_ymd,
+                granularity=granularity,
+                destination_name=destination_name,
+                debug=debug,
+            )
+
         rows = SocialDailySnapshot.get_range(
             business_id=business_id,
             user__id=user__id,
@@ -198,4 +259,156 @@ class SnapshotStore:
             totals=totals,
             timeline=timeline,
             debug=debug,
-        )
\ No newline at end of file
+        )
+
+    @staticmethod
+    def _read_rollup_range(
+        *,
+        business_id: str,
+        user__id: str,
+        platform: str,
+        destination_id: str,
+        since_ymd: str,
+        until_ymd: str,
+        granularity: str,
+        destination_name: Optional[str] = None,
+        debug: Optional[Dict[str, Any]] = None,
+    ) -> ProviderResult:
+        """
+        One timeline point per `granularity` period inside [since, until].
+
+        Whole periods are read straight from their rollup. Periods clipped by the
+        range edges are covered with the coarsest finer rollups that fit, then
+        single days, so the result is exact without scanning every day row.
+        """
+        since = _parse_ymd(since_ymd)
+        until = _parse_ymd(until_ymd)
+
+        # 1) Plan: bucket -> segments, and the set of rollup/day keys to fetch
+        buckets = []
+        wanted: Dict[str, set] = {g: set() for g in GRANULARITIES + ["day"]}
+
+        cur = since
+        while cur <= until:
+            b_start, b_end = period_bounds(granularity, cur)
+            clip_start, clip_end = max(b_start, since), min(b_end, until)
+
+            if (clip_start, clip_end) == (b_start, b_end):
+                segments = [(granularity, b_start, b_end)]
+            else:
+                segments = decompose_range(clip_start, clip_end, finer_granularities(granularity))
+
+            for g, seg_start, _ in segments:
+                wanted[g].add(seg_start.strftime("%Y-%m-%d"))
+
+            buckets.append((clip_start, clip_end, segments))
+            cur = clip_end + timedelta(days=1)
+
+        # 2) Fetch: one query per granularity actually needed
+        key = dict(
+            business_id=business_id,
+            user__id=user__id,
+            platform=platform,
+            destination_id=destination_id,
+        )
+        fetched: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for g in GRANULARITIES:
+            fetched[g] = SocialSnapshotRollup.get_periods(
+                **key, granularity=g, period_starts=sorted(wanted[g])
+            )
+
+        fetched["day"] = {}
+        for r in SocialDailySnapshot.get_dates(**key, dates_ymd=sorted(wanted["day"])):
+            data = r.get("data") or {}
+            fetched["day"][r["date_ymd"]] = {
+                "days": 1,
+                "data": data,
+                "followers": _f(data.get("followers")),
+                "followers_date": r["date_ymd"],
+            }
+
+        # 3) Assemble timeline points
+        totals = _zero()
+        timeline: List[Dict[str, Any]] = []
+
+        for clip_start, clip_end, segments in buckets:
+            sums = {k: 0.0 for k in SUM_KEYS}
+            days = 0
+            followers, followers_date = 0.0, ""
+
+            for g, seg_start, _ in segments:
+                doc = fetched[g].get(seg_start.strftime("%Y-%m-%d"))
+                if not doc or not doc.get("days"):
+                    continue
+
+                days += int(doc.get("days") or 0)
+                data = doc.get("data") or {}
+                for k in SUM_KEYS:
+                    sums[k] += _f(data.get(k))
+
+                if (doc.get("followers_date") or "") >= followers_date:
+                    followers = _f(doc.get("followers"))
+                    followers_date = doc.get("followers_date") or ""
+
+            if not days:
+                continue
+
+            pt = {
+                "date": clip_start.strftime("%Y-%m-%d"),
+                "until": clip_end.strftime("%Y-%m-%d"),
+                "granularity": granularity,
+                "days": days,
+                "followers": int(followers),
+            }
+            for k in SUM_KEYS:
+                pt[k] = int(sums[k])
+                totals[k] += sums[k]
+            timeline.append(pt)
+
+        # same rule as the daily path: latest follower snapshot inside range
+        totals["followers"] = float(timeline[-1]["followers"]) if timeline else 0.0
+
+        return ProviderResult(
+            platform=platform,
+            destination_id=destination_id,
+            destination_name=destination_name,
+            totals=totals,
+            timeline=timeline,
+            debug=debug,
+        )
+
+    @staticmethod
+    def rebuild_rollups(
+        *,
+        business_id: str,
+        user__id: str,
+        platform: str,
+        destination_id: str,
+    ) -> Dict[str, Any]:
+        """
+        Recompute all rollups of one destination from its day rows.
+        Use for backfilling history written before rollups existed.
+
+        Periods are overwritten in place (no delete-then-refill window). Day
+        writes landing during a pass may have their delta folded twice, so
+        the pass repeats while day rows changed under it.
+        """
+        platform = (platform or "").lower().strip()
+        key = dict(
+            business_id=business_id,
+            user__id=user__id,
+            platform=platform,
+            destination_id=destination_id,
+        )
+
+        rows: List[Dict[str, Any]] = []
+        passes = 0
+        while passes < REBUILD_MAX_PASSES:
+            passes += 1
+            started = datetime.now(timezone.utc)
+            rows = SocialDailySnapshot.get_range(**key, since_ymd="0000-00-00", until_ymd="9999-99-99")
+            SocialSnapshotRollup.replace_for_destination(**key, days=rows)
+            if not SocialDailySnapshot.updated_since(**key, since=started):
+                break
+
+        return {"days": len(rows), "passes": passes}
@@ -50,33 +50,31 @@ def _wallet_state():
     return db.get_collection("wallet_state")
 
 
-# ---------- Indexes (call once at startup) ----------
-def setup_indexes(idempotency_ttl_seconds: int = 30 * 24 * 3600):
-    # Accounts
-    _accounts().create_index([("account_id", ASCENDING)], unique=True)
-    _accounts().create_index([("business_id", ASCENDING)])
-    _accounts().create_index([("owner_id", ASCENDING)])
-    _accounts().create_index([("type", ASCENDING)])
-
-    # Ledger
-    _ledger().create_index([("txn_id", ASCENDING)], unique=True)
-    _ledger().create_index([("business_id", ASCENDING), ("created_at", ASCENDING)])
-    _ledger().create_index([("debit_account", ASCENDING)])
-    _ledger().create_index([("credit_account", ASCENDING)])
-    
-    #seed account
+# ---------- Indexes ----------
+# Built by `flask indexes build` (utils/index_registry.py). The shared
+# "idempotency" collection is declared in pos_ledger_service.
+INDEXES = {
+    "accounts": (
+        IndexModel([("account_id", ASCENDING)], unique=True),
+        IndexModel([("business_id", ASCENDING)]),
+        IndexModel([("owner_id", ASCENDING)]),
+        IndexModel([("type", ASCENDING)]),
+    ),
+    "ledger": (
+        IndexModel([("txn_id", ASCENDING)], unique=True),
+        IndexModel([("business_id", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("debit_account", ASCENDING)]),
+        IndexModel([("credit_account", ASCENDING)]),
+    ),
     # Wallet state (one row per business)
-    _wallet_state().create_index([("business_id", ASCENDING)], unique=True)
-
-    # Holds
-    _holds().create_index([("hold_id", ASCENDING)], unique=True)
-    _holds().create_index([("business_id", ASCENDING), ("account_id", ASCENDING), ("status", ASCENDING)])
-
-    # Idempotency
-    _idem().create_index([("key", ASCENDING)], unique=True)
-    _idem().create_indexes([
-        IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=idempotency_ttl_seconds)
-    ])
+    "wallet_state": (
+        IndexModel([("business_id", ASCENDING)], unique=True),
+    ),
+    "holds": (
+        IndexModel([("hold_id", ASCENDING)], unique=True),
+        IndexModel([("business_id", ASCENDING), ("account_id", ASCENDING), ("status", ASCENDING)]),
+    ),
+}
 
 # ---------- Core helpers ----------
 def _ensure_account(
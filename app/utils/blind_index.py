@@ -0,0 +1,215 @@
+# app/utils/blind_index.py
+#
+# Declarative blind indexes for encrypted fields.
+#
+# Key design:
+# - encrypt_data uses a random nonce, so ciphertext can never be queried.
+#   A blind index stores a keyed HMAC (crypt.hash_data) of the plaintext next
+#   to the ciphertext, and queries compare HMACs instead
+# - Kinds:
+#     exact  -> "hashed_<name>": one HMAC of the (normalised) value; a single
+#               field without a normaliser is identical to the existing
+#               hashed_* fields (hash_data(value)), so old data still matches
+#     prefix -> "bidx_<name>": array of truncated HMACs of every token prefix
+#               (min_prefix..max_prefix chars) -> indexed "starts with" search
+#     tokens -> "bidx_<name>": array of truncated HMACs of whole tokens
+#   Several fields in one spec form a compound index (exact: one HMAC of the
+#   combined values; prefix/tokens: terms of all fields in one array)
+# - Compound, prefix and token terms are domain-separated by collection and
+#   index name, so equal values in different indexes do not correlate, and
+#   truncated to BLIND_TERM_HEX hex chars (fewer bits, less leakage)
+# - Indexes live outside the envelope blob (utils/envelope.py), so they work
+#   the same for per-field and sealed documents
+#
+# Models declare BaseModel._blind_indexes; documents written before a
+# declaration existed are filled in by app.jobs.blind_index_backfill_job.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .crypt import hash_data
+
+
+BLIND_TERM_HEX = int(os.getenv("BLIND_TERM_HEX", "32"))
+
+# Stored on each document: fingerprint of the declarations it was indexed with
+VERSION_FIELD = "bidx_v"
+
+KIND_EXACT = "exact"
+KIND_PREFIX = "prefix"
+KIND_TOKENS = "tokens"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ---------------------------------------------------------------------
+# Normalisers
+# ---------------------------------------------------------------------
+def normalize_text(value: Any) -> str:
+    """
+    Case/width/whitespace-insensitive text (search terms, names).
+    """
+    text = unicodedata.normalize("NFKC", str(value)).casefold()
+    return " ".join(text.split())
+
+
+def normalize_code(value: Any) -> str:
+    """
+    Codes and identifiers (SKU, coupon codes): trimmed, upper-case.
+    """
+    return str(value).strip().upper()
+
+
+def _canonical(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(int(value)) if float(value).is_integer() else str(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return str(value)
+
+
+# ---------------------------------------------------------------------
+# Spec
+# ---------------------------------------------------------------------
+class BlindIndex:
+    """
+    One declared blind index.
+
+        BlindIndex("sku", normalize=normalize_code)           # hashed_sku
+        BlindIndex("sell_on_point_of_sale", "status",
+                   name="pos_listing")                         # hashed_pos_listing
+        BlindIndex("name", "sku", kind="prefix", name="search")  # bidx_search
+    """
+
+    def __init__(
+        self,
+        *fields: str,
+        kind: str = KIND_EXACT,
+        name: Optional[str] = None,
+        normalize: Optional[Callable[[Any], str]] = None,
+        min_prefix: int = 2,
+        max_prefix: int = 12,
+    ):
+        if not fields:
+            raise ValueError("BlindIndex needs at least one field")
+        if kind not in (KIND_EXACT, KIND_PREFIX, KIND_TOKENS):
+            raise ValueError(f"unknown blind index kind: {kind}")
+        if len(fields) > 1 and not name:
+            raise ValueError("compound blind indexes need a name")
+
+        self.fields = tuple(fields)
+        self.kind = kind
+        self.name = name or fields[0]
+        self.normalize = normalize
+        self.min_prefix = min_prefix
+        self.max_prefix = max_prefix
+
+        if kind == KIND_EXACT:
+            self.storage_field = f"hashed_{self.name}"
+        else:
+            self.storage_field = f"bidx_{self.name}"
+
+        # Single field, no normaliser: plain hash_data(value), like hashed_* elsewhere
+        self.legacy = kind == KIND_EXACT and len(self.fields) == 1 and normalize is None
+
+    def __repr__(self):
+        return f"BlindIndex({', '.join(self.fields)}, kind={self.kind!r}, name={self.name!r})"
+
+    @property
+    def signature(self) -> str:
+        norm = getattr(self.normalize, "__name__", None)
+        return f"{self.name}:{self.kind}:{','.join(self.fields)}:{norm}:{self.min_prefix}:{self.max_prefix}"
+
+    # -- hashing --------------------------------------------------------
+    def _norm(self, value: Any) -> str:
+        return self.normalize(value) if self.normalize else _canonical(value)
+
+    def _term(self, scope: str, term: str) -> str:
+        return hash_data(f"{scope}.{self.name}:{term}")[:BLIND_TERM_HEX]
+
+    def _tokens(self, value: Any) -> List[str]:
+        return _TOKEN_RE.findall(normalize_text(value) if self.normalize is None else self._norm(value))
+
+    # -- write side -----------------------------------------------------
+    def value_for(self, values: Dict[str, Any], scope: str):
+        """
+        Stored value for a document whose plain fields are in `values`.
+        None when an exact index has no value to hash.
+        """
+        if self.kind == KIND_EXACT:
+            parts = [values.get(f) for f in self.fields]
+            if any(p is None for p in parts):
+                return None
+            if self.legacy:
+                return hash_data(_canonical(parts[0]))
+            return self._term(scope, "\x1f".join(self._norm(p) for p in parts))
+
+        terms = set()
+        for f in self.fields:
+            value = values.get(f)
+            if value is None:
+                continue
+            for token in self._tokens(value):
+                if self.kind == KIND_TOKENS:
+                    terms.add(token)
+                    continue
+                for n in range(self.min_prefix, min(len(token), self.max_prefix) + 1):
+                    terms.add(token[:n])
+                if len(token) < self.min_prefix:
+                    terms.add(token)
+        return sorted(self._term(scope, t) for t in terms)
+
+    # -- read side ------------------------------------------------------
+    def match(self, scope: str, *values: Any) -> Dict[str, Any]:
+        """
+        Equality filter for an exact index: match(scope, "COF-1").
+        """
+        if self.kind != KIND_EXACT:
+            raise ValueError(f"{self!r} is not an exact index")
+        if len(values) != len(self.fields):
+            raise ValueError(f"{self!r} expects {len(self.fields)} values")
+        return {self.storage_field: self.value_for(dict(zip(self.fields, values)), scope)}
+
+    def match_any(self, scope: str, values: Iterable[Any]) -> Dict[str, Any]:
+        """
+        $in filter for a single-field exact index.
+        """
+        hashes = [self.match(scope, v)[self.storage_field] for v in values]
+        return {self.storage_field: {"$in": hashes}}
+
+    def search(self, scope: str, term: Any) -> Optional[Dict[str, Any]]:
+        """
+        Filter for a prefix/token index: every token of `term` must match.
+        None when the term has nothing searchable (caller skips the filter).
+        """
+        if self.kind == KIND_EXACT:
+            raise ValueError(f"{self!r} is not a search index")
+        terms = []
+        for token in self._tokens(term or ""):
+            if self.kind == KIND_PREFIX:
+                if len(token) < self.min_prefix:
+                    continue
+                token = token[:self.max_prefix]
+            terms.append(self._term(scope, token))
+        if not terms:
+            return None
+        if len(terms) == 1:
+            return {self.storage_field: terms[0]}
+        return {self.storage_field: {"$all": terms}}
+
+
+def version_of(indexes: Iterable[BlindIndex]) -> str:
+    """
+    Fingerprint of a model's declarations; documents indexed with a different
+    fingerprint are picked up again by the backfill.
+    """
+    raw = "|".join(sorted(idx.signature for idx in indexes))
+    return hashlib.sha256(raw.encode()).hexdigest()[:12]
@@ -0,0 +1,281 @@
+# app/utils/envelope.py
+#
+# Document-level envelope encryption.
+#
+# Key design:
+# - Each business (tenant) gets its own random 256-bit data key (DEK). DEKs are
+#   stored wrapped (AES-GCM) by the application master key in tenant_data_keys
+#   and cached unwrapped in-process after first use
+# - All sensitive fields of a document are serialised together and sealed as
+#   ONE AES-GCM blob under the tenant DEK:
+#       doc["_enc"] = {"v": 1, "kid": "<key id>", "ct": "<b64 nonce+ciphertext>"}
+#   The collection name and business id are bound as associated data, so a blob
+#   cannot be replayed into another collection or tenant
+# - Reads open the blob lazily (SealedRecord): nothing is decrypted until a
+#   sealed field is actually accessed
+# - Per-field ciphertext (crypt.encrypt_data) is still read transparently, so
+#   models can switch modes and migrate documents in the background
+#
+# Models opt in via BaseModel._envelope_fields + ENVELOPE_ENCRYPTION_MODELS.
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from pymongo import IndexModel
+
+from .crypt import SECRET_KEY
+from .logger import Log
+
+
+ENVELOPE_FIELD = "_enc"
+ENVELOPE_VERSION = 1
+
+DATA_KEYS_COLLECTION = "tenant_data_keys"
+
+# Comma-separated model class names that write in envelope mode, e.g. "Product"
+ENVELOPE_ENCRYPTION_MODELS = {
+    x.strip() for x in (os.getenv("ENVELOPE_ENCRYPTION_MODELS") or "").split(",") if x.strip()
+}
+
+# (business_id, key_id) -> AESGCM ; business_id -> active key_id
+_KEYS: Dict[Tuple[str, str], AESGCM] = {}
+_ACTIVE: Dict[str, str] = {}
+_KEYS_LOCK = threading.Lock()
+
+
+def model_enabled(model_name: str) -> bool:
+    return model_name in ENVELOPE_ENCRYPTION_MODELS
+
+
+# ---------------------------------------------------------------------
+# Data keys
+# ---------------------------------------------------------------------
+def _master() -> AESGCM:
+    return AESGCM(SECRET_KEY)
+
+
+def _wrap_aad(business_id: str, key_id: str) -> bytes:
+    return f"dek:{business_id}:{key_id}".encode()
+
+
+def _wrap(business_id: str, key_id: str, dek: bytes) -> str:
+    nonce = os.urandom(12)
+    return base64.b64encode(nonce + _master().encrypt(nonce, dek, _wrap_aad(business_id, key_id))).decode()
+
+
+def _unwrap(business_id: str, key_id: str, wrapped: str) -> bytes:
+    raw = base64.b64decode(wrapped)
+    return _master().decrypt(raw[:12], raw[12:], _wrap_aad(business_id, key_id))
+
+
+def _keys_col():
+    from ..extensions.db import db
+    return db.get_collection(DATA_KEYS_COLLECTION)
+
+
+INDEXES = {
+    DATA_KEYS_COLLECTION: (
+        IndexModel([("business_id", 1), ("key_id", 1)], unique=True, name="uniq_business_key"),
+        # one active key per business
+        IndexModel(
+            [("business_id", 1)],
+            unique=True,
+            partialFilterExpression={"status": "active"},
+            name="uniq_business_active_key",
+        ),
+    ),
+}
+
+
+def _cache_key(business_id: str, key_id: str, dek: bytes, active: bool) -> AESGCM:
+    aead = AESGCM(dek)
+    with _KEYS_LOCK:
+        _KEYS[(business_id, key_id)] = aead
+        if active:
+            _ACTIVE[business_id] = key_id
+    return aead
+
+
+def active_key(business_id: Any) -> Tuple[str, AESGCM]:
+    """
+    The tenant's active DEK, created on first use.
+    """
+    business_id = str(business_id)
+    with _KEYS_LOCK:
+        key_id = _ACTIVE.get(business_id)
+        if key_id and (business_id, key_id) in _KEYS:
+            return key_id, _KEYS[(business_id, key_id)]
+
+    doc = _keys_col().find_one({"business_id": business_id, "status": "active"})
+    if not doc:
+        key_id = uuid.uuid4().hex
+        dek = AESGCM.generate_key(bit_length=256)
+        try:
+            _keys_col().insert_one({
+                "business_id": business_id,
+                "key_id": key_id,
+                "wrapped_key": _wrap(business_id, key_id, dek),
+                "status": "active",
+                "created_at": datetime.utcnow(),
+            })
+            Log.info(f"[envelope][active_key] created data key business_id={business_id} key_id={key_id}")
+            return key_id, _cache_key(business_id, key_id, dek, active=True)
+        except Exception:
+            # another worker created it first
+            doc = _keys_col().find_one({"business_id": business_id, "status": "active"})
+            if not doc:
+                raise
+
+    dek = _unwrap(business_id, doc["key_id"], doc["wrapped_key"])
+    return doc["key_id"], _cache_key(business_id, doc["key_id"], dek, active=True)
+
+
+def key_by_id(business_id: Any, key_id: str) -> AESGCM:
+    """
+    Any (active or retired) DEK of the tenant, for opening older blobs.
+    """
+    business_id = str(business_id)
+    with _KEYS_LOCK:
+        aead = _KEYS.get((business_id, key_id))
+    if aead is not None:
+        return aead
+
+    doc = _keys_col().find_one({"business_id": business_id, "key_id": key_id})
+    if not doc:
+        raise KeyError(f"data key not found business_id={business_id} key_id={key_id}")
+    dek = _unwrap(business_id, key_id, doc["wrapped_key"])
+    return _cache_key(business_id, key_id, dek, active=doc.get("status") == "active")
+
+
+# ---------------------------------------------------------------------
+# Seal / open
+# ---------------------------------------------------------------------
+def _aad(collection: str, business_id: Any) -> bytes:
+    return f"{collection}:{business_id}".encode()
+
+
+def seal_with_key(aead: AESGCM, key_id: str, values: Dict[str, Any], aad: bytes) -> Dict[str, Any]:
+    nonce = os.urandom(12)
+    plaintext = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return {
+        "v": ENVELOPE_VERSION,
+        "kid": key_id,
+        "ct": base64.b64encode(nonce + aead.encrypt(nonce, plaintext, aad)).decode(),
+    }
+
+
+def open_with_key(aead: AESGCM, blob: Dict[str, Any], aad: bytes) -> Dict[str, Any]:
+    raw = base64.b64decode(blob["ct"])
+    return json.loads(aead.decrypt(raw[:12], raw[12:], aad).decode())
+
+
+def seal(collection: str, business_id: Any, values: Dict[str, Any]) -> Dict[str, Any]:
+    key_id, aead = active_key(business_id)
+    return seal_with_key(aead, key_id, values, _aad(collection, business_id))
+
+
+def open_sealed(collection: str, business_id: Any, blob: Dict[str, Any]) -> Dict[str, Any]:
+    if not blob or blob.get("v") != ENVELOPE_VERSION:
+        raise ValueError("unsupported envelope blob")
+    aead = key_by_id(business_id, blob["kid"])
+    return open_with_key(aead, blob, _aad(collection, business_id))
+
+
+# ---------------------------------------------------------------------
+# Lazy reads
+# ---------------------------------------------------------------------
+class SealedRecord(dict):
+    """
+    dict whose sealed fields are decrypted on first access.
+
+    Plain fields are available immediately; touching any sealed field (or
+    iterating / serialising the whole record) opens the blob once.
+    """
+
+    def __init__(self, plain: Dict[str, Any], *, collection: str, business_id: Any,
+                 blob: Dict[str, Any], sealed_fields: Iterable[str]):
+        super().__init__(plain)
+        self._collection = collection
+        self._business_id = business_id
+        self._blob = blob
+        self._sealed_fields = frozenset(sealed_fields)
+
+    def _open(self):
+        if self._blob is None:
+            return
+        blob, self._blob = self._blob, None
+        values = open_sealed(self._collection, self._business_id, blob)
+        for field in self._sealed_fields:
+            if not dict.__contains__(self, field):
+                dict.__setitem__(self, field, values.get(field))
+
+    @property
+    def is_open(self) -> bool:
+        return self._blob is None
+
+    def __getitem__(self, key):
+        if key in self._sealed_fields:
+            self._open()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._sealed_fields:
+            self._open()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        if key in self._sealed_fields:
+            self._open()
+        return dict.__contains__(self, key)
+
+    def pop(self, key, *args):
+        if key in self._sealed_fields:
+            self._open()
+        return dict.pop(self, key, *args)
+
+    def setdefault(self, key, default=None):
+        if key in self._sealed_fields:
+            self._open()
+        return dict.setdefault(self, key, default)
+
+    def __iter__(self):
+        self._open()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._open()
+        return dict.__len__(self)
+
+    def keys(self):
+        self._open()
+        return dict.keys(self)
+
+    def values(self):
+        self._open()
+        return dict.values(self)
+
+    def items(self):
+        self._open()
+        return dict.items(self)
+
+    def copy(self):
+        self._open()
+        return dict(dict.items(self))
+
+    def __eq__(self, other):
+        self._open()
+        return dict.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._open()
+        return dict.__repr__(self)
@@ -35,6 +35,18 @@ def register_error_handlers(app):
             "errors": error.meta,
         }), 403
 
+    @app.errorhandler(ApiRateLimitError)
+    def handle_api_rate_limit(error):
+        response = jsonify({
+            "success": False,
+            "status_code": 429,
+            "message": error.message,
+            "errors": error.meta,
+        })
+        for k, v in (error.headers or {}).items():
+            response.headers[k] = v
+        return response, 429
+
     @app.errorhandler(ValidationError)
     def handle_validation_error(error):
         return jsonify({
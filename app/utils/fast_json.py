@@ -0,0 +1,166 @@
+# app/utils/fast_json.py
+#
+# Fast JSON responses: orjson behind Flask's JSON provider interface.
+#
+# Key design:
+# - init_app(app) swaps app.json for FastJSONProvider, so jsonify(),
+#   prepared_response() and flask-smorest responses all encode through orjson
+#   without touching call sites. Set JSON_FAST_PATH=false (or leave orjson
+#   uninstalled) to keep Flask's DefaultJSONProvider
+# - Types the app returns are handled natively, so handlers no longer need to
+#   pre-walk documents to stringify them:
+#     ObjectId -> str, Decimal -> str, UUID -> str, set -> list,
+#     datetime/date -> JSON_DATETIME_FORMAT: "http" (default, same as Flask:
+#     "Mon, 01 Jan 2025 00:00:00 GMT") or "iso" (orjson native, fastest)
+# - Output stays compatible with Flask's provider (sorted keys, indent in
+#   debug); only non-ASCII text is emitted as UTF-8 instead of \u escapes
+# - Subclasses of builtin types (OPT_PASSTHROUGH_SUBCLASS) go through default()
+#   too: orjson would otherwise read a dict subclass's storage directly, and a
+#   lazily decrypted SealedRecord would be emitted without its sealed fields
+# - Anything orjson rejects (ints beyond 64 bit, ...) falls back to the stdlib
+#   encoder with the same default(), so the fast path never fails a response
+#   the old path would have served
+# - stream_array(): encodes a large list item by item in ~64 KiB chunks, for
+#   exports/reports where building one big bytes object is the cost
+#   (json_response.prepared_stream_response)
+#
+# Benchmark: app/scripts/bench_json_response.py
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, Optional
+from uuid import UUID
+
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson not installed
+    orjson = None
+
+
+FAST_JSON_ENABLED = (os.getenv("JSON_FAST_PATH", "true") or "").strip().lower() in ("1", "true", "yes")
+DATETIME_FORMAT = (os.getenv("JSON_DATETIME_FORMAT", "http") or "http").strip().lower()
+STREAM_CHUNK_BYTES = int(os.getenv("JSON_STREAM_CHUNK_BYTES", str(64 * 1024)))
+
+
+def default(o: Any) -> Any:
+    """
+    Fallback for types neither encoder handles natively.
+    """
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, (datetime, date)):
+        return http_date(o) if DATETIME_FORMAT == "http" else o.isoformat()
+    if isinstance(o, time):
+        return o.isoformat()
+    if isinstance(o, (Decimal, UUID)):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    # builtin subclasses (orjson passthrough); items() opens a SealedRecord
+    if isinstance(o, dict):
+        return dict(o.items())
+    if isinstance(o, (list, tuple)):
+        return list(o)
+    if isinstance(o, str):
+        return str.__str__(o)
+    if isinstance(o, int):
+        return int(o)
+    if isinstance(o, float):
+        return float(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _options(sort_keys: bool, indent: bool) -> int:
+    opts = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if DATETIME_FORMAT == "http":
+        opts |= orjson.OPT_PASSTHROUGH_DATETIME
+    if sort_keys:
+        opts |= orjson.OPT_SORT_KEYS
+    if indent:
+        opts |= orjson.OPT_INDENT_2
+    return opts
+
+
+def dumps_bytes(obj: Any, *, sort_keys: bool = True, indent: bool = False) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_options(sort_keys, indent))
+        except orjson.JSONEncodeError:
+            pass  # stdlib below handles big ints etc.
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, indent=2 if indent else None,
+        separators=None if indent else (",", ":"), ensure_ascii=False,
+    ).encode()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Drop-in for Flask's provider; loads() is unchanged (orjson.loads when
+    available).
+    """
+
+    def _indent(self, kwargs: Dict[str, Any]) -> bool:
+        if "indent" in kwargs:
+            return bool(kwargs["indent"])
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys), indent=self._indent(kwargs)).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=self._indent({}))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def stream_array(items: Iterable[Any], *, head: Optional[Dict[str, Any]] = None, key: str = "data") -> Iterator[bytes]:
+    """
+    Yields `{**head, key: [item, ...]}` as JSON chunks, encoding one item at a
+    time. An item that fails to encode aborts the stream (the status line is
+    already sent), so pre-validate anything exotic.
+    """
+    prefix = dumps_bytes(head or {}, sort_keys=True)[:-1]
+    buf = bytearray(prefix)
+    if head:
+        buf += b","
+    buf += json.dumps(key).encode() + b":["
+
+    first = True
+    for item in items:
+        if not first:
+            buf += b","
+        buf += dumps_bytes(item, sort_keys=True)
+        first = False
+        if len(buf) >= STREAM_CHUNK_BYTES:
+            yield bytes(buf)
+            buf.clear()
+
+    buf += b"]}\n"
+    yield bytes(buf)
+
+
+def is_active(app) -> bool:
+    return isinstance(app.json, FastJSONProvider)
+
+
+def init_app(app) -> None:
+    if FAST_JSON_ENABLED and orjson is not None:
+        app.json = FastJSONProvider(app)
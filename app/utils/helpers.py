@@ -1,4 +1,5 @@
 import secrets
+import uuid
 
 from flask.views import MethodView
 from flask import jsonify, g, redirect, request
@@ -156,9 +157,13 @@ def generate_tokens(user, account_type, permissions=None):
     access_token_expiration = timedelta(minutes=3600) #change to 15 minutes
     refresh_token_expiration = timedelta(days=7)
     
+    issued_at = datetime.utcnow()
+
     payload_access = {
         'user_id': str(user["_id"]),
-        'exp': datetime.utcnow() + access_token_expiration,
+        'exp': issued_at + access_token_expiration,
+        'iat': issued_at,
+        'jti': uuid.uuid4().hex,  # identifies the token (principal cache key)
         "account_type": account_type,
         "type": decrypt_data(user.get("type"))  if user.get("type") else None,
         'permissions': permissions,  # This includes the permissions dictionary
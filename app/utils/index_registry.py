@@ -0,0 +1,273 @@
+# app/utils/index_registry.py
+#
+# Declarative MongoDB index registry.
+#
+# Key design:
+# - Indexes are declared next to the code that queries them and are never
+#   created by the running app:
+#     * models:   `_indexes = (IndexModel(...), ...)` (collection = collection_name)
+#     * services: module-level `INDEXES = {"collection": (IndexModel(...), ...)}`
+# - registry() merges all declarations per collection; the same index declared
+#   twice is fine, the same name with a different spec is an error
+# - diff() compares the registry with the live database (missing / changed /
+#   renamed / extra, with $indexStats usage for extra indexes)
+# - build() creates missing indexes with ONE createIndexes command per
+#   collection (a single collection scan); MongoDB 4.2+ builds do not block
+#   reads/writes for the duration of the build
+# - drop() removes indexes that are no longer declared (only in registered
+#   collections)
+#
+# CLI: `flask indexes diff|build|drop` (app.jobs.index_migration_job)
+
+from __future__ import annotations
+
+import importlib
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from ..extensions.db import db
+from .doseal.ensure_index import _norm_keys, _same_options
+from .logger import Log
+
+
+# Classes declaring `_indexes`
+_MODEL_CLASSES = (
+    "app.models.product_model:Product",
+    "app.models.product_model:Discount",
+    "app.models.admin.sale:Sale",
+    "app.models.admin.payment:Payment",
+    "app.models.admin.subscription_model:Subscription",
+    "app.models.admin.package_model:Package",
+    "app.models.admin.setup_model:Outlet",
+    "app.models.admin.paystack_authorization:PaystackAuthorization",
+    "app.models.admin.promo_model:PromoCode",
+    "app.models.admin.promo_model:Referral",
+    "app.models.admin.promo_model:CommissionWallet",
+    "app.models.admin.promo_model:CommissionLedger",
+    "app.models.social.social_account:SocialAccount",
+    "app.models.social.scheduled_post:ScheduledPost",
+    "app.models.notifications.notification_settings:NotificationSettings",
+    "app.models.social.ad_account:AdAccount",
+    "app.models.social.ad_account:AdCampaign",
+    "app.models.social.pinterest_ad_account:PinterestAdAccount",
+    "app.models.social.pinterest_ad_account:PinterestAdCampaign",
+    "app.models.social.social_auth:SocialAuth",
+    "app.models.social.social_daily_snapshot:SocialDailySnapshot",
+    "app.models.social.social_snapshot_rollup:SocialSnapshotRollup",
+    "app.models.social.social_analytics_export:SocialAnalyticsExport",
+    "app.models.social.ads_targeting_catalog:AdsTargetingCatalog",
+    "app.models.social.ads_insight_daily:AdsInsightDaily",
+    "app.models.social.ads_insight_daily:AdsInsightSyncState",
+    "app.models.social.password_reset_token:PasswordResetToken",
+    "app.models.social.branch_model:Branch",
+    "app.models.social.provider_setting_model:ProviderSetting",
+    "app.models.social.integration_model:Integration",
+    "app.models.social.integration_model:Webhook",
+    "app.models.social.integration_model:EmbedWidget",
+    "app.models.social.form_model:StorageQuota",
+    "app.models.social.form_model:Form",
+    "app.models.social.form_model:FormSubmission",
+    "app.models.social.payment_method_model:PaymentMethod",
+    "app.models.social.discount_model:Discount",
+    "app.models.transaction_model:Transaction",
+)
+
+# Modules declaring `INDEXES = {collection: (...)}`
+_INDEX_MODULES = (
+    "app.services.pos_ledger_service",
+    "app.services.wallet_service",
+    "app.services.funding_service",
+    "app.utils.envelope",
+    "app.utils.plan.usage_counters",
+)
+
+
+class IndexRegistryError(Exception):
+    pass
+
+
+def _load(path: str):
+    module_name, _, attr = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attr) if attr else module
+
+
+def _declare(out: Dict[str, Dict[str, IndexModel]], collection: str, models: Iterable[IndexModel], source: str):
+    declared = out.setdefault(collection, {})
+    for model in models:
+        doc = model.document
+        existing = declared.get(doc["name"])
+        if existing is None:
+            declared[doc["name"]] = model
+            continue
+        if (
+            _norm_keys(existing.document["key"]) != _norm_keys(doc["key"])
+            or not _same_options(existing.document, doc)
+        ):
+            raise IndexRegistryError(f"{collection}.{doc['name']} declared twice with different specs ({source})")
+
+
+def registry() -> Dict[str, Dict[str, IndexModel]]:
+    """
+    {collection: {index_name: IndexModel}} from every declaration.
+    """
+    out: Dict[str, Dict[str, IndexModel]] = {}
+    for path in _MODEL_CLASSES:
+        cls = _load(path)
+        _declare(out, cls.collection_name, getattr(cls, "_indexes", ()), path)
+    for path in _INDEX_MODULES:
+        for collection, models in getattr(_load(path), "INDEXES", {}).items():
+            _declare(out, collection, models, path)
+    return out
+
+
+# ---------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------
+def _usage(collection) -> Dict[str, int]:
+    try:
+        return {s["name"]: int(s["accesses"]["ops"]) for s in collection.aggregate([{"$indexStats": {}}])}
+    except Exception:
+        return {}
+
+
+def _describe(doc: Dict[str, Any]) -> Dict[str, Any]:
+    out = {"key": list(_norm_keys(doc["key"]))}
+    for opt in ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression"):
+        if doc.get(opt) not in (None, False):
+            out[opt] = doc[opt]
+    return out
+
+
+def diff_collection(collection_name: str, declared: Dict[str, IndexModel]) -> List[Dict[str, Any]]:
+    """
+    One entry per index: status is ok | missing | changed | renamed | extra.
+    """
+    collection = db.get_collection(collection_name)
+    live = {idx["name"]: idx for idx in collection.list_indexes() if idx["name"] != "_id_"}
+    usage = None
+    matched = set()
+    rows = []
+
+    for name, model in declared.items():
+        want = model.document
+        have = live.get(name)
+        row = {"collection": collection_name, "name": name, "declared": _describe(want)}
+
+        if have is not None:
+            matched.add(name)
+            same = _norm_keys(have["key"]) == _norm_keys(want["key"]) and _same_options(have, want)
+            row["status"] = "ok" if same else "changed"
+            if not same:
+                row["live"] = _describe(have)
+            rows.append(row)
+            continue
+
+        twin = next((
+            idx for n, idx in live.items()
+            if n not in matched and _norm_keys(idx["key"]) == _norm_keys(want["key"]) and _same_options(idx, want)
+        ), None)
+        if twin is not None:
+            matched.add(twin["name"])
+            row.update(status="renamed", live_name=twin["name"])
+        else:
+            row["status"] = "missing"
+        rows.append(row)
+
+    for name, have in live.items():
+        if name in matched:
+            continue
+        if usage is None:
+            usage = _usage(collection)
+        rows.append({
+            "collection": collection_name,
+            "name": name,
+            "status": "extra",
+            "live": _describe(have),
+            "ops": usage.get(name),
+        })
+
+    return rows
+
+
+def diff(collections: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    declared = registry()
+    names = sorted(collections) if collections else sorted(declared)
+    rows = []
+    for name in names:
+        if name not in declared:
+            raise IndexRegistryError(f"collection not in registry: {name}")
+        rows.extend(diff_collection(name, declared[name]))
+    return rows
+
+
+# ---------------------------------------------------------------------
+# Build / drop
+# ---------------------------------------------------------------------
+def build(collections: Optional[Iterable[str]] = None, rebuild: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Create missing indexes. With rebuild=True, changed and renamed indexes are
+    dropped and recreated from the declaration.
+    """
+    declared = registry()
+    stats = {"created": [], "rebuilt": [], "failed": [], "skipped": []}
+
+    for row_group in _group(diff(collections)):
+        collection_name = row_group[0]["collection"]
+        collection = db.get_collection(collection_name)
+        to_create = []
+
+        for row in row_group:
+            label = f"{collection_name}.{row['name']}"
+            if row["status"] == "missing":
+                to_create.append(declared[collection_name][row["name"]])
+                stats["created"].append(label)
+            elif row["status"] in ("changed", "renamed"):
+                if not rebuild:
+                    stats["skipped"].append(label)
+                    continue
+                if not dry_run:
+                    collection.drop_index(row.get("live_name") or row["name"])
+                to_create.append(declared[collection_name][row["name"]])
+                stats["rebuilt"].append(label)
+
+        if not to_create or dry_run:
+            continue
+
+        try:
+            collection.create_indexes(to_create)
+            Log.info(f"[index_registry][build] {collection_name}: {[m.document['name'] for m in to_create]}")
+        except OperationFailure as e:
+            Log.error(f"[index_registry][build] {collection_name}: {e}")
+            stats["failed"].append({"collection": collection_name, "error": str(e)})
+
+    return stats
+
+
+def drop(collections: Optional[Iterable[str]] = None, unused_only: bool = False, dry_run: bool = True) -> Dict[str, Any]:
+    """
+    Drop indexes that exist in the database but are no longer declared.
+    unused_only keeps any that $indexStats reports as used since the last restart.
+    """
+    stats = {"dropped": [], "kept": []}
+    for row in diff(collections):
+        if row["status"] != "extra":
+            continue
+        label = f"{row['collection']}.{row['name']}"
+        if unused_only and row.get("ops"):
+            stats["kept"].append(label)
+            continue
+        if not dry_run:
+            db.get_collection(row["collection"]).drop_index(row["name"])
+            Log.info(f"[index_registry][drop] {label}")
+        stats["dropped"].append(label)
+    return stats
+
+
+def _group(rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(row["collection"], []).append(row)
+    return list(groups.values())
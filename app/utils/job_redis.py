@@ -1,24 +1,14 @@
-# app/extensions/cache.py
-import os
+# app/utils/job_redis.py
 import redis
 from typing import Any, Iterable, Optional, Tuple, List
 
+from ..extensions.redis_manager import get_redis as _role_client
+
 # -------------------------------------------------------------------
-# Config
+# Client: "queue" role (bytes) of the shared Redis manager
 # -------------------------------------------------------------------
-REDIS_HOST = os.getenv("REDIS_HOST", "redis")       # docker-compose service name
-REDIS_PORT = int(os.getenv("REDIS_PORT", 6381))     # keep your 6381 default
-REDIS_DB   = int(os.getenv("REDIS_DB", 0))
-REDIS_PASSWORD = os.getenv("REDIS_PASSWORD") or None
-
-# Single shared client
-_client = redis.Redis(
-    host=REDIS_HOST,
-    port=REDIS_PORT,
-    db=REDIS_DB,
-    password=REDIS_PASSWORD,
-    decode_responses=False,  # keep as bytes; decode where needed
-)
+def _client() -> redis.Redis:
+    return _role_client("queue")
 
 # -------------------------------------------------------------------
 # Connectivity
@@ -26,7 +16,7 @@ _client = redis.Redis(
 def connect() -> bool:
     """Ping Redis; returns True if reachable."""
     try:
-        _client.ping()
+        _client().ping()
         print("Connected to Redis")
         return True
     except redis.ConnectionError as err:
@@ -41,11 +31,11 @@ def get_redis(key: Optional[str] = None) -> redis.Redis:
     Return the Redis client. `key` is accepted for compatibility with code
     that calls get_redis(<some_key>), but it's ignored here.
     """
-    return _client
+    return _client()
 
 # Alias often used in older code (typo-friendly)
 def get_redis_client(key: Optional[str] = None) -> redis.Redis:
-    return _client
+    return _client()
 
 # -------------------------------------------------------------------
 # String KV helpers (backward compatible)
@@ -53,7 +43,7 @@ def get_redis_client(key: Optional[str] = None) -> redis.Redis:
 def get_value(key: str) -> Optional[bytes]:
     """Get raw bytes value for key."""
     try:
-        return _client.get(key)
+        return _client().get(key)
     except redis.RedisError as err:
         print(f"Error fetching data from Redis: {err}")
         return None
@@ -69,9 +59,9 @@ def set_redis(key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
     """
     try:
         if ttl_seconds is not None:
-            _client.setex(key, ttl_seconds, value)
+            _client().setex(key, ttl_seconds, value)
         else:
-            _client.set(key, value)
+            _client().set(key, value)
         return True
     except redis.RedisError as err:
         print(f"Error setting data in Redis: {err}")
@@ -83,7 +73,7 @@ set_redist = set_redis
 def set_redis_with_expiry(key: str, expiry_in_seconds: int, value: Any) -> bool:
     """Legacy helper: set value with TTL."""
     try:
-        _client.setex(key, expiry_in_seconds, value)
+        _client().setex(key, expiry_in_seconds, value)
         return True
     except redis.RedisError as err:
         print(f"Error setting data with expiry in Redis: {err}")
@@ -92,7 +82,7 @@ def set_redis_with_expiry(key: str, expiry_in_seconds: int, value: Any) -> bool:
 def remove_redis(key: str) -> int:
     """Delete a key. Returns number of keys removed."""
     try:
-        return _client.delete(key)
+        return _client().delete(key)
     except redis.RedisError as err:
         print(f"Error removing data from Redis: {err}")
         return 0
@@ -100,7 +90,7 @@ def remove_redis(key: str) -> int:
 def expire(key: str, ttl_seconds: int) -> bool:
     """Apply TTL to an existing key."""
     try:
-        return bool(_client.expire(key, ttl_seconds))
+        return bool(_client().expire(key, ttl_seconds))
     except redis.RedisError as err:
         print(f"Error setting expiry on Redis key: {err}")
         return False
@@ -116,7 +106,7 @@ def zadd(key: str, mapping: dict) -> int:
     """
     try:
         # redis-py accepts mapping[member] = score
-        return int(_client.zadd(key, mapping))
+        return int(_client().zadd(key, mapping))
     except redis.RedisError as err:
         print(f"Error zadd on {key}: {err}")
         return 0
@@ -124,7 +114,7 @@ def zadd(key: str, mapping: dict) -> int:
 def zrange_withscores(key: str, start: int, end: int) -> List[Tuple[bytes, float]]:
     """ZRANGE key start end WITHSCORES."""
     try:
-        return _client.zrange(key, start, end, withscores=True)
+        return _client().zrange(key, start, end, withscores=True)
     except redis.RedisError as err:
         print(f"Error zrange on {key}: {err}")
         return []
@@ -132,7 +122,7 @@ def zrange_withscores(key: str, start: int, end: int) -> List[Tuple[bytes, float
 def zpopmin(key: str, count: int = 1) -> List[Tuple[bytes, float]]:
     """ZPOPMIN key [count]."""
     try:
-        return _client.zpopmin(key, count=count)
+        return _client().zpopmin(key, count=count)
     except redis.RedisError as err:
         print(f"Error zpopmin on {key}: {err}")
         return []
@@ -140,7 +130,7 @@ def zpopmin(key: str, count: int = 1) -> List[Tuple[bytes, float]]:
 def zrem(key: str, *members: str) -> int:
     """ZREM key member [member ...]. Returns number of removed members."""
     try:
-        return int(_client.zrem(key, *members))
+        return int(_client().zrem(key, *members))
     except redis.RedisError as err:
         print(f"Error zrem on {key}: {err}")
         return 0
@@ -150,21 +140,21 @@ def zrem(key: str, *members: str) -> int:
 # -------------------------------------------------------------------
 def sadd(key: str, *members: str) -> int:
     try:
-        return int(_client.sadd(key, *members))
+        return int(_client().sadd(key, *members))
     except redis.RedisError as err:
         print(f"Error sadd on {key}: {err}")
         return 0
 
 def smembers(key: str) -> Iterable[bytes]:
     try:
-        return _client.smembers(key)
+        return _client().smembers(key)
     except redis.RedisError as err:
         print(f"Error smembers on {key}: {err}")
         return set()
 
 def srem(key: str, *members: str) -> int:
     try:
-        return int(_client.srem(key, *members))
+        return int(_client().srem(key, *members))
     except redis.RedisError as err:
         print(f"Error srem on {key}: {err}")
         return 0
@@ -175,12 +165,10 @@ def srem(key: str, *members: str) -> int:
 def pipeline(transaction: bool = True):
     """Return a pipeline you can use with 'with' or manually."""
     try:
-        return _client.pipeline(transaction=transaction)
+        return _client().pipeline(transaction=transaction)
     except redis.RedisError as err:
         print(f"Error creating Redis pipeline: {err}")
         # Fallback: return a pipeline anyway (may raise on use)
-        return _client.pipeline(transaction=transaction)
+        return _client().pipeline(transaction=transaction)
 
-# Connect on import (optional)
-connect()
 
@@ -1,5 +1,6 @@
-from flask import jsonify
+from flask import jsonify, current_app, stream_with_context
 from ..constants.service_code import HTTP_STATUS_CODES
+from .fast_json import stream_array
 
 
 def prepared_response(status, status_code, message, data=None, errors=None, required_fields=None, agent_id=None):
@@ -24,4 +25,15 @@ def prepared_response(status, status_code, message, data=None, errors=None, requ
     }
     
     return jsonify(response_data), HTTP_STATUS_CODES[status_code]
- 
\ No newline at end of file
+
+
+def prepared_stream_response(status, status_code, message, items):
+    # Same envelope as prepared_response, with `data` streamed item by item.
+    # For large lists (exports, long reports); items may be a cursor/generator.
+    head = {
+        "message": f"{message}",
+        "status_code": HTTP_STATUS_CODES[status_code],
+        "success": status,
+    }
+    body = stream_with_context(stream_array(items, head=head, key="data"))
+    return current_app.response_class(body, mimetype="application/json"), HTTP_STATUS_CODES[status_code]
@@ -1,7 +1,36 @@
+import atexit
+import json
 import logging
 import logging.handlers
 import os
-from datetime import datetime
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+# -----------------------------
+# Config
+# -----------------------------
+# LOG_MODE:
+#   sync  -> console + daily file handlers called on the logging thread (default)
+#   queue -> records are put on a bounded in-memory queue and written by a
+#            background QueueListener as JSON lines; request threads never touch
+#            disk or stdout. When the queue is full the record is dropped and
+#            counted instead of blocking.
+LOG_MODE = (os.getenv("LOG_MODE", "sync") or "sync").strip().lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_LEVEL = (os.getenv("LOG_LEVEL", "DEBUG") or "DEBUG").strip().upper()
+
+# Per-module overrides, keyed by dotted module prefix (longest prefix wins):
+#   LOG_LEVEL_OVERRIDES="app.middleware.access_mode=WARNING,app.services.social=INFO"
+#   LOG_SAMPLE_RATES="app.middleware.access_mode=0.01,app.utils.calculate_composite_fee=0.1"
+# Sampling only applies below WARNING; warnings and errors are always kept.
+LOG_LEVEL_OVERRIDES = os.getenv("LOG_LEVEL_OVERRIDES", "")
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+_APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
 
 class DynamicDailyFileHandler(logging.handlers.WatchedFileHandler):
     """
@@ -11,49 +40,244 @@ class DynamicDailyFileHandler(logging.handlers.WatchedFileHandler):
         self.base_log_dir = base_log_dir
         self.current_date = None
         self.current_stream = None
+        self.rollover_at = 0.0
         # Initialize with today's log file
         initial_filename = self._get_current_log_path()
         super().__init__(initial_filename, encoding=encoding)
-    
+
     def _get_current_log_path(self):
         """Generate the current log file path based on today's date."""
         now = datetime.now()
         year = now.strftime("%Y")
         month = now.strftime("%m")
         day = now.strftime("%Y-%m-%d")
-        
+
         logs_folder = os.path.join(self.base_log_dir, year, month)
         os.makedirs(logs_folder, exist_ok=True)
-        
+
         return os.path.join(logs_folder, f"log-{day}.log")
-    
+
+    @staticmethod
+    def _next_midnight() -> float:
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+
     def emit(self, record):
         """
         Emit a record, checking if we need to roll over to a new day's log file.
+        The date path is only rebuilt once the day boundary has been crossed.
         """
         try:
-            today = datetime.now().strftime("%Y-%m-%d")
-            
-            # Check if the date has changed
-            if self.current_date != today:
-                # Close current file if it exists
-                if self.stream and not self.stream.closed:
-                    self.stream.close()
-                
-                # Update to new log file
-                self.current_date = today
-                new_log_path = self._get_current_log_path()
-                self.baseFilename = new_log_path
-                
-                # Reopen the stream with the new file
-                self.stream = self._open()
-            
+            if record.created >= self.rollover_at:
+                today = datetime.now().strftime("%Y-%m-%d")
+
+                # Check if the date has changed
+                if self.current_date != today:
+                    # Close current file if it exists
+                    if self.stream and not self.stream.closed:
+                        self.stream.close()
+
+                    # Update to new log file
+                    self.current_date = today
+                    new_log_path = self._get_current_log_path()
+                    self.baseFilename = new_log_path
+
+                    # Reopen the stream with the new file
+                    self.stream = self._open()
+
+                self.rollover_at = self._next_midnight()
+
             # Call parent emit method
             super().emit(record)
-            
+
         except Exception:
             self.handleError(record)
 
+
+# -----------------------------
+# Stats
+# -----------------------------
+_STATS = {"enqueued": 0, "dropped": 0, "sampled_out": 0, "filtered": 0}
+_STATS_LOCK = threading.Lock()
+
+
+def _count(field: str) -> None:
+    with _STATS_LOCK:
+        _STATS[field] += 1
+
+
+def get_log_stats() -> dict:
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+    stats["mode"] = LOG_MODE
+    stats["queue_size"] = _LOG_QUEUE.qsize() if _LOG_QUEUE is not None else 0
+    return stats
+
+
+# -----------------------------
+# Per-module level / sampling
+# -----------------------------
+def _parse_overrides(raw: str, cast):
+    out = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        try:
+            out[key.strip()] = cast(value.strip())
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def _level_value(name: str) -> int:
+    level = logging.getLevelName(name.upper())
+    if not isinstance(level, int):
+        raise ValueError(name)
+    return level
+
+
+class ModuleRulesFilter(logging.Filter):
+    """
+    Every module logs through the same "MyLogger" instance, so rules are matched
+    on the caller's dotted module path (derived from record.pathname, cached).
+    """
+
+    def __init__(self, level_overrides: dict, sample_rates: dict):
+        super().__init__()
+        self.level_overrides = level_overrides
+        self.sample_rates = sample_rates
+        self._rules = {}
+
+    @staticmethod
+    def module_path(pathname: str) -> str:
+        path = os.path.abspath(pathname or "")
+        if path.startswith(_APP_ROOT + os.sep):
+            rel = os.path.relpath(path, os.path.dirname(_APP_ROOT))
+        else:
+            rel = os.path.basename(path)
+        return os.path.splitext(rel)[0].replace(os.sep, ".")
+
+    @staticmethod
+    def _longest_prefix(module: str, table: dict):
+        best, best_len = None, -1
+        for prefix, value in table.items():
+            if (module == prefix or module.startswith(prefix + ".")) and len(prefix) > best_len:
+                best, best_len = value, len(prefix)
+        return best
+
+    def _rule(self, pathname: str):
+        rule = self._rules.get(pathname)
+        if rule is None:
+            module = self.module_path(pathname)
+            rule = (
+                module,
+                self._longest_prefix(module, self.level_overrides),
+                self._longest_prefix(module, self.sample_rates),
+            )
+            self._rules[pathname] = rule
+        return rule
+
+    def filter(self, record):
+        module, min_level, rate = self._rule(record.pathname)
+        record.module_path = module
+
+        if min_level is not None and record.levelno < min_level:
+            _count("filtered")
+            return False
+        if rate is not None and record.levelno < logging.WARNING and random.random() >= rate:
+            _count("sampled_out")
+            return False
+        return True
+
+
+# -----------------------------
+# JSON lines
+# -----------------------------
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "module": getattr(record, "module_path", record.module),
+            "line": record.lineno,
+            "msg": record.getMessage(),
+            "pid": record.process,
+            "thread": record.threadName,
+        }
+        exc_text = record.exc_text
+        if not exc_text and record.exc_info:
+            exc_text = self.formatException(record.exc_info)
+        if exc_text:
+            payload["exc"] = exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Never blocks: a full queue drops the record and counts it.
+    """
+
+    def prepare(self, record):
+        # Resolve msg % args and the traceback on the caller thread, keep the
+        # traceback separate so the JSON formatter can emit it as its own field.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            _count("enqueued")
+        except queue.Full:
+            _count("dropped")
+
+
+class _DropReporter:
+    """
+    Reports drops from the listener thread (never from the caller).
+    """
+
+    def __init__(self, interval: float = 60.0):
+        self.interval = interval
+        self.last_dropped = 0
+        self.last_report = time.monotonic()
+
+    def maybe_report(self, handlers):
+        now = time.monotonic()
+        if now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        with _STATS_LOCK:
+            dropped = _STATS["dropped"]
+        if dropped == self.last_dropped:
+            return
+        record = logging.makeLogRecord({
+            "name": "MyLogger",
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "pathname": __file__,
+            "msg": f"[logger] dropped {dropped - self.last_dropped} records (queue full); total={dropped}",
+        })
+        self.last_dropped = dropped
+        for h in handlers:
+            h.handle(record)
+
+
+class _ReportingQueueListener(logging.handlers.QueueListener):
+    def __init__(self, q, *handlers, **kwargs):
+        super().__init__(q, *handlers, **kwargs)
+        self.drop_reporter = _DropReporter()
+
+    def handle(self, record):
+        super().handle(record)
+        self.drop_reporter.maybe_report(self.handlers)
+
+
 def get_base_log_dir():
     """Get the base log directory from environment or default."""
     base_log_dir = os.environ.get("APP_LOG_DIR")
@@ -67,7 +291,39 @@ def get_base_log_dir():
 BASE_LOG_DIR = get_base_log_dir()
 
 Log = logging.getLogger("MyLogger")
-Log.setLevel(logging.DEBUG)
+Log.setLevel(getattr(logging, LOG_LEVEL, logging.DEBUG))
+
+_LOG_QUEUE = None
+_LISTENER = None
+
+
+def _start_listener(handlers):
+    global _LISTENER
+    _LISTENER = _ReportingQueueListener(_LOG_QUEUE, *handlers, respect_handler_level=True)
+    _LISTENER.start()
+
+
+def _restart_listener_after_fork():
+    # The listener thread does not survive fork (gunicorn --preload etc.)
+    global _LOG_QUEUE
+    if _LISTENER is None:
+        return
+    handlers = _LISTENER.handlers
+    _LOG_QUEUE = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    for h in Log.handlers:
+        if isinstance(h, DroppingQueueHandler):
+            h.queue = _LOG_QUEUE
+    _start_listener(handlers)
+
+
+def stop_logging():
+    """Flush and stop the background listener (no-op in sync mode)."""
+    if _LISTENER is not None:
+        try:
+            _LISTENER.stop()
+        except Exception:
+            pass
+
 
 if not Log.handlers:
     # Console handler
@@ -78,16 +334,34 @@ if not Log.handlers:
     file_handler = DynamicDailyFileHandler(BASE_LOG_DIR, encoding="utf-8")
     file_handler.setLevel(logging.DEBUG)
 
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
-    file_handler.setFormatter(formatter)
+    Log.addFilter(ModuleRulesFilter(
+        _parse_overrides(LOG_LEVEL_OVERRIDES, _level_value),
+        _parse_overrides(LOG_SAMPLE_RATES, float),
+    ))
+
+    if LOG_MODE == "queue":
+        json_formatter = JsonLineFormatter()
+        console_handler.setFormatter(json_formatter)
+        file_handler.setFormatter(json_formatter)
+
+        _LOG_QUEUE = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        Log.addHandler(DroppingQueueHandler(_LOG_QUEUE))
+        _start_listener([console_handler, file_handler])
+
+        atexit.register(stop_logging)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_restart_listener_after_fork)
+    else:
+        # Formatter
+        formatter = logging.Formatter(
+            '%(asctime)s %(levelname)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        console_handler.setFormatter(formatter)
+        file_handler.setFormatter(formatter)
 
-    Log.addHandler(console_handler)
-    Log.addHandler(file_handler)
+        Log.addHandler(console_handler)
+        Log.addHandler(file_handler)
 
 Log.debug("Logger initialized with dynamic daily file handler.")
 
-__all__ = ["Log"]
\ No newline at end of file
+__all__ = ["Log", "get_log_stats", "stop_logging"]
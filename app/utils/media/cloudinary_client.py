@@ -1,10 +1,12 @@
 # app/utils/media/cloudinary_client.py
 import os
+import time
 import uuid
 from typing import Optional, Dict, Any
 
 import cloudinary
 import cloudinary.uploader
+import cloudinary.utils
 
 
 def init_cloudinary():
@@ -102,6 +104,68 @@ def upload_raw_bytes(
     }
 
 
+def upload_raw_file(
+    path: str,
+    *,
+    folder: str,
+    filename: str,
+    public_id: Optional[str] = None,
+    content_type: str = "application/octet-stream",
+) -> Dict[str, Any]:
+    """
+    Upload a file on disk to Cloudinary as a RAW asset without loading it into memory.
+    upload_large sends the file in fixed-size chunks read from disk.
+
+    The asset is stored with type "private", so it has no public delivery URL;
+    hand out access with get_private_download_url(public_id).
+    """
+    init_cloudinary()
+
+    options = {
+        "folder": folder,
+        "resource_type": "raw",
+        "type": "private",
+        "overwrite": True,
+        "use_filename": True,
+        "unique_filename": False,
+        "filename_override": filename,
+        "chunk_size": 6 * 1024 * 1024,
+    }
+    if public_id:
+        options["public_id"] = public_id
+
+    result = cloudinary.uploader.upload_large(path, **options)
+
+    return {
+        "url": None,
+        "public_id": result.get("public_id"),
+        "bytes": result.get("bytes"),
+        "format": result.get("format"),
+        "resource_type": result.get("resource_type"),
+        "raw": result,
+        "content_type": content_type,
+        "filename": filename,
+    }
+
+
+def get_private_download_url(public_id: str, expires_in: int = 900) -> Optional[str]:
+    """
+    Short-lived signed download link for a private RAW asset (see upload_raw_file).
+    """
+    init_cloudinary()
+    try:
+        return cloudinary.utils.private_download_url(
+            public_id,
+            "",
+            resource_type="raw",
+            type="private",
+            attachment=True,
+            expires_at=int(time.time()) + int(expires_in),
+        )
+    except Exception:
+        return None
+
+
 def upload_invoice_and_get_asset(
     *,
     business_id: str,
@@ -272,6 +272,68 @@ def upload_raw_bytes(
         raise
 
 
+def upload_raw_file(
+    path: str,
+    *,
+    folder: str,
+    filename: str,
+    public_id: Optional[str] = None,
+    content_type: str = "application/octet-stream",
+) -> Dict[str, Any]:
+    """
+    Upload a file on disk to DigitalOcean Spaces without loading it into memory.
+    boto3's upload_file streams it and switches to multipart for large files.
+
+    The object is private (no public-read ACL) and no public URL is returned;
+    hand out access with get_private_download_url(public_id).
+    """
+    log_tag = "[spaces_client.upload_raw_file]"
+    config = _get_config()
+
+    try:
+        client = _get_client()
+
+        if public_id:
+            ext = filename.rsplit(".", 1)[-1] if "." in filename else ""
+            key_filename = f"{public_id}.{ext}" if ext else public_id
+        else:
+            key_filename = filename
+
+        key = f"{folder.strip('/')}/{key_filename}"
+        size = os.path.getsize(path)
+
+        client.upload_file(
+            path,
+            config["bucket"],
+            key,
+            ExtraArgs={
+                "ContentType": content_type,
+                "ContentDisposition": f'attachment; filename="{filename}"',
+            },
+        )
+
+        Log.info(f"{log_tag} Uploaded (private): {key} ({size} bytes)")
+
+        return {
+            "url": None,
+            "public_id": key,
+            "bytes": size,
+            "format": filename.rsplit(".", 1)[-1] if "." in filename else "",
+            "resource_type": "raw",
+            "raw": {
+                "key": key,
+                "bucket": config["bucket"],
+                "size": size,
+            },
+            "content_type": content_type,
+            "filename": filename,
+        }
+
+    except Exception as e:
+        Log.error(f"{log_tag} Error: {e}", exc_info=True)
+        raise
+
+
 def upload_invoice_and_get_asset(
     *,
     business_id: str,
@@ -408,6 +470,13 @@ def get_presigned_url(key: str, expires_in: int = 3600) -> Optional[str]:
         return None
 
 
+def get_private_download_url(key: str, expires_in: int = 900) -> Optional[str]:
+    """
+    Short-lived download link for a private object (see upload_raw_file).
+    """
+    return get_presigned_url(key, expires_in=expires_in)
+
+
 def list_files(prefix: str, max_keys: int = 100) -> list:
     """
     List files under a prefix.
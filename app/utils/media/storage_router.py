@@ -13,6 +13,8 @@ Usage:
       upload_image_file,
       upload_video_file,
       upload_raw_bytes,
+      upload_raw_file,
+      get_private_download_url,
       upload_invoice_and_get_asset,
       upload_document,
       delete_file,
@@ -31,6 +33,8 @@ if STORAGE_PROVIDER == "spaces":
         upload_image_file,
         upload_video_file,
         upload_raw_bytes,
+        upload_raw_file,
+        get_private_download_url,
         upload_invoice_and_get_asset,
         upload_document,
         delete_file,
@@ -43,6 +47,8 @@ elif STORAGE_PROVIDER == "cloudinary":
         upload_image_file,
         upload_video_file,
         upload_raw_bytes,
+        upload_raw_file,
+        get_private_download_url,
         upload_invoice_and_get_asset,
     )
 
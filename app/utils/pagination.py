@@ -0,0 +1,232 @@
+# app/utils/pagination.py
+#
+# Keyset (cursor) pagination for Mongo listings.
+#
+# Key design:
+# - Pages are read with a range filter on the sort key instead of skip():
+#     sort [(created_at, -1), (_id, -1)], after (t, id) ->
+#     {$or: [{created_at: {$lt: t}}, {created_at: t, _id: {$lt: id}}]}
+#   so page 500 costs the same index seek as page 1. _id is always appended
+#   as the tie-breaker, so the order is total and no row is skipped or repeated
+# - Missing / null sort values are ordered the way MongoDB sorts them (lowest)
+# - The cursor is opaque and signed: base64url(payload).base64url(hmac).
+#   The payload holds the last row's sort values, the sort spec and a
+#   fingerprint of collection + filter, so a cursor cannot be edited or
+#   replayed against another listing/tenant (-> InvalidCursor)
+# - Totals are optional: count="none" (default for cursors), "estimate"
+#   (count capped at PAGINATION_COUNT_CAP) or "exact"
+# - stringify_ids() converts ObjectIds without recursion (explicit stack)
+#
+# Used by BaseModel.paginate(cursor=...) and Transaction listings.
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import ObjectId, json_util
+
+from .crypt import HASH_KEY
+
+
+PAGINATION_COUNT_CAP = int(os.getenv("PAGINATION_COUNT_CAP", "10000"))
+
+COUNT_NONE = "none"
+COUNT_ESTIMATE = "estimate"
+COUNT_EXACT = "exact"
+
+_JSON_OPTIONS = json_util.JSONOptions(json_mode=json_util.JSONMode.CANONICAL, tz_aware=False)
+_SIG_BYTES = 16
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# ---------------------------------------------------------------------
+# Serialisation
+# ---------------------------------------------------------------------
+def stringify_ids(doc: Any) -> Any:
+    """
+    ObjectId -> str everywhere inside dicts/lists, in place where possible.
+    Iterative, so deep documents cost no Python recursion.
+    """
+    if isinstance(doc, ObjectId):
+        return str(doc)
+    if not isinstance(doc, (dict, list)):
+        return doc
+
+    stack = [doc]
+    while stack:
+        node = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for k, v in list(items):
+            if isinstance(v, ObjectId):
+                node[k] = str(v)
+            elif isinstance(v, (dict, list)):
+                stack.append(v)
+    return doc
+
+
+# ---------------------------------------------------------------------
+# Cursors
+# ---------------------------------------------------------------------
+def _b64e(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64d(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def _sign(raw: bytes) -> bytes:
+    return hmac.new(HASH_KEY, b"cursor:" + raw, hashlib.sha256).digest()[:_SIG_BYTES]
+
+
+def _fingerprint(collection_name: str, query: Dict[str, Any]) -> str:
+    raw = json_util.dumps({"c": collection_name, "q": query}, json_options=_JSON_OPTIONS, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def encode_cursor(collection_name: str, query: Dict[str, Any], sort_spec: Sequence[Tuple[str, int]], values: List[Any]) -> str:
+    payload = {
+        "f": _fingerprint(collection_name, query),
+        "s": [[k, d] for k, d in sort_spec],
+        "v": values,
+    }
+    raw = json_util.dumps(payload, json_options=_JSON_OPTIONS).encode()
+    return f"{_b64e(raw)}.{_b64e(_sign(raw))}"
+
+
+def decode_cursor(cursor: str, collection_name: str, query: Dict[str, Any], sort_spec: Sequence[Tuple[str, int]]) -> List[Any]:
+    try:
+        body, sig = cursor.split(".", 1)
+        raw = _b64d(body)
+        if not hmac.compare_digest(_sign(raw), _b64d(sig)):
+            raise InvalidCursor("cursor signature mismatch")
+        payload = json_util.loads(raw, json_options=_JSON_OPTIONS)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor("malformed cursor") from e
+
+    if payload.get("f") != _fingerprint(collection_name, query):
+        raise InvalidCursor("cursor belongs to a different listing")
+    if [tuple(x) for x in payload.get("s") or []] != [tuple(x) for x in sort_spec]:
+        raise InvalidCursor("cursor sort does not match")
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != len(sort_spec):
+        raise InvalidCursor("malformed cursor")
+    return values
+
+
+# ---------------------------------------------------------------------
+# Keyset filter
+# ---------------------------------------------------------------------
+def normalize_sort(sort_spec: Optional[Sequence[Tuple[str, int]]]) -> List[Tuple[str, int]]:
+    """
+    Sort spec with _id appended as the tie-breaker.
+    """
+    spec = [(k, -1 if d == -1 else 1) for k, d in (sort_spec or [("created_at", -1)])]
+    if not any(k == "_id" for k, _ in spec):
+        spec.append(("_id", spec[-1][1] if spec else -1))
+    return spec
+
+
+def _after(field: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    # rows strictly after `value` in `direction`; null/missing sort lowest
+    if direction == 1:
+        if value is None:
+            return {field: {"$ne": None}}
+        return {field: {"$gt": value}}
+    if value is None:
+        return None
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort_spec: Sequence[Tuple[str, int]], values: List[Any]) -> Dict[str, Any]:
+    branches = []
+    for i, (field, direction) in enumerate(sort_spec):
+        cond = _after(field, direction, values[i])
+        if cond is None:
+            continue
+        # equal on every earlier key, after on this one
+        prefix = {f: values[j] for j, (f, _) in enumerate(sort_spec[:i])}
+        if not prefix:
+            branches.append(cond)
+        elif "$or" in cond:
+            branches.append({"$and": [prefix, cond]})
+        else:
+            branches.append({**prefix, **cond})
+    if not branches:
+        # nothing sorts after the last row
+        return {"_id": {"$exists": False}}
+    return branches[0] if len(branches) == 1 else {"$or": branches}
+
+
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    cur: Any = doc
+    for part in path.split("."):
+        if not isinstance(cur, dict):
+            return None
+        cur = cur.get(part)
+    return cur
+
+
+# ---------------------------------------------------------------------
+# Page
+# ---------------------------------------------------------------------
+def count(collection, query: Dict[str, Any], mode: Optional[str]) -> Dict[str, Any]:
+    if mode == COUNT_EXACT:
+        return {"total_count": collection.count_documents(query)}
+    if mode == COUNT_ESTIMATE:
+        if not query:
+            return {"total_count": collection.estimated_document_count(), "total_count_estimated": True}
+        n = collection.count_documents(query, limit=PAGINATION_COUNT_CAP)
+        return {"total_count": n, "total_count_estimated": n >= PAGINATION_COUNT_CAP}
+    return {}
+
+
+def keyset_page(
+    collection,
+    query: Dict[str, Any],
+    *,
+    sort_spec: Optional[Sequence[Tuple[str, int]]] = None,
+    per_page: int = 50,
+    cursor: Optional[str] = None,
+    count_mode: Optional[str] = COUNT_NONE,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    One page after `cursor` (None / "" = first page).
+
+    Returns {"items", "per_page", "next_cursor", "has_more"} plus
+    total_count (and total_count_estimated) when count_mode asks for it.
+    Raises InvalidCursor for a tampered, foreign or malformed cursor.
+    """
+    spec = normalize_sort(sort_spec)
+    find_query = dict(query)
+    if cursor:
+        values = decode_cursor(cursor, collection.name, query, spec)
+        after = keyset_filter(spec, values)
+        find_query = {"$and": [query, after]} if query else after
+
+    rows = list(collection.find(find_query, projection).sort(spec).limit(per_page + 1))
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(collection.name, query, spec, [_get_path(last, f) for f, _ in spec])
+
+    return {
+        "items": rows,
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        **count(collection, query, count_mode),
+    }
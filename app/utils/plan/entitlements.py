@@ -0,0 +1,294 @@
+# app/utils/plan/entitlements.py
+#
+# Per-tenant entitlement snapshot.
+#
+# One snapshot per business holds everything subscription enforcement needs:
+#   - the access-granting subscription (status, trial_end_date, end_date)
+#   - the latest subscription status (to explain why access is denied)
+#   - the active package (normalised features + limits)
+#
+# Layers (first hit wins):
+#   1. flask.g            -> once per request
+#   2. process dict       -> ENTITLEMENT_LOCAL_TTL seconds
+#   3. Redis              -> ENTITLEMENT_REDIS_TTL seconds
+#   4. Mongo (rebuild)    -> Subscription + Package queries
+#
+# Versioning:
+#   entitlements:ver:{business_id} is INCRemented on every invalidation. A rebuilt
+#   snapshot is only written back if the version did not move while it was being
+#   computed, so a slow rebuild can never overwrite a newer invalidation.
+#
+# Expiry (trial_end_date / end_date vs now + grace days) is still evaluated on
+# every check, so a cached snapshot never grants access past its end date.
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from flask import g
+
+from ...extensions.db import db
+from ...utils.logger import Log
+
+
+ENTITLEMENT_LOCAL_TTL = int(os.getenv("ENTITLEMENT_LOCAL_TTL", "5"))
+ENTITLEMENT_REDIS_TTL = int(os.getenv("ENTITLEMENT_REDIS_TTL", "300"))
+
+SNAPSHOT_SCHEMA = 1
+
+KEY_PREFIX = "entitlements"
+
+_LOCAL: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_LOCAL_LOCK = threading.Lock()
+
+# SET the snapshot only if the version key still equals ARGV[1]
+_SET_IF_VERSION = """
+local cur = redis.call('GET', KEYS[2]) or '0'
+if cur == ARGV[1] then
+  redis.call('SET', KEYS[1], ARGV[2], 'EX', tonumber(ARGV[3]))
+  return 1
+end
+return 0
+"""
+
+
+def _redis():
+    from ...extensions.redis_manager import get_redis
+    return get_redis("limiter")
+
+
+def _snap_key(business_id: str) -> str:
+    return f"{KEY_PREFIX}:{business_id}"
+
+
+def _ver_key(business_id: str) -> str:
+    return f"{KEY_PREFIX}:ver:{business_id}"
+
+
+def _g_key(business_id: str) -> str:
+    return f"_entitlements_{business_id}"
+
+
+def _g_get(key: str):
+    try:
+        return g.get(key)
+    except Exception:
+        return None
+
+
+def _g_set(key: str, value) -> None:
+    try:
+        setattr(g, key, value)
+    except Exception:
+        pass
+
+
+def _g_pop(key: str) -> None:
+    try:
+        g.pop(key, None)
+    except Exception:
+        pass
+
+
+def _json_default(v):
+    if isinstance(v, datetime):
+        return v.isoformat()
+    if isinstance(v, ObjectId):
+        return str(v)
+    return str(v)
+
+
+# ---------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------
+def normalise_package(pkg: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    limits from top-level max_* + storage_limit_gb, features always a dict.
+    """
+    limits = (pkg.get("limits") or {}).copy()
+    for k, v in pkg.items():
+        if k.startswith("max_") or k in ("storage_limit_gb",):
+            limits.setdefault(k, v)
+
+    pkg["limits"] = limits
+    pkg["features"] = pkg.get("features") or {}
+
+    if not pkg.get("billing_period"):
+        pkg["billing_period"] = "monthly"
+    return pkg
+
+
+def build_snapshot(business_id: str, version: str = "0") -> Dict[str, Any]:
+    from ...models.admin.subscription_model import Subscription
+    from ...models.admin.package_model import Package
+
+    business_id = str(business_id)
+    sub = Subscription.get_active_by_business(business_id)
+
+    latest = None
+    if not sub:
+        last = Subscription.get_latest_by_business(business_id)
+        latest = {"status": last.get("status")} if last else None
+
+    package = None
+    if sub and sub.get("package_id"):
+        pkg = Package.get_by_id(sub.get("package_id"))
+        if pkg:
+            package = normalise_package(pkg)
+
+    return {
+        "schema": SNAPSHOT_SCHEMA,
+        "business_id": business_id,
+        "version": str(version),
+        "computed_at": datetime.utcnow().isoformat(),
+        "active": bool(sub),
+        "subscription": {
+            "_id": sub.get("_id"),
+            "status": sub.get("status"),
+            "package_id": sub.get("package_id"),
+            "trial_end_date": sub.get("trial_end_date"),
+            "end_date": sub.get("end_date"),
+        } if sub else None,
+        "latest": latest,
+        "package": package,
+        "features": (package or {}).get("features") or {},
+        "limits": (package or {}).get("limits") or {},
+    }
+
+
+# ---------------------------------------------------------------------
+# Read
+# ---------------------------------------------------------------------
+def _load_from_redis(business_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        raw = _redis().get(_snap_key(business_id))
+    except Exception as e:
+        Log.warning(f"[entitlements][redis_get] {business_id}: {e}")
+        return None
+    if not raw:
+        return None
+    try:
+        snap = json.loads(raw)
+    except Exception:
+        return None
+    return snap if snap.get("schema") == SNAPSHOT_SCHEMA else None
+
+
+def _rebuild(business_id: str) -> Dict[str, Any]:
+    r = None
+    version = "0"
+    try:
+        r = _redis()
+        version = str(r.get(_ver_key(business_id)) or "0")
+    except Exception as e:
+        Log.warning(f"[entitlements][version] {business_id}: {e}")
+        r = None
+
+    snap = build_snapshot(business_id, version)
+
+    if r is not None:
+        try:
+            r.eval(
+                _SET_IF_VERSION,
+                2,
+                _snap_key(business_id),
+                _ver_key(business_id),
+                version,
+                json.dumps(snap, default=_json_default),
+                ENTITLEMENT_REDIS_TTL,
+            )
+        except Exception as e:
+            Log.warning(f"[entitlements][redis_set] {business_id}: {e}")
+
+    # same shape as a Redis round trip (datetimes as ISO strings)
+    return json.loads(json.dumps(snap, default=_json_default))
+
+
+def get_entitlements(business_id: str) -> Dict[str, Any]:
+    business_id = str(business_id)
+
+    key = _g_key(business_id)
+    snap = _g_get(key)
+    if snap:
+        return snap
+
+    now = time.monotonic()
+    with _LOCAL_LOCK:
+        hit = _LOCAL.get(business_id)
+
+    if hit and now - hit[0] < ENTITLEMENT_LOCAL_TTL:
+        snap = hit[1]
+    else:
+        snap = _load_from_redis(business_id) or _rebuild(business_id)
+        with _LOCAL_LOCK:
+            _LOCAL[business_id] = (now, snap)
+
+    _g_set(key, snap)
+    return snap
+
+
+def get_package(business_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Active package (normalised), or None when the business has no access-granting subscription.
+    Returns a copy; callers may mutate it.
+    """
+    pkg = get_entitlements(business_id).get("package")
+    return copy.deepcopy(pkg) if pkg else None
+
+
+def has_feature(business_id: str, feature: str) -> bool:
+    return bool((get_entitlements(business_id).get("features") or {}).get(feature))
+
+
+# ---------------------------------------------------------------------
+# Invalidate
+# ---------------------------------------------------------------------
+def invalidate_entitlements(business_id: Any, reason: str = "") -> None:
+    if not business_id:
+        return
+    business_id = str(business_id)
+
+    with _LOCAL_LOCK:
+        _LOCAL.pop(business_id, None)
+    _g_pop(_g_key(business_id))
+
+    try:
+        pipe = _redis().pipeline(transaction=True)
+        pipe.incr(_ver_key(business_id))
+        pipe.delete(_snap_key(business_id))
+        pipe.execute()
+    except Exception as e:
+        Log.warning(f"[entitlements][invalidate] {business_id}: {e}")
+        return
+
+    Log.info(f"[entitlements][invalidate] business_id={business_id} reason={reason}")
+
+
+def invalidate_package(package_id: Any) -> None:
+    """
+    Package edits affect every business subscribed to it.
+    """
+    if not package_id:
+        return
+    try:
+        pid = ObjectId(str(package_id))
+    except Exception:
+        return
+
+    try:
+        business_ids = db.get_collection("subscriptions").distinct(
+            "business_id", {"package_id": {"$in": [pid, str(package_id)]}}
+        )
+    except Exception as e:
+        Log.warning(f"[entitlements][invalidate_package] {package_id}: {e}")
+        return
+
+    for bid in business_ids:
+        invalidate_entitlements(bid, reason=f"package:{package_id}")
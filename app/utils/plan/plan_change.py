@@ -12,6 +12,7 @@ from ...models.admin.package_model import Package
 from ...models.admin.setup_model import Outlet
 from ...utils.crypt import encrypt_data, hash_data
 from ...utils.logger import Log
+from .entitlements import invalidate_entitlements
 
 
 class PlanChangeService:
@@ -140,6 +141,7 @@ class PlanChangeService:
                 }
             },
         )
+        invalidate_entitlements(business_oid, reason="plan_change")
 
         # Compute end_date from billing_period (use Package.billing_period if you want strict validation)
         end_date = PlanChangeService._compute_end_date(now, billing_period)
@@ -1,7 +1,6 @@
 # app/utils/plan/plan_resolver.py
 from flask import g
-from ...models.admin.subscription_model import Subscription
-from ...models.admin.package_model import Package
+from .entitlements import get_package
 from ...utils.logger import Log
 
 DEFAULT_FREE_PLAN = {
@@ -41,9 +40,8 @@ DEFAULT_FREE_PLAN = {
 
 class PlanResolver:
     """
-    Resolves the active package for a business using your Models:
-      - Subscription.get_active_by_business(business_id)
-      - Package.get_by_id(package_id)
+    Resolves the active package for a business from the entitlement snapshot
+    (Subscription.get_active_by_business + Package.get_by_id, cached per tenant).
 
     Normalises:
       - pkg["limits"] from top-level max_* + storage_limit_gb
@@ -64,33 +62,11 @@ class PlanResolver:
         if cached:
             return cached
 
-        sub = Subscription.get_active_by_business(business_id)
-        Log.info(f"PlanResolver: business_id={business_id} active subscription: {sub}")
-        if not sub:
-            pkg = DEFAULT_FREE_PLAN.copy()
-            try:
-                g[cache_key] = pkg
-            except Exception:
-                setattr(g, cache_key, pkg)
-            return pkg
-
-        pkg = Package.get_by_id(sub.get("package_id"))
+        # Active package comes from the tenant entitlement snapshot (already normalised)
+        pkg = get_package(business_id)
         if not pkg:
             pkg = DEFAULT_FREE_PLAN.copy()
 
-        # Normalise limits (supports both top-level max_* and nested limits)
-        limits = (pkg.get("limits") or {}).copy()
-        for k, v in pkg.items():
-            if k.startswith("max_") or k in ("storage_limit_gb",):
-                limits.setdefault(k, v)
-
-        pkg["limits"] = limits
-        pkg["features"] = pkg.get("features") or {}
-
-        # Ensure billing_period exists (default monthly)
-        if not pkg.get("billing_period"):
-            pkg["billing_period"] = "monthly"
-
         try:
             g[cache_key] = pkg
         except Exception:
@@ -10,6 +10,8 @@ from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
 from ...extensions.db import db
+from ...utils.logger import Log
+from . import usage_counters
 from .plan_resolver import PlanResolver
 from .periods import resolve_quota_period_from_billing, period_key
 
@@ -55,6 +57,9 @@ class QuotaEnforcer:
     #   DISABLE_PLAN_LIMITS=true
     DISABLE_LIMITS_ENV = "DISABLE_PLAN_LIMITS"
 
+    # Counter storage: "redis" (default, reconciled to business_usage) or "mongo"
+    COUNTERS_BACKEND_ENV = "QUOTA_COUNTERS_BACKEND"
+
     def __init__(self, business_id: str):
         self.business_id = str(business_id)
         self.package = PlanResolver.get_active_package(self.business_id) or {}
@@ -62,6 +67,9 @@ class QuotaEnforcer:
     def _usage_col(self):
         return db.get_collection(self.USAGE_COLLECTION)
 
+    def _redis_counters_enabled(self) -> bool:
+        return os.getenv(self.COUNTERS_BACKEND_ENV, "redis").strip().lower() == "redis"
+
     def _limits_disabled(self) -> bool:
         return os.getenv(self.DISABLE_LIMITS_ENV, "false").strip().lower() in ("1", "true", "yes")
 
@@ -112,6 +120,24 @@ class QuotaEnforcer:
         return resolve_quota_period_from_billing(self.package.get("billing_period"))
 
     # ---------------- Reserve / Release ----------------
+    def _limit_reached(self, *, limit_key, counter_name, limit_int, current, qty, resolved_period, key, reason):
+        return PlanLimitError(
+            "PACKAGE_LIMIT_REACHED",
+            f"Package limit reached for {limit_key}. Upgrade your plan to continue.",
+            meta={
+                "limit_key": limit_key,
+                "counter": counter_name,
+                "limit": limit_int,
+                "current": current,
+                "attempted": qty,
+                "tier": self.package.get("tier"),
+                "period": resolved_period,
+                "period_key": key,
+                "reason": reason,
+                "billing_period": self.package.get("billing_period"),
+            },
+        )
+
     def reserve(
         self,
         *,
@@ -131,6 +157,9 @@ class QuotaEnforcer:
         Notes:
           - If limit_key does not exist => treated as unlimited (None).
           - If DISABLE_PLAN_LIMITS=true => treated as unlimited.
+          - Counters live in Redis (one Lua call); business_usage in Mongo is
+            the reconciled copy. If Redis is unreachable we fall back to the
+            Mongo counters directly.
         """
         qty = int(qty)
         if qty <= 0:
@@ -141,6 +170,105 @@ class QuotaEnforcer:
 
         resolved_period = self.resolve_period(period)  # month/year
         key = period_key(resolved_period, dt)
+
+        limit_int = None
+        if limit is not None:
+            try:
+                limit_int = int(limit)
+            except Exception:
+                raise PlanLimitError(
+                    "PACKAGE_LIMIT_INVALID",
+                    f"Package limit misconfigured: {limit_key}",
+                    meta={"limit_key": limit_key, "value": limit, "tier": tier},
+                )
+
+            if limit_int < 0:
+                raise PlanLimitError(
+                    "PACKAGE_LIMIT_INVALID",
+                    f"Package limit must be >= 0: {limit_key}",
+                    meta={"limit_key": limit_key, "value": limit_int, "tier": tier},
+                )
+
+            # If qty itself is bigger than limit, fail early with a clean message
+            if qty > limit_int:
+                raise self._limit_reached(
+                    limit_key=limit_key, counter_name=counter_name, limit_int=limit_int,
+                    current=None, qty=qty, resolved_period=resolved_period, key=key, reason=reason,
+                )
+
+        if self._redis_counters_enabled():
+            try:
+                reserved, current = usage_counters.try_reserve(
+                    self.business_id, resolved_period, key, counter_name, qty, limit_int
+                )
+            except Exception as e:
+                # Fallback increments are also recorded as pending deltas and
+                # folded back into the hash by the reconciler.
+                Log.warning(f"[QuotaEnforcer][reserve] redis counters unavailable, using Mongo: {e}")
+            else:
+                if not reserved:
+                    raise self._limit_reached(
+                        limit_key=limit_key, counter_name=counter_name, limit_int=limit_int,
+                        current=current, qty=qty, resolved_period=resolved_period, key=key, reason=reason,
+                    )
+                return {
+                    "reserved": qty,
+                    "limit": limit_int,
+                    "current": current,
+                    "period": resolved_period,
+                    "period_key": key,
+                    "limits_disabled": self._limits_disabled(),
+                    "backend": "redis",
+                }
+
+        return self._reserve_mongo(
+            counter_name=counter_name,
+            limit_key=limit_key,
+            limit_int=limit_int,
+            qty=qty,
+            resolved_period=resolved_period,
+            key=key,
+            reason=reason,
+        )
+
+    def _counter_update(self, counter_name: str, delta: int, now) -> Dict[str, Any]:
+        """
+        Mongo update for counters.<counter_name>. With the Redis backend this is
+        the fallback path, so the delta is also kept under pending.<counter_name>
+        for usage_counters.merge_pending().
+        """
+        inc = {f"counters.{counter_name}": delta}
+        setter: Dict[str, Any] = {"updated_at": now}
+        if self._redis_counters_enabled():
+            inc[f"pending.{counter_name}"] = delta
+            setter["pending_at"] = now
+        return {"$inc": inc, "$set": setter}
+
+    def get_usage(self, *, period: str = "billing", dt=None) -> Dict[str, int]:
+        resolved_period = self.resolve_period(period)
+        key = period_key(resolved_period, dt)
+        if self._redis_counters_enabled():
+            try:
+                return usage_counters.get_counters(self.business_id, resolved_period, key)
+            except Exception as e:
+                Log.warning(f"[QuotaEnforcer][get_usage] redis counters unavailable, using Mongo: {e}")
+        doc = self._usage_col().find_one(
+            {"business_id": self.business_id, "period": resolved_period, "period_key": key},
+            {"counters": 1},
+        ) or {}
+        return {k: int(v or 0) for k, v in (doc.get("counters") or {}).items()}
+
+    def _reserve_mongo(
+        self,
+        *,
+        counter_name: str,
+        limit_key: str,
+        limit_int: Optional[int],
+        qty: int,
+        resolved_period: str,
+        key: str,
+        reason: str,
+    ) -> Dict[str, Any]:
         now = datetime.now(timezone.utc)
 
         # IMPORTANT: use ObjectId in selector, but store string in inserted doc (you already had this)
@@ -170,13 +298,10 @@ class QuotaEnforcer:
             pass
 
         # Unlimited => always allow increment
-        if limit is None:
+        if limit_int is None:
             doc = self._usage_col().find_one_and_update(
                 base_selector,
-                {
-                    "$inc": {f"counters.{counter_name}": qty},
-                    "$set": {"updated_at": now},
-                },
+                self._counter_update(counter_name, qty, now),
                 upsert=False,
                 return_document=ReturnDocument.AFTER,
             )
@@ -187,44 +312,9 @@ class QuotaEnforcer:
                 "period": resolved_period,
                 "period_key": key,
                 "limits_disabled": self._limits_disabled(),
+                "backend": "mongo",
             }
 
-        # Finite limit
-        try:
-            limit_int = int(limit)
-        except Exception:
-            raise PlanLimitError(
-                "PACKAGE_LIMIT_INVALID",
-                f"Package limit misconfigured: {limit_key}",
-                meta={"limit_key": limit_key, "value": limit, "tier": tier},
-            )
-
-        if limit_int < 0:
-            raise PlanLimitError(
-                "PACKAGE_LIMIT_INVALID",
-                f"Package limit must be >= 0: {limit_key}",
-                meta={"limit_key": limit_key, "value": limit_int, "tier": tier},
-            )
-
-        # If qty itself is bigger than limit, fail early with a clean message
-        if qty > limit_int:
-            raise PlanLimitError(
-                "PACKAGE_LIMIT_REACHED",
-                f"Package limit reached for {limit_key}. Upgrade your plan to continue.",
-                meta={
-                    "limit_key": limit_key,
-                    "counter": counter_name,
-                    "limit": limit_int,
-                    "current": None,
-                    "attempted": qty,
-                    "tier": tier,
-                    "period": resolved_period,
-                    "period_key": key,
-                    "reason": reason,
-                    "billing_period": self.package.get("billing_period"),
-                },
-            )
-
         # 2) Conditional increment WITHOUT upsert (CRITICAL)
         filter_q = {
             **base_selector,
@@ -237,10 +327,7 @@ class QuotaEnforcer:
         def _try_conditional_inc():
             return self._usage_col().find_one_and_update(
                 filter_q,
-                {
-                    "$inc": {f"counters.{counter_name}": qty},
-                    "$set": {"updated_at": now},
-                },
+                self._counter_update(counter_name, qty, now),
                 upsert=False,  # ✅ do NOT create a new doc when limit is reached
                 return_document=ReturnDocument.AFTER,
             )
@@ -257,21 +344,9 @@ class QuotaEnforcer:
             ) or {}
             current = int(((existing.get("counters") or {}).get(counter_name)) or 0)
 
-            raise PlanLimitError(
-                "PACKAGE_LIMIT_REACHED",
-                f"Package limit reached for {limit_key}. Upgrade your plan to continue.",
-                meta={
-                    "limit_key": limit_key,
-                    "counter": counter_name,
-                    "limit": limit_int,
-                    "current": current,
-                    "attempted": qty,
-                    "tier": tier,
-                    "period": resolved_period,
-                    "period_key": key,
-                    "reason": reason,
-                    "billing_period": self.package.get("billing_period"),
-                },
+            raise self._limit_reached(
+                limit_key=limit_key, counter_name=counter_name, limit_int=limit_int,
+                current=current, qty=qty, resolved_period=resolved_period, key=key, reason=reason,
             )
 
         return {
@@ -281,6 +356,7 @@ class QuotaEnforcer:
             "period": resolved_period,
             "period_key": key,
             "limits_disabled": self._limits_disabled(),
+            "backend": "mongo",
         }
 
     def release(
@@ -301,6 +377,14 @@ class QuotaEnforcer:
 
         resolved_period = self.resolve_period(period)
         key = period_key(resolved_period, dt)
+
+        if self._redis_counters_enabled():
+            try:
+                usage_counters.release(self.business_id, resolved_period, key, counter_name, qty)
+                return
+            except Exception as e:
+                Log.warning(f"[QuotaEnforcer][release] redis counters unavailable, using Mongo: {e}")
+
         now = datetime.now(timezone.utc)
 
         base_selector = {
@@ -311,9 +395,6 @@ class QuotaEnforcer:
 
         self._usage_col().update_one(
             base_selector,
-            {
-                "$inc": {f"counters.{counter_name}": -qty},
-                "$set": {"updated_at": now},
-            },
+            self._counter_update(counter_name, -qty, now),
             upsert=False,
-        )
\ No newline at end of file
+        )
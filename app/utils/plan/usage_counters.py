@@ -0,0 +1,345 @@
+# app/utils/plan/usage_counters.py
+#
+# Redis-backed plan usage counters (used by QuotaEnforcer).
+#
+# Key design:
+# - One Redis hash per business and quota period:
+#     quota:usage:{business_id}:{period}:{period_key} -> {counter_name: count}
+#   so a new month/year starts from zero without any reset job
+# - Check-and-increment is ONE Lua call: the increment only happens when it
+#   stays within the limit (no read-then-write race between workers)
+# - Hashes are seeded from Mongo (business_usage) on first use; the "__seeded"
+#   field marks a hash as authoritative. After a Redis loss the marker is gone
+#   and the next reserve/release reseeds from the last reconciled Mongo counts
+# - Every write adds the hash key to a "dirty" set; the reconciler drains it
+#   and writes absolute counter values back to business_usage in bulk
+# - When Redis is unreachable QuotaEnforcer writes to Mongo directly and also
+#   records the delta under pending.<counter> (+ pending_at). The reconciler
+#   folds those deltas into the live hash before writing absolute values, and a
+#   reseed (which already reads them via counters) consumes them instead
+# - Hashes expire some time after their period ends (and after reconciliation)
+#
+# Job entrypoints:
+#   - app.jobs.usage_reconcile_job.run_reconcile_usage_counters (rq-scheduler)
+
+from __future__ import annotations
+
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import IndexModel, UpdateOne
+
+from ...extensions.db import db
+from ...utils.logger import Log
+
+
+USAGE_COLLECTION = "business_usage"
+
+KEY_PREFIX = "quota:usage"
+DIRTY_KEY = "quota:usage:dirty"
+SEEDED_FIELD = "__seeded"
+
+# Keep hashes a little past the end of their period
+PERIOD_TTL_SECONDS = {
+    "month": int(os.getenv("QUOTA_MONTH_TTL_SECONDS", str(40 * 86400))),
+    "year": int(os.getenv("QUOTA_YEAR_TTL_SECONDS", str(400 * 86400))),
+}
+
+RECONCILE_BATCH = int(os.getenv("QUOTA_RECONCILE_BATCH", "500"))
+
+INDEXES = {
+    USAGE_COLLECTION: (
+        IndexModel(
+            [("business_id", 1), ("period", 1), ("period_key", 1)],
+            unique=True,
+            name="uniq_business_usage_period",
+        ),
+        IndexModel([("pending_at", 1)], sparse=True, name="business_usage_pending"),
+    ),
+}
+
+
+class CountersNotSeeded(Exception):
+    pass
+
+
+# KEYS[1] = usage hash, KEYS[2] = dirty set
+# ARGV    = counter, qty, limit (-1 = unlimited), ttl, seeded field
+# Returns {status, current}: 1 = reserved, 0 = limit reached, -2 = not seeded
+_RESERVE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[5]) == 0 then
+  return {-2, 0}
+end
+local qty = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+if limit >= 0 and current + qty > limit then
+  return {0, current}
+end
+local new = redis.call('HINCRBY', KEYS[1], ARGV[1], qty)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+redis.call('SADD', KEYS[2], KEYS[1])
+return {1, new}
+"""
+
+# Same keys; ARGV = counter, qty, ttl, seeded field. Never goes below zero.
+_RELEASE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[4]) == 0 then
+  return {-2, 0}
+end
+local qty = tonumber(ARGV[2])
+local current = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+local new = current - qty
+if new < 0 then
+  new = 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], new)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+redis.call('SADD', KEYS[2], KEYS[1])
+return {1, new}
+"""
+
+# KEYS[1] = usage hash; ARGV = ttl, seeded field, name1, value1, name2, value2 ...
+# Seeds only once: a concurrent seeder (or live counts) always wins.
+_SEED_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[2]) == 1 then
+  return 0
+end
+for i = 3, #ARGV, 2 do
+  redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('HSET', KEYS[1], ARGV[2], 1)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+return 1
+"""
+
+# KEYS[1] = usage hash, KEYS[2] = dirty set; ARGV = ttl, seeded field, name1, delta1 ...
+# Folds fallback deltas into a live hash (clamped at zero). -2 = not seeded.
+_MERGE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[2]) == 0 then
+  return -2
+end
+for i = 3, #ARGV, 2 do
+  local new = redis.call('HINCRBY', KEYS[1], ARGV[i], tonumber(ARGV[i + 1]))
+  if new < 0 then
+    redis.call('HSET', KEYS[1], ARGV[i], 0)
+  end
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+redis.call('SADD', KEYS[2], KEYS[1])
+return 1
+"""
+
+
+def _redis():
+    from ...extensions.redis_manager import get_redis
+    return get_redis("limiter")
+
+
+def usage_key(business_id: str, period: str, key: str) -> str:
+    return f"{KEY_PREFIX}:{business_id}:{period}:{key}"
+
+
+def _parse_usage_key(k: str) -> Optional[Tuple[str, str, str]]:
+    parts = k.split(":")
+    if len(parts) != 5:
+        return None
+    return parts[2], parts[3], parts[4]
+
+
+def _ttl(period: str) -> int:
+    return PERIOD_TTL_SECONDS.get(period, PERIOD_TTL_SECONDS["month"])
+
+
+def _int_map(raw: Optional[Dict[str, Any]], *, floor: Optional[int] = None) -> Dict[str, int]:
+    out = {}
+    for name, value in (raw or {}).items():
+        try:
+            v = int(value or 0)
+        except (TypeError, ValueError):
+            continue
+        out[name] = v if floor is None else max(floor, v)
+    return out
+
+
+def _consume_pending(doc_id, pending: Dict[str, int], pending_at, *, exact: bool) -> bool:
+    """
+    Subtract deltas that are now reflected in Redis from pending.<counter>.
+
+    pending_at is only cleared when no fallback write landed since it was read.
+    exact=False: only consume when nothing changed (the caller did not apply
+    the deltas anywhere, so leaving them for the next run is harmless).
+    """
+    col = db.get_collection(USAGE_COLLECTION)
+    dec = {f"pending.{name}": -v for name, v in pending.items() if v}
+    update: Dict[str, Any] = {"$unset": {"pending_at": ""}}
+    if dec:
+        update["$inc"] = dec
+    if col.update_one({"_id": doc_id, "pending_at": pending_at}, update).matched_count:
+        return True
+    if exact and dec:
+        col.update_one({"_id": doc_id}, {"$inc": dec})
+        return True
+    return False
+
+
+def seed(business_id: str, period: str, key: str) -> bool:
+    """
+    Load the persisted counts into Redis unless the hash is already live.
+    Fallback deltas recorded alongside those counts are consumed by the seed.
+    """
+    doc = db.get_collection(USAGE_COLLECTION).find_one(
+        {"business_id": business_id, "period": period, "period_key": key},
+        {"counters": 1, "pending": 1, "pending_at": 1},
+    ) or {}
+
+    args: List[Any] = [_ttl(period), SEEDED_FIELD]
+    for name, value in _int_map(doc.get("counters"), floor=0).items():
+        args.extend([name, value])
+    seeded = bool(_redis().eval(_SEED_SCRIPT, 1, usage_key(business_id, period, key), *args))
+    if seeded:
+        Log.info(f"[usage_counters][seed] business_id={business_id} {period}:{key}")
+        if doc.get("pending_at") is not None:
+            try:
+                _consume_pending(doc["_id"], _int_map(doc.get("pending")), doc["pending_at"], exact=True)
+            except Exception as e:
+                Log.warning(f"[usage_counters][seed] pending not consumed for {business_id} {period}:{key}: {e}")
+    return seeded
+
+
+def _run(script: str, business_id: str, period: str, key: str, *args) -> Tuple[int, int]:
+    k = usage_key(business_id, period, key)
+    for _ in range(2):
+        status, current = (int(x) for x in _redis().eval(script, 2, k, DIRTY_KEY, *args))
+        if status != -2:
+            return status, current
+        seed(business_id, period, key)
+    raise CountersNotSeeded(k)
+
+
+def try_reserve(
+    business_id: str, period: str, key: str, counter: str, qty: int, limit: Optional[int]
+) -> Tuple[bool, int]:
+    """
+    Atomic check-and-increment. Returns (reserved, current_after_or_current).
+    limit=None means unlimited.
+    """
+    status, current = _run(
+        _RESERVE_SCRIPT, business_id, period, key,
+        counter, int(qty), -1 if limit is None else int(limit), _ttl(period), SEEDED_FIELD,
+    )
+    return status == 1, current
+
+
+def release(business_id: str, period: str, key: str, counter: str, qty: int) -> int:
+    _, current = _run(
+        _RELEASE_SCRIPT, business_id, period, key,
+        counter, int(qty), _ttl(period), SEEDED_FIELD,
+    )
+    return current
+
+
+def get_counters(business_id: str, period: str, key: str) -> Dict[str, int]:
+    k = usage_key(business_id, period, key)
+    raw = _redis().hgetall(k) or {}
+    if SEEDED_FIELD not in raw:
+        seed(business_id, period, key)
+        raw = _redis().hgetall(k) or {}
+    return {name: int(v) for name, v in raw.items() if name != SEEDED_FIELD}
+
+
+# ---------------------------------------------------------------------
+# Reconciliation (Redis -> Mongo)
+# ---------------------------------------------------------------------
+def merge_pending(batch_size: int = RECONCILE_BATCH) -> Dict[str, int]:
+    """
+    Fold Mongo-fallback deltas into the live Redis hashes.
+
+    A hash that is not live needs nothing: business_usage.counters already
+    holds the fallback increments and the next seed starts from them.
+    """
+    r = _redis()
+    stats = {"merged": 0, "cleared": 0}
+
+    cursor = db.get_collection(USAGE_COLLECTION).find(
+        {"pending_at": {"$exists": True}},
+        {"business_id": 1, "period": 1, "period_key": 1, "pending": 1, "pending_at": 1},
+    ).limit(batch_size)
+
+    for doc in cursor:
+        business_id, period, key = str(doc.get("business_id")), doc.get("period"), doc.get("period_key")
+        pending = {name: v for name, v in _int_map(doc.get("pending")).items() if v}
+
+        merged = -2
+        if pending:
+            args: List[Any] = [_ttl(period), SEEDED_FIELD]
+            for name, v in pending.items():
+                args.extend([name, v])
+            merged = int(r.eval(_MERGE_SCRIPT, 2, usage_key(business_id, period, key), DIRTY_KEY, *args))
+
+        if merged == 1:
+            _consume_pending(doc["_id"], pending, doc["pending_at"], exact=True)
+            stats["merged"] += 1
+        elif _consume_pending(doc["_id"], pending, doc["pending_at"], exact=False):
+            stats["cleared"] += 1
+
+    return stats
+
+
+def reconcile(batch_size: int = RECONCILE_BATCH) -> Dict[str, int]:
+    """
+    Merge fallback deltas, then drain the dirty set and persist absolute
+    counter values to business_usage.
+    Keys that fail to persist go back into the dirty set for the next run.
+    """
+    r = _redis()
+    stats = {"keys": 0, "written": 0, "expired": 0, "failed": 0}
+    stats.update(merge_pending(batch_size))
+
+    while True:
+        keys = r.spop(DIRTY_KEY, batch_size) or []
+        if not keys:
+            break
+
+        pipe = r.pipeline(transaction=False)
+        for k in keys:
+            pipe.hgetall(k)
+        snapshots = pipe.execute()
+
+        now = datetime.now(timezone.utc)
+        ops = []
+        for k, raw in zip(keys, snapshots):
+            stats["keys"] += 1
+            parsed = _parse_usage_key(k)
+            if not parsed or not raw or SEEDED_FIELD not in raw:
+                # expired or lost before we got to it; Mongo keeps the last reconciled counts
+                stats["expired"] += 1
+                continue
+            business_id, period, key = parsed
+            counters = {f"counters.{name}": int(v) for name, v in raw.items() if name != SEEDED_FIELD}
+            ops.append(UpdateOne(
+                {"business_id": business_id, "period": period, "period_key": key},
+                {
+                    "$set": {**counters, "updated_at": now, "reconciled_at": now},
+                    "$setOnInsert": {"created_at": now},
+                },
+                upsert=True,
+            ))
+
+        if not ops:
+            continue
+
+        try:
+            db.get_collection(USAGE_COLLECTION).bulk_write(ops, ordered=False)
+            stats["written"] += len(ops)
+        except Exception as e:
+            stats["failed"] += len(ops)
+            Log.error(f"[usage_counters][reconcile] bulk_write failed: {e}")
+            try:
+                r.sadd(DIRTY_KEY, *keys)
+            except Exception:
+                pass
+            break
+
+    return stats
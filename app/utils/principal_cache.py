@@ -0,0 +1,184 @@
+# app/utils/principal_cache.py
+#
+# Short-lived cache of the resolved principal used by token_required.
+#
+# Key design:
+# - One Redis hash per user: principal:{user_id} -> {token_id: principal}
+#   token_id = jti, else iat, else a hash of the raw token
+# - The principal is the cleaned user document (sensitive fields removed) with
+#   agent_id resolved and account_type decrypted; token-specific permissions are
+#   still applied from the JWT on every request
+# - Entries carry cached_at and expire after PRINCIPAL_CACHE_TTL seconds; the
+#   whole hash is also EXPIREd as a backstop
+# - Explicit invalidation (DEL principal:{user_id}) on user update, role change,
+#   password change and logout
+# - Hit/miss counters per process, logged every PRINCIPAL_CACHE_LOG_EVERY lookups
+# - Fail-open: a Redis error is treated as a miss
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from bson import ObjectId, json_util
+
+from .logger import Log
+
+
+PRINCIPAL_CACHE_ENABLED = (os.getenv("PRINCIPAL_CACHE_ENABLED", "true") or "").strip().lower() in ("1", "true", "yes")
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+PRINCIPAL_CACHE_LOG_EVERY = int(os.getenv("PRINCIPAL_CACHE_LOG_EVERY", "1000"))
+
+KEY_PREFIX = "principal"
+
+# Canonical extended JSON keeps ObjectId / datetime / int-vs-float round trips exact
+_JSON_OPTIONS = json_util.JSONOptions(json_mode=json_util.JSONMode.CANONICAL, tz_aware=False)
+
+_STATS = {"hits": 0, "misses": 0, "errors": 0, "invalidations": 0}
+_STATS_LOCK = threading.Lock()
+
+
+def _redis():
+    from ..extensions.redis_conn import redis_client
+    return redis_client
+
+
+def _key(user_id: str) -> str:
+    return f"{KEY_PREFIX}:{user_id}"
+
+
+def token_id(token: str, claims: Dict[str, Any]) -> str:
+    if claims.get("jti"):
+        return f"jti:{claims['jti']}"
+    if claims.get("iat"):
+        return f"iat:{claims['iat']}"
+    return "tok:" + hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:24]
+
+
+def _record(field: str) -> None:
+    with _STATS_LOCK:
+        _STATS[field] += 1
+        lookups = _STATS["hits"] + _STATS["misses"]
+        if field in ("hits", "misses") and PRINCIPAL_CACHE_LOG_EVERY and lookups % PRINCIPAL_CACHE_LOG_EVERY == 0:
+            Log.info(
+                f"[principal_cache] hit_rate={_STATS['hits'] / lookups:.3f} "
+                f"hits={_STATS['hits']} misses={_STATS['misses']} errors={_STATS['errors']}"
+            )
+
+
+def get_stats() -> Dict[str, Any]:
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def get_principal(user_id: str, tid: str) -> Optional[Dict[str, Any]]:
+    if not PRINCIPAL_CACHE_ENABLED or not user_id:
+        return None
+
+    try:
+        raw = _redis().hget(_key(user_id), tid)
+    except Exception as e:
+        _record("errors")
+        Log.warning(f"[principal_cache][get] redis unavailable: {e}")
+        return None
+
+    if not raw:
+        _record("misses")
+        return None
+
+    try:
+        entry = json_util.loads(raw, json_options=_JSON_OPTIONS)
+    except Exception:
+        _record("misses")
+        return None
+
+    if time.time() - float(entry.get("cached_at") or 0) > PRINCIPAL_CACHE_TTL:
+        _record("misses")
+        return None
+
+    _record("hits")
+    return entry.get("principal")
+
+
+def set_principal(user_id: str, tid: str, principal: Dict[str, Any]) -> None:
+    if not PRINCIPAL_CACHE_ENABLED or not user_id:
+        return
+
+    payload = json_util.dumps({"cached_at": time.time(), "principal": principal}, json_options=_JSON_OPTIONS)
+    try:
+        pipe = _redis().pipeline(transaction=False)
+        pipe.hset(_key(user_id), tid, payload)
+        pipe.expire(_key(user_id), PRINCIPAL_CACHE_TTL)
+        pipe.execute()
+    except Exception as e:
+        _record("errors")
+        Log.warning(f"[principal_cache][set] redis unavailable: {e}")
+
+
+def invalidate_user(user_id: Any, reason: str = "") -> None:
+    if not user_id:
+        return
+    try:
+        _redis().delete(_key(str(user_id)))
+        _record("invalidations")
+        Log.info(f"[principal_cache][invalidate] user_id={user_id} reason={reason}")
+    except Exception as e:
+        Log.warning(f"[principal_cache][invalidate] failed user_id={user_id}: {e}")
+
+
+def invalidate_users(user_ids: Iterable[Any], reason: str = "") -> None:
+    keys = [_key(str(u)) for u in user_ids if u]
+    if not keys:
+        return
+    try:
+        _redis().delete(*keys)
+        _record("invalidations")
+        Log.info(f"[principal_cache][invalidate] users={len(keys)} reason={reason}")
+    except Exception as e:
+        Log.warning(f"[principal_cache][invalidate_users] failed: {e}")
+
+
+def invalidate_role(role_id: Any) -> None:
+    """
+    Role changes affect every user holding the role.
+    """
+    if not role_id:
+        return
+    from ..extensions.db import db
+
+    try:
+        rid = ObjectId(str(role_id))
+    except Exception:
+        return
+
+    try:
+        cursor = db.get_collection("users").find({"role": {"$in": [rid, str(role_id)]}}, {"_id": 1})
+        invalidate_users((d["_id"] for d in cursor), reason=f"role:{role_id}")
+    except Exception as e:
+        Log.warning(f"[principal_cache][invalidate_role] failed role_id={role_id}: {e}")
+
+
+def invalidate_system_user(system_user_id: Any, reason: str = "system_user_update") -> None:
+    """
+    Admin/system-user records are linked to users via users.system_user_id.
+    """
+    if not system_user_id:
+        return
+    from ..extensions.db import db
+
+    try:
+        sid = ObjectId(str(system_user_id))
+    except Exception:
+        return
+
+    try:
+        cursor = db.get_collection("users").find({"system_user_id": sid}, {"_id": 1})
+        invalidate_users((d["_id"] for d in cursor), reason=reason)
+    except Exception as e:
+        Log.warning(f"[principal_cache][invalidate_system_user] failed system_user_id={system_user_id}: {e}")
@@ -1,18 +1,25 @@
-
 import redis
-import os
 
-# Use environment variables to get Redis host and port (defaulting to 'redis' and '6381' respectively)
-redis_host = os.getenv('REDIS_HOST', 'redis')  # 'redis' is the service name from docker-compose
-redis_port = int(os.getenv('REDIS_PORT', 6381))  # Default to port 6381 if not set in the environment
+from ..extensions.redis_manager import get_redis as _role_client
+
+# Bytes-valued "cache" role client from the shared Redis manager
+# (REDIS_URL / REDIS_CACHE_URL); importing this module does not connect
+
+
+def get_client():
+    return _role_client("cache")
+
 
-# Create a Redis client
-client = redis.Redis(host=redis_host, port=redis_port, db=0)
+def __getattr__(name):
+    # `from app.utils.redis import client` keeps working
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Function to connect to Redis (with basic error handling)
 def connect():
     try:
-        client.ping()
+        get_client().ping()
         print("Connected to Redis")
     except redis.ConnectionError as err:
         print(f"Redis Client Error: {err}")
@@ -20,7 +27,7 @@ def connect():
 # Function to get value from Redis by key
 def get_redis(key):
     try:
-        return client.get(key)
+        return get_client().get(key)
     except redis.RedisError as err:
         print(f"Error fetching data from Redis: {err}")
         return None
@@ -28,14 +35,14 @@ def get_redis(key):
 # Function to set value in Redis by key
 def set_redis(key, value):
     try:
-        return client.set(key, value)
+        return get_client().set(key, value)
     except redis.RedisError as err:
         print(f"Error setting data in Redis: {err}")
 
 # Function to set value with expiry time in Redis
 def set_redis_with_expiry(key, expiry_in_seconds, value):
     try:
-        return client.setex(key, expiry_in_seconds, value)
+        return get_client().setex(key, expiry_in_seconds, value)
     except redis.RedisError as err:
         print(f"Error setting data with expiry in Redis: {err}")
 
@@ -43,9 +50,7 @@ def set_redis_with_expiry(key, expiry_in_seconds, value):
 def remove_redis(key):
     try:
         print(f"Removing Redis key: {key}")
-        return client.delete(key)
+        return get_client().delete(key)
     except redis.RedisError as err:
         print(f"Error removing data from Redis: {err}")
 
-# Connect to Redis
-connect()
@@ -1,16 +1,92 @@
-# app/utils/church/api_rate_limiter.py
+# app/utils/social/api_rate_limiter.py
+#
+# Per-business API rate limits (plan tiers), enforced in Redis.
+#
+# Key design:
+# - ONE Lua script call per check (one round trip), atomic across workers:
+#     * per-minute limit -> GCRA (generic cell rate algorithm): a single
+#       "theoretical arrival time" per business, burst = the per-minute limit
+#     * per-day limit    -> calendar-day counter (UTC), expires after the day
+#   A request is only counted when both limits allow it.
+# - Tier limits come from the cached entitlement snapshot (no Mongo per check)
+# - Standard RateLimit-Limit / RateLimit-Remaining / RateLimit-Reset /
+#   RateLimit-Policy headers (+ Retry-After when limited), attached to the
+#   response by apply_rate_limit_headers (after_request)
+# - Enforced centrally in token_required, so every authenticated endpoint is
+#   limited by the caller's business
+# - Fail-open: a Redis error never blocks an API call
 
 import time
-from ...extensions.db import db
+
+from flask import g
+
 from ...utils.logger import Log
-from bson import ObjectId
+
+
+KEY_PREFIX = "ratelimit:api"
+
+MINUTE_WINDOW_MS = 60_000
+DAY_WINDOW_S = 86_400
+
+# KEYS[1] = GCRA TAT key, KEYS[2] = day counter key
+# ARGV    = now_ms, per_minute_limit (0 = off), per_day_limit (0 = off), seconds_to_day_end
+# Returns {allowed, denied_by, minute_remaining, minute_reset_ms, day_remaining, retry_after_ms}
+#   denied_by: 0 = none, 1 = minute, 2 = day
+_CHECK_SCRIPT = """
+local now = tonumber(ARGV[1])
+local per_minute = tonumber(ARGV[2])
+local per_day = tonumber(ARGV[3])
+local day_left_s = tonumber(ARGV[4])
+local window = 60000
+
+local day_used = 0
+if per_day > 0 then
+  day_used = tonumber(redis.call('GET', KEYS[2]) or '0')
+  if day_used >= per_day then
+    return {0, 2, -1, 0, 0, day_left_s * 1000}
+  end
+end
+
+local minute_remaining = -1
+local minute_reset = 0
+local new_tat = 0
+if per_minute > 0 then
+  local interval = window / per_minute
+  local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+  if tat < now then
+    tat = now
+  end
+  new_tat = tat + interval
+  local allow_at = new_tat - window
+  if now < allow_at then
+    local remaining_day = -1
+    if per_day > 0 then remaining_day = per_day - day_used end
+    return {0, 1, 0, math.ceil(tat - now), remaining_day, math.ceil(allow_at - now)}
+  end
+  minute_remaining = math.floor((now + window - new_tat) / interval)
+  minute_reset = math.ceil(new_tat - now)
+  redis.call('SET', KEYS[1], tostring(new_tat), 'PX', minute_reset)
+end
+
+local day_remaining = -1
+if per_day > 0 then
+  local used = redis.call('INCR', KEYS[2])
+  if used == 1 then
+    redis.call('EXPIRE', KEYS[2], day_left_s + 60)
+  end
+  day_remaining = per_day - used
+end
+
+return {1, 0, minute_remaining, minute_reset, day_remaining, 0}
+"""
 
 
 class ApiRateLimitError(Exception):
-    def __init__(self, limit_type, limit, reset_at=None):
+    def __init__(self, limit_type, limit, reset_at=None, headers=None):
         self.limit_type = limit_type
         self.limit = limit
         self.reset_at = reset_at
+        self.headers = headers or {}
         self.message = f"API rate limit exceeded. Max {limit} requests per {limit_type}."
         self.meta = {
             "limit_type": limit_type,
@@ -21,67 +97,119 @@ class ApiRateLimitError(Exception):
         super().__init__(self.message)
 
 
+def _redis():
+    from ...extensions.redis_manager import get_redis
+    return get_redis("limiter")
+
+
+def _minute_key(bid: str) -> str:
+    return f"{KEY_PREFIX}:{bid}:gcra"
+
+
+def _day_key(bid: str, today: str) -> str:
+    return f"{KEY_PREFIX}:{bid}:day:{today}"
+
+
+def _limits_for(business_id):
+    """
+    (per_minute, per_day) from the cached entitlement snapshot.
+    None when the business has no active package (subscription check decides).
+    """
+    from ...utils.plan.entitlements import get_entitlements
+
+    package = get_entitlements(business_id).get("package")
+    if not package:
+        return None
+
+    def _as_int(v):
+        try:
+            return int(v or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    return _as_int(package.get("api_rate_limit_per_minute")), _as_int(package.get("max_api_requests_per_day"))
+
+
+def _build_headers(per_minute, per_day, minute_remaining, minute_reset_ms, day_remaining, seconds_to_day_end, retry_after_ms=0):
+    """
+    Headers describe the limit closest to being exhausted.
+    """
+    policies = []
+    candidates = []
+    if per_minute > 0:
+        policies.append(f"{per_minute};w=60")
+        candidates.append((max(0, minute_remaining), per_minute, max(0, -(-minute_reset_ms // 1000))))
+    if per_day > 0:
+        policies.append(f"{per_day};w={DAY_WINDOW_S}")
+        candidates.append((max(0, day_remaining), per_day, seconds_to_day_end))
+
+    if not candidates:
+        return {}
+
+    remaining, limit, reset = min(candidates, key=lambda c: (c[0], -c[2]))
+    headers = {
+        "RateLimit-Limit": str(limit),
+        "RateLimit-Remaining": str(remaining),
+        "RateLimit-Reset": str(int(reset)),
+        "RateLimit-Policy": ", ".join(policies),
+    }
+    if retry_after_ms:
+        headers["Retry-After"] = str(max(1, -(-retry_after_ms // 1000)))
+    return headers
+
+
 def check_api_rate_limit(business_id):
     """
-    Check both per-minute and per-day API rate limits.
-    Uses MongoDB counters with TTL (or Redis if available).
+    Check both per-minute and per-day API rate limits in one Redis round trip.
 
-    Call this at the top of any API-facing endpoint or in middleware.
+    Called by token_required for every authenticated request.
+    Returns True when the request may proceed (the RateLimit-* headers are
+    stored on g for after_request); raises ApiRateLimitError when limited.
     """
     try:
-        from ...utils.feature_gate import get_business_package
-
-        package = get_business_package(business_id)
-        if not package:
+        limits = _limits_for(business_id)
+        if not limits:
             return True  # No package = let subscription check handle it
 
-        max_per_day = package.get("max_api_requests_per_day", 0)
-        max_per_minute = package.get("api_rate_limit_per_minute", 0)
+        per_minute, per_day = limits
 
-        # -1 = unlimited
-        if max_per_day == -1 and max_per_minute == -1:
+        # -1 (unlimited) and 0 (not configured) are not enforced
+        per_minute = per_minute if per_minute > 0 else 0
+        per_day = per_day if per_day > 0 else 0
+        if not per_minute and not per_day:
             return True
 
-        c = db.get_collection("api_rate_limits")
         now = time.time()
-        today = time.strftime("%Y-%m-%d")
-        current_minute = time.strftime("%Y-%m-%d-%H-%M")
+        today = time.strftime("%Y-%m-%d", time.gmtime(now))
+        seconds_to_day_end = DAY_WINDOW_S - int(now) % DAY_WINDOW_S
 
         bid = str(business_id)
-
-        # ── Per-day check ──
-        if max_per_day != -1 and max_per_day > 0:
-            day_key = f"{bid}:{today}"
-            day_doc = c.find_one({"_id": day_key})
-
-            if day_doc and day_doc.get("count", 0) >= max_per_day:
-                raise ApiRateLimitError("day", max_per_day, reset_at=f"{today}T23:59:59Z")
-
-            c.update_one(
-                {"_id": day_key},
-                {
-                    "$inc": {"count": 1},
-                    "$setOnInsert": {"created_at": now, "type": "day"},
-                },
-                upsert=True,
+        allowed, denied_by, minute_remaining, minute_reset_ms, day_remaining, retry_after_ms = (
+            int(x) for x in _redis().eval(
+                _CHECK_SCRIPT,
+                2,
+                _minute_key(bid),
+                _day_key(bid, today),
+                int(now * 1000),
+                per_minute,
+                per_day,
+                seconds_to_day_end,
             )
+        )
 
-        # ── Per-minute check ──
-        if max_per_minute != -1 and max_per_minute > 0:
-            min_key = f"{bid}:{current_minute}"
-            min_doc = c.find_one({"_id": min_key})
-
-            if min_doc and min_doc.get("count", 0) >= max_per_minute:
-                raise ApiRateLimitError("minute", max_per_minute)
-
-            c.update_one(
-                {"_id": min_key},
-                {
-                    "$inc": {"count": 1},
-                    "$setOnInsert": {"created_at": now, "type": "minute"},
-                },
-                upsert=True,
-            )
+        headers = _build_headers(
+            per_minute, per_day, minute_remaining, minute_reset_ms, day_remaining,
+            seconds_to_day_end, retry_after_ms=0 if allowed else retry_after_ms,
+        )
+        try:
+            g.rate_limit_headers = headers
+        except Exception:
+            pass
+
+        if not allowed:
+            if denied_by == 2:
+                raise ApiRateLimitError("day", per_day, reset_at=f"{today}T23:59:59Z", headers=headers)
+            raise ApiRateLimitError("minute", per_minute, headers=headers)
 
         return True
 
@@ -92,21 +220,27 @@ def check_api_rate_limit(business_id):
         return True  # Fail open
 
 
+def apply_rate_limit_headers(response):
+    """
+    after_request hook: copy the headers of the last check onto the response.
+    """
+    headers = g.get("rate_limit_headers")
+    if headers:
+        for k, v in headers.items():
+            response.headers.setdefault(k, v)
+    return response
+
+
 def get_api_usage(business_id):
     """Get current API usage for dashboard display."""
     try:
-        from ...utils.feature_gate import get_business_package
-
-        c = db.get_collection("api_rate_limits")
         bid = str(business_id)
-        today = time.strftime("%Y-%m-%d")
+        today = time.strftime("%Y-%m-%d", time.gmtime())
 
-        day_doc = c.find_one({"_id": f"{bid}:{today}"})
-        used_today = day_doc.get("count", 0) if day_doc else 0
+        used_today = int(_redis().get(_day_key(bid, today)) or 0)
 
-        package = get_business_package(business_id)
-        max_per_day = package.get("max_api_requests_per_day", 0) if package else 0
-        max_per_minute = package.get("api_rate_limit_per_minute", 0) if package else 0
+        limits = _limits_for(business_id) or (0, 0)
+        max_per_minute, max_per_day = limits
 
         if max_per_day == -1:
             remaining = "Unlimited"
@@ -128,15 +262,3 @@ def get_api_usage(business_id):
     except Exception as e:
         Log.error(f"[get_api_usage] {e}")
         return {"used_today": 0, "daily_limit": 0, "remaining": 0, "pct": 0}
-
-
-def create_rate_limit_indexes():
-    """Create TTL index to auto-clean old rate limit docs."""
-    try:
-        c = db.get_collection("api_rate_limits")
-        # Auto-delete after 48 hours (day counters need to survive midnight)
-        c.create_index("created_at", expireAfterSeconds=172800)
-        return True
-    except Exception as e:
-        Log.error(f"[create_rate_limit_indexes] {e}")
-        return False
\ No newline at end of file
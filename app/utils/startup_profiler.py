@@ -0,0 +1,214 @@
+# app/utils/startup_profiler.py
+#
+# Startup profiling: where does worker / app boot time go?
+#
+# Key design:
+# - Enabled with STARTUP_PROFILE=1 (off by default; nothing is wrapped then)
+# - A meta-path finder hands every module a timing loader for the duration of
+#   exec_module only (the original loader is put back afterwards), so each
+#   imported module gets:
+#     * inclusive time: executing the module including everything it imports
+#     * self time:      inclusive minus nested imports
+# - phase("name") times initialisation steps (extensions, routes, ...)
+# - report(label) logs the slowest modules, the cost per top-level package
+#   (pandas, reportlab, twilio, ...) and the phases; STARTUP_PROFILE_OUTPUT
+#   also writes the full report as JSON
+# - Must be installed before anything heavy is imported: app/__init__.py
+#   imports this module first
+#
+# Offline: `python app/scripts/profile_startup.py [admin|social|both]`
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Any, Dict, List, Optional
+
+
+ENABLED = (os.getenv("STARTUP_PROFILE", "") or "").strip().lower() in ("1", "true", "yes", "on")
+TOP_N = int(os.getenv("STARTUP_PROFILE_TOP", "25"))
+OUTPUT = os.getenv("STARTUP_PROFILE_OUTPUT")
+
+_T0 = time.perf_counter()
+
+# module -> (inclusive_s, self_s)
+_MODULES: Dict[str, tuple] = {}
+# (label, name, seconds), in order
+_PHASES: List[tuple] = []
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_finder: Optional["_TimingFinder"] = None
+
+
+def _stack() -> list:
+    stack = getattr(_LOCAL, "stack", None)
+    if stack is None:
+        stack = _LOCAL.stack = []
+    return stack
+
+
+class _TimingLoader:
+    """
+    Wraps a loader for one exec_module call; everything else is delegated.
+    """
+
+    def __init__(self, loader, name: str):
+        self._loader = loader
+        self._name = name
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = _stack()
+        frame = [time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            stack.pop()
+            inclusive = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += inclusive
+            with _LOCK:
+                _MODULES[self._name] = (inclusive, inclusive - frame[1])
+            # hand the real loader back (importlib.resources, pkgutil, reloads)
+            spec = getattr(module, "__spec__", None)
+            if spec is not None and spec.loader is self:
+                spec.loader = self._loader
+            if getattr(module, "__loader__", None) is self:
+                module.__loader__ = self._loader
+
+
+class _TimingFinder(MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, fullname)
+            return spec
+        return None
+
+
+def install() -> bool:
+    """
+    Start timing imports. No-op unless STARTUP_PROFILE is set.
+    """
+    global _finder
+    if not ENABLED or _finder is not None:
+        return False
+    _finder = _TimingFinder()
+    sys.meta_path.insert(0, _finder)
+    return True
+
+
+def uninstall():
+    global _finder
+    if _finder is not None and _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+    _finder = None
+
+
+@contextmanager
+def phase(name: str, label: str = ""):
+    """
+    Time one initialisation step:
+
+        with phase("routes", "admin"):
+            register_admin_routes(app, api)
+    """
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _LOCK:
+            _PHASES.append((label, name, time.perf_counter() - start))
+
+
+def _top(rows: Dict[str, tuple], idx: int, n: int) -> List[Dict[str, Any]]:
+    ranked = sorted(rows.items(), key=lambda kv: kv[1][idx], reverse=True)[:n]
+    return [
+        {"module": name, "inclusive_ms": round(t[0] * 1000, 2), "self_ms": round(t[1] * 1000, 2)}
+        for name, t in ranked
+    ]
+
+
+def snapshot(label: str = "", top: int = TOP_N) -> Dict[str, Any]:
+    with _LOCK:
+        modules = dict(_MODULES)
+        phases = [p for p in _PHASES if not label or p[0] == label]
+
+    packages: Dict[str, List[float]] = {}
+    for name, (_, self_s) in modules.items():
+        row = packages.setdefault(name.split(".")[0], [0.0, 0])
+        row[0] += self_s
+        row[1] += 1
+
+    return {
+        "label": label,
+        "since_start_ms": round((time.perf_counter() - _T0) * 1000, 2),
+        "modules_imported": len(modules),
+        "import_ms": round(sum(t[1] for t in modules.values()) * 1000, 2),
+        "slowest_self": _top(modules, 1, top),
+        "slowest_inclusive": _top(modules, 0, top),
+        "packages": [
+            {"package": name, "ms": round(v[0] * 1000, 2), "modules": v[1]}
+            for name, v in sorted(packages.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+        ],
+        "phases": [{"phase": name, "ms": round(s * 1000, 2)} for _, name, s in phases],
+    }
+
+
+def report(label: str = "", top: int = TOP_N) -> Optional[Dict[str, Any]]:
+    """
+    Log (and optionally write) the profile. Returns None when disabled.
+    """
+    if not ENABLED:
+        return None
+
+    from .logger import Log
+
+    data = snapshot(label, top)
+    log_tag = f"[startup_profiler][{label or 'startup'}]"
+
+    Log.info(
+        f"{log_tag} {data['since_start_ms']}ms since start, "
+        f"{data['modules_imported']} modules, {data['import_ms']}ms importing"
+    )
+    for row in data["phases"]:
+        Log.info(f"{log_tag} phase {row['phase']}: {row['ms']}ms")
+    for row in data["packages"]:
+        Log.info(f"{log_tag} package {row['package']}: {row['ms']}ms ({row['modules']} modules)")
+    for row in data["slowest_self"]:
+        Log.info(f"{log_tag} module {row['module']}: self={row['self_ms']}ms inclusive={row['inclusive_ms']}ms")
+
+    if OUTPUT:
+        path = OUTPUT.replace("{label}", label or "startup")
+        try:
+            with open(path, "w") as fh:
+                json.dump(data, fh, indent=2)
+        except OSError as e:
+            Log.error(f"{log_tag} could not write {path}: {e}")
+
+    return data
+
+
+install()
@@ -0,0 +1,15 @@
+// Initiates rs0 once; re-running against an initiated set is a no-op.
+try {
+  rs.status();
+  print("rs0 already initiated");
+} catch (e) {
+  rs.initiate({
+    _id: "rs0",
+    members: [
+      { _id: 0, host: "rs-primary:27117", priority: 2 },
+      { _id: 1, host: "rs-secondary:27118", priority: 1 },
+      { _id: 2, host: "rs-analytics:27119", priority: 0, tags: { nodeType: "ANALYTICS" } },
+    ],
+  });
+  print("rs0 initiated");
+}
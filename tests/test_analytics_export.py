@@ -0,0 +1,47 @@
+# tests/test_analytics_export.py
+#
+# Background exports are uploaded as private objects; the status endpoint only
+# hands out a short-lived signed link.
+
+from unittest import mock
+
+from app.services.social import analytics_export
+from app.utils.media import spaces_client
+
+
+def test_spaces_export_upload_is_private(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("date\n2025-01-01\n")
+    client = mock.Mock()
+
+    with mock.patch.object(spaces_client, "_get_client", return_value=client):
+        out = spaces_client.upload_raw_file(
+            str(path), folder="exports/b1/u1", filename="export.csv", public_id="snapshots_x1", content_type="text/csv",
+        )
+
+    extra = client.upload_file.call_args.kwargs["ExtraArgs"]
+    assert "ACL" not in extra
+    assert out["url"] is None
+    assert out["public_id"] == "exports/b1/u1/snapshots_x1.csv"
+
+
+def test_spaces_download_url_is_presigned_and_short_lived():
+    client = mock.Mock()
+    client.generate_presigned_url.return_value = "https://signed"
+
+    with mock.patch.object(spaces_client, "_get_client", return_value=client):
+        assert spaces_client.get_private_download_url("exports/b1/u1/x.csv", expires_in=600) == "https://signed"
+
+    args, kwargs = client.generate_presigned_url.call_args
+    assert args == ("get_object",)
+    assert kwargs["Params"]["Key"] == "exports/b1/u1/x.csv"
+    assert kwargs["ExpiresIn"] == 600
+
+
+def test_export_download_url_only_for_finished_exports():
+    with mock.patch("app.utils.media.storage_router.get_private_download_url", return_value="https://signed") as sign:
+        assert analytics_export.export_download_url({"status": "running", "public_id": "exports/x"}) is None
+        assert analytics_export.export_download_url({"status": "done", "public_id": None}) is None
+        assert analytics_export.export_download_url({"status": "done", "public_id": "exports/x"}) == "https://signed"
+
+    sign.assert_called_once_with("exports/x", expires_in=analytics_export.EXPORT_DOWNLOAD_URL_TTL)
@@ -0,0 +1,102 @@
+# tests/test_sale_service.py
+#
+# A sale whose stock movement never lands is marked Failed, writes no ledger
+# rows and gives its cart's stock hold back.
+
+from unittest import mock
+
+import pytest
+
+from app.models.admin.sale import Sale
+from app.services.pos.sale import sale_service
+from app.services.pos.sale.sale_service import SaleService
+
+
+BUSINESS_ID = "64b000000000000000000001"
+SALE_ID = "64b0000000000000000000aa"
+
+CART = {
+    "lines": [
+        {
+            "product_id": "p1",
+            "product_name": "Tea",
+            "category": "Drinks",
+            "quantity": 2,
+            "unit_price": 5.0,
+            "unit_cost": 2.0,
+            "tax_rate": 0,
+            "tax_amount": 0,
+        }
+    ],
+    "totals": {"subtotal": 10.0, "total_discount": 0, "total_tax": 0, "total_cost": 4.0, "grand_total": 10.0},
+}
+
+
+@pytest.fixture
+def failing_stock_write():
+    sale_cls = mock.Mock(STATUS_COMPLETED=Sale.STATUS_COMPLETED, STATUS_FAILED=Sale.STATUS_FAILED)
+    sale_cls.return_value.save.return_value = SALE_ID
+    inventory = mock.Mock()
+    inventory.validate_stock_availability.return_value = (True, [])
+    inventory.decrease_stock_lines.return_value = None
+    ledger = mock.Mock(REF_TYPE_SALE="Sale")
+    ledger.get_by_reference.return_value = []
+
+    with mock.patch.object(sale_service, "Sale", sale_cls), \
+         mock.patch.object(sale_service, "InventoryService", inventory), \
+         mock.patch.object(sale_service, "StockLedger", ledger), \
+         mock.patch.object(sale_service.CartService, "validate_cart", return_value=(True, [])), \
+         mock.patch.object(sale_service, "release_stock_hold") as release:
+        yield sale_cls, inventory, ledger, release
+
+
+def _create(hold_id):
+    return SaleService.create_sale_from_cart(
+        business_id=BUSINESS_ID,
+        outlet_id="o1",
+        user_id="u1",
+        user__id="64b000000000000000000002",
+        cart=CART,
+        payment_method="Cash",
+        transaction_number="TXN-1",
+        receipt_number="RCT-1",
+        hold_id=hold_id,
+    )
+
+
+def test_failed_stock_write_fails_sale_and_releases_hold(failing_stock_write):
+    sale_cls, inventory, ledger, release = failing_stock_write
+
+    result = _create(hold_id="hold-1")
+
+    assert result == (False, None, "Failed to record stock movement for sale", None, None)
+    assert inventory.decrease_stock_lines.call_count == SaleService.STOCK_WRITE_ATTEMPTS
+    # Only reads against the ledger: no rows were written for the sale
+    assert {name for name, _, _ in ledger.method_calls} == {"get_by_reference"}
+    assert ledger.get_by_reference.call_count == SaleService.STOCK_WRITE_ATTEMPTS
+    sale_cls.update_status.assert_called_once_with(
+        sale_id=SALE_ID, business_id=BUSINESS_ID, new_status=Sale.STATUS_FAILED,
+    )
+    release.assert_called_once()
+    assert release.call_args.kwargs["hold_id"] == "hold-1"
+    assert release.call_args.kwargs["reason"] == "sale_failed"
+
+
+def test_failed_stock_write_without_hold_skips_release(failing_stock_write):
+    sale_cls, _, _, release = failing_stock_write
+
+    result = _create(hold_id=None)
+
+    assert result[0] is False
+    sale_cls.update_status.assert_called_once()
+    release.assert_not_called()
+
+
+def test_release_error_does_not_mask_failed_sale(failing_stock_write):
+    sale_cls, _, _, release = failing_stock_write
+    release.side_effect = ValueError("Hold not found or not active")
+
+    result = _create(hold_id="hold-1")
+
+    assert result[:3] == (False, None, "Failed to record stock movement for sale")
+    sale_cls.update_status.assert_called_once()
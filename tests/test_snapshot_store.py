@@ -0,0 +1,58 @@
+# tests/test_snapshot_store.py
+#
+# Range reads pick the coarsest covering granularity on their own: a long
+# range is answered from week/month/quarter rollup documents, not day rows.
+
+from unittest import mock
+
+from app.services.social import snapshot_store
+from app.services.social.snapshot_store import SnapshotStore
+
+
+KEY = dict(business_id="b1", user__id="u1", platform="facebook", destination_id="d1")
+
+
+def _rollup(period_start, followers, impressions, days=30):
+    return {
+        "period_start": period_start,
+        "days": days,
+        "data": {"impressions": impressions, "posts": 1},
+        "followers": followers,
+        "followers_date": period_start,
+    }
+
+
+def _fake_get_periods(*, granularity, period_starts, **_):
+    if granularity != "month":
+        return {}
+    return {p: _rollup(p, followers=100 + i, impressions=10) for i, p in enumerate(period_starts)}
+
+
+def test_long_range_is_served_from_rollups():
+    with mock.patch.object(snapshot_store.SocialSnapshotRollup, "get_periods", side_effect=_fake_get_periods) as periods, \
+         mock.patch.object(snapshot_store.SocialDailySnapshot, "get_dates", return_value=[]) as dates, \
+         mock.patch.object(snapshot_store.SocialDailySnapshot, "get_range") as day_range:
+        res = SnapshotStore.read_range_as_provider_result(**KEY, since_ymd="2025-01-01", until_ymd="2025-12-31")
+
+    day_range.assert_not_called()
+    dates.assert_called_once()
+    assert dates.call_args.kwargs["dates_ymd"] == []
+    month_calls = [c for c in periods.call_args_list if c.kwargs["granularity"] == "month"]
+    assert len(month_calls[0].kwargs["period_starts"]) == 12
+
+    assert [pt["date"] for pt in res.timeline] == [f"2025-{m:02d}-01" for m in range(1, 13)]
+    assert all(pt["granularity"] == "month" for pt in res.timeline)
+    assert res.totals["impressions"] == 120
+    assert res.totals["followers"] == 111
+
+
+def test_short_range_keeps_the_daily_timeline():
+    rows = [{"date_ymd": "2025-03-01", "data": {"impressions": 5, "followers": 7}}]
+    with mock.patch.object(snapshot_store.SocialDailySnapshot, "get_range", return_value=rows) as day_range, \
+         mock.patch.object(snapshot_store.SocialSnapshotRollup, "get_periods") as periods:
+        res = SnapshotStore.read_range_as_provider_result(**KEY, since_ymd="2025-03-01", until_ymd="2025-03-30")
+
+    day_range.assert_called_once()
+    periods.assert_not_called()
+    assert res.timeline[0]["date"] == "2025-03-01"
+    assert res.totals["impressions"] == 5
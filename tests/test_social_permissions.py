@@ -0,0 +1,82 @@
+# tests/test_social_permissions.py
+#
+# has_permission must give the same allow/deny answers as before the token
+# permissions were compiled into a grant set: token permissions first, then
+# the ROLE_PERMISSIONS defaults. A role document never narrows the answer.
+
+from unittest import mock
+
+import pytest
+
+from app.constants import social_permissions as sp
+
+
+def _previous_has_permission(user_info, module, action, branch_id=None):
+    """has_permission as it was before grant compilation (reference)."""
+    if not user_info:
+        return False
+    account_type = sp._safe_account_type(user_info.get("account_type", ""))
+    if account_type in (sp.ROLE_SYSTEM_OWNER, "SYSTEM_OWNER"):
+        return True
+    if module in sp.SYSTEM_OWNER_ONLY_MODULES:
+        return False
+    custom_permissions = user_info.get("permissions")
+    if custom_permissions and isinstance(custom_permissions, dict):
+        if action in custom_permissions.get(module, []):
+            if branch_id:
+                return sp._check_branch_scope(user_info, module, action, branch_id)
+            return True
+    default_perms = sp.ROLE_PERMISSIONS.get(sp._resolve_role_key(account_type), sp.PERMISSIONS_MEMBER)
+    if action not in default_perms.get(module, []):
+        return False
+    if branch_id:
+        return sp._check_branch_scope(user_info, module, action, branch_id)
+    return True
+
+
+TOKEN_PERMISSIONS = [
+    None,
+    {},
+    {"members": ["read", "export"], "donations": ["read"], "roles": ["read"]},
+    {"events": {"read": "1", "publish": "0"}, "branches": ("read", "archive")},
+]
+
+USERS = [
+    {"account_type": account_type, "role": "65a1b2c3d4e5f60718293a4b", "permissions": perms}
+    for account_type in ["SUPER_ADMIN", "BUSINESS_OWNER", "PASTOR", "FINANCE_OFFICER", "ADMIN",
+                         "GROUP_LEADER", "VOLUNTEER", "MEMBER", "GUEST", ""]
+    for perms in TOKEN_PERMISSIONS
+]
+
+
+@pytest.mark.parametrize("user_info", USERS)
+def test_role_user_answers_unchanged(user_info):
+    with mock.patch(
+        "app.models.admin.super_superadmin_model.role_permissions",
+        side_effect=AssertionError("role documents must not decide has_permission"),
+    ):
+        for module in sp.MODULE_ACTIONS:
+            for action in sp.ALL_ACTIONS:
+                assert sp.has_permission(user_info, module, action) == _previous_has_permission(
+                    user_info, module, action
+                ), (user_info, module, action)
+
+
+def test_branch_scope_still_applies_to_token_grants():
+    user_info = {
+        "account_type": "MEMBER",
+        "role": "65a1b2c3d4e5f60718293a4b",
+        "permissions": {"members": ["update"]},
+        "branch_permissions": {"b1": {"members": ["read"]}},
+    }
+    for branch_id in ("b1", "b2"):
+        assert sp.has_permission(user_info, "members", "update", branch_id) == _previous_has_permission(
+            user_info, "members", "update", branch_id
+        )
+
+
+def test_grants_follow_a_changed_token():
+    user_info = {"account_type": "MEMBER", "permissions": {"members": ["delete"]}}
+    assert sp.has_permission(user_info, "members", "delete")
+    user_info = {"account_type": "MEMBER", "permissions": {"members": ["read"]}}
+    assert not sp.has_permission(user_info, "members", "delete")
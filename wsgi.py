@@ -4,6 +4,7 @@ from app import (
     create_social_app,
     create_mto_admin_app, 
 )
+from app.jobs.periodic import register_periodic_jobs_safely
 
 # admin api base
 project_default_app = create_mto_admin_app()
@@ -12,3 +13,6 @@ project_default_app = create_mto_admin_app()
 application = DispatcherMiddleware(project_default_app, {
     "/social": create_social_app(), #for serving subscriber app
 })
+
+# recurring jobs live in rq-scheduler (idempotent, PERIODIC_JOBS_ENABLED)
+register_periodic_jobs_safely()